@@ -17,6 +17,9 @@ Initialisation file.
 
 __all__ = ['spiders']#analysis:ignore
 
+import os
+import re
+
 #==============================================================================
 # PROGRAM METADATA
 #==============================================================================
@@ -53,6 +56,48 @@ class ENetWarning(Warning):
         if expr is not None:    self.expr = expr
     def __str__(self):              return repr(self.msg)
 
+#==============================================================================
+# GENERIC SHARED RESOURCES
+#==============================================================================
+
+_SHARED             = {}
+
+class ENetShared(object):
+    """Base class of the resources backed by a file (stores, tables, graphs,
+    exporters) that all the components of a process opening the same file share.
+
+        >>> obj = cls._open_shared(path, create)
+        >>> if obj._release_shared(path): ...
+
+    The resources are counted by class and absolute path: :meth:`_open_shared`
+    returns the same object to all the callers, and :meth:`_release_shared`
+    tells the caller closing it whether it is the last user.
+    """
+
+    @staticmethod
+    def _shared_key(path):
+        return path if path == ':memory:' else os.path.abspath(path)
+
+    @classmethod
+    def _open_shared(cls, path, create):
+        key = (cls, cls._shared_key(path))
+        if key not in _SHARED:
+            _SHARED[key] = [create(), 0]
+        _SHARED[key][1] += 1
+        return _SHARED[key][0]
+
+    def _release_shared(self, path):
+        # True when the resource shall be closed: released by its last user, or
+        # not shared at all
+        key = (type(self), self._shared_key(path))
+        if _SHARED.get(key, [None])[0] is not self:
+            return True
+        _SHARED[key][1] -= 1
+        if _SHARED[key][1] > 0:
+            return False
+        del _SHARED[key]
+        return True
+
 #==============================================================================
 # GENERIC XPATH BUILDER
 #==============================================================================
@@ -63,11 +108,73 @@ class ENetXpath():
     to extract structured contents from webpage. 
     """
 
+    OPTIMIZE = False
+    """Default setting of the OPTIMIZE parameter of :meth:`create`.
+    """
+
+    # pattern of the "sibling section" rules, e.g.:
+    #   '//h3[span[@id="X"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1][span[@id="X"]]]//li/a/@href'
+    # i.e. all siblings following an anchor up to the next heading
+    _SIBLING_SECTION = re.compile(
+        r'^(?P<anchor>(?:.*?/)?[^/\[\]]+(?P<identifier>\[.+?\]))/{1,2}following-sibling::\*'
+        r'\[preceding-sibling::(?P<heading>.+?)\[(?:position\(\)=)?1\](?P=identifier)\]'
+        r'(?P<tag>/.*)?$')
+
+    @staticmethod
+    def optimize(path):
+        """Static method for rewriting an xpath expression generated by 
+        :meth:`create` into an equivalent expression with lower (linear) cost.
+        
+            >>> opath = xpath.optimize(path)
+            
+        Arguments
+        ---------
+        path : str
+            `xpath` formatted path.
+            
+        Returns
+        -------
+        opath : str
+            rewritten path, or :data:`path` itself when no rewriting applies.
+            
+        Note
+        ----
+        The "sibling section" rules, _e.g._:
+        
+            '//h3[span[@id="X"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1][span[@id="X"]]]//li/a/@href'
+        
+        test, for every sibling following the anchor, that its closest preceding
+        heading is the anchor, hence rescan all preceding siblings of every 
+        candidate node (quadratic cost). They are rewritten so as to collect 
+        the following siblings up to the next heading instead, using the EXSLT 
+        function `set:leading` (namespace `http://exslt.org/sets`):
+        
+            '(set:leading(//h3[span[@id="X"]]/following-sibling::*, //h3[span[@id="X"]]/following-sibling::*[starts-with(name(),"h")][1]) | //h3[span[@id="X"]]/following-sibling::*[starts-with(name(),"h")][1])//li/a/@href'
+        
+        Both forms are equivalent when the identifier of the anchor is carried
+        by no other heading of the page, whatever its level (as for the
+        identifiers of MediaWiki headlines): otherwise the original form goes
+        on collecting the siblings past the next heading carrying it, while the
+        rewritten one stops there. See :func:`estatnet.xpaths.check_equivalence`.
+        """
+        if path in (None,'') or not isinstance(path, str):
+            return path
+        match = ENetXpath._SIBLING_SECTION.match(path)
+        if match is None:
+            return path
+        anchor, heading = match.group('anchor'), match.group('heading')
+        if not anchor.startswith('/'):
+            anchor = '//%s' % anchor
+        following = '%s/following-sibling::*' % anchor
+        nextheading = '%s/following-sibling::%s[1]' % (anchor, heading)
+        return '(set:leading(%s, %s) | %s)%s' % (following, nextheading, nextheading,
+                                                 match.group('tag') or '')
+
     @staticmethod
     def create(node=None, tag=None, first=None, last=None, identifier=None, 
                following_sibling=None, following=None, preceding_sibling=None, preceding=None, 
                ancestor=None, ancestor_self=None, descendant=None, descendant_self=None,
-               parent=None, child=None, sep='/'):
+               parent=None, child=None, sep='/', optimize=None):
         """Static method for generating generic xpath based on simple rules.
         
             >>> path = xpath.create(node, tag, first, last, identifier, 
@@ -111,6 +218,10 @@ class ENetXpath():
             "descendant" and "descendant-or-self" keywords respectively); default: None.
         sep:
             ; default: '/'.
+        optimize : bool
+            when True, the generated path is rewritten into an equivalent path
+            with lower evaluation cost (see :meth:`optimize`); default: None, 
+            _i.e._ :data:`ENetXpath.OPTIMIZE` is used.
             
         Returns
         -------
@@ -263,6 +374,8 @@ class ENetXpath():
                 xrule = '%s%s*%s' % (xrule, SEP, tag)
             else:                           
                 xrule = '%s%s' % (xrule, tag)   
+        if optimize is True or (optimize is None and ENetXpath.OPTIMIZE is True):
+            xrule = ENetXpath.optimize(xrule)
         return xrule
 
 
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__analytics
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+.. _scipy: https://scipy.org
+.. |scipy| replace:: `scipy <scipy_>`_
+.. _NetworkX: https://networkx.github.io
+.. |NetworkX| replace:: `NetworkX <NetworkX_>`_
+.. _CSR: https://en.wikipedia.org/wiki/Sparse_matrix#Compressed_sparse_row_(CSR,_CRS_or_Yale_format)
+.. |CSR| replace:: `compressed sparse row <CSR_>`_
+
+Ranking of the |StatX| pages over the graph of their relationships.
+
+**Description**
+
+The scores of the nodes of the graph of the pages (see :class:`estatnet.graph.ENetGraph`)
+are computed on its |CSR| adjacency directly, by sparse matrix-vector iterations:
+
+* the (weighted) in- and out-degrees, see :meth:`degrees`,
+* the PageRank, see :meth:`pagerank`,
+* the hub and authority scores of HITS, see :meth:`hits`.
+
+The edges can be weighted by type (_e.g._, :literal:`{'see_also': 2, 'link': 0.5}`),
+types of null weight being ignored. The scores are arrays indexed by the nodes,
+_i.e._ aligned with the titles of the graph (see :meth:`top`). They follow the
+definitions of |NetworkX| (dangling nodes, normalisation, convergence test), so
+that both give the same scores.
+
+The iterations are vectorized with |scipy| sparse matrices when available
+(:literal:`backend='scipy'`), and otherwise run over the arrays of the graph
+(:literal:`backend='python'`). The backends, and |NetworkX| as a baseline, are
+benchmarked over a crawled or random graph by:
+
+    python -m estatnet.analytics estatnet.graph --benchmark -o results.json
+
+**Dependencies**
+
+*require*:      :mod:`time`, :mod:`random`, :mod:`array`, :mod:`json`, :mod:`argparse`
+
+*optional*:     :mod:`numpy`, :mod:`scipy`, :mod:`networkx`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Sun Jan 14 17:31:51 2018
+
+#%%
+import sys
+import json
+import time
+import random
+import argparse
+from array import array
+
+from . import ENetError#analysis:ignore
+from .graph import ENetGraph, EDGE_TYPES
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+BACKENDS            = ['scipy', 'python']
+"""Backends of the iterations, in order of preference.
+"""
+
+DAMPING             = 0.85
+"""Default damping factor of the PageRank.
+"""
+
+TOLERANCE           = 1.0e-6
+"""Default tolerance of the iterations (per node).
+"""
+
+MAX_ITER            = 100
+"""Default maximum number of iterations.
+"""
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+def _backend(backend):
+    if backend not in (None, 'auto') and backend not in BACKENDS:
+        raise ENetError("Backend %s not supported (only: %s)" % (backend, BACKENDS))
+    try:
+        import numpy#analysis:ignore
+        import scipy.sparse#analysis:ignore
+    except ImportError:
+        if backend == 'scipy':
+            raise ENetError("Modules numpy and scipy are required by the backend 'scipy'")
+        return 'python'
+    return backend if backend in BACKENDS else 'scipy'
+
+def _weights(graph, weights):
+    # weight of every edge of the graph, from the weights of the edge types
+    if not graph.finalized:
+        raise ENetError("Graph not finalized")
+    if weights is None:
+        return None
+    if set(weights).difference(EDGE_TYPES):
+        raise ENetError("Edge types %s not supported" % list(set(weights).difference(EDGE_TYPES)))
+    table = [float(weights.get(t, 1.)) for t in EDGE_TYPES]
+    return array('d', [table[t] for t in graph.types])
+
+def _matrix(graph, weights):
+    # sparse adjacency (rows: sources) of the graph
+    import numpy as np
+    import scipy.sparse as sp
+    n = len(graph.indptr) - 1
+    data = np.ones(len(graph.indices)) if weights is None else np.array(weights, dtype=np.float64)
+    # copies: the matrix is modified in place below, it shall not share the
+    # arrays of the graph
+    A = sp.csr_matrix((data, np.array(graph.indices, dtype=np.int32),
+                       np.array(graph.indptr, dtype=np.int64)), shape=(n, n))
+    A.sum_duplicates() # edges of different types between the same nodes
+    A.eliminate_zeros()
+    return A
+
+def degrees(graph, weights=None, backend=None):
+    """Compute the (weighted) in- and out-degrees of the nodes of a graph.
+
+        >>> indegree, outdegree = degrees(graph, weights=None, backend=None)
+
+    Arguments
+    ---------
+    graph : :class:`estatnet.graph.ENetGraph`
+        finalized graph.
+    weights : dict
+        weights of the edges, indexed by type (see :data:`estatnet.graph.EDGE_TYPES`);
+        missing types weigh 1; default: all edges weigh 1.
+    backend : str
+        one of :data:`BACKENDS`; default: the first available.
+
+    Returns
+    -------
+    indegree, outdegree : array
+        degrees of the nodes.
+    """
+    w = _weights(graph, weights)
+    if _backend(backend) == 'scipy':
+        A = _matrix(graph, w)
+        return A.sum(axis=0).A1, A.sum(axis=1).A1
+    n = len(graph.indptr) - 1
+    indegree, outdegree = array('d', bytes(8 * n)), array('d', bytes(8 * n))
+    for s in range(n):
+        for i in range(graph.indptr[s], graph.indptr[s+1]):
+            x = 1. if w is None else w[i]
+            outdegree[s] += x
+            indegree[graph.indices[i]] += x
+    return indegree, outdegree
+
+def pagerank(graph, damping=DAMPING, weights=None, tol=TOLERANCE, max_iter=MAX_ITER, backend=None):
+    """Compute the PageRank of the nodes of a graph.
+
+        >>> scores = pagerank(graph, damping=DAMPING, weights=None, tol=TOLERANCE,
+                              max_iter=MAX_ITER, backend=None)
+
+    Arguments
+    ---------
+    graph : :class:`estatnet.graph.ENetGraph`
+        finalized graph.
+    damping : float
+        damping factor; default: :data:`DAMPING`.
+    weights : dict
+        weights of the edges, indexed by type; see :meth:`degrees`.
+    tol : float
+        tolerance: the iterations stop when the L1 change of the scores is less
+        than :literal:`n * tol`; default: :data:`TOLERANCE`.
+    max_iter : int
+        maximum number of iterations; default: :data:`MAX_ITER`.
+    backend : str
+        one of :data:`BACKENDS`; default: the first available.
+
+    Returns
+    -------
+    scores : array
+        PageRank of the nodes, summing to 1; the rank of dangling nodes (no
+        out-edges) is spread over all nodes.
+    """
+    if not 0 <= damping <= 1:
+        raise ENetError("Wrong damping factor: %s" % damping)
+    w = _weights(graph, weights)
+    n = len(graph.indptr) - 1
+    if n == 0:
+        return array('d')
+    if _backend(backend) == 'scipy':
+        import numpy as np
+        A = _matrix(graph, w)
+        out = A.sum(axis=1).A1
+        dangling = out == 0
+        inv = np.divide(1., out, out=np.zeros(n), where=~dangling)
+        AT = A.T.tocsr()
+        x = np.full(n, 1. / n)
+        for _ in range(max_iter):
+            last = x
+            x = damping * (AT @ (last * inv)) + (damping * last[dangling].sum() + 1. - damping) / n
+            if np.abs(x - last).sum() < n * tol:
+                return x
+        raise ENetError("PageRank failed to converge in %s iterations" % max_iter)
+    _, out = degrees(graph, weights=weights, backend='python')
+    x = array('d', [1. / n]) * n
+    for _ in range(max_iter):
+        last = x
+        base = (damping * sum([last[s] for s in range(n) if out[s] == 0]) + 1. - damping) / n
+        x = array('d', [base]) * n
+        for s in range(n):
+            if out[s] == 0:
+                continue
+            share = damping * last[s] / out[s]
+            for i in range(graph.indptr[s], graph.indptr[s+1]):
+                x[graph.indices[i]] += share * (1. if w is None else w[i])
+        if sum([abs(a - b) for (a, b) in zip(x, last)]) < n * tol:
+            return x
+    raise ENetError("PageRank failed to converge in %s iterations" % max_iter)
+
+def hits(graph, weights=None, tol=TOLERANCE, max_iter=MAX_ITER, backend=None):
+    """Compute the hub and authority scores (HITS) of the nodes of a graph.
+
+        >>> hubs, authorities = hits(graph, weights=None, tol=TOLERANCE,
+                                     max_iter=MAX_ITER, backend=None)
+
+    Arguments
+    ---------
+    graph : :class:`estatnet.graph.ENetGraph`
+        finalized graph.
+    weights, tol, max_iter, backend :
+        see :meth:`pagerank`.
+
+    Returns
+    -------
+    hubs, authorities : array
+        scores of the nodes, each summing to 1.
+    """
+    w = _weights(graph, weights)
+    n = len(graph.indptr) - 1
+    if n == 0:
+        return array('d'), array('d')
+    if _backend(backend) == 'scipy':
+        import numpy as np
+        A = _matrix(graph, w)
+        AT = A.T.tocsr()
+        h = np.full(n, 1. / n)
+        for _ in range(max_iter):
+            last = h
+            a = AT @ h
+            a = a / a.max() if a.max() > 0 else a
+            h = A @ a
+            h = h / h.max() if h.max() > 0 else h
+            if np.abs(h - last).sum() < tol:
+                break
+        else:
+            raise ENetError("HITS failed to converge in %s iterations" % max_iter)
+        return h / (h.sum() or 1.), a / (a.sum() or 1.)
+    h = array('d', [1. / n]) * n
+    for _ in range(max_iter):
+        last, a = h, array('d', bytes(8 * n))
+        for s in range(n):
+            for i in range(graph.indptr[s], graph.indptr[s+1]):
+                a[graph.indices[i]] += h[s] * (1. if w is None else w[i])
+        a = _scaled(a, max(a))
+        h = array('d', [sum([a[graph.indices[i]] * (1. if w is None else w[i])
+                             for i in range(graph.indptr[s], graph.indptr[s+1])]) for s in range(n)])
+        h = _scaled(h, max(h))
+        if sum([abs(x - y) for (x, y) in zip(h, last)]) < tol:
+            break
+    else:
+        raise ENetError("HITS failed to converge in %s iterations" % max_iter)
+    return _scaled(h, sum(h)), _scaled(a, sum(a))
+
+def _scaled(x, norm):
+    return array('d', [v / norm for v in x]) if norm > 0 else x
+
+def top(graph, scores, n=10, prefix=None):
+    """Best scored pages of a graph.
+
+        >>> ranking = top(graph, scores, n=10, prefix=None)
+
+    Arguments
+    ---------
+    graph : :class:`estatnet.graph.ENetGraph`
+        graph of the scores.
+    scores : array
+        scores of the nodes (_e.g._, as returned by :meth:`pagerank`).
+    n : int
+        number of pages returned; default: 10.
+    prefix : str
+        prefix of the titles of the pages ranked, _e.g._ :literal:`'Glossary:'`
+        for the concepts; default: all pages.
+
+    Returns
+    -------
+    ranking : list
+        :literal:`(title, score)` pairs, by decreasing score.
+    """
+    nodes = [s for s in range(len(scores)) if prefix is None or graph.title(s).startswith(prefix)]
+    nodes.sort(key=lambda s: (-scores[s], graph.title(s)))
+    return [(graph.title(s), float(scores[s])) for s in nodes[:n]]
+
+def random_graph(nnodes, nedges, seed=0, types=('link', 'see_also', 'category')):
+    """Generate a random graph, _e.g._ for benchmarking.
+
+        >>> graph = random_graph(nnodes, nedges, seed=0, types=('link', 'see_also', 'category'))
+    """
+    rng = random.Random(seed)
+    graph = ENetGraph()
+    [graph.node('Page_%d' % s, create=True) for s in range(nnodes)]
+    for _ in range(nedges):
+        graph.add_edges('Page_%d' % rng.randrange(nnodes), ['Page_%d' % rng.randrange(nnodes)],
+                        rng.choice(types))
+    graph.finalize()
+    return graph
+
+def _networkx(graph, weights):
+    # baseline: the graph in NetworkX, the weights of parallel edges summed
+    import networkx as nx
+    w = _weights(graph, weights)
+    G = nx.DiGraph()
+    G.add_nodes_from(range(len(graph.indptr) - 1))
+    for s in range(len(graph.indptr) - 1):
+        for i in range(graph.indptr[s], graph.indptr[s+1]):
+            d, x = graph.indices[i], 1. if w is None else w[i]
+            if x == 0:
+                continue
+            if G.has_edge(s, d):
+                G[s][d]['weight'] += x
+            else:
+                G.add_edge(s, d, weight=x)
+    return G
+
+def benchmark(graph, weights=None, repeat=1, baseline=True):
+    """Benchmark the computation of the scores of a graph over the backends
+    available, and |NetworkX| (when available).
+
+        >>> results = benchmark(graph, weights=None, repeat=1, baseline=True)
+
+    Returns
+    -------
+    results : dict
+        best time (in seconds) of :literal:`'degrees'`, :literal:`'pagerank'`
+        and :literal:`'hits'`, by backend (:literal:`'networkx'` for the
+        baseline), and size of the graph.
+    """
+    backends = ['python'] + (['scipy'] if _backend(None) == 'scipy' else [])
+    runs = {b: {'degrees': lambda b=b: degrees(graph, weights=weights, backend=b),
+                'pagerank': lambda b=b: pagerank(graph, weights=weights, backend=b),
+                'hits': lambda b=b: hits(graph, weights=weights, backend=b)}
+            for b in backends}
+    if baseline:
+        try:
+            import networkx as nx
+        except ImportError:
+            pass
+        else:
+            G = _networkx(graph, weights)
+            # the degree views are lazy: they are evaluated for the time to compare
+            runs['networkx'] = {'degrees': lambda: (dict(G.in_degree(weight='weight')),
+                                                    dict(G.out_degree(weight='weight'))),
+                                'pagerank': lambda: nx.pagerank(G, alpha=DAMPING, tol=TOLERANCE, weight='weight'),
+                                'hits': lambda: nx.hits(G, tol=TOLERANCE)}
+    results = {'nodes': len(graph.indptr) - 1, 'edges': len(graph.indices), 'times': {}}
+    for (name, functions) in runs.items():
+        results['times'][name] = {}
+        for (key, function) in functions.items():
+            times = []
+            for _ in range(max(repeat, 1)):
+                start = time.perf_counter()
+                function()
+                times.append(time.perf_counter() - start)
+            results['times'][name][key] = min(times)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ranking of the pages of a graph of Statistics Explained.')
+    parser.add_argument('graph', nargs='?', help='file of the graph (see estatnet.graph)')
+    parser.add_argument('-n', '--top', type=int, default=10, help='number of pages listed')
+    parser.add_argument('-p', '--prefix', help='prefix of the titles of the pages listed')
+    parser.add_argument('-w', '--weights', help='weights of the edge types, as JSON')
+    parser.add_argument('--benchmark', action='store_true', help='benchmark the backends')
+    parser.add_argument('--random', type=int, nargs=2, metavar=('NODES', 'EDGES'),
+                        help='benchmark over a random graph instead')
+    parser.add_argument('-r', '--repeat', type=int, default=1, help='repetitions of the benchmark')
+    parser.add_argument('-o', '--output', help='JSON file of the results')
+    args = parser.parse_args(argv)
+    if args.random:
+        graph = random_graph(*args.random)
+    elif args.graph:
+        graph = ENetGraph.load(args.graph)
+    else:
+        parser.error('either a graph or --random is required')
+    weights = json.loads(args.weights) if args.weights else None
+    if args.benchmark:
+        results = benchmark(graph, weights=weights, repeat=args.repeat)
+    else:
+        hubs, authorities = hits(graph, weights=weights)
+        results = {'pagerank': top(graph, pagerank(graph, weights=weights), args.top, args.prefix),
+                   'hubs': top(graph, hubs, args.top, args.prefix),
+                   'authorities': top(graph, authorities, args.top, args.prefix)}
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
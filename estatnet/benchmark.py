@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__benchmark
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+
+Benchmark of the extraction of |StatX| items.
+
+**Description**
+
+Run the item loaders of :mod:`estatnet.items` over a corpus of stored pages and
+report:
+
+* the time spent on every field evaluated through its xpath expression (for
+  the detected layout version), and on the single-pass extraction of the
+  section-based fields, reported as a whole (:data:`SECTIONS_FIELD`), as the
+  loaders run them,
+* the time per item and the number of items per second of every loader,
+* the peak memory allocated while loading the items,
+* the time spent building the xpath tables from their definitions, and reading
+  them from the snapshot instead (see :mod:`estatnet.snapshot`), as well as
+  the time of a cold import of :mod:`estatnet.items` (up to the first table
+  used) in a new process, with and without a snapshot.
+
+The corpus is a directory with one subdirectory per page type (:literal:`article`,
+:literal:`glossary`, :literal:`category`, :literal:`theme`), each containing the
+HTML pages as :literal:`<title>.html` files (the title without its type prefix,
+_e.g._ :literal:`glossary/At-risk-of-poverty_rate.html`). Results are written in
+JSON and can be compared to a baseline run so as to catch regressions:
+
+    python -m estatnet.benchmark tests/corpus -o results.json -b baseline.json
+
+**Dependencies**
+
+*require*:      :mod:`os`, :mod:`json`, :mod:`time`, :mod:`tracemalloc`, :mod:`subprocess`, :mod:`tempfile`, :mod:`argparse`, :mod:`scrapy`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Mon Dec 18 17:28:29 2017
+
+#%%
+import os, sys
+import json
+import time
+import platform
+import tracemalloc
+import subprocess
+import tempfile
+import argparse
+
+from scrapy import http
+
+from . import ENetError#analysis:ignore
+from . import settings#analysis:ignore
+from . import items
+from . import snapshot
+from .xpaths import XPATHS
+from .sections import detect_version
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+BENCHMARK_KEYS      = [settings.ARTICLE_KEY, settings.GLOSSARY_KEY,
+                       settings.CATEGORY_KEY, settings.THEME_KEY]
+"""Types of pages (and loaders) benchmarked.
+"""
+
+SECTIONS_FIELD      = '<sections>'
+"""Name used for reporting the time of the single-pass extraction of the sections.
+"""
+
+TOLERANCE           = 0.25
+"""Default relative slowdown tolerated when comparing to a baseline.
+"""
+
+IMPORT_CODE         = 'import time; start = time.perf_counter(); '                  \
+                      'import estatnet.items as items; items.ARTICLE_PATHS; '       \
+                      'print(time.perf_counter() - start)'
+"""Code timing a cold import of :mod:`estatnet.items` in a new process, up to
+the first table used (the tables are loaded lazily).
+"""
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+def load_corpus(directory, keys=None):
+    """Load a corpus of stored pages.
+
+        >>> corpus = load_corpus(directory, keys=None)
+
+    Arguments
+    ---------
+    directory : str
+        directory of the corpus, with one subdirectory per page type.
+    keys : list
+        page types to load; default: :data:`BENCHMARK_KEYS`.
+
+    Returns
+    -------
+    corpus : dict
+        lists of :class:`scrapy.http.HtmlResponse` indexed by page type.
+    """
+    if not os.path.isdir(directory):
+        raise ENetError("Corpus directory %s not found" % directory)
+    corpus = {}
+    for key in keys or BENCHMARK_KEYS:
+        subdir = os.path.join(directory, key)
+        if not os.path.isdir(subdir):
+            continue
+        corpus[key] = []
+        for name in sorted(os.listdir(subdir)):
+            if not name.endswith('.html'):
+                continue
+            with open(os.path.join(subdir, name), 'rb') as f:
+                body = f.read()
+            url = '%s/%s%s' % (settings.SX_MAINURL, settings.SX_KEYDOMAINS[key], name[:-len('.html')])
+            corpus[key].append(http.HtmlResponse(url=url, body=body, encoding='utf-8'))
+    if not any(corpus.values()):
+        raise ENetError("No page found in corpus directory %s" % directory)
+    return corpus
+
+def _time_fields(key, responses, repeat):
+    # time spent on every field, for the paths of the version of each response:
+    # the section-based fields are not evaluated by xpath, but all together
+    # through ENetSections (see PageCrawler._parse_loader)
+    item, fields = items.SX_ITEMS[key], {}
+    def add(field, elapsed, calls):
+        stat = fields.setdefault(field, {'time': 0., 'calls': 0})
+        stat['time'] += elapsed
+        stat['calls'] += calls
+    for response in responses:
+        root = response.selector.root
+        version = detect_version(response.selector)
+        version = settings.SX_VERSIONS['current'] if version is None else version
+        sections = item.sections[version]
+        for (field, path) in sections.paths.items():
+            xpath = XPATHS[path]
+            start = time.perf_counter()
+            for _ in range(repeat):
+                xpath(root)
+            add(field, time.perf_counter() - start, repeat)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            sections.extract(root)
+        add(SECTIONS_FIELD, time.perf_counter() - start, repeat)
+    for stat in fields.values():
+        stat['time_per_call'] = stat['time'] / stat['calls']
+    return fields
+
+def _load_items(key, responses):
+    from .spiders.sxnet import PageCrawler
+    loader = items.SX_ITEMLOADERS[key]
+    return [PageCrawler._parse_loader(loader, response) for response in responses]
+
+def _time_import(filename):
+    # the interpreter start-up is left out: the time is measured in the process
+    env = dict(os.environ, **{snapshot.SNAPSHOT_ENV: filename})
+    output = subprocess.check_output([sys.executable, '-W', 'ignore', '-c', IMPORT_CODE], env=env,
+                                     cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return float(output.split()[-1])
+
+def _time_snapshot(repeat):
+    snapshot.load() # make sure the snapshot is up to date
+    timings = {}
+    for (name, function) in (('build', snapshot.build), ('read', snapshot.read)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        timings[name] = (time.perf_counter() - start) / repeat
+    timings['import_snapshot'] = min([_time_import(snapshot.SNAPSHOT_FILE) for _ in range(repeat)])
+    # without snapshot: a new (missing) snapshot file for every run
+    with tempfile.TemporaryDirectory() as tmpdir:
+        timings['import_build'] = min([_time_import(os.path.join(tmpdir, '%d.txt' % i))
+                                       for i in range(repeat)])
+    return timings
+
+def run(corpus, repeat=1):
+    """Run the benchmark over a corpus.
+
+        >>> results = run(corpus, repeat=1)
+
+    Arguments
+    ---------
+    corpus : dict,str
+        corpus (see :meth:`load_corpus`) or directory of the corpus.
+    repeat : int
+        number of times every page is loaded; default: 1.
+
+    Returns
+    -------
+    results : dict
+        dictionary with the following keys: :literal:`'metadata'`, :literal:`'total'`,
+        :literal:`'loaders'` (time per item and items per second, by page type),
+        :literal:`'fields'` (time per field, by page type) and :literal:`'snapshot'`
+        (time of building and reading the xpath tables, and of a cold import
+        of the items with and without a snapshot).
+    """
+    directory = corpus if isinstance(corpus, str) else None
+    if directory is not None:
+        corpus = load_corpus(directory)
+    if repeat < 1:
+        raise ENetError("Wrong number of repetitions: %s" % repeat)
+    results = {'metadata': {'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                            'python': platform.python_version(),
+                            'platform': platform.platform(),
+                            'corpus': directory,
+                            'npages': sum([len(r) for r in corpus.values()]),
+                            'repeat': repeat},
+               'loaders': {}, 'fields': {}}
+    for (key, responses) in corpus.items():
+        _load_items(key, responses) # warm up: tables, compiled expressions
+    nitems, elapsed = 0, 0.
+    for (key, responses) in corpus.items():
+        if not responses:
+            continue
+        start = time.perf_counter()
+        for _ in range(repeat):
+            _load_items(key, responses)
+        total = time.perf_counter() - start
+        n = len(responses) * repeat
+        results['loaders'][key] = {'items': n, 'time': total,
+                                   'time_per_item': total / n,
+                                   'items_per_second': n / total if total > 0 else None}
+        results['fields'][key] = _time_fields(key, responses, repeat)
+        nitems, elapsed = nitems + n, elapsed + total
+    # memory is measured apart: tracing allocations slows down the loaders
+    tracemalloc.start()
+    try:
+        [_load_items(key, responses) for (key, responses) in corpus.items()]
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    results['total'] = {'items': nitems, 'time': elapsed,
+                        'items_per_second': nitems / elapsed if elapsed > 0 else None,
+                        'peak_memory': peak}
+    results['snapshot'] = _time_snapshot(repeat)
+    return results
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Compare the results of a run to a baseline run.
+
+        >>> regressions = compare(results, baseline, tolerance=TOLERANCE)
+
+    Arguments
+    ---------
+    results, baseline : dict
+        results of two runs of :meth:`run`.
+    tolerance : float
+        relative slowdown (or memory increase) tolerated; default: :data:`TOLERANCE`.
+
+    Returns
+    -------
+    regressions : list
+        list of tuples :literal:`(metric, baseline_value, value)` for all metrics
+        that regressed by more than :data:`tolerance`; metrics missing in either
+        run are ignored.
+    """
+    regressions = []
+    def check(metric, base, value, higher_is_better=False):
+        if base in (None,0) or value is None:
+            return
+        ratio = base / value if higher_is_better else value / base
+        if ratio > 1 + tolerance:
+            regressions.append((metric, base, value))
+    for (key, stat) in results.get('loaders', {}).items():
+        base = baseline.get('loaders', {}).get(key)
+        if base is not None:
+            check('loaders/%s/time_per_item' % key, base['time_per_item'], stat['time_per_item'])
+    for (key, fields) in results.get('fields', {}).items():
+        for (field, stat) in fields.items():
+            base = baseline.get('fields', {}).get(key, {}).get(field)
+            if base is not None:
+                check('fields/%s/%s/time_per_call' % (key, field), base['time_per_call'],
+                      stat['time_per_call'])
+    total, base = results.get('total', {}), baseline.get('total', {})
+    check('total/items_per_second', base.get('items_per_second'), total.get('items_per_second'),
+          higher_is_better=True)
+    check('total/peak_memory', base.get('peak_memory'), total.get('peak_memory'))
+    return regressions
+
+def write(results, filename):
+    """Write the results of a run in JSON.
+
+        >>> write(results, filename)
+    """
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+def read(filename):
+    """Read the results of a run written in JSON.
+
+        >>> results = read(filename)
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m estatnet.benchmark',
+                                     description='Benchmark the extraction of Statistics Explained items.')
+    parser.add_argument('corpus', help='directory of the corpus of stored pages')
+    parser.add_argument('-o', '--output', help='JSON file where the results are written')
+    parser.add_argument('-b', '--baseline', help='JSON file of a baseline run to compare to')
+    parser.add_argument('-r', '--repeat', type=int, default=1, help='number of runs over each page')
+    parser.add_argument('-t', '--tolerance', type=float, default=TOLERANCE,
+                        help='relative slowdown tolerated with respect to the baseline')
+    args = parser.parse_args(argv)
+    results = run(args.corpus, repeat=args.repeat)
+    total = results['total']
+    print('%d items in %.4fs: %.1f items/s - peak memory: %.1f KiB'
+          % (total['items'], total['time'], total['items_per_second'] or 0., total['peak_memory'] / 1024.))
+    for (key, stat) in results['loaders'].items():
+        print('  %-10s %8.3f ms/item' % (key, 1e3 * stat['time_per_item']))
+    print('xpath tables: %.3f ms built - %.3f ms read from the snapshot'
+          % (1e3 * results['snapshot']['build'], 1e3 * results['snapshot']['read']))
+    print('cold import of the items: %.3f ms with the snapshot - %.3f ms without'
+          % (1e3 * results['snapshot']['import_snapshot'], 1e3 * results['snapshot']['import_build']))
+    if args.output:
+        write(results, args.output)
+    if args.baseline:
+        regressions = compare(results, read(args.baseline), tolerance=args.tolerance)
+        for (metric, base, value) in regressions:
+            print('REGRESSION %s: %.6g -> %.6g' % (metric, base, value))
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
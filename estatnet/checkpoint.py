@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__checkpoint
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+.. _Scrapy: https://scrapy.org
+.. |Scrapy| replace:: `Scrapy <Scrapy_>`_
+
+Checkpoints of the |StatX| crawls, for resuming interrupted crawls.
+
+**Description**
+
+The class :class:`ENetCheckpoint` keeps, in a job directory:
+
+* a store (SQLite) of the requests seen, either pending (scheduled or in flight)
+  or done (all the output of their response was emitted),
+* a journal (JSON lines) of the items emitted.
+
+Changes are buffered in memory and saved at every checkpoint, in a single
+transaction together with the size of the journal: the store and the journal
+always reflect the same state of the crawl. The items of a response are
+appended to the journal with the response marked done, at once. When a crawl is
+interrupted, the journal is truncated to the size saved at the last checkpoint,
+and the pending requests are scheduled again: the pages done are neither
+fetched, nor their items emitted again.
+
+The spider middleware :class:`estatnet.middlewares.ENetCheckpointMiddleware`
+records the crawl, checkpoints it periodically and resumes it when the job
+directory already holds a checkpoint. The requests whose download failed (after
+their retries) skip the spider middlewares: the downloader middleware
+:class:`estatnet.middlewares.ENetCheckpointFailureMiddleware` marks them done:
+
+    ESTATNET_CHECKPOINT_DIR = 'crawls/pages-1'
+    ESTATNET_CHECKPOINT_INTERVAL = 60
+    SPIDER_MIDDLEWARES = {'estatnet.middlewares.ENetCheckpointMiddleware': 40}
+    DOWNLOADER_MIDDLEWARES = {'estatnet.middlewares.ENetCheckpointFailureMiddleware': 40}
+
+The work saved when resuming (pages done, items journaled, requests restored)
+is logged and reported in the crawl stats (:literal:`estatnet/checkpoint/resumed_pages`,
+:literal:`resumed_items`, :literal:`restored`). The job directory replaces the
+|Scrapy| :literal:`JOBDIR`, which should not be set as well.
+
+**Dependencies**
+
+*require*:      :mod:`os`, :mod:`pickle`, :mod:`sqlite3`, :mod:`scrapy`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Sun Jan 14 17:31:51 2018
+
+#%%
+import os
+import pickle
+import sqlite3
+
+from . import ENetError, ENetShared#analysis:ignore
+from .dupefilter import request_key
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+CHECKPOINT_SETTING  = 'ESTATNET_CHECKPOINT_DIR'
+"""Name of the |Scrapy| setting giving the job directory of the checkpoints.
+"""
+
+CHECKPOINT_INTERVAL = 60.
+"""Default interval between two checkpoints, in seconds (setting
+:literal:`ESTATNET_CHECKPOINT_INTERVAL`).
+"""
+
+STORE_FILE          = 'checkpoint.sqlite'
+"""Name of the store of the requests in the job directory.
+"""
+
+JOURNAL_FILE        = 'items.jl'
+"""Name of the journal of the items in the job directory.
+"""
+
+KEY_META            = 'estatnet_checkpoint'
+"""Key of the request meta holding the key of the request in the store, kept
+through redirections.
+"""
+
+PENDING, DONE       = 0, 1
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+class ENetCheckpoint(ENetShared):
+    """Class providing with the checkpoints of a crawl.
+
+        >>> checkpoint = ENetCheckpoint(directory)
+        >>> checkpoint.schedule(request, spider)
+        >>> checkpoint.complete(request, items)
+        >>> checkpoint.save()
+
+    Arguments
+    ---------
+    directory : str
+        job directory, created when missing: when it holds a checkpoint, the
+        journal is truncated to its last saved state.
+
+    Attributes
+    ----------
+    resumed : dict
+        work saved by the previous runs: :literal:`'pages'` done, :literal:`'items'`
+        journaled, :literal:`'pending'` requests.
+    """
+
+    def __init__(self, directory):
+        if directory in (None,''):
+            raise ENetError("Job directory of the checkpoints is missing")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.__db = sqlite3.connect(os.path.join(directory, STORE_FILE))
+        self.__db.execute('PRAGMA journal_mode=WAL')
+        self.__db.execute('CREATE TABLE IF NOT EXISTS requests (key BLOB PRIMARY KEY, state INTEGER, request BLOB)')
+        self.__db.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)')
+        self.__db.commit()
+        meta = dict(self.__db.execute('SELECT name, value FROM meta').fetchall())
+        self.offset, self.nitems = meta.get('offset', 0), meta.get('items', 0)
+        self.ncheckpoints = meta.get('checkpoints', 0)
+        self.resumed = {'pages': self.count(DONE), 'items': self.nitems, 'pending': self.count(PENDING)}
+        # the items journaled after the last checkpoint are dropped: their
+        # responses are still pending
+        filename = os.path.join(directory, JOURNAL_FILE)
+        self.__journal = open(filename, 'r+b' if os.path.exists(filename) else 'w+b')
+        self.__journal.truncate(self.offset)
+        self.__journal.seek(self.offset)
+        self.__new, self.__done = {}, set()
+        from scrapy.utils.serialize import ScrapyJSONEncoder
+        self.__encoder = ScrapyJSONEncoder(ensure_ascii=False)
+
+    @classmethod
+    def open(cls, directory):
+        """Open the checkpoints of a job directory, shared within the process
+        (see :class:`estatnet.ENetShared`).
+
+            >>> checkpoint = ENetCheckpoint.open(directory)
+        """
+        return cls._open_shared(directory, lambda: cls(directory))
+
+    def count(self, state):
+        """Number of requests (saved) in a given state.
+        """
+        return self.__db.execute('SELECT COUNT(*) FROM requests WHERE state = ?', (state,)).fetchone()[0]
+
+    def __contains__(self, request):
+        key = request_key(request)
+        return key in self.__new \
+            or self.__db.execute('SELECT 1 FROM requests WHERE key = ?', (key,)).fetchone() is not None
+
+    def pending(self, spider):
+        """Requests pending at the last checkpoint (scheduled, or in flight).
+
+            >>> requests = checkpoint.pending(spider)
+        """
+        from scrapy.utils.request import request_from_dict
+        return [request_from_dict(pickle.loads(blob), spider=spider) for (blob,) in
+                self.__db.execute('SELECT request FROM requests WHERE state = ?', (PENDING,))]
+
+    def schedule(self, request, spider):
+        """Record a request scheduled.
+
+            >>> new = checkpoint.schedule(request, spider)
+
+        Returns
+        -------
+        new : bool
+            `False` when the request was already seen.
+        """
+        if request in self:
+            return False
+        key = request_key(request)
+        request.meta[KEY_META] = key
+        self.__new[key] = pickle.dumps(request.to_dict(spider=spider), protocol=4)
+        return True
+
+    def complete(self, request, items=()):
+        """Record a request done, together with the items emitted from its
+        response.
+
+            >>> checkpoint.complete(request, items=())
+        """
+        lines = [(self.__encoder.encode(dict(item)) + '\n').encode('utf-8') for item in items]
+        self.__journal.write(b''.join(lines))
+        self.nitems += len(lines)
+        self.__done.add(request.meta.get(KEY_META) or request_key(request))
+
+    def save(self):
+        """Checkpoint the crawl: the journal is flushed to disk, then the store
+        is updated in a single transaction.
+
+            >>> checkpoint.save()
+        """
+        self.__journal.flush()
+        os.fsync(self.__journal.fileno())
+        offset = self.__journal.tell()
+        with self.__db:
+            self.__db.executemany('INSERT OR IGNORE INTO requests (key, state, request) VALUES (?, ?, ?)',
+                                  [(key, PENDING, blob) for (key, blob) in self.__new.items()])
+            self.__db.executemany('UPDATE requests SET state = ?, request = NULL WHERE key = ?',
+                                  [(DONE, key) for key in self.__done])
+            self.__db.executemany('INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)',
+                                  [('offset', offset), ('items', self.nitems),
+                                   ('checkpoints', self.ncheckpoints + 1)])
+        self.offset, self.ncheckpoints = offset, self.ncheckpoints + 1
+        self.__new, self.__done = {}, set()
+
+    def close(self):
+        if not self._release_shared(self.directory):
+            return
+        self.__journal.close()
+        self.__db.close()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__diff
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+.. _CSR: https://en.wikipedia.org/wiki/Sparse_matrix#Compressed_sparse_row_(CSR,_CRS_or_Yale_format)
+.. |CSR| replace:: `compressed sparse row <CSR_>`_
+
+Differences between the graphs of the |StatX| pages of two crawls.
+
+**Description**
+
+The class :class:`ENetGraphDiff` compares two graphs of the pages saved by
+successive crawls (see :class:`estatnet.graph.ENetGraph`):
+
+* the nodes of both graphs are mapped onto the same identifiers through their
+  titles (no remapping when the crawls share the table of titles, see
+  :mod:`estatnet.titles`),
+* every edge is encoded as a single integer :literal:`(source * n + target) << 8 | type`,
+  so that the edges of each graph form a sorted integer array (read off the
+  |CSR| adjacency of the graph),
+* the edges added and removed are the differences of both arrays, computed by
+  merging them (with :mod:`numpy` when available) instead of sets of tuples.
+
+A node is present in a graph when its page was scraped or has edges. The delta
+is written to a directory (see :meth:`ENetGraphDiff.write`):
+
+* :literal:`nodes.csv`: the pages added or removed, with their type,
+* :literal:`edges.csv`: the edges added or removed, with their type,
+* :literal:`summary.json`: the numbers of changes per edge type and page type.
+
+or from the command line:
+
+    python -m estatnet.diff old.graph new.graph -o delta
+
+**Dependencies**
+
+*require*:      :mod:`os`, :mod:`csv`, :mod:`json`, :mod:`array`, :mod:`argparse`
+
+*optional*:     :mod:`numpy`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Sun Jan 14 17:31:51 2018
+
+#%%
+import os
+import sys
+import csv
+import json
+import argparse
+from array import array
+
+from . import ENetError#analysis:ignore
+from . import settings
+from .graph import ENetGraph, EDGE_TYPES
+from .pages import ENetPrefixTrie
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+ADDED               = 'added'
+REMOVED             = 'removed'
+"""Changes of the nodes and edges.
+"""
+
+DEF_PAGE_TYPE       = settings.ARTICLE_KEY
+"""Type of the pages whose title has no prefix of a page type (see
+:data:`settings.SX_KEYDOMAINS`).
+"""
+
+DELTA_FILES         = {'nodes': 'nodes.csv', 'edges': 'edges.csv', 'summary': 'summary.json'}
+"""Files of the delta written by :meth:`ENetGraphDiff.write`.
+"""
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+def _difference(a, b):
+    # elements of a not in b, both sorted arrays of distinct integers
+    try:
+        import numpy as np
+    except ImportError:
+        pass
+    else:
+        x = np.setdiff1d(np.frombuffer(a, dtype=np.int64), np.frombuffer(b, dtype=np.int64),
+                         assume_unique=True)
+        return array('q', x.astype(np.int64).tobytes())
+    diff, i, j, na, nb = array('q'), 0, 0, len(a), len(b)
+    while i < na and j < nb:
+        x, y = a[i], b[j]
+        if x < y:
+            diff.append(x)
+            i += 1
+        else:
+            i, j = (i + 1, j + 1) if x == y else (i, j + 1)
+    diff.extend(a[i:])
+    return diff
+
+
+class ENetGraphDiff(object):
+    """Class providing with the differences between the graphs of two crawls.
+
+        >>> diff = ENetGraphDiff(old, new)
+        >>> for (change, source, target, edge_type) in diff.edges(): ...
+        >>> diff.write(directory)
+
+    Arguments
+    ---------
+    old, new : :class:`estatnet.graph.ENetGraph`
+        graphs of the previous and last crawls (finalized).
+
+    Attributes
+    ----------
+    titles : list
+        titles of the nodes of both graphs, indexed by identifier: those of the
+        last graph first.
+    added, removed : :class:`array.array`
+        edges added and removed, as sorted integer keys (see :meth:`edge`).
+    nodes_added, nodes_removed : list
+        identifiers of the nodes added and removed.
+    """
+
+    def __init__(self, old, new):
+        if not (old.finalized and new.finalized):
+            raise ENetError("Graphs not finalized")
+        self.titles = list(new.titles[:len(new.indptr)-1])
+        ids = dict([(t, n) for (n, t) in enumerate(self.titles)])
+        mapping = array('i')
+        for title in old.titles[:len(old.indptr)-1]:
+            if title not in ids:
+                ids[title] = len(self.titles)
+                self.titles.append(title)
+            mapping.append(ids[title])
+        self.nnodes = len(self.titles)
+        # nodes of the new graph keep their identifiers: its keys come sorted
+        new_keys, old_keys = self._keys(new), self._keys(old, mapping)
+        self.added, self.removed = _difference(new_keys, old_keys), _difference(old_keys, new_keys)
+        self.nedges = {'old': len(old_keys), 'new': len(new_keys)}
+        old_nodes, new_nodes = self._nodes(old, mapping), self._nodes(new)
+        self.nodes_added = [n for n in range(self.nnodes) if new_nodes[n] and not old_nodes[n]]
+        self.nodes_removed = [n for n in range(self.nnodes) if old_nodes[n] and not new_nodes[n]]
+        self.nnodes_present = {'old': sum(old_nodes), 'new': sum(new_nodes)}
+        self.__trie = ENetPrefixTrie()
+        [self.__trie.insert(domain, page) for (page, domain) in settings.SX_KEYDOMAINS.items()
+            if domain not in (None,'',[])] # the first type of a given prefix is kept
+
+    @classmethod
+    def load(cls, old, new):
+        """Compare two graphs saved with :meth:`estatnet.graph.ENetGraph.save`.
+
+            >>> diff = ENetGraphDiff.load(old, new)
+        """
+        return cls(ENetGraph.load(old), ENetGraph.load(new))
+
+    def _keys(self, graph, mapping=None):
+        n, keys = self.nnodes, array('q')
+        indptr, indices, types = graph.indptr, graph.indices, graph.types
+        for s in range(len(indptr) - 1):
+            u = s if mapping is None else mapping[s]
+            keys.extend([((u * n + (d if mapping is None else mapping[d])) << 8) | t
+                         for (d, t) in zip(indices[indptr[s]:indptr[s+1]], types[indptr[s]:indptr[s+1]])])
+        if mapping is not None and mapping != array('i', range(len(mapping))):
+            keys = array('q', sorted(keys)) # titles of the old graph not in the same order
+        return keys
+
+    def _nodes(self, graph, mapping=None):
+        nodes = bytearray(self.nnodes)
+        indptr, indices = graph.indptr, graph.indices
+        for s in range(len(indptr) - 1):
+            if graph.scraped[s] or indptr[s+1] > indptr[s]:
+                nodes[s if mapping is None else mapping[s]] = 1
+        for d in indices:
+            nodes[d if mapping is None else mapping[d]] = 1
+        return nodes
+
+    def edge(self, key):
+        """Decode the key of an edge.
+
+            >>> source, target, edge_type = diff.edge(key)
+        """
+        s, d = divmod(key >> 8, self.nnodes)
+        return s, d, EDGE_TYPES[key & 0xff]
+
+    def page_type(self, n):
+        """Type of the page of a node, from its title.
+
+            >>> page = diff.page_type(n)
+        """
+        return self.__trie.match(self.titles[n]) or DEF_PAGE_TYPE
+
+    def nodes(self):
+        """Iterate over the nodes added and removed.
+
+            >>> for (change, title, page) in diff.nodes(): ...
+        """
+        for (change, nodes) in ((ADDED, self.nodes_added), (REMOVED, self.nodes_removed)):
+            for n in nodes:
+                yield change, self.titles[n], self.page_type(n)
+
+    def edges(self):
+        """Iterate over the edges added and removed, as titles and type names.
+
+            >>> for (change, source, target, edge_type) in diff.edges(): ...
+        """
+        for (change, keys) in ((ADDED, self.added), (REMOVED, self.removed)):
+            for key in keys:
+                s, d, t = self.edge(key)
+                yield change, self.titles[s], self.titles[d], t
+
+    def summary(self):
+        """Statistics of the differences.
+
+            >>> stats = diff.summary()
+
+        Returns
+        -------
+        stats : dict
+            numbers of nodes and edges of both graphs and of changes, and numbers
+            of changes per edge type, and per page type (of the source for the
+            edges).
+        """
+        stats = {'nodes': dict(self.nnodes_present, added=len(self.nodes_added), removed=len(self.nodes_removed)),
+                 'edges': dict(self.nedges, added=len(self.added), removed=len(self.removed)),
+                 'edge_types': {}, 'page_types': {}}
+        for (change, nodes) in ((ADDED, self.nodes_added), (REMOVED, self.nodes_removed)):
+            for n in nodes:
+                counts = stats['page_types'].setdefault(self.page_type(n), {})
+                counts['nodes_' + change] = counts.get('nodes_' + change, 0) + 1
+        for (change, keys) in ((ADDED, self.added), (REMOVED, self.removed)):
+            for key in keys:
+                s, _, t = self.edge(key)
+                counts = stats['edge_types'].setdefault(t, {ADDED: 0, REMOVED: 0})
+                counts[change] += 1
+                counts = stats['page_types'].setdefault(self.page_type(s), {})
+                counts['edges_' + change] = counts.get('edges_' + change, 0) + 1
+        for counts in stats['page_types'].values():
+            [counts.setdefault(k, 0) for k in ('nodes_added', 'nodes_removed', 'edges_added', 'edges_removed')]
+        return stats
+
+    def write(self, directory):
+        """Write the delta (see :data:`DELTA_FILES`) in a directory.
+
+            >>> stats = diff.write(directory)
+        """
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, DELTA_FILES['nodes']), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['change', 'title', 'page_type'])
+            writer.writerows(self.nodes())
+        with open(os.path.join(directory, DELTA_FILES['edges']), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['change', 'source', 'target', 'type'])
+            writer.writerows(self.edges())
+        stats = self.summary()
+        with open(os.path.join(directory, DELTA_FILES['summary']), 'w') as f:
+            json.dump(stats, f, indent=2, sort_keys=True)
+        return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Differences between the graphs of two crawls of Statistics Explained.')
+    parser.add_argument('old', help='file of the graph of the previous crawl')
+    parser.add_argument('new', help='file of the graph of the last crawl')
+    parser.add_argument('-o', '--output', help='directory of the delta')
+    args = parser.parse_args(argv)
+    diff = ENetGraphDiff.load(args.old, args.new)
+    stats = diff.write(args.output) if args.output else diff.summary()
+    print(json.dumps(stats, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__dupefilter
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+.. _Scrapy: https://scrapy.org
+.. |Scrapy| replace:: `Scrapy <Scrapy_>`_
+.. _Bloom: https://en.wikipedia.org/wiki/Bloom_filter
+.. |Bloom| replace:: `Bloom filter <Bloom_>`_
+
+Persistent filter of the duplicate requests of the |StatX| crawls.
+
+**Description**
+
+The default |Scrapy| filter keeps the fingerprints of all the requests in an
+in-memory set, lost at the end of every run. The class :class:`ENetDupeFilter`
+keeps them instead in a (SQLite) store on disk, fronted by a fixed-size |Bloom|
+(:class:`ENetBloomFilter`) so that:
+
+* the memory used stays flat however many requests are seen,
+* most new requests (negative answers of the |Bloom|) need no disk lookup,
+* the requests seen in a run are filtered in the next runs (resume).
+
+Requests to |StatX| pages are keyed by the canonical title of the page (see
+:meth:`estatnet.pages.canonical_title`), so that the different URLs of a same
+page are deduplicated; other requests (_e.g._, to the MediaWiki API) are keyed
+by their |Scrapy| fingerprint. The filter is enabled through the settings:
+
+    DUPEFILTER_CLASS = 'estatnet.dupefilter.ENetDupeFilter'
+    ESTATNET_DUPEFILTER_FILE = 'estatnet.seen'
+
+When no file is set, the store is kept in :literal:`JOBDIR` when defined, in a
+temporary file (removed when the crawl ends) otherwise.
+
+**Dependencies**
+
+*require*:      :mod:`os`, :mod:`math`, :mod:`hashlib`, :mod:`sqlite3`, :mod:`tempfile`, :mod:`scrapy`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Sun Jan 14 17:31:51 2018
+
+#%%
+import os
+import math
+import hashlib
+import sqlite3
+import tempfile
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+from scrapy.dupefilters import RFPDupeFilter
+from scrapy.utils.job import job_dir
+
+from . import ENetError#analysis:ignore
+from . import settings#analysis:ignore
+from .pages import page_title, canonical_title
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+DUPEFILTER_SETTING  = 'ESTATNET_DUPEFILTER_FILE'
+"""Name of the |Scrapy| setting giving the file of the store of the requests seen.
+"""
+
+DUPEFILTER_FILE     = 'requests.seen.sqlite'
+"""Name of the store of the requests seen in :literal:`JOBDIR`.
+"""
+
+CAPACITY            = 5000000
+"""Default number of requests the |Bloom| is sized for (setting
+:literal:`ESTATNET_DUPEFILTER_CAPACITY`); beyond, the rate of false positives,
+hence of disk lookups, increases, not the memory.
+"""
+
+ERROR_RATE          = 0.001
+"""Default rate of false positives of the |Bloom| at full capacity (setting
+:literal:`ESTATNET_DUPEFILTER_ERROR_RATE`).
+"""
+
+COMMIT_SIZE         = 1000
+"""Number of requests after which the store is committed to disk.
+"""
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+def request_key(request, fingerprinter=None):
+    """Key of a request in the store of the requests seen.
+
+        >>> key = request_key(request, fingerprinter=None)
+
+    Arguments
+    ---------
+    request : :class:`scrapy.Request`
+        request to identify.
+    fingerprinter :
+        |Scrapy| request fingerprinter used for the requests that are not GET
+        requests of |StatX| pages; default: :meth:`scrapy.utils.request.fingerprint`.
+
+    Returns
+    -------
+    key : bytes
+        digest (20 bytes) of the canonical title of the page (with the other
+        sorted query arguments), or fingerprint of the request.
+    """
+    title = page_title(request.url) if request.method == 'GET' and not request.body else None
+    if title is None or settings.EC_URL not in urlsplit(request.url).netloc:
+        if fingerprinter is None:
+            from scrapy.utils.request import fingerprint
+            return fingerprint(request)
+        return fingerprinter.fingerprint(request)
+    query = sorted([(k, v) for (k, v) in parse_qsl(urlsplit(request.url).query) if k != 'title'])
+    key = canonical_title(title) + ('?%s' % urlencode(query) if query else '')
+    return hashlib.sha1(key.encode('utf-8')).digest()
+
+
+class ENetBloomFilter(object):
+    """Class providing with a fixed-size |Bloom| over digests.
+
+        >>> bloom = ENetBloomFilter(capacity=CAPACITY, error_rate=ERROR_RATE)
+        >>> bloom.add(key)
+        >>> key in bloom
+
+    Arguments
+    ---------
+    capacity : int
+        number of keys the filter is sized for; default: :data:`CAPACITY`.
+    error_rate : float
+        rate of false positives at full capacity; default: :data:`ERROR_RATE`.
+
+    Note
+    ----
+    The keys are digests (at least 16 bytes): the positions of a key are derived
+    from its first bytes by double hashing, with no further hashing.
+    """
+
+    def __init__(self, capacity=CAPACITY, error_rate=ERROR_RATE):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ENetError("Wrong capacity (%s) or error rate (%s)" % (capacity, error_rate))
+        self.nbits = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.nhashes = max(1, int(round(self.nbits / capacity * math.log(2))))
+        self.__bits = bytearray((self.nbits + 7) // 8)
+
+    def __positions(self, key):
+        h1, h2 = int.from_bytes(key[:8], 'little'), int.from_bytes(key[8:16], 'little') | 1
+        return [(h1 + i * h2) % self.nbits for i in range(self.nhashes)]
+
+    def add(self, key):
+        """Add a key; return `True` when the key was (possibly) present already.
+        """
+        present = True
+        for pos in self.__positions(key):
+            byte, bit = pos >> 3, 1 << (pos & 7)
+            if not self.__bits[byte] & bit:
+                present = False
+                self.__bits[byte] |= bit
+        return present
+
+    def __contains__(self, key):
+        return all([self.__bits[pos >> 3] & (1 << (pos & 7)) for pos in self.__positions(key)])
+
+    @property
+    def nbytes(self):
+        """Size (in bytes) of the array of bits, set by the capacity only.
+        """
+        return len(self.__bits)
+
+
+class ENetFingerprintStore(object):
+    """Class providing with a persistent, memory-bounded set of request keys.
+
+        >>> store = ENetFingerprintStore(filename, capacity=CAPACITY, error_rate=ERROR_RATE)
+        >>> new = store.add(key)
+
+    Arguments
+    ---------
+    filename : str
+        file of the (SQLite) store; the keys stored already are loaded in the
+        |Bloom| when the store is opened.
+    capacity, error_rate :
+        see :class:`ENetBloomFilter`.
+
+    Attributes
+    ----------
+    nlookups : int
+        number of keys looked up on disk (positive answers of the |Bloom|).
+    nfalse : int
+        number of keys looked up on disk and not found (false positives).
+    """
+
+    def __init__(self, filename, capacity=CAPACITY, error_rate=ERROR_RATE):
+        if filename in (None,''):
+            raise ENetError("File of the store of the requests seen is missing")
+        self.filename = filename
+        self.bloom = ENetBloomFilter(capacity, error_rate)
+        self.__db = sqlite3.connect(filename)
+        self.__db.execute('CREATE TABLE IF NOT EXISTS seen (key BLOB PRIMARY KEY) WITHOUT ROWID')
+        for (key,) in self.__db.execute('SELECT key FROM seen'):
+            self.bloom.add(key)
+        self.__pending = 0
+        self.nlookups = self.nfalse = 0
+
+    def add(self, key):
+        """Add a key; return `True` when the key is new.
+
+            >>> new = store.add(key)
+        """
+        if self.bloom.add(key):
+            # possibly seen: only the disk can tell
+            self.nlookups += 1
+            if self.__db.execute('SELECT 1 FROM seen WHERE key = ?', (key,)).fetchone() is not None:
+                return False
+            self.nfalse += 1
+        self.__db.execute('INSERT INTO seen (key) VALUES (?)', (key,))
+        self.__pending += 1
+        if self.__pending >= COMMIT_SIZE:
+            self.commit()
+        return True
+
+    def __contains__(self, key):
+        return key in self.bloom                                                \
+            and self.__db.execute('SELECT 1 FROM seen WHERE key = ?', (key,)).fetchone() is not None
+
+    def __len__(self):
+        return self.__db.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+
+    def commit(self):
+        self.__db.commit()
+        self.__pending = 0
+
+    def close(self):
+        self.commit()
+        self.__db.close()
+
+
+class ENetDupeFilter(RFPDupeFilter):
+    """Class providing with a persistent |Scrapy| filter of duplicate requests.
+
+        >>> DUPEFILTER_CLASS = 'estatnet.dupefilter.ENetDupeFilter'
+
+    Arguments
+    ---------
+    path : str
+        file of the store of the requests seen; when `None`, a temporary file
+        removed on :meth:`close`.
+    debug : bool
+        log all the duplicate requests; default: `False`.
+    capacity, error_rate :
+        see :class:`ENetBloomFilter`.
+    """
+
+    def __init__(self, path=None, debug=False, *, fingerprinter=None,
+                 capacity=CAPACITY, error_rate=ERROR_RATE):
+        super(ENetDupeFilter, self).__init__(None, debug, fingerprinter=fingerprinter)
+        self.fingerprints = None # no in-memory set
+        self.stats = None
+        self.__temporary = path is None
+        if self.__temporary:
+            fd, path = tempfile.mkstemp(prefix='estatnet-', suffix='.seen')
+            os.close(fd)
+        self.store = ENetFingerprintStore(path, capacity=capacity, error_rate=error_rate)
+
+    @classmethod
+    def from_settings(cls, crawler_settings, *, fingerprinter=None):
+        path = crawler_settings.get(DUPEFILTER_SETTING)
+        if path in (None,'') and job_dir(crawler_settings):
+            path = os.path.join(job_dir(crawler_settings), DUPEFILTER_FILE)
+        return cls(path or None, crawler_settings.getbool('DUPEFILTER_DEBUG'),
+                   fingerprinter=fingerprinter,
+                   capacity=crawler_settings.getint('ESTATNET_DUPEFILTER_CAPACITY', CAPACITY),
+                   error_rate=crawler_settings.getfloat('ESTATNET_DUPEFILTER_ERROR_RATE', ERROR_RATE))
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        dupefilter = cls.from_settings(crawler.settings, fingerprinter=crawler.request_fingerprinter)
+        dupefilter.stats = crawler.stats
+        return dupefilter
+
+    def request_fingerprint(self, request):
+        return request_key(request, self.fingerprinter).hex()
+
+    def request_seen(self, request):
+        return not self.store.add(request_key(request, self.fingerprinter))
+
+    def close(self, reason):
+        if self.stats is not None:
+            self.stats.set_value('estatnet/dupefilter/stored', len(self.store))
+            self.stats.set_value('estatnet/dupefilter/disk_lookups', self.store.nlookups)
+            self.stats.set_value('estatnet/dupefilter/false_positives', self.store.nfalse)
+        self.store.close()
+        if self.__temporary:
+            os.remove(self.store.filename)
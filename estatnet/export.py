@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__export
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+.. _Scrapy: https://scrapy.org
+.. |Scrapy| replace:: `Scrapy <Scrapy_>`_
+.. _neo4j: https://neo4j.com
+.. |neo4j| replace:: `neo4j <neo4j_>`_
+.. _neo4jimport: https://neo4j.com/docs/operations-manual/current/tools/neo4j-admin/neo4j-admin-import/
+.. |neo4jimport| replace:: `neo4j-admin database import <neo4jimport_>`_
+.. _Parquet: https://parquet.apache.org
+.. |Parquet| replace:: `Parquet <Parquet_>`_
+.. _pyarrow: https://arrow.apache.org/docs/python
+.. |pyarrow| replace:: `pyarrow <pyarrow_>`_
+
+Bulk export of the crawled |StatX| pages, for graph databases and dataframes.
+
+**Description**
+
+Creating the nodes and relationships of a full crawl one at a time in a |neo4j|
+database (over Bolt, through :mod:`py2neo`) takes millions of transactions. The
+class :class:`ENetNeo4jExporter` streams instead the items of a crawl into the
+CSV files of the offline bulk import of |neo4j| (|neo4jimport|):
+
+* one file of nodes per page type (:data:`settings.SX_KEYS`), with its header
+  file, _e.g._ :literal:`article_header.csv` and :literal:`article.csv`,
+* one file of stub nodes (:literal:`page.csv`) for the pages linked to, so that
+  no relationship is left dangling when a page was not crawled,
+* one file of relationships (:literal:`relationships.csv`), typed by the field
+  of the items holding the links (see :data:`estatnet.graph.EDGE_TYPES`).
+
+All the nodes share the identifier space :literal:`Page` (canonical titles).
+Rows are buffered and written by chunks, and no state is kept across items:
+the memory used does not grow with the crawl. As a result, a page linked from
+several pages has as many stub rows, skipped (like the stubs of the pages
+crawled) at import time, the typed nodes being imported first (see
+:meth:`ENetNeo4jExporter.command`).
+
+The item pipeline :class:`estatnet.pipelines.ENetNeo4jPipeline` exports the
+items of all the spiders of a process:
+
+    ESTATNET_NEO4J_DIR = 'neo4j-import'
+    ITEM_PIPELINES = {'estatnet.pipelines.ENetNeo4jPipeline': 810}
+
+The JSON feeds of |Scrapy| are large, and slow both to write and to load into
+dataframes. The feed exporters :class:`ENetParquetItemExporter` (format
+:literal:`parquet`, through |pyarrow|) and :class:`ENetColumnarItemExporter`
+(format :literal:`columnar`, standard modules only) write the items in columnar
+form instead:
+
+* the rows are written by row groups of bounded size: the memory used does not
+  grow with the crawl,
+* the link fields (see :data:`LIST_FIELDS`) are list columns, dictionary-encoded
+  (the same links are repeated over many pages),
+* one dataset is written per item type, through the :literal:`item_classes` of
+  the feeds (see :meth:`feeds`):
+
+    FEED_EXPORTERS = {'parquet': 'estatnet.export.ENetParquetItemExporter',
+                      'columnar': 'estatnet.export.ENetColumnarItemExporter'}
+    FEEDS = feeds('crawls/items', format='parquet')
+
+The :literal:`columnar` files are JSON lines, one per row group, holding the
+columns of the group and the dictionary of its links: they are read back (one
+row group at a time) with :meth:`row_groups`, _e.g._ into :mod:`pandas`:
+
+    >>> df = pandas.concat([pandas.DataFrame(g) for g in row_groups(f)])
+
+**Dependencies**
+
+*require*:      :mod:`os`, :mod:`csv`, :mod:`json`, :mod:`scrapy`
+
+*optional*:     :mod:`pyarrow`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Sun Jan 14 17:31:51 2018
+
+#%%
+import os
+import csv
+import json
+
+from scrapy.exporters import BaseItemExporter
+
+from . import ENetError, ENetShared#analysis:ignore
+from . import settings
+from .pages import canonical_title, link_title
+from .graph import EDGE_TYPES
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+NEO4J_SETTING       = 'ESTATNET_NEO4J_DIR'
+"""Name of the |Scrapy| setting giving the directory of the |neo4j| import files.
+"""
+
+CHUNK_SIZE          = 10000
+"""Default number of rows buffered per file before they are written.
+"""
+
+ID_SPACE            = 'Page'
+"""Identifier space (and common label) of the nodes.
+"""
+
+STUB_KEY            = 'page'
+"""Name of the file of the stub nodes of the pages linked to.
+"""
+
+RELATIONSHIPS_KEY   = 'relationships'
+"""Name of the file of the relationships.
+"""
+
+NODE_HEADER         = ['page:ID(%s)' % ID_SPACE, 'title', 'last_modified', 'language', 'version:int']
+"""Header of the files of nodes: canonical title (identifier), title, date of
+the last modification, language and layout version of the page.
+"""
+
+STUB_HEADER         = NODE_HEADER[:1]
+
+RELATIONSHIP_HEADER = [':START_ID(%s)' % ID_SPACE, ':END_ID(%s)' % ID_SPACE, ':TYPE']
+
+ROW_GROUP_SIZE      = 10000
+"""Default number of items per row group of the columnar feeds.
+"""
+
+LIST_FIELDS         = [t for t in EDGE_TYPES if t != 'backlink']
+"""Fields of the items written as (dictionary-encoded) list columns in the
+columnar feeds; the other fields hold single values.
+"""
+
+INT_FIELDS          = ['version', 'node_id']
+
+JSON_FIELDS         = ['link_ids']
+
+FEED_ITEMS          = {settings.ARTICLE_KEY:    'ArticleItem',
+                       settings.GLOSSARY_KEY:   'GlossaryItem',
+                       settings.CATEGORY_KEY:   'CategoryItem',
+                       settings.THEME_KEY:      'ThemeItem',
+                       settings.CONCEPT_KEY:    'ConceptItem',
+                       settings.WHATLINKS_KEY:  'WhatLinksItem'}
+"""Classes (in :mod:`estatnet.items`) of the items of the datasets of the
+columnar feeds, indexed by page type.
+"""
+
+FEED_FORMATS        = {'parquet': 'parquet', 'columnar': 'jl'}
+"""Extensions of the files of the columnar feed formats.
+"""
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+def _value(value):
+    # single-valued CSV fields: first value of lists, no line breaks
+    if isinstance(value, (list, tuple)):
+        value = value[0] if value else None
+    if value is None:
+        return ''
+    return ' '.join(str(value).split())
+
+
+class ENetNeo4jExporter(ENetShared):
+    """Class providing with the export of crawled items into the CSV files of
+    the |neo4j| bulk import.
+
+        >>> exporter = ENetNeo4jExporter(directory, chunk_size=CHUNK_SIZE)
+        >>> exporter.add_item(item)
+        >>> exporter.close()
+        >>> command = exporter.command(database='neo4j')
+
+    Arguments
+    ---------
+    directory : str
+        directory of the import files, created when missing; files already
+        there are overwritten.
+    chunk_size : int
+        number of rows buffered per file before they are written; default:
+        :data:`CHUNK_SIZE`.
+    """
+
+    def __init__(self, directory, chunk_size=CHUNK_SIZE):
+        if directory in (None,''):
+            raise ENetError("Directory of the import files is missing")
+        elif chunk_size < 1:
+            raise ENetError("Wrong chunk size: %s" % chunk_size)
+        os.makedirs(directory, exist_ok=True)
+        self.directory, self.chunk_size = directory, chunk_size
+        from . import items
+        self.__keys = {cls: key for (key, cls) in items.SX_ITEMS.items()}
+        headers = dict([(key, NODE_HEADER) for key in settings.SX_KEYS])
+        headers.update({STUB_KEY: STUB_HEADER, RELATIONSHIPS_KEY: RELATIONSHIP_HEADER})
+        self.__files, self.__writers, self.__buffers = {}, {}, {}
+        for (name, header) in headers.items():
+            with open(self.filename(name, header=True), 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerow(header)
+            self.__files[name] = open(self.filename(name), 'w', newline='', encoding='utf-8')
+            self.__writers[name] = csv.writer(self.__files[name])
+            self.__buffers[name] = []
+        self.nnodes, self.nrelationships = dict.fromkeys(settings.SX_KEYS, 0), 0
+
+    @classmethod
+    def open(cls, directory, chunk_size=CHUNK_SIZE):
+        """Open the exporter of a directory, written by all the spiders of the
+        process (see :class:`estatnet.ENetShared`).
+
+            >>> exporter = ENetNeo4jExporter.open(directory)
+        """
+        return cls._open_shared(directory, lambda: cls(directory, chunk_size=chunk_size))
+
+    def filename(self, name, header=False):
+        """Path of an import file.
+
+            >>> path = exporter.filename(name, header=False)
+        """
+        return os.path.join(self.directory, '%s%s.csv' % (name, '_header' if header else ''))
+
+    def _write(self, name, row):
+        buffer = self.__buffers[name]
+        buffer.append(row)
+        if len(buffer) >= self.chunk_size:
+            self.__writers[name].writerows(buffer)
+            del buffer[:]
+
+    def flush(self):
+        """Write the rows buffered.
+
+            >>> exporter.flush()
+        """
+        for (name, buffer) in self.__buffers.items():
+            self.__writers[name].writerows(buffer)
+            del buffer[:]
+            self.__files[name].flush()
+
+    def add_item(self, item):
+        """Export a scraped item: node of its page, stubs of the pages it links
+        to, and relationships of its links.
+
+            >>> exported = exporter.add_item(item)
+
+        Returns
+        -------
+        exported : bool
+            `False` when the page of the item is not known (no title).
+        """
+        source = item.get('page_id') or canonical_title(item.get('title'))
+        if source in (None,''):
+            return False
+        fields = getattr(item, 'fields', item)
+        whatlinks = 'title' not in fields
+        key = self.__keys.get(type(item))
+        # the translations share the node of the page in the default language
+        translation = item.get('page_id') and _value(item.get('language')) not in ('', settings.DEF_LANG)
+        if key is not None and not translation:
+            self._write(key, [source] + [_value(item.get(f)) for f in ('title', 'last_modified', 'language', 'version')])
+            self.nnodes[key] += 1
+        for field in fields:
+            links = item.get(field)
+            if field not in EDGE_TYPES or not isinstance(links, (list, tuple)):
+                continue
+            edge_type = 'backlink' if whatlinks and field == 'link' else field
+            for target in set(filter(None, map(link_title, links))):
+                self._write(STUB_KEY, [target])
+                start, end = (target, source) if edge_type == 'backlink' else (source, target)
+                self._write(RELATIONSHIPS_KEY, [start, end, edge_type.upper()])
+                self.nrelationships += 1
+        if whatlinks:
+            self._write(STUB_KEY, [source])
+        return True
+
+    def command(self, database='neo4j'):
+        """Arguments of the |neo4j| command importing the files.
+
+            >>> args = exporter.command(database='neo4j')
+            >>> subprocess.check_call(args)
+
+        Arguments
+        ---------
+        database : str
+            name of the database created by the import; default: :literal:`neo4j`.
+        """
+        files = lambda name: '%s,%s' % (self.filename(name, header=True), self.filename(name))
+        # the typed nodes come first: their stubs are skipped as duplicates
+        args = ['neo4j-admin', 'database', 'import', 'full']
+        args.extend(['--nodes=%s:%s=%s' % (ID_SPACE, key.capitalize(), files(key)) for key in settings.SX_KEYS])
+        args.extend(['--nodes=%s=%s' % (ID_SPACE, files(STUB_KEY)),
+                     '--relationships=%s' % files(RELATIONSHIPS_KEY),
+                     '--skip-duplicate-nodes=true', database])
+        return args
+
+    def close(self):
+        """Write the rows buffered and close the files; an exporter shared
+        through :meth:`open` is closed by its last user.
+
+            >>> exporter.close()
+        """
+        self.flush()
+        if self._release_shared(self.directory):
+            for f in self.__files.values():
+                f.close()
+
+
+def feeds(directory, format=None):
+    """Feeds (setting :literal:`FEEDS`) exporting one dataset per item type in
+    columnar form.
+
+        >>> FEEDS = feeds(directory, format=None)
+
+    Arguments
+    ---------
+    directory : str
+        directory (or URI) of the datasets, _e.g._ :literal:`article.parquet`.
+    format : str
+        either :literal:`'parquet'` or :literal:`'columnar'`; default:
+        :literal:`'parquet'` when |pyarrow| is available, :literal:`'columnar'`
+        otherwise.
+    """
+    if format is None:
+        try:
+            import pyarrow#analysis:ignore
+        except ImportError:
+            format = 'columnar'
+        else:
+            format = 'parquet'
+    if format not in FEED_FORMATS:
+        raise ENetError("Format %s not supported (only: %s)" % (format, list(FEED_FORMATS)))
+    # the datasets are written anew: appending to them would corrupt them
+    return {'%s/%s.%s' % (directory.rstrip('/'), key, FEED_FORMATS[format]):
+            {'format': format, 'overwrite': True, 'item_classes': ['estatnet.items.%s' % name]}
+            for (key, name) in FEED_ITEMS.items()}
+
+
+def row_groups(f):
+    """Read the row groups of a :literal:`columnar` feed.
+
+        >>> for group in row_groups(f): ...
+
+    Arguments
+    ---------
+    f : file
+        file of the feed, opened in binary or text mode.
+
+    Returns
+    -------
+    group : dict
+        columns of the group (values indexed by field), the links of the list
+        columns decoded.
+    """
+    for line in f:
+        line = line.decode('utf-8') if isinstance(line, bytes) else line
+        if not line.strip():
+            continue
+        group = json.loads(line)
+        dictionary = group['dictionary']
+        yield {name: [[dictionary[i] for i in row] for row in values] if name in group['lists'] else values
+               for (name, values) in group['columns'].items()}
+
+
+class ENetColumnarItemExporter(BaseItemExporter):
+    """Class providing with a feed exporter writing the items in columnar form,
+    by row groups (format :literal:`columnar`, standard modules only).
+
+        >>> exporter = ENetColumnarItemExporter(file, row_group_size=ROW_GROUP_SIZE)
+
+    Arguments
+    ---------
+    file : file
+        file of the feed, opened in binary mode.
+    row_group_size : int
+        number of items per row group; default: :data:`ROW_GROUP_SIZE`.
+    kwargs :
+        options of the |Scrapy| exporters (:literal:`fields_to_export`, ...).
+    """
+
+    def __init__(self, file, **kwargs):
+        self.row_group_size = int(kwargs.pop('row_group_size', ROW_GROUP_SIZE))
+        super(ENetColumnarItemExporter, self).__init__(dont_fail=True, **kwargs)
+        if self.row_group_size < 1:
+            raise ENetError("Wrong row group size: %s" % self.row_group_size)
+        self.file = file
+        # the columns are those of the first item exported
+        self.names, self.columns, self.nrows = None, None, 0
+
+    @staticmethod
+    def _normalise(name, value):
+        if name in LIST_FIELDS:
+            if value is None:
+                return []
+            return [str(v) for v in value] if isinstance(value, (list, tuple)) else [str(value)]
+        if isinstance(value, (list, tuple)):
+            value = value[0] if value else None
+        if value is None:
+            return None
+        elif name in INT_FIELDS:
+            return int(value)
+        elif name in JSON_FIELDS:
+            return json.dumps(value, sort_keys=True)
+        return str(value)
+
+    def export_item(self, item):
+        fields = list(self._get_serialized_fields(item, default_value=None, include_empty=True))
+        if self.names is None:
+            self.names = [name for (name, _) in fields]
+            self.columns = {name: [] for name in self.names}
+        values = dict(fields)
+        for name in self.names:
+            self.columns[name].append(self._normalise(name, values.get(name)))
+        self.nrows += 1
+        if self.nrows >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Write the row group buffered.
+
+            >>> exporter.flush()
+        """
+        if not self.nrows:
+            return
+        self._write_group(self.columns, self.nrows)
+        self.columns = {name: [] for name in self.names}
+        self.nrows = 0
+
+    def _write_group(self, columns, nrows):
+        dictionary, codes = [], {}
+        def encode(value):
+            if value not in codes:
+                codes[value] = len(dictionary)
+                dictionary.append(value)
+            return codes[value]
+        lists = [name for name in self.names if name in LIST_FIELDS]
+        group = {'rows': nrows, 'lists': lists, 'dictionary': dictionary,
+                 'columns': {name: [[encode(v) for v in row] for row in values] if name in lists else values
+                             for (name, values) in columns.items()}}
+        self.file.write((json.dumps(group, ensure_ascii=False) + '\n').encode(self.encoding or 'utf-8'))
+
+    def finish_exporting(self):
+        self.flush()
+
+
+class ENetParquetItemExporter(ENetColumnarItemExporter):
+    """Class providing with a feed exporter writing the items in |Parquet|
+    files, by row groups (format :literal:`parquet`, through |pyarrow|).
+
+        >>> exporter = ENetParquetItemExporter(file, row_group_size=ROW_GROUP_SIZE,
+                                               compression='snappy')
+
+    Arguments
+    ---------
+    file : file
+        file of the feed, opened in binary mode.
+    row_group_size : int
+        number of items per row group; default: :data:`ROW_GROUP_SIZE`.
+    compression : str
+        compression codec of the columns; default: :literal:`'snappy'`.
+    kwargs :
+        options of the |Scrapy| exporters (:literal:`fields_to_export`, ...).
+    """
+
+    def __init__(self, file, **kwargs):
+        self.compression = kwargs.pop('compression', 'snappy')
+        super(ENetParquetItemExporter, self).__init__(file, **kwargs)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ENetError("Module pyarrow is required by the parquet feeds: use the format 'columnar'")
+        self.pa, self.pq = pyarrow, pyarrow.parquet
+        self.writer = None
+
+    def _schema(self):
+        pa = self.pa
+        types = {name: pa.list_(pa.string()) if name in LIST_FIELDS
+                 else pa.int64() if name in INT_FIELDS else pa.string()
+                 for name in self.names}
+        return pa.schema([(name, types[name]) for name in self.names])
+
+    def _write_group(self, columns, nrows):
+        if self.writer is None:
+            # the string columns (links included) are dictionary-encoded
+            self.writer = self.pq.ParquetWriter(self.file, self._schema(), compression=self.compression,
+                                                use_dictionary=True)
+        table = self.pa.Table.from_pydict(columns, schema=self.writer.schema)
+        self.writer.write_table(table, row_group_size=nrows)
+
+    def finish_exporting(self):
+        self.flush()
+        if self.writer is not None:
+            # the feed file itself is closed by Scrapy
+            self.writer.close()
+            self.writer = None
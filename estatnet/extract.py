@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__extract
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+.. _Scrapy: https://scrapy.org
+.. |Scrapy| replace:: `Scrapy <Scrapy_>`_
+.. _Twisted: https://twistedmatrix.com
+
+Extraction of the items of the |StatX| pages out of the reactor thread.
+
+**Description**
+
+The items are extracted (path tables and processors of :mod:`estatnet.items`)
+on the |Twisted| reactor thread: while a large article or category page is
+parsed, no download progresses. The class :class:`ENetExtractor` sends instead
+the body and the type of the pages to a pool of worker processes, which run the
+same extraction (see :meth:`extract`) and return the items to the reactor:
+
+    ESTATNET_EXTRACT_WORKERS = 4
+    ESTATNET_EXTRACT_MAX_INFLIGHT = 8
+
+The number of pages sent to the workers at once is bounded: beyond it, the pages
+wait for a free slot, their responses held by the |Scrapy| scraper (up to
+:literal:`SCRAPER_SLOT_MAX_ACTIVE_SIZE`), which then stops downloading more.
+
+The workers are spawned (not forked, the crawler process running threads):
+scripts running a crawl with workers shall guard their main code with
+:literal:`if __name__ == '__main__'`, as for any :mod:`multiprocessing` pool.
+
+In both modes (in the reactor thread, or in the pool), the extraction throughput
+and the lag of the reactor (delay of the calls scheduled on it) are reported in
+the crawl stats: :literal:`estatnet/extract/pages`, :literal:`seconds`,
+:literal:`throughput`, :literal:`inflight_max`, :literal:`reactor_lag_mean`,
+:literal:`reactor_lag_max`.
+
+**Dependencies**
+
+*require*:      :mod:`time`, :mod:`concurrent.futures`, :mod:`multiprocessing`, :mod:`scrapy`, :mod:`twisted`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Sun Jan 14 17:31:51 2018
+
+#%%
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+
+from . import ENetError#analysis:ignore
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+EXTRACT_SETTING     = 'ESTATNET_EXTRACT_WORKERS'
+"""Name of the |Scrapy| setting giving the number of worker processes of the
+extraction; 0 (default) to extract in the reactor thread.
+"""
+
+INFLIGHT_FACTOR     = 2
+"""Default number of pages sent at once to the pool, per worker (setting
+:literal:`ESTATNET_EXTRACT_MAX_INFLIGHT`).
+"""
+
+LAG_INTERVAL        = 0.1
+"""Interval (in seconds) of the calls measuring the lag of the reactor.
+"""
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+def extract(key, url, body, encoding, skip=()):
+    """Extract the item of a page (in a worker process).
+
+        >>> values, seconds = extract(key, url, body, encoding, skip=())
+
+    Arguments
+    ---------
+    key : str
+        type of the page (see :data:`settings.SX_KEYS`).
+    url, body, encoding :
+        URL, body (bytes) and encoding of the response.
+    skip : list
+        fields not extracted.
+
+    Returns
+    -------
+    values : dict
+        values of the item.
+    seconds : float
+        time spent in the extraction.
+    """
+    from scrapy.http import HtmlResponse
+    from . import items
+    from .spiders.sxnet import PageCrawler
+    start = time.perf_counter()
+    response = HtmlResponse(url=url, body=body, encoding=encoding)
+    item = PageCrawler._parse_loader(items.SX_ITEMLOADERS[key], response, skip=skip)
+    return dict(item), time.perf_counter() - start
+
+
+def _warm_up():
+    # the spider module, the path tables and the compiled expressions are
+    # loaded once per worker
+    from . import items
+    from .spiders import sxnet#analysis:ignore
+    [items.SX_ITEMS[key].sections for key in items.SX_ITEMS]
+
+
+class ENetExtractor(object):
+    """Class providing with the extraction of the items of a crawl, either in
+    the reactor thread or in a pool of worker processes.
+
+        >>> extractor = ENetExtractor(workers=4, max_inflight=8, stats=stats)
+        >>> extractor.start()
+        >>> item = yield extractor.extract(key, response) # pool
+        >>> item = extractor.inline(key, response)        # reactor thread
+
+    Arguments
+    ---------
+    workers : int
+        number of worker processes; 0 to extract in the reactor thread.
+    max_inflight : int
+        maximum number of pages sent at once to the workers; default:
+        :data:`INFLIGHT_FACTOR` pages per worker.
+    stats :
+        |Scrapy| stats collector.
+    """
+
+    def __init__(self, workers=0, max_inflight=None, stats=None):
+        if workers < 0 or (max_inflight is not None and max_inflight < 1):
+            raise ENetError("Wrong extraction parameters")
+        self.workers, self.crawler, self.__stats = workers, None, stats
+        self.max_inflight = max_inflight or INFLIGHT_FACTOR * max(workers, 1)
+        self.pool, self.semaphore, self.monitor = None, None, None
+        self.npages, self.seconds, self.inflight = 0, 0., 0
+        self.lag_max, self.lag_sum, self.nticks = 0., 0., 0
+        self.__started, self.__tick = None, None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        from scrapy import signals
+        s = crawler.settings
+        extractor = cls(workers=s.getint(EXTRACT_SETTING, 0),
+                        max_inflight=s.getint('ESTATNET_EXTRACT_MAX_INFLIGHT') or None)
+        extractor.crawler = crawler
+        crawler.signals.connect(extractor.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(extractor.spider_closed, signal=signals.spider_closed)
+        return extractor
+
+    @property
+    def stats(self):
+        # looked up lazily: the extractor is built with the spider, before the
+        # stats collector of the crawler is set (Scrapy >= 2.11)
+        if self.crawler is None:
+            return self.__stats
+        return getattr(self.crawler, 'stats', None)
+
+    @property
+    def pooled(self):
+        return self.workers > 0
+
+    def start(self):
+        """Start the workers (if any) and the monitoring of the reactor lag.
+
+            >>> extractor.start()
+        """
+        from twisted.internet import reactor, task, defer
+        if self.pooled and self.pool is None:
+            # spawned, not forked: the crawler process runs threads
+            self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                            initializer=_warm_up)
+            self.semaphore = defer.DeferredSemaphore(self.max_inflight)
+        self.__started = self.__tick = reactor.seconds()
+        self.monitor = task.LoopingCall(self._tick)
+        self.monitor.start(LAG_INTERVAL, now=False)
+
+    def _tick(self):
+        from twisted.internet import reactor
+        now = reactor.seconds()
+        lag = max(now - self.__tick - LAG_INTERVAL, 0.)
+        self.__tick = now
+        self.lag_max, self.lag_sum, self.nticks = max(self.lag_max, lag), self.lag_sum + lag, self.nticks + 1
+
+    def _record(self, seconds):
+        self.npages += 1
+        self.seconds += seconds
+
+    def inline(self, key, response, skip=()):
+        """Extract the item of a page in the reactor thread.
+
+            >>> item = extractor.inline(key, response, skip=())
+        """
+        from . import items
+        from .spiders.sxnet import PageCrawler
+        start = time.perf_counter()
+        item = PageCrawler._parse_loader(items.SX_ITEMLOADERS[key], response, self.stats, skip=skip)
+        self._record(time.perf_counter() - start)
+        return item
+
+    def extract(self, key, response, skip=()):
+        """Extract the item of a page in the pool.
+
+            >>> d = extractor.extract(key, response, skip=())
+
+        Returns
+        -------
+        d : :class:`twisted.internet.defer.Deferred`
+            deferred firing with the item.
+        """
+        if self.pool is None:
+            raise ENetError("Extraction pool not started")
+        return self.semaphore.run(self._submit, key, response, tuple(skip))
+
+    def _submit(self, key, response, skip):
+        from twisted.internet import reactor, defer
+        from twisted.python import failure
+        d = defer.Deferred()
+        self.inflight += 1
+        if self.stats is not None:
+            self.stats.max_value('estatnet/extract/inflight_max', self.inflight)
+        future = self.pool.submit(extract, key, response.url, response.body, response.encoding, skip)
+        def done(future):
+            # the future completes in a thread of the pool, or is cancelled when
+            # the pool shuts down: the deferred fires anyway, so that the slot of
+            # the semaphore is released
+            if future.cancelled():
+                reactor.callFromThread(d.errback, failure.Failure(CancelledError()))
+            elif future.exception() is not None:
+                reactor.callFromThread(d.errback, future.exception())
+            else:
+                reactor.callFromThread(d.callback, future.result())
+        future.add_done_callback(done)
+        d.addBoth(self._received, key)
+        return d
+
+    def _received(self, result, key):
+        from . import items
+        self.inflight -= 1
+        if not isinstance(result, tuple):
+            return result # failure
+        values, seconds = result
+        self._record(seconds)
+        if self.stats is not None:
+            self.stats.inc_value('estatnet/version/%s' % values.get('version', 'unknown'))
+        return items.SX_ITEMS[key](values)
+
+    def report(self):
+        """Report the extraction throughput and the reactor lag in the stats.
+        """
+        if self.stats is None:
+            return
+        from twisted.internet import reactor
+        elapsed = reactor.seconds() - self.__started if self.__started is not None else 0.
+        self.stats.set_value('estatnet/extract/workers', self.workers)
+        self.stats.set_value('estatnet/extract/pages', self.npages)
+        self.stats.set_value('estatnet/extract/seconds', round(self.seconds, 3))
+        if elapsed > 0:
+            self.stats.set_value('estatnet/extract/throughput', round(self.npages / elapsed, 2))
+        if self.nticks > 0:
+            self.stats.set_value('estatnet/extract/reactor_lag_mean', round(self.lag_sum / self.nticks, 4))
+            self.stats.set_value('estatnet/extract/reactor_lag_max', round(self.lag_max, 4))
+
+    def spider_opened(self, spider):
+        self.start()
+
+    def spider_closed(self, spider):
+        if self.monitor is not None and self.monitor.running:
+            self.monitor.stop()
+        self.report()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
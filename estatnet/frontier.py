@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__frontier
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+
+Frontier of the crawls of the |StatX| link graph.
+
+**Description**
+
+The class :class:`ENetBFSFrontier` drives a breadth-first exploration of the
+pages: the pages of a level are all requested before any page of the next level,
+every page is admitted once (visited set), and the exploration is bounded by:
+
+* a depth (number of levels explored beyond the start pages),
+* a page budget (number of pages admitted),
+* a number of links followed from every page.
+
+It holds no request: the spider asks the frontier which pages to request when
+a level is complete (see :meth:`ENetBFSFrontier.complete`), so that the pages
+of a level can be batched.
+
+**Dependencies**
+
+*require*:      :mod:`collections`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Sun Jan 14 17:31:51 2018
+
+#%%
+from collections import OrderedDict, defaultdict
+
+from . import ENetError#analysis:ignore
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+class ENetBFSFrontier(object):
+    """Class providing with a bounded breadth-first frontier of pages.
+
+        >>> frontier = ENetBFSFrontier(npages=-1, nlinks=-1, depth=-1)
+        >>> titles = frontier.seed(pages)
+        >>> frontier.admit(links, level)
+        >>> titles = frontier.complete(level, n)
+
+    Arguments
+    ---------
+    npages : int
+        maximum number of pages admitted (start pages included); negative: no
+        limit; default: -1.
+    nlinks : int
+        maximum number of links followed from every page (see :meth:`links`);
+        negative: no limit; default: -1.
+    depth : int
+        maximum level of the pages admitted (the start pages are of level 0);
+        negative: no limit; default: -1.
+
+    Attributes
+    ----------
+    sizes : dict
+        number of pages admitted, by level.
+    ndropped : dict
+        number of links not admitted, by reason: :literal:`'visited'`,
+        :literal:`'depth'` or :literal:`'budget'`.
+    """
+
+    def __init__(self, npages=-1, nlinks=-1, depth=-1):
+        self.npages, self.nlinks, self.depth = int(npages), int(nlinks), int(depth)
+        self.visited = set()
+        self.sizes = OrderedDict()
+        self.ndropped = {'visited': 0, 'depth': 0, 'budget': 0}
+        self.__levels = defaultdict(list) # pages admitted, not requested yet
+        self.__inflight = defaultdict(int) # pages requested, not completed yet
+        self.level = None # level being explored
+
+    def __len__(self):
+        return sum([len(pages) for pages in self.__levels.values()])
+
+    def __contains__(self, page):
+        return page in self.visited
+
+    @property
+    def exhausted(self):
+        """`True` when the page budget is spent.
+        """
+        return self.npages >= 0 and len(self.visited) >= self.npages
+
+    def links(self, links):
+        """Truncate the links of a page to the links followed.
+
+            >>> links = frontier.links(links)
+        """
+        links = list(links)
+        return links if self.nlinks < 0 else links[:self.nlinks]
+
+    def admit(self, pages, level):
+        """Admit pages at a given level.
+
+            >>> n = frontier.admit(pages, level)
+
+        Arguments
+        ---------
+        pages : list
+            pages (_e.g._ titles) discovered; pages already visited, beyond the
+            maximum depth, or over the page budget are dropped.
+        level : int
+            level of the pages.
+
+        Returns
+        -------
+        n : int
+            number of pages admitted.
+        """
+        n = 0
+        for page in pages:
+            if page in self.visited:
+                self.ndropped['visited'] += 1
+            elif self.depth >= 0 and level > self.depth:
+                self.ndropped['depth'] += 1
+            elif self.exhausted:
+                self.ndropped['budget'] += 1
+            else:
+                self.visited.add(page)
+                self.__levels[level].append(page)
+                self.sizes[level] = self.sizes.get(level, 0) + 1
+                n += 1
+        return n
+
+    def seed(self, pages):
+        """Admit the start pages and issue them.
+
+            >>> pages = frontier.seed(pages)
+
+        Returns
+        -------
+        pages : list
+            pages of level 0 to request.
+        """
+        if self.level is not None:
+            raise ENetError("Frontier already seeded")
+        self.admit(pages, 0)
+        return self.issue(0)
+
+    def issue(self, level):
+        """Issue all the pages admitted at a given level: they are considered
+        in flight until completed.
+
+            >>> pages = frontier.issue(level)
+        """
+        pages = self.__levels.pop(level, [])
+        self.__inflight[level] += len(pages)
+        self.level = level
+        return pages
+
+    def complete(self, level, n=1):
+        """Complete requested pages of a given level.
+
+            >>> pages = frontier.complete(level, n=1)
+
+        Arguments
+        ---------
+        level : int
+            level of the pages completed (either crawled, or failed).
+        n : int
+            number of pages completed; default: 1.
+
+        Returns
+        -------
+        pages : list
+            when the level is complete, the pages of the next level to request
+            (see :meth:`issue`), an empty list otherwise.
+        """
+        if self.__inflight[level] < n:
+            raise ENetError("More pages completed than issued at level %s" % level)
+        self.__inflight[level] -= n
+        if self.__inflight[level] > 0 or level != self.level:
+            return []
+        del self.__inflight[level]
+        # the next level is complete: all the pages of the current one are done
+        return self.issue(level + 1) if level + 1 in self.__levels else []
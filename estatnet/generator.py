@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__generator
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+.. _MediaWiki: https://www.mediawiki.org
+
+Generator of synthetic |StatX| pages.
+
+**Description**
+
+Build |MediaWiki|-shaped HTML pages matching the structures targeted by the path
+tables of :mod:`estatnet.paths` (:literal:`firstHeading` title, sections of
+layout version 0 or :literal:`dat-section` blocks of version 1,
+:literal:`mw-normal-catlinks` categories, :literal:`mw-whatlinkshere-list`
+lists, :literal:`lastmod` footer, ...), at configurable sizes, _e.g._ pages
+with 50 sections, 2000 category links or a 1000-row "What links here" list.
+The pages feed the benchmarks (see :mod:`estatnet.benchmark`) and the scaling
+tests:
+
+    >>> generator = ENetPageGenerator(seed=0)
+    >>> response = generator.response('article', version=0, nsections=50)
+    >>> corpus = generator.corpus(ncategories=2000)
+
+**Dependencies**
+
+*require*:      :mod:`os`, :mod:`random`, :mod:`html`, :mod:`scrapy`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Mon Dec 18 17:28:29 2017
+
+#%%
+import os, sys
+import random
+import argparse
+from html import escape
+
+from scrapy import http
+
+from . import ENetError#analysis:ignore
+from . import settings#analysis:ignore
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+ARTICLE_SECTIONS    = {
+    settings.SX_VERSIONS[0]: [('h2', 'See_also', 'See also'),
+                              ('h2', 'Further_Eurostat_information', 'Further Eurostat information'),
+                              ('h3', 'Publications', 'Publications'),
+                              ('h3', 'Main_tables', 'Main tables'),
+                              ('h3', 'Database', 'Database'),
+                              ('h3', 'Dedicated_section', 'Dedicated section'),
+                              ('h3', 'Methodology_.2F_Metadata', 'Methodology / Metadata'),
+                              ('h3', 'Other_information', 'Other information'),
+                              ('h2', 'External_links', 'External links')],
+    settings.SX_VERSIONS[1]: [('h2', 'seealso', 'See also'),
+                              ('h3', 'publications', 'Publications'),
+                              ('h3', 'maintables', 'Main tables'),
+                              ('h3', 'database', 'Database'),
+                              ('h3', 'dedicatedsection', 'Dedicated section'),
+                              ('h3', 'methodology', 'Methodology'),
+                              ('h3', 'legal', 'Legislation'),
+                              ('h3', 'externallinks', 'External links')]
+    }
+"""Link sections of the articles, as :literal:`(heading, identifier, text)`,
+per layout version: the identifiers are those of :data:`estatnet.paths.ARTICLE_PATHS`.
+"""
+
+GLOSSARY_SECTIONS   = [('h2', 'Further_information', 'Further information'),
+                       ('h2', 'Related_concepts', 'Related concepts'),
+                       ('h2', 'Statistical_data', 'Statistical data')]
+
+THEME_SECTIONS      = [('h2', 'Statistical_articles', 'Statistical articles'),
+                       ('h4', 'Topics', 'Topics'),
+                       ('h4', 'Overview', 'Overview'),
+                       ('h4', 'Background_articles', 'Background articles'),
+                       ('h4', 'Glossary', 'Glossary'),
+                       ('h2', 'Online_publications', 'Online publications')]
+
+SX_RELPATH          = '/%s' % settings.SX_RELURL
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+class ENetPageGenerator(object):
+    """Class providing with the generation of synthetic |StatX| pages.
+
+        >>> generator = ENetPageGenerator(seed=None, lang=settings.DEF_LANG)
+
+    Arguments
+    ---------
+    seed : int
+        seed of the pseudo-random generator of the contents (titles of the links,
+        texts, ...); the same seed generates the same pages.
+    lang : str
+        language of the pages (:literal:`html/@lang`): the same seed generates
+        pages of the same structure in all languages; default: :data:`settings.DEF_LANG`.
+    """
+
+    def __init__(self, seed=None, lang=settings.DEF_LANG):
+        self.random, self.lang = random.Random(seed), lang
+        self.__count = 0
+
+    #/************************************************************************/
+    def _title(self, prefix=''):
+        self.__count += 1
+        words = ['Income', 'Housing', 'Population', 'Employment', 'Energy', 'Trade',
+                 'Health', 'Education', 'Transport', 'Agriculture', 'Poverty', 'Prices']
+        return '%s%s_statistics_%d' % (prefix, self.random.choice(words), self.__count)
+
+    def _link(self, title=None, prefix=''):
+        title = title or self._title(prefix)
+        return '<a href="%s/%s" title="%s">%s</a>' % (SX_RELPATH, escape(title),
+                                                      escape(title.replace('_', ' ')),
+                                                      escape(title.replace('_', ' ')))
+
+    def _external(self):
+        return '<a class="external text" href="http://ec.europa.eu/eurostat/web/%s">%s</a>' \
+            % (self._title().lower(), self._title().replace('_', ' '))
+
+    def _list(self, nlinks, external=False, prefix=''):
+        return '<ul>\n%s\n</ul>' % '\n'.join(['    <li>%s</li>' % (self._external() if external
+                                                                    else self._link(prefix=prefix))
+                                              for _ in range(nlinks)])
+
+    def _paragraph(self, nlinks=1):
+        return '<p>%s</p>' % ' '.join(['Statistics on %s.' % self._link(prefix='Glossary:')
+                                       for _ in range(nlinks)])
+
+    @staticmethod
+    def _heading(tag, identifier, text):
+        return '<%s><span class="mw-headline" id="%s">%s</span></%s>' % (tag, identifier, text, tag)
+
+    def _catlinks(self, ncategories, nhidden=0):
+        html = ['<div id="catlinks" class="catlinks">',
+                '<div id="mw-normal-catlinks" class="mw-normal-catlinks">',
+                '<a href="%s/Special:Categories" title="Special:Categories">Categories</a>:' % SX_RELPATH,
+                self._list(ncategories, prefix=settings.CATEGORY_DOMAIN),
+                '</div>']
+        if nhidden > 0:
+            html.extend(['<div id="mw-hidden-catlinks" class="mw-hidden-catlinks mw-hidden-cats-hidden">',
+                         self._list(nhidden, prefix=settings.CATEGORY_DOMAIN),
+                         '</div>'])
+        html.append('</div>')
+        return '\n'.join(html)
+
+    def _page(self, title, content, lang=None):
+        return '\n'.join(['<!DOCTYPE html>',
+                          '<html lang="%s">' % (lang or self.lang),
+                          '<head><title>%s - Statistics Explained</title></head>' % escape(title),
+                          '<body>',
+                          '<div id="content">',
+                          '<h1 id="firstHeading" class="firstHeading">%s</h1>' % escape(title),
+                          '<div id="bodyContent">',
+                          content,
+                          '</div>',
+                          '</div>',
+                          '<div id="footer" role="contentinfo">',
+                          '<ul id="f-list" class="list-inline">',
+                          '<li id="lastmod"> This page was last modified on %d March 2018, at 10:%02d.</li>'
+                            % (self.random.randint(1, 28), self.random.randint(0, 59)),
+                          '</ul>',
+                          '</div>',
+                          '</body>',
+                          '</html>'])
+
+    #/************************************************************************/
+    def article(self, version=0, nsections=5, nlinks=3, ncategories=2, title=None):
+        """Generate an article.
+
+            >>> html = generator.article(version=0, nsections=5, nlinks=3, ncategories=2, title=None)
+
+        Arguments
+        ---------
+        version : int
+            layout version (see :data:`settings.SX_VERSIONS`); default: 0.
+        nsections : int
+            number of (text) sections, besides the link sections of :data:`ARTICLE_SECTIONS`;
+            default: 5.
+        nlinks : int
+            number of links listed in every link section; default: 3.
+        ncategories : int
+            number of category links; default: 2.
+        title : str
+            title of the page; default: a random title.
+
+        Returns
+        -------
+        html : str
+            HTML of the page.
+        """
+        if version not in ARTICLE_SECTIONS:
+            raise ENetError("Layout version %s not supported" % version)
+        title = title or self._title()
+        content = ['<div id="mw-content-text" class="mw-content-ltr">', self._paragraph()]
+        for i in range(nsections):
+            # text sections, with some subsections, figures and product links
+            content.append(self._heading('h2', 'Section_%d' % i, 'Section %d' % i)
+                           if version == settings.SX_VERSIONS[0] else '<h2>Section %d</h2>' % i)
+            content.append(self._paragraph(self.random.randint(1, 3)))
+            if i % 3 == 0:
+                content.append('<div class="thumb"><div class="thumbcaption">Source: Eurostat '
+                               '(<a class="external text" href="http://ec.europa.eu/eurostat/product?code=ilc_%02d&amp;mode=view">ilc_%02d</a>)'
+                               '</div></div>' % (i, i))
+            if i % 2 == 1:
+                content.append(self._heading('h3', 'Subsection_%d' % i, 'Subsection %d' % i)
+                               if version == settings.SX_VERSIONS[0] else '<h3>Subsection %d</h3>' % i)
+                content.append(self._paragraph())
+        for (tag, identifier, text) in ARTICLE_SECTIONS[version]:
+            external = identifier not in ('See_also', 'seealso')
+            if version == settings.SX_VERSIONS[0]:
+                content.append(self._heading(tag, identifier, text))
+                if identifier != 'Further_Eurostat_information':
+                    content.append(self._list(nlinks, external=external))
+            else:
+                content.append('<div class="dat-section" id="%s">\n<%s>%s</%s>\n%s\n</div>'
+                               % (identifier, tag, text, tag, self._list(nlinks, external=external)))
+        content.append('</div>')
+        content.append(self._catlinks(ncategories, nhidden=1))
+        return self._page(title.replace('_', ' '), '\n'.join(content))
+
+    def glossary(self, nlinks=3, ncategories=2, title=None):
+        """Generate a glossary page.
+
+            >>> html = generator.glossary(nlinks=3, ncategories=2, title=None)
+        """
+        title = title or self._title(settings.GLOSSARY_DOMAIN)
+        content = ['<div id="mw-content-text" class="mw-content-ltr">', self._paragraph(2)]
+        for (tag, identifier, text) in GLOSSARY_SECTIONS:
+            content.append(self._heading(tag, identifier, text))
+            content.append(self._list(nlinks, external=(identifier == 'Further_information'),
+                                      prefix=settings.GLOSSARY_DOMAIN if identifier == 'Related_concepts' else ''))
+        content.append('</div>')
+        content.append(self._catlinks(ncategories))
+        return self._page(title.replace('_', ' '), '\n'.join(content))
+
+    def category(self, npages=200, ncolumns=3, title=None):
+        """Generate a category page listing :data:`npages` pages.
+
+            >>> html = generator.category(npages=200, ncolumns=3, title=None)
+        """
+        title = title or self._title(settings.CATEGORY_DOMAIN)
+        size = max(1, -(-npages // max(1, ncolumns)))
+        columns = []
+        for start in range(0, npages, size):
+            columns.append('<td style="width: 33.3%%;">\n<h3>%s</h3>\n%s\n</td>'
+                           % (chr(ord('A') + len(columns) % 26), self._list(min(size, npages - start))))
+        content = '\n'.join(['<div id="mw-content-text">',
+                             '<div id="mw-pages">',
+                             '<h2>Pages in category "%s"</h2>' % escape(title.replace('_', ' ')),
+                             '<p>The following %d pages are in this category, out of %d total.</p>' % (npages, npages),
+                             '<div lang="en" dir="ltr" class="mw-content-ltr">',
+                             '<table style="width: 100%;"><tr valign="top">',
+                             '\n'.join(columns),
+                             '</tr></table>',
+                             '</div>',
+                             '</div>',
+                             '</div>'])
+        return self._page(title.replace('_', ' '), content)
+
+    def theme(self, nlinks=3, title=None):
+        """Generate a theme page.
+
+            >>> html = generator.theme(nlinks=3, title=None)
+        """
+        title = title or self._title()
+        content = ['<div id="mw-content-text" class="mw-content-ltr">']
+        for (tag, identifier, text) in THEME_SECTIONS:
+            content.append(self._heading(tag, identifier, text))
+            content.append(self._list(nlinks, prefix=settings.GLOSSARY_DOMAIN if identifier == 'Glossary' else ''))
+        content.append('</div>')
+        return self._page(title.replace('_', ' '), '\n'.join(content))
+
+    def whatlinks(self, nlinks=1000, title=None):
+        """Generate a "What links here" page listing :data:`nlinks` pages.
+
+            >>> html = generator.whatlinks(nlinks=1000, title=None)
+        """
+        title = title or self._title()
+        rows = []
+        for link in self.backlinks(nlinks):
+            rows.append('<li>%s ‎ (<a href="%s/%s/%s" title="%s">← links</a>)</li>'
+                        % (self._link(link), SX_RELPATH, settings.WHATLINKSHERE_PAGE, link,
+                           settings.WHATLINKSHERE_PAGE))
+        content = '\n'.join(['<div id="mw-content-text">',
+                             '<p>The following pages link to %s:</p>' % self._link(title),
+                             '<ul id="mw-whatlinkshere-list">',
+                             '\n'.join(rows),
+                             '</ul>',
+                             '</div>'])
+        return self._page('Pages that link to "%s"' % title.replace('_', ' '), content)
+
+    def backlinks(self, nlinks=1000):
+        """Generate the titles of the pages linking to a page, as listed by
+        :meth:`whatlinks` (for the same state of the generator).
+
+            >>> titles = generator.backlinks(nlinks=1000)
+        """
+        return [self._title() for _ in range(nlinks)]
+
+    def start(self, key, nlinks=50, title=None):
+        """Generate a start page (see :data:`settings.SX_START_PAGES`) listing
+        :data:`nlinks` pages.
+
+            >>> html = generator.start(key, nlinks=50, title=None)
+
+        Arguments
+        ---------
+        key : str
+            type of the pages listed (:literal:`'main'`, :literal:`'article'`,
+            :literal:`'glossary'`, :literal:`'category'`, :literal:`'theme'` or
+            :literal:`'concept'`); the page matches the paths of :data:`estatnet.paths.SX_START_PAGES_PATHS`.
+        """
+        if key not in settings.SX_START_PAGES:
+            raise ENetError("Start page %s not supported" % key)
+        title = title or settings.SX_START_PAGES[key].split('&', 1)[0]
+        prefix = settings.SX_KEYDOMAINS.get(key, '')
+        if key == settings.CATEGORY_KEY:
+            content = '\n'.join(['<div id="mw-content-text">',
+                                  '<p>The following categories exist on the wiki.</p>',
+                                  self._list(nlinks, prefix=prefix),
+                                  '</div>',
+                                  '<div class="printfooter">Retrieved from Statistics Explained</div>'])
+        elif key == settings.CONCEPT_KEY:
+            size = max(1, -(-nlinks // 3))
+            content = '\n'.join(['<div id="mw-content-text" class="mw-content-ltr">',
+                                  '<h2>Statistical concepts</h2>',
+                                  '<table><tr valign="top">',
+                                  '\n'.join(['<td>%s</td>' % self._list(min(size, nlinks - start), prefix=prefix)
+                                             for start in range(0, nlinks, size)]),
+                                  '</tr></table>',
+                                  '</div>'])
+        else:
+            panels = []
+            for start in range(0, nlinks, 10):
+                panels.append('\n'.join(['<div class="panel panel-default">',
+                                         '<div class="panel-heading"><h3 class="panel-title">%s</h3></div>' % self._link(),
+                                         '<div class="panel-body">%s</div>' % self._list(min(10, nlinks - start), prefix=prefix),
+                                         '</div>']))
+            content = '\n'.join(['<div id="mw-content-text" class="mw-content-ltr">'] + panels + ['</div>'])
+        return self._page(title.replace('_', ' '), content)
+
+    #/************************************************************************/
+    def response(self, key, **kwargs):
+        """Generate a page as a response.
+
+            >>> response = generator.response(key, **kwargs)
+
+        Arguments
+        ---------
+        key : str
+            type of the page (:literal:`'article'`, :literal:`'glossary'`,
+            :literal:`'category'`, :literal:`'theme'` or :literal:`'whatlinks'`).
+        kwargs :
+            keyword arguments passed to the generating method of the given type.
+
+        Returns
+        -------
+        response : scrapy.http.HtmlResponse
+            response with the generated page, and an URL built upon its title.
+        """
+        if key == settings.WHATLINKS_KEY:
+            title = kwargs.pop('title', None) or self._title()
+            url = '%s/%s&limit=%s' % (settings.WHATLINKSHERE_URL, title, settings.WHATLINKSHERE_LIMIT)
+            return http.HtmlResponse(url=url, body=self.whatlinks(title=title, **kwargs).encode('utf-8'),
+                                     encoding='utf-8')
+        elif key not in (settings.ARTICLE_KEY, settings.GLOSSARY_KEY, settings.CATEGORY_KEY,
+                         settings.THEME_KEY):
+            raise ENetError("Page type %s not supported" % key)
+        title = kwargs.pop('title', None) or self._title(settings.SX_KEYDOMAINS[key])
+        body = getattr(self, key)(title=title, **kwargs)
+        return http.HtmlResponse(url='%s/%s' % (settings.SX_MAINURL, title), body=body.encode('utf-8'),
+                                 encoding='utf-8')
+
+    def corpus(self, npages=2, nsections=5, nlinks=3, ncategories=2, ncategory_pages=200):
+        """Generate a corpus of pages of all types, for both layout versions of
+        the articles.
+
+            >>> corpus = generator.corpus(npages=2, nsections=5, nlinks=3, ncategories=2,
+                                          ncategory_pages=200)
+
+        Returns
+        -------
+        corpus : dict
+            lists of responses indexed by page type, as loaded by
+            :meth:`estatnet.benchmark.load_corpus`.
+        """
+        corpus = {settings.ARTICLE_KEY: [], settings.GLOSSARY_KEY: [],
+                  settings.CATEGORY_KEY: [], settings.THEME_KEY: []}
+        for i in range(npages):
+            corpus[settings.ARTICLE_KEY].append(
+                self.response(settings.ARTICLE_KEY, version=settings.SX_VERSIONS[i % 2],
+                              nsections=nsections, nlinks=nlinks, ncategories=ncategories))
+            corpus[settings.GLOSSARY_KEY].append(
+                self.response(settings.GLOSSARY_KEY, nlinks=nlinks, ncategories=ncategories))
+            corpus[settings.CATEGORY_KEY].append(
+                self.response(settings.CATEGORY_KEY, npages=ncategory_pages))
+            corpus[settings.THEME_KEY].append(self.response(settings.THEME_KEY, nlinks=nlinks))
+        return corpus
+
+    def write(self, directory, corpus):
+        """Store a corpus in a directory, as read by :meth:`estatnet.benchmark.load_corpus`.
+
+            >>> generator.write(directory, corpus)
+        """
+        for (key, responses) in corpus.items():
+            os.makedirs(os.path.join(directory, key), exist_ok=True)
+            for response in responses:
+                name = response.url.rsplit('/', 1)[-1][len(settings.SX_KEYDOMAINS.get(key, '')):]
+                with open(os.path.join(directory, key, '%s.html' % name), 'wb') as f:
+                    f.write(response.body)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m estatnet.generator',
+                                     description='Generate a corpus of synthetic Statistics Explained pages.')
+    parser.add_argument('directory', help='directory where the corpus is written')
+    parser.add_argument('-n', '--npages', type=int, default=2, help='number of pages per type')
+    parser.add_argument('--sections', type=int, default=5, help='number of sections per article')
+    parser.add_argument('--links', type=int, default=3, help='number of links per section')
+    parser.add_argument('--categories', type=int, default=2, help='number of category links per page')
+    parser.add_argument('--category-pages', type=int, default=200, help='number of pages per category')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the generator')
+    args = parser.parse_args(argv)
+    generator = ENetPageGenerator(seed=args.seed)
+    generator.write(args.directory,
+                    generator.corpus(npages=args.npages, nsections=args.sections, nlinks=args.links,
+                                     ncategories=args.categories, ncategory_pages=args.category_pages))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__graph
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+.. _Scrapy: https://scrapy.org
+.. |Scrapy| replace:: `Scrapy <Scrapy_>`_
+.. _CSR: https://en.wikipedia.org/wiki/Sparse_matrix#Compressed_sparse_row_(CSR,_CRS_or_Yale_format)
+.. |CSR| replace:: `compressed sparse row <CSR_>`_
+
+Compact graph of the relationships between the |StatX| pages.
+
+**Description**
+
+The class :class:`ENetGraph` builds the graph of the pages from the items of
+the crawls, as they are scraped:
+
+* the canonical titles of the pages (see :meth:`estatnet.pages.link_title`)
+  are interned to consecutive integer identifiers (see :mod:`estatnet.titles`),
+* every link of an item is an edge from the page of the item to the linked page,
+  typed by the field holding the link (see :data:`EDGE_TYPES`), the backlinks
+  of the "What links here" items being reversed,
+* the edges are appended to growable arrays (3 integers per edge), then sorted
+  into a |CSR| adjacency (:literal:`indptr`, :literal:`indices`, :literal:`types`)
+  when the graph is finalized.
+
+Links to external websites (data products, publications, ...) are not edges
+of the graph. The item pipeline :class:`estatnet.pipelines.ENetGraphPipeline`
+streams the items of all the spiders of a process into the same graph, saved
+when the last spider closes:
+
+    ESTATNET_GRAPH_FILE = 'estatnet.graph'
+    ITEM_PIPELINES = {'estatnet.pipelines.ENetGraphPipeline': 800}
+
+A graph saved is loaded again (and extended) by the next crawls writing to the
+same file. When the table of titles is stored as well (setting
+:literal:`ESTATNET_TITLES_FILE`), the nodes of the graph are the identifiers of
+the titles in the table.
+
+**Dependencies**
+
+*require*:      :mod:`os`, :mod:`array`, :mod:`pickle`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Sun Jan 14 17:31:51 2018
+
+#%%
+import os
+import pickle
+from array import array
+
+from . import ENetError, ENetShared#analysis:ignore
+from .pages import canonical_title, link_title
+from .titles import ENetTitleTable
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+GRAPH_SETTING       = 'ESTATNET_GRAPH_FILE'
+"""Name of the |Scrapy| setting giving the file of the graph.
+"""
+
+EDGE_TYPES          = ('link', 'backlink', 'category', 'category_hidden', 'see_also',
+                       'concept', 'data', 'article', 'page', 'glossary',
+                       'article_statistical', 'article_background', 'topic',
+                       'overview', 'publication', 'section', 'information',
+                       'link_external', 'dataset', 'table', 'database', 'metadata',
+                       'product', 'legislation', 'methodology')
+"""Types of the edges, _i.e._ fields of the items holding links (the type of an
+edge is its index in the list): :literal:`'backlink'` stands for the field
+:literal:`'link'` of the "What links here" items. New types are appended, so
+that the graphs saved remain readable.
+"""
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+class ENetGraph(ENetShared):
+    """Class providing with a compact graph of the |StatX| pages.
+
+        >>> graph = ENetGraph(table=None)
+        >>> graph.add_item(item)
+        >>> graph.finalize()
+        >>> [graph.title(n) for n in graph.successors(graph.node(title))]
+
+    Arguments
+    ---------
+    table : :class:`estatnet.titles.ENetTitleTable`
+        table interning the titles of the nodes; default: a new transient table.
+
+    Attributes
+    ----------
+    titles : list
+        titles of the nodes, indexed by identifier.
+    indptr, indices, types : :class:`array.array`
+        |CSR| adjacency of the graph, once finalized: the successors of node
+        :literal:`n` are :literal:`indices[indptr[n]:indptr[n+1]]`, reached
+        through edges of types :literal:`types[indptr[n]:indptr[n+1]]`.
+    """
+
+    def __init__(self, table=None):
+        self.filename = None
+        self.table = table if table is not None else ENetTitleTable()
+        # nodes whose page was scraped, not only linked to (grown on demand:
+        # the table may be shared)
+        self.scraped = bytearray()
+        self.__src, self.__dst, self.__types = array('i'), array('i'), array('B')
+        self.indptr, self.indices, self.types = None, None, None
+
+    @classmethod
+    def open(cls, filename, table=None):
+        """Open the graph of a file, loaded from the file when it exists, and
+        extended by all the spiders of the process (see :class:`estatnet.ENetShared`).
+
+            >>> graph = ENetGraph.open(filename, table=None)
+        """
+        def create():
+            graph = cls.load(filename, table=table) if os.path.exists(filename) else cls(table=table)
+            graph.thaw()
+            graph.filename = filename
+            return graph
+        return cls._open_shared(filename, create)
+
+    @property
+    def finalized(self):
+        return self.indptr is not None
+
+    @property
+    def titles(self):
+        return self.table.titles
+
+    @property
+    def nnodes(self):
+        return len(self.table)
+
+    @property
+    def nedges(self):
+        return len(self.indices) if self.finalized else len(self.__src)
+
+    @property
+    def nbytes(self):
+        """Size (in bytes) of the arrays of the graph, titles excluded.
+        """
+        arrays = (self.indptr, self.indices, self.types) if self.finalized  \
+            else (self.__src, self.__dst, self.__types)
+        return sum([a.itemsize * len(a) for a in arrays]) + len(self.scraped)
+
+    def node(self, title, create=False):
+        """Identifier of the node of a page.
+
+            >>> n = graph.node(title, create=False)
+
+        Returns
+        -------
+        n : int
+            identifier of the node; `None` when the page is not a node of the
+            graph, unless it is created (:literal:`create=True`).
+        """
+        return self.table.id(title, create=create)
+
+    def title(self, n):
+        return self.titles[n]
+
+    def add_edges(self, source, targets, edge_type):
+        """Add the edges of a given type from a page to other pages.
+
+            >>> graph.add_edges(source, targets, edge_type)
+
+        Arguments
+        ---------
+        source : str
+            canonical title of the source page.
+        targets : list
+            canonical titles of the target pages.
+        edge_type : str
+            type of the edges (see :data:`EDGE_TYPES`).
+        """
+        if self.finalized:
+            raise ENetError("Graph already finalized")
+        try:
+            t = EDGE_TYPES.index(edge_type)
+        except ValueError:
+            raise ENetError("Edge type %s not supported" % edge_type)
+        s = self.node(source, create=True)
+        for target in targets:
+            self.__src.append(s)
+            self.__dst.append(self.node(target, create=True))
+            self.__types.append(t)
+
+    def add_item(self, item):
+        """Add a scraped item to the graph: node of its page, and edges of its
+        links.
+
+            >>> added = graph.add_item(item)
+
+        Returns
+        -------
+        added : bool
+            `False` when the page of the item is not known (no title).
+        """
+        if self.finalized:
+            raise ENetError("Graph already finalized")
+        # translations and "What links here" items are keyed by page_id
+        source = item.get('page_id') or canonical_title(item.get('title'))
+        if source in (None,''):
+            return False
+        s = self.node(source, create=True)
+        fields = getattr(item, 'fields', item)
+        whatlinks = 'title' not in fields
+        if not whatlinks:
+            self._grow()
+            self.scraped[s] = 1
+        for field in fields:
+            links = item.get(field)
+            if field not in EDGE_TYPES or not isinstance(links, (list, tuple)):
+                continue
+            targets = [t for t in map(link_title, links) if t not in (None,'')]
+            if whatlinks and field == 'link':
+                for target in targets:
+                    self.add_edges(target, [source], 'backlink')
+            else:
+                self.add_edges(source, targets, field)
+        return True
+
+    def _grow(self):
+        self.scraped.extend(bytes(self.nnodes - len(self.scraped)))
+
+    def finalize(self):
+        """Sort the edges into the |CSR| adjacency of the graph; duplicated
+        edges (same nodes and type) are dropped.
+
+            >>> graph.finalize()
+        """
+        if self.finalized:
+            return
+        self._grow()
+        n, m = self.nnodes, len(self.__src)
+        # counting sort of the edges by source: (target, type) pairs packed in
+        # a single integer
+        start = array('q', bytes(8 * (n + 1)))
+        for s in self.__src:
+            start[s+1] += 1
+        for s in range(n):
+            start[s+1] += start[s]
+        keys, position = array('q', bytes(8 * m)), start[:-1]
+        for (s, d, t) in zip(self.__src, self.__dst, self.__types):
+            keys[position[s]] = d << 8 | t
+            position[s] += 1
+        del position
+        self.__src, self.__dst, self.__types = array('i'), array('i'), array('B')
+        indptr, indices, types = array('q', [0]), array('i'), array('B')
+        for s in range(n):
+            for key in sorted(set(keys[start[s]:start[s+1]])):
+                indices.append(key >> 8)
+                types.append(key & 0xff)
+            indptr.append(len(indices))
+        self.indptr, self.indices, self.types = indptr, indices, types
+
+    def thaw(self):
+        """Turn a finalized graph into a graph accepting new edges.
+
+            >>> graph.thaw()
+        """
+        if not self.finalized:
+            return
+        for s in range(len(self.indptr) - 1):
+            k = self.indptr[s+1] - self.indptr[s]
+            self.__src.extend([s] * k)
+        self.__dst, self.__types = array('i', self.indices), array('B', self.types)
+        self.indptr, self.indices, self.types = None, None, None
+
+    def successors(self, n, edge_type=None):
+        """Successors of a node, through the edges of a given type (default: all).
+
+            >>> nodes = graph.successors(n, edge_type=None)
+        """
+        if not self.finalized:
+            raise ENetError("Graph not finalized")
+        start, end = self.indptr[n], self.indptr[n+1]
+        if edge_type is None:
+            return self.indices[start:end].tolist()
+        t = EDGE_TYPES.index(edge_type)
+        return [d for (d, u) in zip(self.indices[start:end], self.types[start:end]) if u == t]
+
+    def edges(self):
+        """Iterate over the edges of the graph, as :literal:`(source, target, type)`
+        triples of identifiers and type names.
+
+            >>> for (s, d, edge_type) in graph.edges(): ...
+        """
+        if not self.finalized:
+            raise ENetError("Graph not finalized")
+        for s in range(len(self.indptr) - 1):
+            for i in range(self.indptr[s], self.indptr[s+1]):
+                yield s, self.indices[i], EDGE_TYPES[self.types[i]]
+
+    def save(self, filename=None):
+        """Finalize the graph and save it.
+
+            >>> graph.save(filename=None)
+        """
+        filename = filename or self.filename
+        if filename in (None,''):
+            raise ENetError("File of the graph is missing")
+        self.finalize()
+        with open(filename, 'wb') as f:
+            pickle.dump({'titles': self.titles[:len(self.indptr)-1], 'scraped': bytes(self.scraped[:len(self.indptr)-1]),
+                         'edge_types': EDGE_TYPES, 'indptr': self.indptr,
+                         'indices': self.indices, 'types': self.types}, f, protocol=4)
+
+    @classmethod
+    def load(cls, filename, table=None):
+        """Load a (finalized) graph saved with :meth:`save`.
+
+            >>> graph = ENetGraph.load(filename, table=None)
+
+        Arguments
+        ---------
+        table : :class:`estatnet.titles.ENetTitleTable`
+            table interning the titles of the nodes, filled with the titles of
+            the graph when they are missing; the titles already in the table
+            shall have the identifiers of the nodes.
+        """
+        with open(filename, 'rb') as f:
+            data = pickle.load(f)
+        if tuple(data['edge_types']) != EDGE_TYPES[:len(data['edge_types'])]:
+            raise ENetError("Edge types of graph %s not supported" % filename)
+        graph = cls(table=table)
+        for (n, title) in enumerate(data['titles']):
+            if graph.node(title, create=True) != n:
+                raise ENetError("Titles of graph %s not consistent with the table of titles" % filename)
+        graph.scraped = bytearray(data['scraped'])
+        graph.indptr, graph.indices, graph.types = data['indptr'], data['indices'], data['types']
+        # titles of the table added since the graph was saved: nodes without edges
+        graph.indptr.extend([graph.indptr[-1]] * (graph.nnodes - len(data['titles'])))
+        graph._grow()
+        return graph
+
+    def close(self):
+        """Save the graph in its file; a graph shared through :meth:`open` is
+        saved by its last user.
+
+            >>> graph.close()
+        """
+        if self.filename is None:
+            return
+        if self._release_shared(self.filename):
+            self.save()
@@ -5,8 +5,21 @@
 # See documentation in:
 # https://doc.scrapy.org/en/latest/topics/spider-middleware.html
 
+import time
+from warnings import warn
+
 from scrapy import signals
 
+from . import ENetWarning
+from .settings import STANDIN_META_KEY
+
+
+def _enabled(settings, name, middleware):
+    # whether a middleware is enabled in the setting name (e.g., 'SPIDER_MIDDLEWARES')
+    from scrapy.utils.conf import build_component_list
+    from scrapy.utils.misc import load_object
+    return any([load_object(m) is middleware for m in build_component_list(settings.getwithbase(name))])
+
 
 class SpiderMiddleware(object):
     # Not all methods need to be defined. If a method is not defined,
@@ -54,3 +67,646 @@ class SpiderMiddleware(object):
 
     def spider_opened(self, spider):
         spider.logger.info('Spider opened: %s' % spider.name)
+
+
+class ENetStandinMiddleware(object):
+    # Downloader middleware redirecting the requests sent to the Eurostat website
+    # towards a local stand-in server (see estatnet.server), e.g. for load testing.
+    # Enabled through the setting ESTATNET_STANDIN_URL:
+    #   ESTATNET_STANDIN_URL = 'http://127.0.0.1:8000'
+    #   DOWNLOADER_MIDDLEWARES = {'estatnet.middlewares.ENetStandinMiddleware': 60}
+    # The URL is rewritten at download time, in place: the request is not sent
+    # back to the scheduler (hence neither filtered as a duplicate, nor counted
+    # twice), and the responses are given back the URL of the website, so that
+    # the spiders (link extraction, page identification) are unchanged. It runs
+    # below the OffsiteMiddleware of the downloader (50, Scrapy >= 2.11.2), which
+    # still sees the URL of the website; tested with Scrapy 2.11.
+
+    META_KEY = STANDIN_META_KEY
+
+    def __init__(self, url, origin):
+        self.url, self.origin = url.rstrip('/'), origin.rstrip('/')
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        from scrapy.exceptions import NotConfigured
+        from .settings import PROTOCOL, EC_URL
+        url = crawler.settings.get('ESTATNET_STANDIN_URL')
+        if not url:
+            raise NotConfigured
+        return cls(url, '%s://%s' % (PROTOCOL, EC_URL))
+
+    def process_request(self, request, spider):
+        # Rewrite the URL of the website into the URL of the stand-in server;
+        # requests already rewritten (e.g., retried) are left as they are.
+        if not request.url.startswith(self.origin + '/'):
+            return None
+        request.meta[self.META_KEY] = request.url
+        request._set_url(self.url + request.url[len(self.origin):])
+        return None
+
+    def _restore(self, request):
+        origin = request.meta.get(self.META_KEY)
+        if origin is not None and request.url != origin:
+            request._set_url(origin)
+        return origin
+
+    def process_response(self, request, response, spider):
+        origin = self._restore(request)
+        if origin is None:
+            return response
+        return response.replace(url=origin)
+
+    def process_exception(self, request, exception, spider):
+        # the errbacks get the request of the website as well
+        self._restore(request)
+        return None
+
+
+class ENetConditionalMiddleware(object):
+    # Downloader middleware sending conditional requests for the pages already
+    # crawled (see estatnet.state), enabled through the setting ESTATNET_STATE_FILE:
+    #   ESTATNET_STATE_FILE = 'estatnet.state'
+    #   DOWNLOADER_MIDDLEWARES = {'estatnet.middlewares.ENetConditionalMiddleware': 580}
+    #   SPIDER_MIDDLEWARES = {'estatnet.middlewares.ENetIncrementalMiddleware': 990}
+    # Pages that did not change (either answered with 304, or with the same
+    # content) are flagged as unchanged: see ENetIncrementalMiddleware. The 304
+    # responses are turned into empty 200 responses only when the latter is
+    # enabled (it then skips their parsing); they are left as they are otherwise.
+
+    META_KEY = 'estatnet_state'
+    UNCHANGED_KEY = 'estatnet_unchanged'
+
+    def __init__(self, store, stats=None, incremental=True):
+        self.store, self.stats, self.incremental = store, stats, incremental
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        from scrapy.exceptions import NotConfigured
+        from .state import STATE_SETTING, ENetPageStore
+        filename = crawler.settings.get(STATE_SETTING)
+        if not filename:
+            raise NotConfigured
+        incremental = _enabled(crawler.settings, 'SPIDER_MIDDLEWARES', ENetIncrementalMiddleware)
+        if not incremental:
+            warn(ENetWarning("ENetIncrementalMiddleware not enabled: 304 responses are not "
+                             "turned into unchanged pages"))
+        s = cls(ENetPageStore.open(filename), crawler.stats, incremental=incremental)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    @staticmethod
+    def _url(request):
+        # the pages are stored under their URL on the website, also when they
+        # are fetched from a stand-in server (see ENetStandinMiddleware)
+        return request.meta.get(STANDIN_META_KEY, request.url)
+
+    def process_request(self, request, spider):
+        record = self.store.get(self._url(request))
+        if record is None:
+            return None
+        if record['etag'] and b'If-None-Match' not in request.headers:
+            request.headers[b'If-None-Match'] = record['etag']
+        if record['http_modified'] and b'If-Modified-Since' not in request.headers:
+            request.headers[b'If-Modified-Since'] = record['http_modified']
+        return None
+
+    def process_response(self, request, response, spider):
+        from .state import digest
+        record = self.store.get(self._url(request))
+        if response.status == 304 and record is not None and self.incremental:
+            self._inc('not_modified')
+            self._flag(request, record, True)
+            return response.replace(status=200, flags=response.flags + ['unchanged'])
+        elif response.status != 200:
+            return response
+        key = digest(response.body)
+        unchanged = record is not None and record['digest'] == key
+        if unchanged:
+            self._inc('same_digest')
+        state = {'etag': (response.headers.get(b'ETag') or b'').decode('latin-1') or None,
+                 'http_modified': (response.headers.get(b'Last-Modified') or b'').decode('latin-1') or None,
+                 'digest': key}
+        self._flag(request, dict(record or {}, **state), unchanged, known=record is not None)
+        return response
+
+    def _flag(self, request, state, unchanged, known=True):
+        # the state is passed on to the spider middleware through the meta of
+        # the request (shared with the response)
+        request.meta[self.META_KEY] = dict(state, known=known)
+        request.meta[self.UNCHANGED_KEY] = unchanged
+
+    def _inc(self, key):
+        if self.stats is not None:
+            self.stats.inc_value('estatnet/state/%s' % key)
+
+    def spider_closed(self, spider):
+        self.store.close()
+
+
+class ENetIncrementalMiddleware(object):
+    # Spider middleware skipping the extraction, and the pipelines, of the pages
+    # flagged as unchanged by ENetConditionalMiddleware:
+    #   SPIDER_MIDDLEWARES = {'estatnet.middlewares.ENetIncrementalMiddleware': 990}
+    # - for unchanged pages, the callback is not run: the requests it followed
+    #   during the last crawl are issued again from the store,
+    # - for new or changed pages, the requests followed are recorded, and the
+    #   items whose parsed 'last_modified' did not change are dropped.
+
+    REPLAY_META = ('rule',)
+
+    def __init__(self, store, stats=None):
+        self.store, self.stats = store, stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        from scrapy.exceptions import NotConfigured
+        from .state import STATE_SETTING, ENetPageStore
+        filename = crawler.settings.get(STATE_SETTING)
+        if not filename:
+            raise NotConfigured
+        s = cls(ENetPageStore.open(filename), crawler.stats)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    def _describe(self, request, spider):
+        # JSON description of a followed request (see _replay)
+        def name(method):
+            return getattr(method, '__name__', None) if getattr(method, '__self__', None) is spider else None
+        return {'url': request.url, 'callback': name(request.callback), 'errback': name(request.errback),
+                'priority': request.priority, 'dont_filter': request.dont_filter,
+                'meta': {k: request.meta[k] for k in self.REPLAY_META if k in request.meta}}
+
+    def _replay(self, response, spider):
+        from scrapy import Request
+        self._inc('replayed')
+        record = response.meta[ENetConditionalMiddleware.META_KEY]
+        self.store.put(response.url, **{k: record[k] for k in ('etag', 'http_modified', 'digest')})
+        for link in record['links']:
+            yield Request(link['url'], priority=link['priority'], dont_filter=link['dont_filter'],
+                          callback=getattr(spider, link['callback']) if link['callback'] else None,
+                          errback=getattr(spider, link['errback']) if link['errback'] else None,
+                          meta=dict(link['meta']))
+
+    def _record(self, response, spider, links, modified):
+        state = response.meta[ENetConditionalMiddleware.META_KEY]
+        self._inc('changed' if state['known'] else 'new')
+        fields = {k: state[k] for k in ('etag', 'http_modified', 'digest')}
+        fields['links'] = links
+        if modified is not None:
+            fields['page_modified'] = modified
+        self.store.put(response.url, **fields)
+
+    def _filter(self, response, result, spider, links, modified):
+        # process one output of the callback: returns the output to pass on, if any
+        from scrapy import Request
+        if isinstance(result, Request):
+            links.append(self._describe(result, spider))
+            return result
+        try:
+            value = result['last_modified']
+        except (KeyError, TypeError):
+            return result
+        value = str(value[0] if isinstance(value, (list, tuple)) and value else value)
+        modified.append(value)
+        state = response.meta[ENetConditionalMiddleware.META_KEY]
+        if state['known'] and state.get('page_modified') == value:
+            self._inc('same_last_modified')
+            return None
+        return result
+
+    def process_spider_output(self, response, result, spider):
+        if ENetConditionalMiddleware.META_KEY not in response.meta:
+            yield from result
+            return
+        elif response.meta.get(ENetConditionalMiddleware.UNCHANGED_KEY):
+            yield from self._replay(response, spider)
+            return
+        links, modified = [], []
+        for r in result:
+            r = self._filter(response, r, spider, links, modified)
+            if r is not None:
+                yield r
+        self._record(response, spider, links, modified[0] if modified else None)
+
+    async def process_spider_output_async(self, response, result, spider):
+        if ENetConditionalMiddleware.META_KEY not in response.meta:
+            async for r in result:
+                yield r
+            return
+        elif response.meta.get(ENetConditionalMiddleware.UNCHANGED_KEY):
+            for r in self._replay(response, spider):
+                yield r
+            return
+        links, modified = [], []
+        async for r in result:
+            r = self._filter(response, r, spider, links, modified)
+            if r is not None:
+                yield r
+        self._record(response, spider, links, modified[0] if modified else None)
+
+    def _inc(self, key):
+        if self.stats is not None:
+            self.stats.inc_value('estatnet/state/%s' % key)
+
+    def spider_closed(self, spider):
+        self.store.close()
+
+
+class ENetPriorityMiddleware(object):
+    # Spider middleware setting the priority of the requests according to the
+    # type, the estimated staleness and the degree of the pages (see
+    # estatnet.priority), so that the pages fanning out and the pages likely
+    # changed are fetched first:
+    #   SPIDER_MIDDLEWARES = {'estatnet.middlewares.ENetPriorityMiddleware': 980}
+    # The score is added to the priority set by the spider. When placed below
+    # ENetIncrementalMiddleware, the requests replayed are scored again.
+
+    def __init__(self, scorer, stats=None):
+        self.scorer, self.stats = scorer, stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        from .state import STATE_SETTING, ENetPageStore
+        from .priority import ENetPriority
+        filename = crawler.settings.get(STATE_SETTING)
+        store = ENetPageStore.open(filename) if filename else None
+        s = cls(ENetPriority(store, types=crawler.settings.getdict('ESTATNET_PRIORITY_TYPES')),
+                crawler.stats)
+        if store is not None:
+            crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    def _prioritise(self, result, spider):
+        from scrapy import Request
+        if isinstance(result, Request):
+            result.priority += self.scorer.score(result, spider)
+            if self.stats is not None:
+                self.stats.max_value('estatnet/priority/max', result.priority)
+        return result
+
+    def process_start_requests(self, start_requests, spider):
+        for r in start_requests:
+            yield self._prioritise(r, spider)
+
+    def process_spider_output(self, response, result, spider):
+        for r in result:
+            yield self._prioritise(r, spider)
+
+    async def process_spider_output_async(self, response, result, spider):
+        async for r in result:
+            yield self._prioritise(r, spider)
+
+    def spider_closed(self, spider):
+        self.scorer.store.close()
+
+
+class ENetThrottleMiddleware(object):
+    # Downloader middleware adapting the concurrency and the delay of every
+    # download slot to the latencies and the errors observed (see estatnet.throttle),
+    # enabled through the setting ESTATNET_THROTTLE_ENABLED:
+    #   ESTATNET_THROTTLE_ENABLED = True
+    #   DOWNLOADER_MIDDLEWARES = {'estatnet.middlewares.ENetThrottleMiddleware': 600}
+    # It runs above RetryMiddleware (550) so as to see the 429/503 responses
+    # before they are retried; AUTOTHROTTLE_ENABLED should be left off.
+
+    def __init__(self, crawler, **kwargs):
+        self.crawler, self.stats, self.kwargs = crawler, crawler.stats, kwargs
+        self.throttles = {}
+        self.paused = {} # (end, length) of the pauses in progress, by slot
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        from scrapy.exceptions import NotConfigured
+        from .throttle import THROTTLE_SETTING, TARGET_LATENCY, START_CONCURRENCY, MAX_DELAY
+        s = crawler.settings
+        if not s.getbool(THROTTLE_SETTING):
+            raise NotConfigured
+        m = cls(crawler,
+                concurrency=s.getint('ESTATNET_THROTTLE_START_CONCURRENCY', START_CONCURRENCY),
+                delay=s.getfloat('DOWNLOAD_DELAY'),
+                max_concurrency=s.getint('ESTATNET_THROTTLE_MAX_CONCURRENCY', s.getint('CONCURRENT_REQUESTS')),
+                max_delay=s.getfloat('ESTATNET_THROTTLE_MAX_DELAY', MAX_DELAY),
+                target=s.getfloat('ESTATNET_THROTTLE_TARGET_LATENCY', TARGET_LATENCY))
+        # the download slots are created once the requests went through the
+        # downloader middlewares
+        crawler.signals.connect(m.request_reached_downloader, signal=signals.request_reached_downloader)
+        return m
+
+    def _slot(self, request):
+        key = request.meta.get('download_slot')
+        return key, self.crawler.engine.downloader.slots.get(key)
+
+    def _apply(self, key, throttle, slot):
+        # as AutoThrottle does, only the concurrency and the delay of the slot
+        # are set: the downloader schedules the requests itself
+        delay = max(throttle.delay, self.paused.get(key, (0., 0.))[1])
+        slot.concurrency, slot.delay = throttle.concurrency, delay
+        self.stats.set_value('estatnet/throttle/concurrency', throttle.concurrency)
+        self.stats.set_value('estatnet/throttle/delay', throttle.delay)
+        self.stats.min_value('estatnet/throttle/min_concurrency', throttle.concurrency)
+        self.stats.max_value('estatnet/throttle/max_delay', delay)
+
+    def request_reached_downloader(self, request, spider):
+        from .throttle import ENetThrottle
+        key, slot = self._slot(request)
+        if slot is not None and key not in self.throttles:
+            self.throttles[key] = ENetThrottle(**self.kwargs)
+            self._apply(key, self.throttles[key], slot)
+
+    def _pause(self, key, throttle):
+        # the slot is paused through its delay (requests of a slot with a delay
+        # are sent one at a time, spaced by the delay), until the pause elapsed
+        pause, throttle.pause = throttle.pause, None
+        end, length = self.paused.get(key, (0., 0.))
+        self.paused[key] = (max(end, time.monotonic() + pause), max(length, pause))
+        self.stats.inc_value('estatnet/throttle/pause')
+
+    def _observe(self, request, spider, **kwargs):
+        key, slot = self._slot(request)
+        throttle = self.throttles.get(key)
+        if throttle is None or slot is None:
+            return
+        decision, paused = throttle.observe(**kwargs), False
+        if throttle.pause:
+            self._pause(key, throttle)
+            paused = True
+        elif key in self.paused and self.paused[key][0] <= time.monotonic():
+            del self.paused[key] # the pause elapsed: back to the delay of the throttle
+            paused = True
+        p50, p95 = throttle.percentile(0.5), throttle.percentile(0.95)
+        if p95 is not None:
+            self.stats.set_value('estatnet/throttle/latency_p50', p50)
+            self.stats.set_value('estatnet/throttle/latency_p95', p95)
+        if decision is None:
+            if paused:
+                self._apply(key, throttle, slot)
+            return
+        self.stats.inc_value('estatnet/throttle/%s' % decision)
+        self._apply(key, throttle, slot)
+        spider.logger.debug('Throttling %s (%s): concurrency %s, delay %.2fs (latency p95: %s)',
+                            key, decision, throttle.concurrency, throttle.delay, p95)
+
+    def process_response(self, request, response, spider):
+        from .throttle import OVERLOAD_STATUS, retry_after
+        if response.status in OVERLOAD_STATUS:
+            self.stats.inc_value('estatnet/throttle/overloaded/%s' % response.status)
+        self._observe(request, spider, latency=request.meta.get('download_latency'), status=response.status,
+                      wait=retry_after(response.headers.get(b'Retry-After')))
+        return response
+
+    def process_exception(self, request, exception, spider):
+        from twisted.internet.error import TimeoutError, TCPTimedOutError, ConnectionRefusedError
+        if isinstance(exception, (TimeoutError, TCPTimedOutError, ConnectionRefusedError)):
+            self.stats.inc_value('estatnet/throttle/overloaded/error')
+            self._observe(request, spider, status=None)
+        return None
+
+
+class ENetShardMiddleware(object):
+    # Spider middleware sharing the crawl of a spider between several processes
+    # through a shared frontier (see estatnet.shard), enabled by the settings
+    # ESTATNET_SHARD ('i/N') and ESTATNET_SHARD_FRONTIER:
+    #   SPIDER_MIDDLEWARES = {'estatnet.middlewares.ENetShardMiddleware': 50}
+    # It sits close to the engine, so that the requests filtered by the other
+    # middlewares (e.g., OffsiteMiddleware) are not routed. The processes are
+    # best started with estatnet.shard.launch.
+
+    def __init__(self, crawler, frontier):
+        self.crawler, self.stats, self.frontier = crawler, crawler.stats, frontier
+        self.poller = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        from scrapy.exceptions import NotConfigured
+        from .shard import SHARD_SETTING, FRONTIER_SETTING, ENetSharedFrontier, parse_shard
+        shard = crawler.settings.get(SHARD_SETTING)
+        if not shard:
+            raise NotConfigured
+        shard, nshards = parse_shard(shard)
+        m = cls(crawler, ENetSharedFrontier(crawler.settings.get(FRONTIER_SETTING), shard, nshards))
+        crawler.signals.connect(m.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(m.spider_idle, signal=signals.spider_idle)
+        crawler.signals.connect(m.spider_closed, signal=signals.spider_closed)
+        return m
+
+    def _route(self, requests, spider):
+        new = self.frontier.route(requests, spider)
+        nmine = len([r for r in requests if self._mine(r)])
+        self.stats.inc_value('estatnet/shard/routed', len(requests) - nmine)
+        self.stats.inc_value('estatnet/shard/duplicates', nmine - len(new))
+        return new
+
+    def _mine(self, request):
+        from .shard import shard_of
+        return shard_of(request, self.frontier.nshards) == self.frontier.shard
+
+    def _split(self, result):
+        # the requests output for a response are routed at once, in a single
+        # transaction
+        from scrapy import Request
+        requests, others = [], []
+        for r in result:
+            (requests if isinstance(r, Request) else others).append(r)
+        return requests, others
+
+    def process_start_requests(self, start_requests, spider):
+        requests, others = self._split(start_requests)
+        yield from others
+        yield from self._route(requests, spider)
+
+    def process_spider_output(self, response, result, spider):
+        requests, others = self._split(result)
+        yield from others
+        yield from self._route(requests, spider)
+
+    async def process_spider_output_async(self, response, result, spider):
+        from scrapy import Request
+        requests = []
+        async for r in result:
+            if isinstance(r, Request):
+                requests.append(r)
+            else:
+                yield r
+        for r in self._route(requests, spider):
+            yield r
+
+    def _claim(self, spider):
+        requests = self.frontier.claim(spider)
+        for request in requests:
+            self.crawler.engine.crawl(request)
+        if requests:
+            self.stats.inc_value('estatnet/shard/claimed', len(requests))
+        return len(requests)
+
+    def spider_opened(self, spider):
+        from twisted.internet import task
+        from .shard import POLL_INTERVAL
+        self.poller = task.LoopingCall(self._claim, spider)
+        self.poller.start(POLL_INTERVAL, now=False)
+
+    def spider_idle(self, spider):
+        from scrapy.exceptions import DontCloseSpider
+        # the shard is flagged idle only when nothing is left to claim; the
+        # crawl is over once all the shards are
+        if self._claim(spider) or not self.frontier.idle():
+            raise DontCloseSpider
+
+    def spider_closed(self, spider):
+        if self.poller is not None and self.poller.running:
+            self.poller.stop()
+        self.frontier.close()
+
+
+class ENetCheckpointMiddleware(object):
+    # Spider middleware checkpointing the crawl periodically in a job directory
+    # (requests pending and done, journal of the items: see estatnet.checkpoint),
+    # and resuming it from the last checkpoint:
+    #   ESTATNET_CHECKPOINT_DIR = 'crawls/pages-1'
+    #   SPIDER_MIDDLEWARES = {'estatnet.middlewares.ENetCheckpointMiddleware': 40}
+    # It sits close to the engine, so that the requests filtered by the other
+    # middlewares are not recorded. The requests already seen are dropped,
+    # unless they are not filtered (dont_filter), the start requests excepted.
+    # The output of the errbacks of the failed downloads, which bypasses the
+    # spider middlewares, is recorded through the signals of the engine, and
+    # the requests failed are done: see ENetCheckpointFailureMiddleware.
+
+    def __init__(self, crawler, checkpoint, interval):
+        self.crawler, self.stats, self.checkpoint = crawler, crawler.stats, checkpoint
+        self.interval, self.saver = interval, None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        from scrapy.exceptions import NotConfigured
+        from .checkpoint import CHECKPOINT_SETTING, CHECKPOINT_INTERVAL, ENetCheckpoint
+        directory = crawler.settings.get(CHECKPOINT_SETTING)
+        if not directory:
+            raise NotConfigured
+        if not _enabled(crawler.settings, 'DOWNLOADER_MIDDLEWARES', ENetCheckpointFailureMiddleware):
+            warn(ENetWarning("ENetCheckpointFailureMiddleware not enabled: the requests whose "
+                             "download fails are restored on resume"))
+        m = cls(crawler, ENetCheckpoint.open(directory),
+                crawler.settings.getfloat('ESTATNET_CHECKPOINT_INTERVAL', CHECKPOINT_INTERVAL))
+        crawler.signals.connect(m.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(m.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(m.request_scheduled, signal=signals.request_scheduled)
+        crawler.signals.connect(m.request_dropped, signal=signals.request_dropped)
+        crawler.signals.connect(m.item_scraped, signal=signals.item_scraped)
+        return m
+
+    def _schedule(self, request, spider, filtered=True):
+        if self.checkpoint.schedule(request, spider) or not filtered:
+            return True
+        self.stats.inc_value('estatnet/checkpoint/skipped')
+        return False
+
+    def process_start_requests(self, start_requests, spider):
+        # the requests pending at the last checkpoint come first
+        for r in self.checkpoint.pending(spider):
+            yield r
+        for r in start_requests:
+            if self._schedule(r, spider):
+                yield r
+
+    def process_spider_output(self, response, result, spider):
+        from scrapy import Request
+        items = []
+        try:
+            for r in result:
+                if not isinstance(r, Request):
+                    items.append(r)
+                    yield r
+                elif self._schedule(r, spider, filtered=not r.dont_filter):
+                    yield r
+        finally:
+            self.checkpoint.complete(response.request, items)
+
+    async def process_spider_output_async(self, response, result, spider):
+        from scrapy import Request
+        items = []
+        try:
+            async for r in result:
+                if not isinstance(r, Request):
+                    items.append(r)
+                    yield r
+                elif self._schedule(r, spider, filtered=not r.dont_filter):
+                    yield r
+        finally:
+            self.checkpoint.complete(response.request, items)
+
+    def process_spider_exception(self, response, exception, spider):
+        # e.g., HttpError: the page is done
+        self.checkpoint.complete(response.request)
+        return None
+
+    def request_scheduled(self, request, spider):
+        # requests scheduled without going through the middleware, e.g. output
+        # by the errbacks of failed downloads
+        from .checkpoint import KEY_META
+        if KEY_META not in request.meta:
+            self.checkpoint.schedule(request, spider)
+
+    def request_dropped(self, request, spider):
+        # e.g., filtered by the dupefilter: never downloaded, hence done
+        from .checkpoint import KEY_META
+        if KEY_META in request.meta:
+            self.checkpoint.complete(request)
+
+    def item_scraped(self, item, response, spider):
+        # the items output by the errbacks of failed downloads (the response is
+        # then the failure)
+        from twisted.python.failure import Failure
+        if isinstance(response, Failure) and getattr(response, 'request', None) is not None:
+            self.checkpoint.complete(response.request, [item])
+
+    def _save(self):
+        self.checkpoint.save()
+        self.stats.set_value('estatnet/checkpoint/checkpoints', self.checkpoint.ncheckpoints)
+        self.stats.set_value('estatnet/checkpoint/items', self.checkpoint.nitems)
+
+    def spider_opened(self, spider):
+        from twisted.internet import task
+        resumed = self.checkpoint.resumed
+        if any(resumed.values()):
+            spider.logger.info('Resuming crawl from %s: %d pages and %d items saved, %d requests restored',
+                               self.checkpoint.directory, resumed['pages'], resumed['items'], resumed['pending'])
+            self.stats.set_value('estatnet/checkpoint/resumed_pages', resumed['pages'])
+            self.stats.set_value('estatnet/checkpoint/resumed_items', resumed['items'])
+            self.stats.set_value('estatnet/checkpoint/restored', resumed['pending'])
+        self.saver = task.LoopingCall(self._save)
+        self.saver.start(self.interval, now=False)
+
+    def spider_closed(self, spider):
+        if self.saver is not None and self.saver.running:
+            self.saver.stop()
+        self._save()
+        self.checkpoint.close()
+
+
+class ENetCheckpointFailureMiddleware(object):
+    # Downloader middleware marking done, in the checkpoints of the crawl (see
+    # ENetCheckpointMiddleware), the requests whose download failed for good:
+    #   DOWNLOADER_MIDDLEWARES = {'estatnet.middlewares.ENetCheckpointFailureMiddleware': 40}
+    # It runs below RetryMiddleware (550), so that it sees the exceptions only
+    # once the retries are exhausted (or for the requests ignored, e.g. offsite).
+
+    def __init__(self, checkpoint):
+        self.checkpoint = checkpoint
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        from scrapy.exceptions import NotConfigured
+        from .checkpoint import CHECKPOINT_SETTING, ENetCheckpoint
+        directory = crawler.settings.get(CHECKPOINT_SETTING)
+        if not directory:
+            raise NotConfigured
+        m = cls(ENetCheckpoint.open(directory))
+        crawler.signals.connect(m.spider_closed, signal=signals.spider_closed)
+        return m
+
+    def process_exception(self, request, exception, spider):
+        self.checkpoint.complete(request)
+        return None
+
+    def spider_closed(self, spider):
+        self.checkpoint.close()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__pages
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+
+Identification of the type of |StatX| pages.
+
+**Description**
+
+The type of a page (glossary, category, article, ...) is given by the prefix of
+its title (see :data:`settings.SX_KEYDOMAINS`), _e.g._ :literal:`Glossary:` or
+:literal:`Category:`. The class :class:`ENetPageClassifier` dispatches on a trie
+of these prefixes built once: no DOM work is needed for most pages. Only when
+the title does not tell the type (articles and themes share the same empty
+prefix) a single combined probe is run over the document. The result is
+memoized per canonical page title.
+
+The links to a page take many forms: absolute or relative URLs, of the form
+:literal:`index.php/Title` or :literal:`index.php?title=Title`, quoted or not,
+with any case of namespace prefix. They are all turned into the canonical title
+of the page by :meth:`link_title` (memoized, the same links being repeated over
+thousands of pages); links to files, special or talk pages are ignored.
+
+**Dependencies**
+
+*require*:      :mod:`collections`, :mod:`functools`, :mod:`urllib`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Sun Jan 14 17:31:51 2018
+
+#%%
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import urljoin, urlsplit, parse_qs, unquote
+
+from . import ENetError#analysis:ignore
+from . import settings#analysis:ignore
+from .xpaths import XPATHS
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+try:
+    assert PAGE_CHECK
+    assert not (PAGE_CHECK in (None,{}) or all([v in ([],'',None) for v in PAGE_CHECK.values()]))
+except (NameError,AssertionError):
+    PAGE_CHECK = {}
+    PAGE_CHECK[settings.ARTICLE_KEY] =                          \
+        '//h2[span[contains(normalize-space(text()), "Further Eurostat information")]] \
+            | //h2[span[contains(normalize-space(text()), "See also")]] \
+            | //h3[span[contains(normalize-space(text()), "Dedicated section")]] \
+            | //div[@class="dat-section"]'
+    PAGE_CHECK[settings.GLOSSARY_KEY] =                         \
+        '//h1[@id="firstHeading"][starts-with(normalize-space(text()), "Glossary")]   \
+            | //h2[span[contains(normalize-space(text()), "Related concepts")]] \
+            | //h2[span[contains(normalize-space(text()), "Statistical data")]]'
+    PAGE_CHECK[settings.CATEGORY_KEY] =                         \
+        '//h1[@id="firstHeading"][starts-with(normalize-space(text()), "Category")]   \
+            | //h2[starts-with(normalize-space(text()), "Pages in category")]'
+    PAGE_CHECK[settings.THEME_KEY] =                            \
+        '//h2[span[@id="Statistical_articles"]]//text()'
+    PAGE_CHECK[settings.CONCEPT_KEY] =                          \
+        PAGE_CHECK[settings.GLOSSARY_KEY]
+
+NAMESPACES          = set([d for d in settings.SX_KEYDOMAINS.values() if d != '']
+                          + ['%s:' % settings.WHATLINKSHERE_PAGE.split(':')[0]])
+"""Namespaces of the |StatX| titles (prefixes ending with :literal:`':'`).
+"""
+
+SKIP_NAMESPACES     = set(['special:', 'file:', 'image:', 'media:', 'talk:', 'user:',
+                           'template:', 'help:', 'mediawiki:', 'module:', 'project:'])
+"""Namespaces (lowercased) of the |StatX| titles that are not content pages
+(files, special pages, ...), whose links are ignored by :meth:`link_title`; so
+are the talk pages (namespaces ending with :literal:`'_talk:'`).
+"""
+
+MEMO_SIZE           = 100000
+"""Maximum number of page titles whose type is memoized, and of links whose
+title is memoized.
+"""
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+def page_title(url):
+    """Extract the canonical title of a |StatX| page from its URL.
+
+        >>> title = page_title(url)
+
+    Arguments
+    ---------
+    url : str
+        URL of the page, either of the form :literal:`.../index.php/Title` or
+        :literal:`.../index.php?title=Title`.
+
+    Returns
+    -------
+    title : str
+        unquoted title of the page, with spaces replaced by underscores (as
+        MediaWiki does), or `None` when the title cannot be found.
+    """
+    if url in (None,''):
+        return None
+    parts = urlsplit(url)
+    title = parse_qs(parts.query).get('title', [None])[0]
+    if title is None and '/index.php/' in parts.path:
+        title = unquote(parts.path.split('/index.php/', 1)[1])
+    if title in (None,''):
+        return None
+    return title.strip().replace(' ', '_')
+
+def canonical_title(title):
+    """Normalise a |StatX| title the way MediaWiki does, so that all spellings
+    of a page share the same title.
+
+        >>> title = canonical_title(title)
+
+    Arguments
+    ---------
+    title : str
+        title of a page (_e.g._, as returned by :meth:`page_title`).
+
+    Returns
+    -------
+    title : str
+        title with runs of spaces and underscores replaced by a single
+        underscore, leading and trailing ones removed, and the first letter of
+        the title (and of the name following a known namespace, _e.g._
+        :literal:`Glossary:`) capitalised.
+    """
+    if title in (None,''):
+        return title
+    title = '_'.join(title.replace('_', ' ').split())
+    namespace, sep, name = title.partition(':')
+    if sep and '%s:' % namespace.capitalize() in NAMESPACES:
+        namespace, title = '%s:' % namespace.capitalize(), name.lstrip('_')
+    else:
+        namespace = ''
+    return namespace + title[:1].upper() + title[1:]
+
+@lru_cache(maxsize=MEMO_SIZE)
+def link_title(link):
+    """Canonical title of the |StatX| page targeted by a link.
+
+        >>> title = link_title(link)
+
+    Arguments
+    ---------
+    link : str
+        absolute or relative URL of the page, _e.g._ the value of a link field
+        of the items.
+
+    Returns
+    -------
+    title : str
+        canonical title (see :meth:`canonical_title`), or `None` when the link
+        does not target a content page of the website (_e.g._, external websites,
+        data products, files, special pages, see :data:`SKIP_NAMESPACES`).
+    """
+    if link in (None,''):
+        return None
+    # relative links (e.g., 'index.php?title=Title') are resolved against the
+    # main page of the website
+    link = urljoin(settings.SX_MAINURL, link)
+    if settings.SX_DOMAINURL not in urlsplit(link).path:
+        return None
+    title = canonical_title(page_title(link))
+    namespace, sep, _ = (title or '').partition(':')
+    if sep and (namespace.lower().endswith('_talk')
+                or namespace.lower() + ':' in SKIP_NAMESPACES):
+        return None
+    return title
+
+def split_lang(title):
+    """Split the title of a translated |StatX| page, _e.g._ :literal:`Title/de`,
+    into the title of the original page and the language.
+
+        >>> title, lang = split_lang(title)
+
+    Returns
+    -------
+    title, lang : str
+        title of the page in the default language (:data:`settings.DEF_LANG`),
+        and language of the translation (one of :data:`settings.LANGS`), or
+        :data:`settings.DEF_LANG` when the title is not a translation.
+    """
+    if title in (None,''):
+        return title, settings.DEF_LANG
+    base, sep, lang = title.rpartition('/')
+    if sep and base and lang in settings.LANGS and lang != settings.DEF_LANG:
+        return base, lang
+    return title, settings.DEF_LANG
+
+def lang_title(title, lang):
+    """Title of the translation of a |StatX| page (see :meth:`split_lang`).
+
+        >>> title = lang_title(title, lang)
+    """
+    if lang not in settings.LANGS:
+        raise ENetError("Language %s not supported (only: %s)" % (lang, list(settings.LANGS)))
+    title = split_lang(title)[0]
+    return title if lang == settings.DEF_LANG else '%s/%s' % (title, lang)
+
+
+class ENetPrefixTrie(object):
+    """Class providing with a trie of string prefixes.
+
+        >>> trie = ENetPrefixTrie(prefixes)
+        >>> value = trie.match(string)
+
+    Arguments
+    ---------
+    prefixes : dict
+        values indexed by (non-empty) prefixes; when several values share the
+        same prefix, the first one is kept.
+    """
+
+    _END = None # key of the values stored in the nodes
+
+    def __init__(self, prefixes=None):
+        self.__root = {}
+        [self.insert(prefix, value) for (prefix, value) in (prefixes or {}).items()]
+
+    def insert(self, prefix, value):
+        if prefix in (None,''):
+            raise ENetError("Empty prefix cannot be inserted")
+        node = self.__root
+        for c in prefix:
+            node = node.setdefault(c, {})
+        node.setdefault(self._END, value)
+
+    def match(self, string):
+        """Retrieve the value of the longest prefix of a string.
+
+            >>> value = trie.match(string)
+
+        Returns
+        -------
+        value :
+            value of the longest prefix of :data:`string` in the trie, `None`
+            when no prefix matches.
+        """
+        node, value = self.__root, None
+        for c in string or '':
+            node = node.get(c)
+            if node is None:
+                break
+            value = node.get(self._END, value)
+        return value
+
+
+class ENetPageClassifier(object):
+    """Class providing with the identification of the type of pages.
+
+        >>> classifier = ENetPageClassifier(domains=None, checks=None)
+        >>> page = classifier.identify(response)
+
+    Arguments
+    ---------
+    domains : dict
+        title prefixes indexed by page type; default: :data:`settings.SX_KEYDOMAINS`.
+        Types with an empty prefix are identified through the DOM probe.
+    checks : dict
+        xpath tests indexed by page type; default: :data:`PAGE_CHECK`.
+    memo : int
+        maximum number of memoized titles; default: :data:`MEMO_SIZE`.
+    """
+
+    def __init__(self, domains=None, checks=None, memo=MEMO_SIZE):
+        self.domains = domains or settings.SX_KEYDOMAINS
+        self.checks = checks or PAGE_CHECK
+        self.trie = ENetPrefixTrie()
+        [self.trie.insert(domain, page) for (page, domain) in self.domains.items()
+            if domain not in (None,'',[])] # the first type of a given prefix is kept
+        # the types left ambiguous by the titles are tested, in order, through
+        # a single expression returning the first type whose test holds, e.g.:
+        #   'concat(substring("article|",1,8*boolean(A)),substring("theme|",1,6*boolean(T)),"")'
+        self.ambiguous = [page for (page, domain) in self.domains.items()
+                          if domain in (None,'',[])]
+        probes = ['substring("%s|",1,%d*boolean(%s))' % (page, len(page)+1, ' '.join(self.checks[page].split()))
+                  for page in self.ambiguous]
+        self.probe = 'concat(%s,"")' % ','.join(probes) if probes else None
+        self.__memo, self.__size = OrderedDict(), memo
+        self.nprobes = 0
+
+    def _probe(self, response):
+        if self.probe is None:
+            return None
+        self.nprobes += 1
+        result = XPATHS[self.probe](response.selector.root)
+        return result.split('|', 1)[0] or None
+
+    def identify(self, response):
+        """Identify the type of a page.
+
+            >>> page = classifier.identify(response)
+
+        Arguments
+        ---------
+        response : scrapy.http.Response
+            response of the page.
+
+        Returns
+        -------
+        page : str
+            type of the page (see :data:`settings.SX_KEYS`), or `None` when the
+            page is not recognised as any standard type.
+        """
+        title = canonical_title(page_title(response.url))
+        if title is not None and title in self.__memo:
+            self.__memo.move_to_end(title)
+            return self.__memo[title]
+        page = self.trie.match(title)
+        if page is None:
+            page = self._probe(response)
+        # a failed probe (e.g., error or maintenance page) is not memoized: the
+        # next response of the title is identified again
+        if title is not None and page is not None:
+            self.__memo[title] = page
+            if len(self.__memo) > self.__size:
+                self.__memo.popitem(last=False)
+        return page
+
+    def check(self, response, page):
+        """Check that a page is of a given type.
+
+            >>> res = classifier.check(response, page)
+        """
+        if not page in self.domains:
+            raise ENetError("Page type %s not recognised as any from Eurostat website" % page)
+        domain = self.domains[page]
+        if domain not in (None,'',[]):
+            return (page_title(response.url) or '').startswith(domain)
+        else:
+            return XPATHS['boolean(%s)' % ' '.join(self.checks[page].split())](response.selector.root)
@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__paths
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+
+Definitions of the xpath tables used for scraping |StatX| pages.
+
+**Description**
+
+The tables below are built with :meth:`estatnet.ENetXpath.create`. This module
+is not meant to be imported directly: the tables are computed once and cached
+into a generated snapshot module, which is rebuilt whenever the definitions
+change (see :mod:`estatnet.snapshot`); they are exposed lazily through
+:mod:`estatnet.items`.
+
+**Dependencies**
+
+*require*:      :mod:`estatnet`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_ 
+# *since*:        Mon Dec 18 17:28:29 2017
+
+#%%
+from . import ENetXpath#analysis:ignore 
+from . import settings#analysis:ignore
+from .items import ARTICLE_FIELDS, GLOSSARY_FIELDS, CATEGORY_FIELDS, THEME_FIELDS#analysis:ignore
+from .items import SX_VERSION_0, SX_VERSION_1, KEY_URL_PRODUCT#analysis:ignore
+
+#%%
+## definition of ARTICLE paths
+
+try:
+    assert ARTICLE_PATHS
+    assert not (ARTICLE_PATHS in (None,{}) or all([v in ([],'',None) for v in ARTICLE_PATHS.values()]))
+except (NameError,AssertionError):
+    ARTICLE_PATHS      = {}
+    [ARTICLE_PATHS.update({v: dict.fromkeys(ARTICLE_FIELDS)})               \
+         for v in settings.SX_VERSIONS.values()] 
+    ## define the current version
+    ## Title ------------------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['title'] =                                  \
+        ENetXpath.create(first='h1[@id="firstHeading"]', 
+                     tag='text()[normalize-space(.)]')
+    ARTICLE_PATHS[SX_VERSION_1]['title'] = ARTICLE_PATHS[SX_VERSION_0]['title']
+    #   '//h1[@id="firstHeading"]/text()[normalize-space(.)]'
+    # also try: 
+    #   ENetXpath.create(first='title', tag='text()[normalize-space(.)]')    
+    ## Last_modified ----------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['last_modified'] =                          \
+        ENetXpath.create(node='div[@id="footer"]',                            
+                     first='li[@id="lastmod"]',  
+                     tag='text()',
+                     sep='//')
+    ARTICLE_PATHS[SX_VERSION_1]['last_modified'] = ARTICLE_PATHS[SX_VERSION_0]['last_modified']
+    #   '//div[@id="footer"]//li[@id="lastmod"]//text()'    
+    ## Language ---------------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['language'] =                               \
+        ENetXpath.create(node='html',                            
+                     tag='@lang')
+    ARTICLE_PATHS[SX_VERSION_1]['language'] = ARTICLE_PATHS[SX_VERSION_0]['language']
+    # nothing else than: '//html/@lang'
+    ## Categories -------------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['category'] =                               \
+        ENetXpath.create(first='div',                                    
+                     tag='a/@href',                                
+                     identifier='@id="mw-normal-catlinks"',  
+                     ancestor='*[starts-with(name(),"div")][position()=1]',                           
+                     descendant=True,
+                     sep='//')
+    ARTICLE_PATHS[SX_VERSION_1]['category'] = ARTICLE_PATHS[SX_VERSION_0]['category']
+    #   '//div[@id="mw-normal-catlinks"]//descendant::*[ancestor::*[starts-with(name(),"div")][position()=1][@id="mw-normal-catlinks"]]//a/@href'    
+    ## Hidden_categories ------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['category_hidden'] =                        \
+        ENetXpath.create(first='div',                                    
+                     tag='a/@href',                                
+                     identifier='@id="mw-hidden-catlinks"',  
+                     ancestor='*[starts-with(name(),"div")][position()=1]',                           
+                     descendant=True,
+                     sep='//')
+    ARTICLE_PATHS[SX_VERSION_1]['category_hidden'] = ARTICLE_PATHS[SX_VERSION_0]['category_hidden']
+    #   '//div[@id="mw-hidden-catlinks"]//descendant::*[ancestor::*[starts-with(name(),"div")][position()=1][@id="mw-hidden-catlinks"]]//a/@href'        
+    ## Source_datasets --------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['dataset'] =                                \
+        ENetXpath.create(first='div[@class="thumbcaption"]',
+                     identifier='descendant-or-self::text()[contains(.,"Source")]',
+                     tag='a[contains(@href,"%s")]//@href' % KEY_URL_PRODUCT,                                
+                     sep='//')
+    #   '//div[contains(@class,"thumbcaption")][descendant-or-self::text()[contains(.,"Source")]]//a[contains(@href,"product?code")]//@href'
+    ARTICLE_PATHS[SX_VERSION_1]['dataset'] = ARTICLE_PATHS[SX_VERSION_0]['dataset']        
+    #   '//div[contains(@class,"thumbcaption") and descendant-or-self::text()[contains(.,"Source")]]//a[contains(@href,"product?code")]//@href'
+    ## See_also ---------------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['see_also'] =                               \
+        ENetXpath.create(first='h2',
+                     tag='a/@href',
+                     identifier='span[@id="See_also"]',
+                     #identifier='span[@id="See_also" and normalize-space(.)="See also"]',
+                     following_sibling=True,
+                     preceding_sibling='*[starts-with(name(),"h")][position()=1]',
+                     #preceding_sibling='h2[span[@id="Further_Eurostat_information"]]',
+                     sep='//')
+    #   '//h2[span[@id="See_also"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1][span[@id="See_also"]]]//a/@href'
+    # note that this will work as well:
+    #   '//h2[span[@id="See_also" and normalize-space(.)="See also"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][1]/span[@id="See_also" and normalize-space(.)="See also"]]//a/@href'    
+    ARTICLE_PATHS[SX_VERSION_1]['see_also'] =                               \
+        ENetXpath.create(first='div[@class="dat-section"]',
+                     ancestor_self='div[position()=1]',
+                     identifier='@id="seealso"',
+                     tag='a/@href',
+                     sep='//')
+    #   '//div[@class="dat-section"][@id="seealso"]//*[ancestor-or-self::div[position()=1][@id="seealso"]]//a/@href'
+    ## Publications -----------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['publication'] =                            \
+        ENetXpath.create(first='h3',
+                     tag='li/a/@href',
+                     identifier='span[@id="Publications"]',
+                     #identifier='span[@id="Publications" and normalize-space(.)="Publications"]',
+                     following_sibling=True,
+                     preceding_sibling='*[starts-with(name(),"h")][position()=1]',
+                     #preceding_sibling='h3[span[@id="Main_tables"]]'
+                     sep='//')   
+    #   '//h3[span[@id="Publications"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1][span[@id="Publications"]]]//li/a/@href'
+    # note that this will work as well:    
+    #   '//h3[span[@id="Publications" and normalize-space(.)="Publications"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][1]/span[@id="Publications" and normalize-space(.)="Publications"]]//li/a/@href'       
+    ARTICLE_PATHS[SX_VERSION_1]['publication'] =                            \
+        ENetXpath.create(first='div[@class="dat-section"]',
+                     ancestor_self='div[position()=1]',
+                     identifier='@id="publications"',
+                     tag='a/@href',
+                     sep='//')
+    # '//div[@class="dat-section"][@id="publications"]//*[ancestor-or-self::div[position()=1][@id="publications"]]//a/@href'
+    ## Main tables ------------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['table'] =                                  \
+        ENetXpath.create(first='h3',
+                     tag='li/a/@href',
+                     identifier='span[@id="Main_tables"]',
+                     #identifier='span[@id="Main_tables" and normalize-space(.)="Main tables"]',
+                     following_sibling=True,
+                     preceding_sibling='*[starts-with(name(),"h")][position()=1]',
+                     #preceding_sibling='h3[span[@id="Database"]]'
+                     sep='//')
+    #   '//h3[span[@id="Main_tables"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1][span[@id="Main_tables"]]]//li/a/@href'
+    # note that this will work as well:
+    #   '//h3[span[@id="Main_tables" and normalize-space(.)="Main tables"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1]/span[@id="Main_tables" and normalize-space(.)="Main tables"]]//li/a/@href'
+    ARTICLE_PATHS[SX_VERSION_1]['table'] =                                  \
+        ENetXpath.create(first='div[@class="dat-section"]',
+                     ancestor_self='div[position()=1]',
+                     identifier='@id="maintables"',
+                     tag='a/@href',
+                     sep='//')
+    #   '//div[@class="dat-section"][@id="maintables"]//*[ancestor-or-self::div[position()=1][@id="maintables"]]//a/@href'
+    ## Database  --------------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['database'] =                               \
+        ENetXpath.create(first='h3',
+                     tag='li/a/@href',
+                     identifier='span[@id="Database"]',
+                     #identifier='span[@id="Database" and normalize-space(.)="Database"]',
+                     following_sibling=True,
+                     preceding_sibling='*[starts-with(name(),"h")][position()=1]',
+                     #preceding_sibling='h3[span[@id="Dedicated_section"]]'
+                     sep='//')
+    #   '//h3[span[@id="Database"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1][span[@id="Database"]]]//li/a/@href'
+    ARTICLE_PATHS[SX_VERSION_1]['database'] =                               \
+        ENetXpath.create(first='div[@class="dat-section"]',
+                     ancestor_self='div[position()=1]',
+                     identifier='@id="database"',
+                     tag='a/@href',
+                     sep='//')
+    #   '//div[@class="dat-section"][@id="database"]//*[ancestor-or-self::div[position()=1][@id="database"]]//a/@href'
+    ## Dedicated_section ------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['section'] =                                \
+        ENetXpath.create(first='h3',
+                     tag='li/a/@href',
+                     identifier='span[@id="Dedicated_section"]',
+                     following_sibling=True,
+                     preceding_sibling='*[starts-with(name(),"h")][position()=1]',
+                     #preceding_sibling='h2[span[@id="Methodology_.2F_Metadata"]]'
+                     sep='//')
+    #   '//h3[span[@id="Dedicated_section"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1][span[@id="Dedicated_section"]]]//li/a/@href'
+    # note that this will work as well:
+    #   '//h3[span[@id="Dedicated_section" and normalize-space(.)="Dedicated section"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1]/span[@id="Dedicated_section" and normalize-space(.)="Dedicated section"]]//li/a/@href'    
+    ARTICLE_PATHS[SX_VERSION_1]['section'] =                                \
+        ENetXpath.create(first='div[@class="dat-section"]',
+                     ancestor_self='div[position()=1]',
+                     identifier='@id="dedicatedsection"',
+                     tag='a/@href',
+                     sep='//')
+    # '//div[@class="dat-section"][@id="dedicatedsection"]//*[ancestor-or-self::div[position()=1][@id="dedicatedsection"]]//a/@href'
+    ## Metadata ---------------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['metadata'] =                               \
+        ENetXpath.create(first='h3',
+                     tag='li/a/@href',
+                     identifier='span[@id="Methodology_.2F_Metadata"]',
+                     # identifier='span[@id="Methodology_.2F_Metadata" and normalize-space(.)="Methodology / Metadata"]',    
+                     following_sibling=True,
+                     preceding_sibling='*[starts-with(name(),"h")][position()=1]',
+                     #preceding_sibling='h2[span[@id="Source_data_for_tables_and_figures_.28MS_Excel.29"]]'
+                     sep='//')
+    #   '//h3[span[@id="Methodology_.2F_Metadata"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1][span[@id="Methodology_.2F_Metadata"]]]//li/a/@href'
+    # note that this will work as well:
+    #   '//h3[span[@id="Methodology_.2F_Metadata"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1]/span[@id="Methodology_.2F_Metadata"]]//li/a/@href'
+    ARTICLE_PATHS[SX_VERSION_1]['metadata'] =                               \
+        ''
+    ## External_links ---------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['link_external'] =                          \
+        ENetXpath.create(first='h2',
+                     tag='li/a/@href',
+                     identifier='span[@id="External_links"]',
+                     #identifier='span[@id="External_links" and normalize-space(.)="External links"]',
+                     following_sibling=True,
+                     preceding_sibling='*[starts-with(name(),"h")][position()=1]',
+                     sep='//')
+    #   '//h2[span[@id="External_links"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1][span[@id="External_links"]]]//li/a/@href'
+    # note that this will work as well:
+    #   '//h2[span[@id="External_links" and normalize-space(.)="External links"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1]/span[@id="External_links" and normalize-space(.)="External links"]]//li/a/@href'
+    ARTICLE_PATHS[SX_VERSION_1]['link_external'] =                          \
+        ENetXpath.create(first='div[@class="dat-section"]',
+                     ancestor_self='div[position()=1]',
+                     identifier='@id="externallinks"',
+                     tag='a/@href',
+                     sep='//')
+    #   '//div[@class="dat-section"][@id="externallinks"]//*[ancestor-or-self::div[position()=1][@id="externallinks"]]//a/@href'
+    ## Other information ------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['information'] =                            \
+        ENetXpath.create(first='h3',
+                     tag='li/a/@href',
+                     identifier='span[@id="Other_information"]',
+                     # identifier='span[@id="Other_information" and normalize-space(.)="Other information"]',
+                     following_sibling=True,
+                     preceding_sibling='*[starts-with(name(),"h")][position()=1]',
+                     #preceding_sibling='h2[span[@id="External_links" and normalize-space(.)="External links"]]'
+                     sep='//')
+    #   '//h3[span[@id="Other_information"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1][span[@id="Other_information"]]]//li/a/@href'
+    # note that this will work as well:
+    #   '//h3[span[@id="Other_information"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1]/span[@id="Other_information]]//li/a/@href'
+    ARTICLE_PATHS[SX_VERSION_1]['information'] =                            \
+        ''
+    ## Legislation ------------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['legislation'] =                            \
+        ''
+    ARTICLE_PATHS[SX_VERSION_1]['legislation'] =                            \
+        ENetXpath.create(first='div[@class="dat-section"]',
+                     ancestor_self='div[position()=1]',
+                     identifier='@id="legal"',
+                     tag='a/@href',
+                     sep='//')
+    #   '//div[@class="dat-section"][@id="legal"]//*[ancestor-or-self::div[position()=1][@id="legal"]]//a/@href'
+    ## Methodology ------------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['methodology'] =                            \
+        ''
+    ARTICLE_PATHS[SX_VERSION_1]['methodology'] =                            \
+        ENetXpath.create(first='div[@class="dat-section"]',
+                     ancestor_self='div[position()=1]',
+                     identifier='@id="methodology"',
+                     tag='a/@href',
+                     sep='//')
+    #   '//div[@class="dat-section"][@id="methodology"]//*[ancestor-or-self::div[position()=1][@id="methodology"]]//a/@href'
+    ## Products ---------------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['product'] =                                \
+        ENetXpath.create(first='a',
+                     identifier='contains(@href,"%s")' % KEY_URL_PRODUCT,
+                     tag='@href',
+                     sep='/')
+    ARTICLE_PATHS[SX_VERSION_1]['product'] =  ARTICLE_PATHS[SX_VERSION_0]['product']
+    #   '//a[contains(@href,"product?code")]/@href'
+    ## Link -------------------------------------------------------------------
+    ARTICLE_PATHS[SX_VERSION_0]['link'] = ARTICLE_PATHS[SX_VERSION_0]['see_also']
+    ARTICLE_PATHS[SX_VERSION_1]['link'] = ARTICLE_PATHS[SX_VERSION_0]['link']
+#else:
+#    warn(ENetWarning("Global variable ARTICLE_PATHS already defined"))
+         
+#%%
+## definition of GLOSSARY paths
+
+try:
+    assert GLOSSARY_PATHS
+    assert not (GLOSSARY_PATHS in (None,{}) or all([v in ([],'',None) for v in GLOSSARY_PATHS.values()]))
+except (NameError,AssertionError):
+    GLOSSARY_PATHS      = {}
+    [GLOSSARY_PATHS.update({v: dict.fromkeys(GLOSSARY_FIELDS)})             \
+         for v in settings.SX_VERSIONS.values()] 
+    # GLOSSARY_PATHS      = dict.fromkeys(GLOSSARY_FIELDS)
+    ## Title
+    GLOSSARY_PATHS[SX_VERSION_0]['title'] =                                 \
+        ENetXpath.create(first='h1[@id="firstHeading"]', 
+                     tag='text()[normalize-space(.)]')
+    # that is:
+    #   '//h1[@id="firstHeading"]/text()[normalize-space(.)]'    
+    ## Language
+    GLOSSARY_PATHS[SX_VERSION_0]['language'] =                              \
+        ENetXpath.create(node='html',                            
+                     tag='@lang')
+    # nothing else than: '//html/@lang'
+    ## Last_modified
+    GLOSSARY_PATHS[SX_VERSION_0]['last_modified'] =                         \
+        ENetXpath.create(node='div[@id="footer"]',                            
+                     first='li[@id="lastmod"]',  
+                     tag='text()',
+                     sep='//')
+    # that is actually:    
+    #   '//div[@id="footer"]//li[@id="lastmod"]//text()'    
+    ## Categories
+    GLOSSARY_PATHS[SX_VERSION_0]['category'] =                              \
+        ENetXpath.create(first='div',                                    
+                     tag='a/@href',                                
+                     identifier='@id="mw-normal-catlinks"',  
+                     ancestor='*[starts-with(name(),"div")][1]',                           
+                     descendant=True,
+                     sep='//')
+    # that is actually:   
+    #   '//div[@id="mw-normal-catlinks"]//descendant::*[ancestor::*[starts-with(name(),"div")][1][@id="mw-normal-catlinks"]]//a/@href'        
+    ## Text:
+    GLOSSARY_PATHS[SX_VERSION_0]['text'] =                                  \
+        ENetXpath.create(node='div[@id="bodyContent"]',
+                     last='h2[span[@id="Related_concepts"]]',
+                     child='//div[@id="mw-content-text"]',
+                     preceding_sibling='/',
+                     sep='//')
+    # that is actually:    
+    #   '//div[@id="bodyContent"]//h2[span[@id="Related_concepts"]]/preceding-sibling::*[//div[@id="mw-content-text"]]'
+    # note that this will work as well:
+    #   '//div[@id="bodyContent"]//h2[span[@id="Related_concepts"]]/preceding-sibling::*[//div[@id="mw-content-text"]/descendant::*]'    
+    ## Further_information
+    GLOSSARY_PATHS[SX_VERSION_0]['information'] =                            \
+        ENetXpath.create(first='h2',
+                     tag='li/a/@href',
+                     identifier='span[@id="Further_information"]',
+                     # identifier='span[@id="Further_information" and normalize-space(.)="Further information"]',
+                     following_sibling=True,
+                     preceding_sibling='*[starts-with(name(),"h")][1]',
+                     #preceding_sibling='h2[span[@id="Related_concepts"]]'
+                     sep='//')
+    # that is actually:    
+    #   '//h2[span[@id="Further_information"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][1][span[@id="Further_information"]]]//li/a/@href'    
+    ## Related_concepts
+    GLOSSARY_PATHS[SX_VERSION_0]['concept'] =                               \
+        ENetXpath.create(node='div[@id="bodyContent"]',
+                     tag='ul[1]/li/a/@href',
+                     first='h2[span[@id="Related_concepts"]]',
+                     #first='span[@id="Related_concepts" and contains(text(),"Related concepts")]',
+                     last='h2[span[@id="Statistical_data"]]',
+                     following_sibling=True,
+                     sep='//')
+    # that is actually:    
+    #   '//div[@id="bodyContent"]//h2[span[@id="Statistical_data"]]//preceding::h2[span[@id="Related_concepts"]]//following-sibling::ul[1]/li/a/@href'
+    # note that this will work as well:
+    #   '//div[@id="bodyContent"]//h2[span[@id="Statistical_data"]]//preceding-sibling::*[//h2[span[@id="Related_concepts"]]//following-sibling::ul[1]]/li/a/@href'
+    # or:
+    #   '//div[@id="bodyContent"]//h2[span[@id="Related_concepts"]][following::h2[span[@id="Statistical_data"]]]//following-sibling::ul[1]/li/a/@href'
+    GLOSSARY_PATHS[SX_VERSION_0]['link'] = GLOSSARY_PATHS[SX_VERSION_0]['concept']
+    ## Statistical_data
+    GLOSSARY_PATHS[SX_VERSION_0]['data'] =                                  \
+        ENetXpath.create(tag='ul/li/a/@href',
+                     first='h2[span[@id="Statistical_data"]]',
+                     #first='span[@id="Statistical_data" and contains(text(),"Statistical data")]',
+                     following_sibling=True,
+                     sep='//')
+    # that is actually:    
+    #   '//h2[span[@id="Statistical_data"]]//following-sibling::ul/li/a/@href'
+    # note that this will work as well:
+    #   '//h2[span[@id="Statistical_data"]]//following-sibling::*[//ul/li/a]//@href'
+    GLOSSARY_PATHS[SX_VERSION_0]['article'] = GLOSSARY_PATHS[SX_VERSION_0]['data']
+    GLOSSARY_PATHS[SX_VERSION_1] = GLOSSARY_PATHS[SX_VERSION_0].copy()
+
+#%%
+## definition of CATEGORY paths
+ 
+try:
+    assert CATEGORY_PATHS
+    assert not (CATEGORY_PATHS in (None,{}) or all([v in ([],{},'',None) for v in CATEGORY_PATHS.values()]))
+except (NameError,AssertionError):
+    CATEGORY_PATHS      = {}
+    [CATEGORY_PATHS.update({v: {}}) for v in settings.SX_VERSIONS.values()] 
+    ## Title
+    #    <title>Category:Living conditions glossary - Statistics Explained</title>
+    #    <h1 id="firstHeading" class="firstHeading">Category:Living conditions glossary	</h1>
+    CATEGORY_PATHS[SX_VERSION_0]['title'] =                                 \
+        ENetXpath.create(first='h1[@id="firstHeading"]', 
+                     tag='text()[normalize-space(.)]')
+    # that is:
+    #   '//h1[@id="firstHeading"]/text()[normalize-space(.)]'    
+    ## Language
+    CATEGORY_PATHS[SX_VERSION_0]['language'] =                              \
+        ENetXpath.create(node='html',                            
+                     tag='@lang')
+    # nothing else than: '//html/@lang'
+    ## Last_modified
+    #    <div id="footer" role="contentinfo">
+    #	<ul id="f-list" class="list-inline">
+    #		<li id="lastmod"> This page was last modified on 12 November 2014, at 09:43.</li>
+    CATEGORY_PATHS[SX_VERSION_0]['last_modified'] =                         \
+        ENetXpath.create(node='div[@id="footer"]',                            
+                     first='li[@id="lastmod"]',  
+                     tag='text()',
+                     sep='//')
+    # that is actually:    
+    #   '//div[@id="footer"]//li[@id="lastmod"]//text()'   
+    ## Pages in (sub)category
+    CATEGORY_PATHS[SX_VERSION_0]['page'] =                                  \
+        ENetXpath.create(first='div',                                    
+                     tag='li/a/@href',                                
+                     identifier='@class="mw-content-ltr"',  
+                     ancestor='*[starts-with(name(),"div")][1]',                           
+                     descendant=True,
+                     sep='//')
+    # that is actually:    
+    #   '//div[@class="mw-content-ltr"]//descendant::*[ancestor::*[starts-with(name(),"div")][1][@class="mw-content-ltr"]]//li/a/@href'
+    CATEGORY_PATHS[SX_VERSION_0]['link'] = CATEGORY_PATHS[SX_VERSION_0]['page']
+    CATEGORY_PATHS[SX_VERSION_1] = CATEGORY_PATHS[SX_VERSION_0].copy()
+    
+#%%
+## definition of THEME paths
+
+try:
+    assert THEME_PATHS
+    assert not (THEME_PATHS in (None,{}) or all([v in ([],'',None) for v in THEME_PATHS.values()]))
+except (NameError,AssertionError):
+    THEME_PATHS      = {}
+    THEME_PATHS[SX_VERSION_0]      = {}
+    ## Title
+    #    <title>Living conditions - Statistics Explained</title>
+    #    <h1 id="firstHeading" class="firstHeading"> Living conditions		</h1>
+    THEME_PATHS[SX_VERSION_0]['title'] =                                    \
+        ENetXpath.create(first='h1[@id="firstHeading"]', 
+                     tag='text()[normalize-space(.)]')
+    # that is:
+    #   '//h1[@id="firstHeading"]/text()[normalize-space(.)]'    
+    ## Language
+    THEME_PATHS[SX_VERSION_0]['language'] =                                 \
+        ENetXpath.create(node='html',                            
+                     tag='@lang')
+    # nothing else than: '//html/@lang'
+    ## Last_modified
+    #THEME_PATHS['Last_modified'] =                             \
+    ## Statistical_articles
+    THEME_PATHS[SX_VERSION_0]['article_statistical'] =                      \
+        ENetXpath.create(first='h2',
+                     tag='a/@href',
+                     identifier='span[@id="Statistical_articles"]',
+                     following_sibling=True,
+                     preceding_sibling='*[starts-with(name(),"h")][1]',
+                     sep='//')
+    # that is:
+    #   '//h2[span[@id="Statistical_articles"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][1][span[@id="Statistical_articles"]]]//a/@href'
+    ## Topics (subset of Statistical_articles)
+    THEME_PATHS[SX_VERSION_0]['topic'] =                                    \
+        ENetXpath.create(first='h4',
+                     tag='a/@href',
+                     identifier='span[@id="Topics"]',
+                     following_sibling=True,
+                     preceding_sibling='*[starts-with(name(),"h")][1]',
+                     sep='//')
+    # that is:
+    #   '//h2[span[@id="Statistical_articles"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][1][span[@id="Statistical_articles"]]]//a/@href'
+    ## Online_publications
+    THEME_PATHS[SX_VERSION_0]['publication'] =                              \
+        ENetXpath.create(first='h2',
+                     tag='a/@href',
+                     identifier='span[@id="Online_publications"]',
+                     following_sibling=True,
+                     preceding_sibling='*[starts-with(name(),"h")][1]',
+                     sep='//')
+    # that is:
+    #   '//h2[span[@id="Online_publications"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][1][span[@id="Online_publications"]]]//a/@href'
+    ## Overview
+    THEME_PATHS[SX_VERSION_0]['overview'] =                                 \
+        ENetXpath.create(first='h4',
+                     tag='a/@href',
+                     identifier='span[@id="Overview"]',
+                     following_sibling=True,
+                     preceding_sibling='*[starts-with(name(),"h")][1]',
+                     sep='//')
+    # that is:
+    #   '//h4[span[@id="Overview"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][1][span[@id="Overview"]]]//a/@href'
+    ## Background_articles
+    THEME_PATHS[SX_VERSION_0]['article_background'] =                       \
+        ENetXpath.create(first='h4',
+                     tag='a/@href',
+                     identifier='span[@id="Background_articles"]',
+                     following_sibling=True,
+                     preceding_sibling='*[starts-with(name(),"h")][1]',
+                     sep='//')
+    # that is:
+    #   '//h4[span[@id="Background_articles"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][1][span[@id="Background_articles"]]]//a/@href'   
+    ## Glossary
+    THEME_PATHS[SX_VERSION_0]['glossary'] =                                 \
+        ENetXpath.create(first='h4',
+                     tag='a/@href',
+                     identifier='span[@id="Glossary"]',
+                     following_sibling=True,
+                     preceding_sibling='*[starts-with(name(),"h")][1]',
+                     sep='//')
+    # that is:
+    #   '//h4[span[@id="Glossary"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][1][span[@id="Glossary"]]]//a/@href'
+    THEME_PATHS[SX_VERSION_0]['link'] = THEME_PATHS[SX_VERSION_0]['article_statistical'] 
+    # + THEME_PATHS['article_background'] + THEME_PATHS['glossary']
+    THEME_PATHS[SX_VERSION_1] = THEME_PATHS[SX_VERSION_0].copy()
+    
+#%%
+## definition of CONCEPT paths
+
+try:
+    assert CONCEPT_PATHS
+    assert not (CONCEPT_PATHS in (None,{}) or all([v in ([],'',None) for v in CONCEPT_PATHS.values()]))
+except (NameError,AssertionError):
+    CONCEPT_PATHS = GLOSSARY_PATHS
+
+#%%
+SX_PAGES_PATHS      = {settings.GLOSSARY_KEY:   GLOSSARY_PATHS,
+                       settings.CATEGORY_KEY:   CATEGORY_PATHS,
+                       settings.ARTICLE_KEY:    ARTICLE_PATHS,
+                       settings.THEME_KEY:      THEME_PATHS,
+                       settings.CONCEPT_KEY:    CONCEPT_PATHS}
+
+#%%
+#==============================================================================
+# START PAGES
+#==============================================================================
+
+## definition of specific pages paths
+
+try:
+    assert WHATLINKS_PATHS
+    assert not (WHATLINKS_PATHS in (None,{}) or all([v in ([],'',None) for v in WHATLINKS_PATHS.values()]))
+except (NameError,AssertionError):
+    WHATLINKS_PATHS = {}
+    ## Links
+    WHATLINKS_PATHS['link'] =                                   \
+        ENetXpath.create(first='ul[@id="mw-whatlinkshere-list"]',
+                     tag='li/a[1]/@href',
+                     # tag='li/a[not(@title="Special:WhatLinksHere")]/@href',
+                     child=True,
+                     sep='//')
+        # '//ul[@id="mw-whatlinkshere-list"]//li/a[1]/@href'
+    ## Language
+    WHATLINKS_PATHS['language'] =                               \
+        ENetXpath.create(node='html',                            
+                     tag='@lang')
+    # nothing else than: '//html/@lang'
+    
+    
+# CATEGORIES_PAGE: xpaths for specific scraping of the "Statistical themes" webpage, e.g. 
+# http://ec.europa.eu/eurostat/statistics-explained/index.php?title=Special:Categories&offset=&limit=1000
+try:
+    assert CATEGORIES_PAGE_PATHS
+    assert not (CATEGORIES_PAGE_PATHS in (None,{}) or all([v in ([],'',None) for v in CATEGORIES_PAGE_PATHS.values()]))
+except (NameError,AssertionError):
+    CATEGORIES_PAGE_PATHS = {}
+    CATEGORIES_PAGE_PATHS['link'] =                                         \
+        ENetXpath.create(last='div[@class="printfooter"]',
+                     tag='ul[1]/li/a/@href',
+                     preceding=True)
+    # that is:
+    #   '//div[@class="printfooter"]/preceding::ul[1]/li/a/@href'
+
+
+# THEMES_PAGE: xpaths for specific scraping of the "Statistical themes" webpage, e.g. 
+# http://ec.europa.eu/eurostat/statistics-explained/index.php/Statistical_themes
+try:
+    assert THEMES_PAGE_PATHS
+    assert not (THEMES_PAGE_PATHS in (None,{}) or all([v in ([],'',None) for v in THEMES_PAGE_PATHS.values()]))
+except (NameError,AssertionError):
+    THEMES_PAGE_PATHS = {}
+    THEMES_PAGE_PATHS['theme'] =                                            \
+        ENetXpath.create(first='h3[@class="panel-title"]',
+                     tag='a/@href',
+                     descendant=True)
+    # that is:
+    #   '//h3[@class="panel-title"]//descendant::a/@href'
+    THEMES_PAGE_PATHS['link'] =                                             \
+        ENetXpath.create(node='h1[@id="firstHeading"]', # h1[normalize-space(text())="Statistical themes"]
+                     tag='a/@href',
+                     following='div[@class="panel-body"]',
+                     sep='//')
+    # that is:
+    #   '//h1[@id="firstHeading"]//following::div[@class="panel-body"]//a/@href'
+
+# ARTICLES_PAGE: xpaths for specific scraping of the "All articles" webpage, e.g. 
+# http://ec.europa.eu/eurostat/statistics-explained/index.php/All_articles
+try:
+    assert ARTICLES_PAGE_PATHS
+    assert not (ARTICLES_PAGE_PATHS in (None,{}) or all([v in ([],'',None) for v in ARTICLES_PAGE_PATHS.values()]))
+except (NameError,AssertionError):
+    ARTICLES_PAGE_PATHS = {}
+    # check: the paths are exactly as those used for STATISTICAL_THEMES_PATHS
+    ARTICLES_PAGE_PATHS['theme'] =                                          \
+        ENetXpath.create(first='h3[@class="panel-title"]',
+                     tag='a/@href',
+                     descendant=True)
+    # that is:
+    #   '//h3[@class="panel-title"]//descendant::a/@href'
+    ARTICLES_PAGE_PATHS['link'] =                                           \
+        ENetXpath.create(node='h1[@id="firstHeading"]', # h1[normalize-space(text())="Statistical themes and subthemes"]
+                     tag='a/@href',
+                     following='div[@class="panel-body"]',
+                     sep='//')
+    # that is:
+    #   '//h1[@id="firstHeading"]//following::div[@class="panel-body"]//a/@href'
+
+# GLOSSARIES_PAGE: xpaths for specific scraping of the "Thematic glossaries" webpage, 
+# e.g. http://ec.europa.eu/eurostat/statistics-explained/index.php/Thematic_glossaries
+try:
+    assert GLOSSARIES_PAGE_PATHS
+    assert not (GLOSSARIES_PAGE_PATHS in (None,{}) or all([v in ([],'',None) for v in GLOSSARIES_PAGE_PATHS.values()]))
+except (NameError,AssertionError):
+    GLOSSARIES_PAGE_PATHS = {}
+    GLOSSARIES_PAGE_PATHS['theme'] =                           \
+        ENetXpath.create(first='h3[@class="panel-title"]',
+                     tag='a/@href',
+                     descendant=True)
+    # that is:
+    #   '//h3[@class="panel-title"]//descendant::a/@href'
+    GLOSSARIES_PAGE_PATHS['link'] =                                          \
+        ENetXpath.create(node='h1[@id="firstHeading"]', # h1[normalize-space(text())="Statistical themes and subthemes"]
+                     tag='a/@href',
+                     following='div[@class="panel-body"]',
+                     sep='//')
+    # that is:
+    #   '//h1[@id="firstHeading"]//following::div[@class="panel-body"]//a/@href'
+    GLOSSARIES_PAGE_PATHS['topic'] =                                   \
+        ENetXpath.create(node='h2[span[@id="Special-topic_glossaries"]]',
+                     tag='a/@href',
+                     following='table/tr/td',
+                     sep='//')
+    # that is:
+    #   '//h2[span[@id="Special-topic_glossaries"]]//following::table/tr/td//a/@href'
+
+# CONCEPTS_PAGE: xpaths for specific scraping of the "Statistical concept" webpage, 
+# e.g. http://ec.europa.eu/eurostat/statistics-explained/index.php/Category:Statistical_concept
+try:
+    assert CONCEPTS_PAGE_PATHS
+    assert not (CONCEPTS_PAGE_PATHS in (None,{}) or all([v in ([],'',None) for v in CONCEPTS_PAGE_PATHS.values()]))
+except (NameError,AssertionError):
+    CONCEPTS_PAGE_PATHS = {}
+    CONCEPTS_PAGE_PATHS['link'] =                                            \
+        ENetXpath.create(node='h2[contains(normalize-space(text()),"Statistical concept")]',
+                     tag='a/@href',
+                     following='table/tr/td',
+                     sep='//')
+    # that is:
+    #   '//h2[contains(normalize-space(text()),"Statistical concept")]//following::table/tr/td//a/@href'
+
+SX_START_PAGES_PATHS = {settings.GLOSSARY_KEY:  GLOSSARIES_PAGE_PATHS,
+                       settings.CATEGORY_KEY:   CATEGORIES_PAGE_PATHS,
+                       settings.ARTICLE_KEY:    ARTICLES_PAGE_PATHS,
+                       settings.THEME_KEY:      THEMES_PAGE_PATHS,
+                       settings.CONCEPT_KEY:    CONCEPTS_PAGE_PATHS}
@@ -5,11 +5,129 @@
 # Don't forget to add your pipeline to the ITEM_PIPELINES setting
 # See: http://doc.scrapy.org/en/latest/topics/item-pipeline.html
 
-try:
-    import
-except:
-    import networkx as nx
+from scrapy import signals
+
 
 class Pipeline(object):
     def process_item(self, item, spider):
         return item
+
+
+class ENetTitlePipeline(object):
+    # Item pipeline setting the identifiers of the titles of the pages in the
+    # items (see estatnet.titles): node_id for the page of the item, link_ids
+    # for the pages it links to (by field), enabled by the settings:
+    #   ESTATNET_TITLES_FILE = 'estatnet.titles'
+    #   ITEM_PIPELINES = {'estatnet.pipelines.ENetTitlePipeline': 700}
+    # The table of titles is shared by all the spiders of a process (and the
+    # graph of the pages), and kept across crawls.
+
+    def __init__(self, table, stats=None):
+        self.table, self.stats = table, stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        from scrapy.exceptions import NotConfigured
+        from .titles import TITLES_SETTING, ENetTitleTable
+        filename = crawler.settings.get(TITLES_SETTING)
+        if not filename:
+            raise NotConfigured
+        p = cls(ENetTitleTable.open(filename), crawler.stats)
+        crawler.signals.connect(p.spider_closed, signal=signals.spider_closed)
+        return p
+
+    def process_item(self, item, spider):
+        from .graph import EDGE_TYPES
+        from .pages import canonical_title
+        source = item.get('page_id') or canonical_title(item.get('title'))
+        if source not in (None,''):
+            item['node_id'] = self.table.id(source)
+        ids = {}
+        for field in EDGE_TYPES:
+            links = item.get(field)
+            if isinstance(links, (list, tuple)):
+                ids[field] = self.table.ids(links)
+        item['link_ids'] = {field: val for (field, val) in ids.items() if val}
+        return item
+
+    def spider_closed(self, spider):
+        self.table.close()
+        if self.stats is not None:
+            self.stats.set_value('estatnet/titles/titles', len(self.table))
+
+
+class ENetGraphPipeline(object):
+    # Item pipeline streaming the items of the spiders into the graph of the
+    # pages (see estatnet.graph), enabled by the settings:
+    #   ESTATNET_GRAPH_FILE = 'estatnet.graph'
+    #   ITEM_PIPELINES = {'estatnet.pipelines.ENetGraphPipeline': 800}
+    # All the spiders of a process writing to the same file share the graph:
+    # it is finalized and saved when the last of them closes. With the setting
+    # ESTATNET_TITLES_FILE, the nodes are the identifiers of the shared table
+    # of titles (see ENetTitlePipeline).
+
+    def __init__(self, graph, stats=None):
+        self.graph, self.stats = graph, stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        from scrapy.exceptions import NotConfigured
+        from .graph import GRAPH_SETTING, ENetGraph
+        from .titles import TITLES_SETTING, ENetTitleTable
+        filename = crawler.settings.get(GRAPH_SETTING)
+        if not filename:
+            raise NotConfigured
+        titles = crawler.settings.get(TITLES_SETTING)
+        table = ENetTitleTable.open(titles) if titles else None
+        p = cls(ENetGraph.open(filename, table=table), crawler.stats)
+        crawler.signals.connect(p.spider_closed, signal=signals.spider_closed)
+        return p
+
+    def process_item(self, item, spider):
+        if not self.graph.add_item(item) and self.stats is not None:
+            self.stats.inc_value('estatnet/graph/untitled')
+        return item
+
+    def spider_closed(self, spider):
+        self.graph.close()
+        if self.graph.table.filename:
+            self.graph.table.close()
+        if self.stats is not None:
+            self.stats.set_value('estatnet/graph/nodes', self.graph.nnodes)
+            self.stats.set_value('estatnet/graph/edges', self.graph.nedges)
+            self.stats.set_value('estatnet/graph/bytes', self.graph.nbytes)
+
+
+class ENetNeo4jPipeline(object):
+    # Item pipeline exporting the items of the spiders into the CSV files of
+    # the neo4j bulk import (see estatnet.export), enabled by the settings:
+    #   ESTATNET_NEO4J_DIR = 'neo4j-import'
+    #   ITEM_PIPELINES = {'estatnet.pipelines.ENetNeo4jPipeline': 810}
+    # All the spiders of a process exporting to the same directory share the
+    # files; the import command is logged when the last of them closes.
+
+    def __init__(self, exporter, stats=None):
+        self.exporter, self.stats = exporter, stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        from scrapy.exceptions import NotConfigured
+        from .export import NEO4J_SETTING, CHUNK_SIZE, ENetNeo4jExporter
+        directory = crawler.settings.get(NEO4J_SETTING)
+        if not directory:
+            raise NotConfigured
+        p = cls(ENetNeo4jExporter.open(directory, crawler.settings.getint('ESTATNET_NEO4J_CHUNK_SIZE', CHUNK_SIZE)),
+                crawler.stats)
+        crawler.signals.connect(p.spider_closed, signal=signals.spider_closed)
+        return p
+
+    def process_item(self, item, spider):
+        self.exporter.add_item(item)
+        return item
+
+    def spider_closed(self, spider):
+        self.exporter.close()
+        if self.stats is not None:
+            self.stats.set_value('estatnet/neo4j/nodes', sum(self.exporter.nnodes.values()))
+            self.stats.set_value('estatnet/neo4j/relationships', self.exporter.nrelationships)
+        spider.logger.info('Import files written, load them with: %s', ' '.join(self.exporter.command()))
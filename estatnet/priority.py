@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__priority
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+.. _Scrapy: https://scrapy.org
+.. |Scrapy| replace:: `Scrapy <Scrapy_>`_
+
+Priorities of the requests of the |StatX| crawls.
+
+**Description**
+
+The class :class:`ENetPriority` ranks the requests of a crawl so that, with a
+limited budget, the link graph is covered as early as possible:
+
+* by type of page (see :data:`settings.SX_KEYDOMAINS`): the categories and the
+  themes, which fan out, are fetched first, then the glossary pages and the
+  articles,
+* by estimated staleness: pages never crawled, or likely to have changed since
+  their last crawl (according to the :literal:`last_modified` value stored in
+  :mod:`estatnet.state`), come before pages likely unchanged,
+* by degree: pages with many links (in their last crawl) come first.
+
+The priorities are set by the spider middleware
+:class:`estatnet.middlewares.ENetPriorityMiddleware`, and honoured by the
+|Scrapy| scheduler:
+
+    SPIDER_MIDDLEWARES = {'estatnet.middlewares.ENetPriorityMiddleware': 980}
+
+**Dependencies**
+
+*require*:      :mod:`re`, :mod:`math`, :mod:`time`, :mod:`calendar`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Sun Jan 14 17:31:51 2018
+
+#%%
+import re
+import math
+import time
+import calendar
+
+from . import settings#analysis:ignore
+from .pages import ENetPrefixTrie, page_title
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+PRIORITY_TYPES      = {settings.CATEGORY_KEY:   300,
+                       settings.THEME_KEY:      300,
+                       settings.GLOSSARY_KEY:   200,
+                       settings.CONCEPT_KEY:    200,
+                       settings.ARTICLE_KEY:    100}
+"""Priorities of the pages by type (setting :literal:`ESTATNET_PRIORITY_TYPES`);
+pages of unknown type (_e.g._ special pages) have priority 0.
+"""
+
+STALENESS_WEIGHT    = 50
+"""Priority added to the pages certainly stale (never crawled); pages likely
+unchanged since their last crawl get close to 0.
+"""
+
+DEGREE_WEIGHT       = 5
+"""Priority added per doubling of the number of links of a page.
+"""
+
+DEGREE_MAX          = 40
+"""Maximum priority added for the number of links of a page.
+"""
+
+CHANGE_INTERVAL     = 30 * 86400.
+"""Default interval (in seconds) between changes of a page, when the date of its
+last modification is unknown.
+"""
+
+CHANGE_MIN_INTERVAL = 86400.
+"""Minimum interval (in seconds) between changes of a page.
+"""
+
+TYPE_META           = 'estatnet_type'
+"""Key of the meta of a request giving the type of the page requested, when
+known by the spider (_e.g._, for the links of the start pages).
+"""
+
+MONTHS              = dict([(m, i+1) for (i, m) in enumerate(
+                        ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+                         'august', 'september', 'october', 'november', 'december'])])
+
+_MODIFIED_REGEX     = re.compile(r'(\d{1,2})\s+([A-Za-z]+)\s+(\d{4})(?:\D+(\d{1,2}):(\d{2}))?')
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+def modified_time(value):
+    """Parse the :literal:`last_modified` value of a page.
+
+        >>> seconds = modified_time(value)
+
+    Arguments
+    ---------
+    value : str
+        value as extracted from the page, _e.g._ :literal:`'This page was last
+        modified on 3 March 2018, at 10:20.'`.
+
+    Returns
+    -------
+    seconds : float
+        time (in seconds since the epoch, UTC), or `None` when no date is found.
+    """
+    match = _MODIFIED_REGEX.search(value or '')
+    if match is None or match.group(2).lower() not in MONTHS:
+        return None
+    day, month, year, hour, minute = match.groups()
+    try:
+        return float(calendar.timegm((int(year), MONTHS[month.lower()], int(day),
+                                      int(hour or 0), int(minute or 0), 0)))
+    except ValueError:
+        return None
+
+
+class ENetPriority(object):
+    """Class providing with the priorities of the requests of a crawl.
+
+        >>> scorer = ENetPriority(store=None, types=PRIORITY_TYPES)
+        >>> priority = scorer.score(request, spider)
+
+    Arguments
+    ---------
+    store : :class:`estatnet.state.ENetPageStore`
+        store of the pages crawled before; default: `None`, all pages are
+        considered new.
+    types : dict
+        priorities by type of page; default: :data:`PRIORITY_TYPES`.
+    """
+
+    def __init__(self, store=None, types=None):
+        self.store = store
+        self.types = dict(PRIORITY_TYPES, **(types or {}))
+        self.trie = ENetPrefixTrie()
+        [self.trie.insert(d, k) for (k, d) in settings.SX_KEYDOMAINS.items() if d != ''] # first type kept
+        self.start = dict([(url, key) for (key, url) in settings.SX_START_URLS.items()])
+
+    def page_type(self, request, spider=None):
+        """Type of the page requested.
+
+            >>> key = scorer.page_type(request, spider=None)
+
+        The type is given by the meta :data:`TYPE_META`, the prefix of the title,
+        or the callback of the rule of a :class:`scrapy.spiders.CrawlSpider`
+        (:literal:`_parse_<type>`); titles with no prefix are articles.
+        """
+        key = request.meta.get(TYPE_META)
+        if key is not None:
+            return key
+        elif request.url in self.start:
+            return self.start[request.url]
+        title = page_title(request.url)
+        if title is None:
+            return None
+        key = self.trie.match(title)
+        if key is not None:
+            return key
+        elif ':' in title:
+            return None # other namespace: special pages, ...
+        rules = getattr(spider, '_rules', None)
+        if rules is not None and request.meta.get('rule') is not None:
+            callback = rules[request.meta['rule']].callback
+            name = getattr(callback, '__name__', callback) or ''
+            if name.startswith('_parse_') and name[len('_parse_'):] in self.types:
+                return name[len('_parse_'):]
+        return settings.ARTICLE_KEY
+
+    @staticmethod
+    def staleness(record, now=None):
+        """Estimate the probability that a page changed since its last crawl.
+
+            >>> p = ENetPriority.staleness(record, now=None)
+
+        Changes are assumed to follow a Poisson process, whose mean interval is
+        estimated by the age of the page when last crawled (time between its
+        last modification and the crawl): :math:`p = 1 - e^{-(now - crawled) / interval}`.
+
+        Arguments
+        ---------
+        record : dict
+            record of the page in the store (see :meth:`estatnet.state.ENetPageStore.get`),
+            or `None` for a page never crawled (:math:`p = 1`).
+        now : float
+            current time; default: :meth:`time.time`.
+        """
+        if record is None or not record.get('crawled'):
+            return 1.
+        now = time.time() if now is None else now
+        crawled, modified = record['crawled'], modified_time(record.get('page_modified'))
+        interval = CHANGE_INTERVAL if modified is None else max(crawled - modified, CHANGE_MIN_INTERVAL)
+        return 1. - math.exp(-max(now - crawled, 0.) / interval)
+
+    @staticmethod
+    def degree(record):
+        """Number of links of a page in its last crawl (0 when never crawled).
+        """
+        if record is None:
+            return 0
+        elif 'nlinks' in record:
+            return record['nlinks']
+        return len(record.get('links') or [])
+
+    def score(self, request, spider=None, now=None):
+        """Priority of a request.
+
+            >>> priority = scorer.score(request, spider=None, now=None)
+
+        Returns
+        -------
+        priority : int
+            sum of the priority of the type of the page, of the staleness (up to
+            :data:`STALENESS_WEIGHT`) and of the degree (up to :data:`DEGREE_MAX`).
+        """
+        record = None
+        if self.store is not None:
+            # the links are counted, not decoded: only their number is used
+            record = self.store.get(request.meta.get(settings.STANDIN_META_KEY, request.url), links=False)
+        priority = self.types.get(self.page_type(request, spider), 0)
+        priority += int(round(STALENESS_WEIGHT * self.staleness(record, now)))
+        priority += min(int(DEGREE_WEIGHT * math.log2(1 + self.degree(record))), DEGREE_MAX)
+        return priority
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__sections
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+
+Single-pass extraction of the section-based fields of |StatX| pages.
+
+**Description**
+
+Most link fields of the articles (and themes) are defined as the content of a
+section of the page, _i.e._:
+
+* for layout version 0, the siblings following a :literal:`h2`/:literal:`h3`/...
+  heading identified by a :literal:`span[@id=...]`, up to the next heading:
+  :literal:`//h3[span[@id="X"]]//following-sibling::*[preceding-sibling::*[starts-with(name(),"h")][position()=1][span[@id="X"]]]//li/a/@href`,
+* for layout version 1, the content of a :literal:`div.dat-section` block:
+  :literal:`//div[@class="dat-section"][@id="X"]//*[ancestor-or-self::div[position()=1][@id="X"]]//a/@href`.
+
+Evaluated one by one, the expressions of the first kind are quadratic in the
+size of the page (every candidate sibling rescans its preceding siblings) and
+each field scans the whole document again. The class :class:`ENetSections`
+recognises these expressions in a table of paths and extracts all of them in a
+single traversal of the document tree, with the exact same output as the xpath
+expressions; the remaining paths are left to the xpath evaluation.
+
+Since the layout version of a page is not known in advance, the function
+:meth:`detect_version` tells both layouts apart (once per response), so that
+only the paths of the detected version are evaluated.
+
+**Dependencies**
+
+*require*:      :mod:`re`, :mod:`collections`, :mod:`lxml`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Mon Dec 18 17:28:29 2017
+
+#%%
+import re
+from collections import namedtuple
+
+from . import settings#analysis:ignore
+from .xpaths import XPATHS
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+HEADING_SECTION     = 'heading'
+DAT_SECTION         = 'dat-section'
+
+SECTION_TAGS        = ('a/@href', 'li/a/@href')
+"""Ending tags supported by the single-pass extraction.
+"""
+
+SECTION_PATTERNS    = {
+    HEADING_SECTION: (
+        re.compile(
+        r'^//(?P<first>[a-z][a-z0-9]*)\[span\[@id="(?P<id>[^"]+)"\]\]'
+        r'//following-sibling::\*\[preceding-sibling::\*\[starts-with\(name\(\),"h"\)\]'
+        r'\[(?:position\(\)=)?1\]\[span\[@id="(?P=id)"\]\]\]'
+        r'//(?P<tag>(?:li/)?a/@href)$'),
+        # same, once rewritten by ENetXpath.optimize
+        re.compile(
+        r'^\(set:leading\(//(?P<first>[a-z][a-z0-9]*)\[span\[@id="(?P<id>[^"]+)"\]\]'
+        r'/following-sibling::\*, (?P<next>//(?P=first)\[span\[@id="(?P=id)"\]\]'
+        r'/following-sibling::\*\[starts-with\(name\(\),"h"\)\]\[1\])\) \| (?P=next)\)'
+        r'//(?P<tag>(?:li/)?a/@href)$')
+        ),
+    DAT_SECTION: (
+        re.compile(
+        r'^//div\[@class="dat-section"\]\[@id="(?P<id>[^"]+)"\]'
+        r'//\*\[ancestor-or-self::div\[position\(\)=1\]\[@id="(?P=id)"\]\]'
+        r'//(?P<tag>a/@href)$'),
+        )
+    }
+"""Regular expressions of the section-based paths built with :meth:`ENetXpath.create`,
+with or without optimization (see the definitions of :data:`estatnet.items.ARTICLE_PATHS`).
+"""
+
+VERSION_CHECK       = [(settings.SX_VERSIONS[1], 'boolean(//div[@class="%s"])' % DAT_SECTION),
+                       (settings.SX_VERSIONS[0], 'boolean(//*[self::h2 or self::h3][span[@id]])')]
+"""Ordered tests run for detecting the layout version of a page: the first
+test that holds gives the version.
+"""
+
+ENetSection         = namedtuple('ENetSection', ['kind', 'first', 'id', 'tag'])
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+def parse_section(path):
+    """Recognise a section-based xpath expression.
+
+        >>> section = parse_section(path)
+
+    Arguments
+    ---------
+    path : str
+        `xpath` formatted path.
+
+    Returns
+    -------
+    section : ENetSection
+        description :literal:`(kind, first, id, tag)` of the section, or `None`
+        when :data:`path` is not a section-based expression.
+    """
+    if path in (None,'') or not isinstance(path, str):
+        return None
+    for (kind, patterns) in SECTION_PATTERNS.items():
+        for pattern in patterns:
+            match = pattern.match(path)
+            if match is not None:
+                return ENetSection(kind, match.groupdict().get('first'),
+                                   match.group('id'), match.group('tag'))
+    return None
+
+
+def detect_version(selector):
+    """Detect the layout version of a page, _i.e._ tell a page with
+    :literal:`div.dat-section` blocks (version 1) apart from a legacy MediaWiki
+    page with :literal:`h2`/:literal:`h3` headings (version 0).
+
+        >>> version = detect_version(selector)
+
+    Arguments
+    ---------
+    selector : scrapy.Selector
+        selector of the page (or :class:`lxml.etree._Element` root of the
+        document tree).
+
+    Returns
+    -------
+    version : int
+        layout version (see :data:`settings.SX_VERSIONS`), or `None` when none
+        of the tests of :data:`VERSION_CHECK` holds.
+    """
+    root = getattr(selector, 'root', selector)
+    if root is None or not isinstance(getattr(root, 'tag', None), str):
+        return None
+    for (version, path) in VERSION_CHECK:
+        if XPATHS[path](root) is True:
+            return version
+    return None
+
+
+class ENetSections(object):
+    """Class providing with the single-pass extraction of the section-based
+    fields of a table of paths.
+
+        >>> sections = ENetSections(paths)
+        >>> values = sections.extract(selector)
+
+    Arguments
+    ---------
+    paths : dict
+        table of paths (for one layout version), _e.g._ :literal:`ARTICLE_PATHS[0]`.
+
+    Attributes
+    ----------
+    fields : dict
+        sections of the fields extracted in a single traversal.
+    paths : dict
+        remaining (non-empty) paths, to be evaluated through xpath.
+    """
+
+    def __init__(self, paths):
+        self.fields, self.paths = {}, {}
+        for (key, path) in paths.items():
+            section = parse_section(path)
+            if section is not None:
+                self.fields[key] = section
+            elif path not in (None,''):
+                self.paths[key] = path
+        # index the (unique) sections as bits of an integer mask: fields sharing
+        # the same section (e.g. 'link' and 'see_also') are extracted once
+        self.__sections = sorted(set(self.fields.values()))
+        bits = {section: 1 << i for (i, section) in enumerate(self.__sections)}
+        self.__bits = bits
+        self.__heading_ids, self.__heading_firsts = {}, {}
+        self.__firsts = set([section.first for section in self.__sections
+                             if section.kind == HEADING_SECTION])
+        self.__dat_ids = {}
+        self.__anchor, self.__anchor_li, self.__anchor_dat = 0, 0, 0
+        for (section, bit) in bits.items():
+            if section.kind == HEADING_SECTION:
+                self.__heading_ids[section.id] = self.__heading_ids.get(section.id, 0) | bit
+                self.__heading_firsts[(section.first, section.id)] =            \
+                    self.__heading_firsts.get((section.first, section.id), 0) | bit
+                if section.tag == 'li/a/@href':     self.__anchor_li |= bit
+                else:                               self.__anchor |= bit
+            else:
+                self.__dat_ids[section.id] = self.__dat_ids.get(section.id, 0) | bit
+                self.__anchor_dat |= bit
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __walk(self, node, own, under, inside, li_inside, dats, div_id, scoped, values):
+        # node:      current element
+        # own:       heading sections the node is a candidate sibling of
+        # under:     heading sections whose first heading is an ancestor-or-self
+        #            of the node (their siblings are following siblings as well)
+        # inside:    heading sections of the (proper) ancestors of the node
+        # li_inside: heading sections of the (proper) ancestors of the parent,
+        #            when the parent is a 'li' element
+        # dats:      dat-sections the node is strictly contained in
+        # div_id:    identifier of the closest 'div' ancestor of the node
+        # scoped:    dat-sections with a marked (proper) ancestor of the node
+        tag = node.tag
+        if tag == 'a':
+            bits = (inside & self.__anchor) | (li_inside & self.__anchor_li)   \
+                | (scoped & self.__anchor_dat)
+            if bits:
+                href = node.get('href')
+                if href is not None:
+                    for (i, section) in enumerate(self.__sections):
+                        if bits & (1 << i):
+                            values[section].append(href)
+        if tag == 'div':
+            div_id = node.get('id')
+        marked = dats & self.__dat_ids.get(div_id, 0) if dats else 0
+        if tag == 'div' and node.get('class') == DAT_SECTION:
+            dats |= self.__dat_ids.get(div_id, 0)
+        li_inside = inside if tag == 'li' else 0
+        inside, scoped = inside | own, scoped | marked
+        seen, current = under, 0
+        for child in node:
+            ctag = child.tag
+            if not isinstance(ctag, str): # comments, processing instructions
+                continue
+            first, heading = 0, ctag.startswith('h')
+            if heading or ctag in self.__firsts:
+                ids = [span.get('id') for span in child if span.tag == 'span']
+                for sid in ids:
+                    first |= self.__heading_firsts.get((ctag, sid), 0)
+            self.__walk(child, current & seen, under | first, inside, li_inside,
+                        dats, div_id, scoped, values)
+            seen |= first
+            if heading:
+                current = 0
+                for sid in ids:
+                    current |= self.__heading_ids.get(sid, 0)
+
+    def extract(self, selector):
+        """Extract all section-based fields in a single traversal.
+
+            >>> values = sections.extract(selector)
+
+        Arguments
+        ---------
+        selector : scrapy.Selector
+            selector of the page (or :class:`lxml.etree._Element` root of the
+            document tree).
+
+        Returns
+        -------
+        values : dict
+            lists of extracted values indexed by field; they are identical to
+            the outputs of :literal:`selector.xpath(path).extract()` run over
+            the original paths.
+        """
+        root = getattr(selector, 'root', selector)
+        values = {section: [] for section in self.__sections}
+        if self.__sections and root is not None and isinstance(getattr(root, 'tag', None), str):
+            self.__walk(root, 0, 0, 0, 0, 0, None, 0, values)
+        return {key: list(values[section]) for (key, section) in self.fields.items()}
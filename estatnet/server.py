@@ -0,0 +1,637 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__server
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+.. _Scrapy: https://scrapy.org
+.. |Scrapy| replace:: `Scrapy <Scrapy_>`_
+
+Local stand-in of the |StatX| website, for offline load testing.
+
+**Description**
+
+The class :class:`ENetStandinServer` serves |StatX| pages over HTTP under the
+same URL scheme as the website:
+
+* :literal:`/eurostat/statistics-explained/index.php/Title` and
+  :literal:`index.php?title=Title` for the pages,
+* :literal:`index.php/Title/de` (any language of :data:`settings.LANGS`) for
+  the translations of the pages, with the same links as the original pages,
+* :literal:`index.php?title=Special:WhatLinksHere/Title&limit=` for the "What
+  links here" lists,
+* :literal:`index.php?title=Special:Categories&offset=&limit=` and the other
+  start pages of :data:`settings.SX_START_PAGES`,
+* :literal:`api.php?action=query&prop=linkshere&titles=...` (and :literal:`list=backlinks`)
+  for the backlinks of the pages through the MediaWiki API.
+
+Pages are read from an archived corpus (see :meth:`estatnet.benchmark.load_corpus`)
+when available, and generated otherwise (see :mod:`estatnet.generator`), the
+same title always giving the same page, until it is modified (see
+:meth:`ENetStandinServer.modify`). Pages are served with :literal:`ETag` and
+:literal:`Last-Modified` validators and conditional requests are answered with
+304 when the page did not change. The latency, error rate, bandwidth and capacity
+(number of requests served at once, beyond which requests are answered with 429)
+of the server are configurable.
+
+The spiders target the server through the setting :literal:`ESTATNET_STANDIN_URL`
+of :class:`estatnet.middlewares.ENetStandinMiddleware`, which rewrites the
+requests to the website into requests to the server (see :meth:`ENetStandinServer.settings`):
+
+    python -m estatnet.server --port 8000 --latency 0.05 --error-rate 0.01
+    scrapy crawl WhatLinksHere -a page=Main_Page                                \\
+        -s ESTATNET_STANDIN_URL=http://127.0.0.1:8000                           \\
+        -s DOWNLOADER_MIDDLEWARES='{"estatnet.middlewares.ENetStandinMiddleware": 60}'
+
+The crawl throughput can be measured against :literal:`CONCURRENT_REQUESTS`
+end to end with :meth:`throughput`:
+
+    python -m estatnet.server --crawl whatlinks --concurrency 4 8 16 32 --pagecount 200
+
+**Dependencies**
+
+*require*:      :mod:`os`, :mod:`http.server`, :mod:`threading`, :mod:`random`, :mod:`zlib`, :mod:`scrapy`
+
+*optional*:     :mod:`twisted` (through :mod:`scrapy`, for :meth:`throughput`)
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Sun Jan 14 17:31:51 2018
+
+#%%
+import os, sys
+import time
+import json
+import random
+import zlib
+import hashlib
+import argparse
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from . import ENetError#analysis:ignore
+from . import settings#analysis:ignore
+from .pages import ENetPrefixTrie, page_title, split_lang
+from .generator import ENetPageGenerator
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+STANDIN_SIZES       = {settings.ARTICLE_KEY:    {'nsections': 5, 'nlinks': 3, 'ncategories': 2},
+                       settings.GLOSSARY_KEY:   {'nlinks': 3, 'ncategories': 2},
+                       settings.CATEGORY_KEY:   {'npages': 50},
+                       settings.THEME_KEY:      {'nlinks': 3},
+                       settings.WHATLINKS_KEY:  {'nlinks': 20},
+                       'start':                 {'nlinks': 50}}
+"""Default sizes of the generated pages, as keyword arguments of the methods of
+:class:`estatnet.generator.ENetPageGenerator`, by page type.
+"""
+
+STANDIN_PATH        = '/%s' % settings.SX_RELURL
+"""Path of the pages on the server, as on the website.
+"""
+
+STANDIN_APIPATH     = urlsplit(settings.SX_APIURL).path
+"""Path of the MediaWiki API on the server, as on the website.
+"""
+
+API_MAXLIMIT        = 500
+"""Maximum number of results returned by a single query to the API.
+"""
+
+STANDIN_SETTING     = 'ESTATNET_STANDIN_URL'
+"""Name of the |Scrapy| setting giving the URL of the stand-in server.
+"""
+
+CHUNK_SIZE          = 16384
+"""Size of the chunks written when the bandwidth is limited.
+"""
+
+STANDIN_EPOCH       = 1514764800 # 2018-01-01
+"""Date of the first revision of the pages (see :literal:`Last-Modified`
+headers).
+"""
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+class ENetStandinHandler(BaseHTTPRequestHandler):
+    """Class providing with the handling of the requests sent to the stand-in
+    server.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True # headers and body are written apart
+
+    def log_message(self, format, *args):
+        pass # the server may be hit by thousands of requests
+
+    def do_GET(self):
+        server = self.server
+        if not server._enter():
+            # over capacity: see ENetThrottleMiddleware
+            body = b'Too Many Requests'
+            self.send_response(429)
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Retry-After', str(server.retry_after))
+            self.end_headers()
+            self.wfile.write(body)
+            server._count(429, len(body))
+            return
+        try:
+            self._get(server)
+        finally:
+            server._leave()
+
+    def _get(self, server):
+        server._sleep()
+        if server._fail():
+            status, body = 503, b'Service Unavailable'
+        else:
+            try:
+                body = server.page(self.path)
+                status = 200 if body is not None else 404
+            except ENetError:
+                status, body = 404, None
+            if body is None:
+                body = b'Not Found'
+        headers = {}
+        if status == 200:
+            # conditional requests: see ENetConditionalMiddleware
+            etag, modified = server.validators(self.path, body)
+            headers = {'ETag': etag, 'Last-Modified': formatdate(modified, usegmt=True)}
+            if server._not_modified(self.headers, etag, modified):
+                status, body = 304, b''
+        self.send_response(status)
+        if status not in (200,304):
+            self.send_header('Content-Type', 'text/plain')
+        elif urlsplit(self.path).path == STANDIN_APIPATH:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        else:
+            self.send_header('Content-Type', 'text/html; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        [self.send_header(k, v) for (k, v) in headers.items()]
+        self.end_headers()
+        server._write(self.wfile, body)
+        server._count(status, len(body))
+
+
+class ENetStandinServer(ThreadingHTTPServer):
+    """Class providing with a local stand-in of the |StatX| website.
+
+        >>> server = ENetStandinServer(address=('127.0.0.1', 0), corpus=None, seed=None,
+                                       sizes=None, latency=0., error_rate=0., bandwidth=None,
+                                       capacity=None)
+        >>> with server:
+        ...     server.url
+
+    Arguments
+    ---------
+    address : tuple
+        address :literal:`(host, port)` of the server; the port 0 picks a free
+        port; default: :literal:`('127.0.0.1', 0)`.
+    corpus : str
+        directory of an archived corpus of pages, with one subdirectory per page
+        type (see :meth:`estatnet.benchmark.load_corpus`); default: `None`, all
+        pages are generated.
+    seed : int
+        seed of the generated pages; default: `None` (_i.e._ 0).
+    sizes : dict
+        sizes of the generated pages, by page type, updating :data:`STANDIN_SIZES`.
+    latency : float,tuple
+        delay (in seconds) before answering a request, or range :literal:`(min, max)`
+        of uniformly drawn delays; default: 0.
+    error_rate : float
+        probability for a request to be answered with an error 503; default: 0.
+    bandwidth : float
+        maximum number of bytes per second sent over every connection; default:
+        `None`, not limited.
+    capacity : int
+        maximum number of requests served at once, the requests beyond being
+        answered with an error 429 (with a :literal:`Retry-After` header); the
+        latency grows with the load up to the capacity; default: `None`, not
+        limited.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 0), corpus=None, seed=None, sizes=None,
+                 latency=0., error_rate=0., bandwidth=None, capacity=None):
+        if not 0 <= error_rate <= 1:
+            raise ENetError("Wrong error rate: %s" % error_rate)
+        elif bandwidth is not None and bandwidth <= 0:
+            raise ENetError("Wrong bandwidth: %s" % bandwidth)
+        elif capacity is not None and capacity < 1:
+            raise ENetError("Wrong capacity: %s" % capacity)
+        self.seed = seed or 0
+        self.sizes = {key: dict(size) for (key, size) in STANDIN_SIZES.items()}
+        [self.sizes.setdefault(key, {}).update(size) for (key, size) in (sizes or {}).items()]
+        self.latency, self.error_rate, self.bandwidth = latency, error_rate, bandwidth
+        self.capacity, self.retry_after, self.nactive = capacity, 1, 0
+        self.trie = ENetPrefixTrie()
+        [self.trie.insert(domain, page) for (page, domain) in settings.SX_KEYDOMAINS.items()
+            if domain not in (None,'',[])]
+        self.starts = {page.split('&', 1)[0]: key for (key, page) in settings.SX_START_PAGES.items()}
+        self.archive = self._index(corpus) if corpus is not None else {}
+        self.__random, self.__lock = random.Random(self.seed), threading.Lock()
+        self.nrequests, self.nerrors, self.nbytes, self.nnotmodified = 0, 0, 0, 0
+        self.nrejected, self.maxactive = 0, 0
+        self.revisions = {}
+        self.__thread = None
+        super(ENetStandinServer, self).__init__(address, ENetStandinHandler)
+
+    @staticmethod
+    def _index(directory):
+        # titles of the archived pages (see estatnet.benchmark.load_corpus)
+        if not os.path.isdir(directory):
+            raise ENetError("Corpus directory %s not found" % directory)
+        archive = {}
+        for (key, domain) in settings.SX_KEYDOMAINS.items():
+            subdir = os.path.join(directory, key)
+            if not os.path.isdir(subdir):
+                continue
+            for name in os.listdir(subdir):
+                if name.endswith('.html'):
+                    archive.setdefault('%s%s' % (domain, name[:-len('.html')]), os.path.join(subdir, name))
+        return archive
+
+    #/************************************************************************/
+    @property
+    def url(self):
+        """URL of the server, _e.g._ :literal:`http://127.0.0.1:8000`.
+        """
+        host, port = self.server_address[:2]
+        return 'http://%s:%s' % (host, port)
+
+    def settings(self, **kwargs):
+        """Settings overriding the |Scrapy| settings so that the spiders target
+        the server.
+
+            >>> crawler_settings = server.settings(**kwargs)
+
+        Arguments
+        ---------
+        kwargs :
+            further settings, _e.g._ :literal:`CONCURRENT_REQUESTS`.
+        """
+        middlewares = dict(kwargs.pop('DOWNLOADER_MIDDLEWARES', {}))
+        middlewares.setdefault('estatnet.middlewares.ENetStandinMiddleware', 60)
+        kwargs.update({STANDIN_SETTING: self.url, 'DOWNLOADER_MIDDLEWARES': middlewares})
+        return kwargs
+
+    def start(self):
+        """Start serving in a background thread.
+
+            >>> server.start()
+        """
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.serve_forever, daemon=True)
+            self.__thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the server.
+
+            >>> server.stop()
+        """
+        if self.__thread is not None:
+            self.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    #/************************************************************************/
+    def _enter(self):
+        with self.__lock:
+            if self.capacity is not None and self.nactive >= self.capacity:
+                self.nrejected += 1
+                return False
+            self.nactive += 1
+            self.maxactive = max(self.maxactive, self.nactive)
+            return True
+
+    def _leave(self):
+        with self.__lock:
+            self.nactive -= 1
+
+    def _sleep(self):
+        latency = self.latency
+        if isinstance(latency, (tuple, list)):
+            with self.__lock:
+                latency = self.__random.uniform(*latency)
+        if self.capacity is not None:
+            latency *= 1. + self.nactive / self.capacity # loaded server: slower
+        if latency > 0:
+            time.sleep(latency)
+
+    def _fail(self):
+        if self.error_rate <= 0:
+            return False
+        with self.__lock:
+            return self.__random.random() < self.error_rate
+
+    def _write(self, wfile, body):
+        if self.bandwidth is None:
+            wfile.write(body)
+            return
+        for start in range(0, len(body), CHUNK_SIZE):
+            chunk = body[start:start+CHUNK_SIZE]
+            wfile.write(chunk)
+            time.sleep(len(chunk) / self.bandwidth)
+
+    def _count(self, status, size):
+        with self.__lock:
+            self.nrequests += 1
+            self.nerrors += status not in (200,304)
+            self.nnotmodified += status == 304
+            self.nbytes += size
+
+    def _not_modified(self, headers, etag, modified):
+        if headers.get('If-None-Match') is not None:
+            return etag in [e.strip() for e in headers['If-None-Match'].split(',')]
+        elif headers.get('If-Modified-Since') is not None:
+            try:
+                return modified <= parsedate_to_datetime(headers['If-Modified-Since']).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _generator(self, title, lang=None):
+        # the same title (and revision) always gives the same page
+        seed = zlib.crc32(title.encode('utf-8')) ^ self.seed ^ (self.revisions.get(title, 0) << 16)
+        return ENetPageGenerator(seed=seed, lang=lang or settings.DEF_LANG)
+
+    def modify(self, *titles):
+        """Modify pages: a new revision of the pages is served.
+
+            >>> server.modify(*titles)
+        """
+        with self.__lock:
+            for title in titles:
+                self.revisions[title] = self.revisions.get(title, 0) + 1
+
+    def validators(self, path, body):
+        """Validators of a page for conditional requests.
+
+            >>> etag, modified = server.validators(path, body)
+
+        Returns
+        -------
+        etag, modified : str, int
+            :literal:`ETag` of the page (built upon its content) and timestamp of
+            its last revision.
+        """
+        title = page_title(path) or settings.MAIN_PAGE
+        return ('"%s"' % hashlib.sha1(body).hexdigest()[:16],
+                STANDIN_EPOCH + 86400 * self.revisions.get(title, 0))
+
+    #/************************************************************************/
+    def page(self, path):
+        """Retrieve the page served at a given path.
+
+            >>> body = server.page(path)
+
+        Arguments
+        ---------
+        path : str
+            path (and query) of the request, _e.g._ :literal:`/eurostat/statistics-explained/index.php/Title`.
+
+        Returns
+        -------
+        body : bytes
+            HTML of the page, or `None` when the path is not a page of the website.
+        """
+        parts = urlsplit(path)
+        if parts.path == STANDIN_APIPATH:
+            return json.dumps(self.api(parse_qs(parts.query))).encode('utf-8')
+        elif not parts.path.startswith(STANDIN_PATH):
+            return None
+        title = page_title(path)
+        if title is None:
+            title = settings.MAIN_PAGE
+        query = parse_qs(parts.query)
+        limit = query.get('limit', [None])[0]
+        limit = int(limit) if limit not in (None,'') and limit.isdigit() else None
+        generator = self._generator(title)
+        if title.startswith('%s/' % settings.WHATLINKSHERE_PAGE):
+            page = title[len(settings.WHATLINKSHERE_PAGE)+1:]
+            size = dict(self.sizes[settings.WHATLINKS_KEY])
+            if limit is not None:
+                size['nlinks'] = min(size.get('nlinks', limit), limit)
+            html = generator.whatlinks(title=page, **size)
+        elif title in self.starts:
+            size = dict(self.sizes['start'])
+            if limit is not None:
+                size['nlinks'] = min(size.get('nlinks', limit), limit)
+            html = generator.start(self.starts[title], title=title, **size)
+        elif title in self.archive:
+            with open(self.archive[title], 'rb') as f:
+                return f.read()
+        else:
+            # the translations (Title/de, ...) share the structure of the
+            # original page: links, categories, datasets
+            base, lang = split_lang(title)
+            generator = self._generator(base, lang)
+            key = self.trie.match(base) or settings.ARTICLE_KEY
+            size = dict(self.sizes.get(key, {}))
+            if key == settings.ARTICLE_KEY:
+                size.setdefault('version', settings.SX_VERSIONS[zlib.crc32(base.encode('utf-8')) % 2])
+            html = getattr(generator, key)(title=title, **size)
+        return html.encode('utf-8')
+
+    def api(self, query):
+        """Answer a query to the MediaWiki API: only the backlinks queries are
+        supported, either :literal:`prop=linkshere` (batched titles) or
+        :literal:`list=backlinks`, with continuation.
+
+            >>> result = server.api(query)
+
+        Arguments
+        ---------
+        query : dict
+            parameters of the query, as returned by :meth:`urllib.parse.parse_qs`.
+
+        Returns
+        -------
+        result : dict
+            JSON result of the query (format version 2); the backlinks of a page are
+            those listed by its "What links here" page.
+        """
+        params = {key: values[0] for (key, values) in query.items()}
+        if params.get('action') != 'query':
+            return {'error': {'code': 'badvalue', 'info': 'Unsupported action'}}
+        elif params.get('prop') == 'linkshere' and params.get('titles'):
+            prefix, titles = 'lh', params['titles'].split('|')
+        elif params.get('list') == 'backlinks' and params.get('bltitle'):
+            prefix, titles = 'bl', [params['bltitle']]
+        else:
+            return {'error': {'code': 'badvalue', 'info': 'Unsupported query'}}
+        limit = params.get('%slimit' % prefix, '10')
+        limit = API_MAXLIMIT if limit == 'max' else min(int(limit), API_MAXLIMIT) if limit.isdigit() else 10
+        # continuation token: index of the title and offset in its backlinks
+        token = params.get('%scontinue' % prefix, '0|0').split('|')
+        try:
+            index, offset = int(token[0]), int(token[1])
+        except (IndexError, ValueError):
+            return {'error': {'code': 'badcontinue', 'info': 'Invalid continue param'}}
+        nlinks = self.sizes[settings.WHATLINKS_KEY].get('nlinks', 0)
+        pages, remaining, token = [], limit, None
+        for (i, title) in enumerate(titles):
+            title = title.replace(' ', '_')
+            page = {'ns': 0, 'title': title.replace('_', ' ')}
+            if i >= index and remaining > 0 and token is None:
+                start = offset if i == index else 0
+                links = self._generator('%s/%s' % (settings.WHATLINKSHERE_PAGE, title)).backlinks(nlinks)
+                chunk = links[start:start+remaining]
+                remaining -= len(chunk)
+                if chunk:
+                    page['linkshere'] = [{'ns': 0, 'title': link.replace('_', ' ')} for link in chunk]
+                if start + len(chunk) < len(links):
+                    token = '%d|%d' % (i, start + len(chunk))
+                elif remaining == 0 and i + 1 < len(titles):
+                    token = '%d|0' % (i + 1)
+            pages.append(page)
+        if prefix == 'bl':
+            result = {'query': {'backlinks': pages[0].get('linkshere', [])}}
+        else:
+            result = {'query': {'pages': pages}}
+        if token is None:
+            result['batchcomplete'] = True
+        else:
+            result['continue'] = {'%scontinue' % prefix: token, 'continue': '||' if prefix == 'lh' else '-||'}
+        return result
+
+
+def throughput(spidercls, concurrency=(16,), pagecount=100, server=None, overrides=None, **kwargs):
+    """Measure the throughput of a crawl against the stand-in server.
+
+        >>> results = throughput(spidercls, concurrency=(16,), pagecount=100, server=None,
+                                 overrides=None, **kwargs)
+
+    Arguments
+    ---------
+    spidercls : type
+        class of the spider crawled.
+    concurrency : list
+        values of :literal:`CONCURRENT_REQUESTS` used for successive crawls.
+    pagecount : int
+        number of responses after which every crawl stops (see
+        :literal:`CLOSESPIDER_PAGECOUNT`); default: 100.
+    server : ENetStandinServer
+        running stand-in server; default: `None`, a server with default parameters
+        is started for the time of the crawls.
+    overrides : dict
+        further |Scrapy| settings.
+    kwargs :
+        keyword arguments passed to the spider.
+
+    Returns
+    -------
+    results : list
+        dictionaries with the keys :literal:`'concurrency'`, :literal:`'responses'`,
+        :literal:`'items'`, :literal:`'time'` and :literal:`'pages_per_second'`,
+        one per crawl.
+
+    Note
+    ----
+    The crawls run the |Scrapy| (twisted) reactor, which cannot be restarted:
+    this can be called only once per process.
+    """
+    from scrapy.crawler import Crawler, CrawlerRunner
+    from scrapy.utils.log import configure_logging
+    from twisted.internet import reactor, defer
+    own = server is None
+    if own:
+        server = ENetStandinServer().start()
+    configure_logging(install_root_handler=False)
+    results = []
+    @defer.inlineCallbacks
+    def crawl():
+        try:
+            for n in concurrency:
+                crawler_settings = server.settings(**dict(overrides or {}))
+                crawler_settings.update({'CONCURRENT_REQUESTS': n, 'CONCURRENT_REQUESTS_PER_DOMAIN': n,
+                                         'CLOSESPIDER_PAGECOUNT': pagecount, 'LOG_LEVEL': 'ERROR'})
+                crawler = Crawler(spidercls, crawler_settings)
+                yield CrawlerRunner().crawl(crawler, **kwargs)
+                stats = crawler.stats.get_stats()
+                elapsed = (stats['finish_time'] - stats['start_time']).total_seconds()
+                responses = stats.get('response_received_count', 0)
+                results.append({'concurrency': n, 'responses': responses,
+                                'items': stats.get('item_scraped_count', 0), 'time': elapsed,
+                                'pages_per_second': responses / elapsed if elapsed > 0 else None})
+        finally:
+            reactor.stop()
+    reactor.callWhenRunning(crawl)
+    try:
+        reactor.run()
+    finally:
+        if own:
+            server.stop()
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m estatnet.server',
+                                     description='Serve a local stand-in of the Statistics Explained website.')
+    parser.add_argument('--host', default='127.0.0.1', help='host of the server')
+    parser.add_argument('--port', type=int, default=8000, help='port of the server (0: any free port)')
+    parser.add_argument('--corpus', help='directory of a corpus of archived pages')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the generated pages')
+    parser.add_argument('--latency', type=float, nargs='+', default=[0.],
+                        help='delay (in seconds) before answering, or range MIN MAX of delays')
+    parser.add_argument('--error-rate', type=float, default=0., help='probability of errors 503')
+    parser.add_argument('--bandwidth', type=float, default=None, help='bytes per second per connection')
+    parser.add_argument('--capacity', type=int, default=None,
+                        help='number of requests served at once (beyond: errors 429)')
+    parser.add_argument('--crawl', choices=['whatlinks', 'pages'],
+                        help='measure the throughput of a spider instead of serving')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[16],
+                        help='values of CONCURRENT_REQUESTS of the crawls')
+    parser.add_argument('--pagecount', type=int, default=100, help='number of responses per crawl')
+    args = parser.parse_args(argv)
+    latency = args.latency[0] if len(args.latency) == 1 else tuple(args.latency[:2])
+    server = ENetStandinServer((args.host, args.port), corpus=args.corpus, seed=args.seed,
+                               latency=latency, error_rate=args.error_rate, bandwidth=args.bandwidth,
+                               capacity=args.capacity)
+    if args.crawl is None:
+        print('Serving Statistics Explained at %s%s' % (server.url, STANDIN_PATH))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+    from .spiders.sxnet import WhatLinksSpider, PageCrawler
+    if args.crawl == 'whatlinks':
+        spidercls, kwargs = WhatLinksSpider, {'page': settings.MAIN_PAGE}
+    else:
+        spidercls, kwargs = PageCrawler, {'pages': settings.CATEGORY_KEY}
+    with server:
+        results = throughput(spidercls, args.concurrency, args.pagecount, server=server, **kwargs)
+    for result in results:
+        print('CONCURRENT_REQUESTS=%-4d %6d responses in %7.3fs: %8.1f pages/s'
+              % (result['concurrency'], result['responses'], result['time'], result['pages_per_second'] or 0.))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
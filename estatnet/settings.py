@@ -168,13 +168,25 @@ WHATLINKSHERE_LIMIT = 1000
 """Upper limit of what can be displayed on a single "What link's here" page: we 
 need to ensure that all links are available on a single page.
 """
-WHATLINKSHERE_URL   = __build_sx_url('title=%s' % WHATLINKSHERE_PAGE)
+WHATLINKSHERE_URL   = __build_sx_url(WHATLINKSHERE_PAGE)
 """Partial (initial) URL of the "What link's here" pages.
 """
 # what links to the page MYPAGE will be retrieved by the following URL:
-# page = __build_sx_url('title=%s/%s&limit=%s' % (WHATLINKSHERE_PAGE, MYPAGE, WHATLINKSHERE_LIMIT))
+# page = __build_sx_url('%s/%s&limit=%s' % (WHATLINKSHERE_PAGE, MYPAGE, WHATLINKSHERE_LIMIT))
 #      = '%s/%s&limit=%s' % (WHATLINKSHERE_URL, MYPAGE, WHATLINKSHERE_LIMIT)
 
+SX_APIURL           = '%s://%s/%s/%s' % (PROTOCOL, EC_URL, ESTAT_DOMAIN, 'statistics-explained/api.php')
+"""URL of the MediaWiki API of Statistics Explained.
+"""
+API_BATCH_SIZE      = 50
+"""Maximum number of titles batched in a single query to the MediaWiki API (the
+limit for anonymous clients).
+"""
+API_LIMIT           = 'max'
+"""Number of results returned by a single query to the MediaWiki API, before
+continuation ('max': 500 for anonymous clients).
+"""
+
 GLOSSARY_DOMAIN     = 'Glossary:'
 """String used for naming the URL subdomains of glossary pages, _i.e._ those pages 
 that are referenced into the "Glossary" page.
@@ -211,7 +223,9 @@ API_DOMAIN          = 'ec.europa.eu/eurostat/wdds/rest/data'
 """
 
 LANGS               = ('en','de','fr')
-"""Languages supported by this package.
+"""Languages supported by this package: the translations of the pages (_e.g._
+:literal:`Title/de`) are crawled along with the pages in the default language
+with :literal:`scrapy crawl PageExplained -a langs=de,fr` (or :literal:`langs=all`).
 """
 DEF_LANG            = 'en'
 """Default language used when launching Eurostat API.
@@ -232,8 +246,8 @@ KEY_URL_PRODUCT     = 'product?code'
 
 BOT_NAME            = 'statxrap'
 
-SPIDER_MODULES      = ['statxrap.spiders']
-NEWSPIDER_MODULE    = 'statxrap.spiders'
+SPIDER_MODULES      = ['estatnet.spiders']
+NEWSPIDER_MODULE    = 'estatnet.spiders'
 
 
 # Crawl responsibly by identifying yourself (and your website) on the user-agent
@@ -277,6 +291,109 @@ ROBOTSTXT_OBEY      = True
 #    'esscrape.middlewares.MyCustomDownloaderMiddleware': 543,
 #}
 
+# Target a local stand-in of Statistics Explained (see estatnet.server) instead
+# of the website, e.g. for load testing
+#ESTATNET_STANDIN_URL = 'http://127.0.0.1:8000'
+#DOWNLOADER_MIDDLEWARES = {
+#    'estatnet.middlewares.ENetStandinMiddleware': 60,
+#}
+STANDIN_META_KEY    = 'estatnet_standin_url'
+"""Meta key of the requests redirected to the stand-in, holding their URL on the
+website.
+"""
+
+# Recrawl incrementally: conditional requests, and no extraction for unchanged
+# pages, using the state of the pages crawled before (see estatnet.state)
+#ESTATNET_STATE_FILE = 'estatnet.state'
+#DOWNLOADER_MIDDLEWARES = {
+#    'estatnet.middlewares.ENetConditionalMiddleware': 580,
+#}
+#SPIDER_MIDDLEWARES = {
+#    'estatnet.middlewares.ENetIncrementalMiddleware': 990,
+#}
+
+# Filter the duplicate requests across runs with a persistent, memory-bounded
+# store of the requests seen (see estatnet.dupefilter)
+#DUPEFILTER_CLASS = 'estatnet.dupefilter.ENetDupeFilter'
+#ESTATNET_DUPEFILTER_FILE = 'estatnet.seen'
+#ESTATNET_DUPEFILTER_CAPACITY = 5000000
+#ESTATNET_DUPEFILTER_ERROR_RATE = 0.001
+
+# Fetch first the pages that fan out (categories, themes), likely changed, or
+# with many links (see estatnet.priority)
+#SPIDER_MIDDLEWARES = {
+#    'estatnet.middlewares.ENetPriorityMiddleware': 980,
+#}
+#ESTATNET_PRIORITY_TYPES = {'category': 300, 'theme': 300, 'glossary': 200, 'article': 100}
+
+# Adapt the concurrency and the delay to the latencies and the errors 429/503
+# of the website (see estatnet.throttle), instead of AutoThrottle
+#ESTATNET_THROTTLE_ENABLED = True
+#ESTATNET_THROTTLE_TARGET_LATENCY = 1.0
+#ESTATNET_THROTTLE_START_CONCURRENCY = 4
+#ESTATNET_THROTTLE_MAX_DELAY = 60.0
+#CONCURRENT_REQUESTS = 16
+#CONCURRENT_REQUESTS_PER_DOMAIN = 16
+#DOWNLOADER_MIDDLEWARES = {
+#    'estatnet.middlewares.ENetThrottleMiddleware': 600,
+#}
+
+# Share the crawl between several processes through a shared frontier (see
+# estatnet.shard); the settings are set by: python -m estatnet.shard -n 4
+#ESTATNET_SHARD = '0/4'
+#ESTATNET_SHARD_FRONTIER = 'items.jl.frontier'
+#SPIDER_MIDDLEWARES = {
+#    'estatnet.middlewares.ENetShardMiddleware': 50,
+#}
+
+# Checkpoint the crawl (requests pending and done, journal of the items) in a
+# job directory, and resume it from there (see estatnet.checkpoint); not to be
+# used together with JOBDIR
+#ESTATNET_CHECKPOINT_DIR = 'crawls/pages-1'
+#ESTATNET_CHECKPOINT_INTERVAL = 60
+#SPIDER_MIDDLEWARES = {
+#    'estatnet.middlewares.ENetCheckpointMiddleware': 40,
+#}
+#DOWNLOADER_MIDDLEWARES = {
+#    'estatnet.middlewares.ENetCheckpointFailureMiddleware': 40,
+#}
+
+# Extract the items in worker processes, not to stall the downloads while
+# parsing large pages (see estatnet.extract)
+#ESTATNET_EXTRACT_WORKERS = 4
+#ESTATNET_EXTRACT_MAX_INFLIGHT = 8
+
+# Intern the titles of the pages linked to in the items to stable identifiers
+# (see estatnet.titles), shared by the graph of the pages
+#ESTATNET_TITLES_FILE = 'estatnet.titles'
+#ITEM_PIPELINES = {
+#    'estatnet.pipelines.ENetTitlePipeline': 700,
+#}
+
+# Build the graph of the pages (titles interned, typed edges in compact
+# arrays) from the items of all spiders (see estatnet.graph)
+#ESTATNET_GRAPH_FILE = 'estatnet.graph'
+#ITEM_PIPELINES = {
+#    'estatnet.pipelines.ENetGraphPipeline': 800,
+#}
+
+# Export the items into the CSV files of the bulk import of neo4j (see
+# estatnet.export), instead of creating the nodes one at a time
+#ESTATNET_NEO4J_DIR = 'neo4j-import'
+#ESTATNET_NEO4J_CHUNK_SIZE = 10000
+#ITEM_PIPELINES = {
+#    'estatnet.pipelines.ENetNeo4jPipeline': 810,
+#}
+
+# Export the items in columnar form, one dataset per item type (see
+# estatnet.export): parquet requires pyarrow, columnar only standard modules
+#FEED_EXPORTERS = {
+#    'parquet': 'estatnet.export.ENetParquetItemExporter',
+#    'columnar': 'estatnet.export.ENetColumnarItemExporter',
+#}
+#from estatnet.export import feeds
+#FEEDS = feeds('crawls/items', format='parquet')
+
 # Enable or disable extensions
 # See http://scrapy.readthedocs.org/en/latest/topics/extensions.html
 #EXTENSIONS = {
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__shard
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+.. _Scrapy: https://scrapy.org
+.. |Scrapy| replace:: `Scrapy <Scrapy_>`_
+.. _WAL: https://www.sqlite.org/wal.html
+.. |WAL| replace:: `WAL <WAL_>`_
+
+Crawls of the |StatX| pages sharded over several processes.
+
+**Description**
+
+A single |Scrapy| process is bound to a single core, while the extraction of the
+items is CPU heavy: :meth:`launch` runs instead :literal:`N` crawler processes
+(shards), each one crawling the pages whose canonical title hashes to it (see
+:meth:`shard_of`).
+
+The processes coordinate through a shared frontier (:class:`ENetSharedFrontier`),
+a SQLite database in |WAL| mode that is also the set of the requests seen by all
+the shards: every request is recorded once, and fetched once, by its shard. The
+spider middleware :class:`estatnet.middlewares.ENetShardMiddleware`:
+
+* keeps the requests of its own shard that were not seen yet,
+* queues the requests of the other shards in the frontier,
+* claims the requests queued for its shard by the other ones,
+* closes the crawl when all the shards are idle and nothing is queued.
+
+Every shard writes its items in its own output (JSON lines), merged when all the
+shards are done:
+
+    python -m estatnet.shard -n 4 -o items.jl --pages category glossary
+
+**Dependencies**
+
+*require*:      :mod:`os`, :mod:`sys`, :mod:`json`, :mod:`pickle`, :mod:`sqlite3`, :mod:`subprocess`, :mod:`scrapy`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Sun Jan 14 17:31:51 2018
+
+#%%
+import os, sys
+import json
+import time
+import pickle
+import sqlite3
+import argparse
+import subprocess
+
+from . import ENetError#analysis:ignore
+from .dupefilter import request_key
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+SHARD_SETTING       = 'ESTATNET_SHARD'
+"""Name of the |Scrapy| setting giving the shard of a process, as :literal:`'i/N'`.
+"""
+
+FRONTIER_SETTING    = 'ESTATNET_SHARD_FRONTIER'
+"""Name of the |Scrapy| setting giving the file of the shared frontier.
+"""
+
+QUEUED, CLAIMED     = 0, 1
+
+CLAIM_SIZE          = 100
+"""Maximum number of requests claimed at once by a shard.
+"""
+
+POLL_INTERVAL       = 0.5
+"""Interval (in seconds) between two claims of the requests queued for a shard.
+"""
+
+TIMEOUT             = 60.
+"""Time (in seconds) a process waits for the lock of the shared frontier.
+"""
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+def shard_of(request, nshards):
+    """Shard of a request.
+
+        >>> shard = shard_of(request, nshards)
+
+    Returns
+    -------
+    shard : int
+        hash of the canonical title of the page requested (see
+        :meth:`estatnet.dupefilter.request_key`) modulo :literal:`nshards`.
+    """
+    return int.from_bytes(request_key(request)[:8], 'big') % nshards
+
+
+def parse_shard(value):
+    """Parse a shard given as :literal:`'i/N'`.
+
+        >>> shard, nshards = parse_shard(value)
+    """
+    try:
+        shard, nshards = [int(v) for v in str(value).split('/')]
+        assert 0 <= shard < nshards
+    except (ValueError, AssertionError):
+        raise ENetError("Wrong shard: %s (expected: 'i/N' with 0 <= i < N)" % value)
+    return shard, nshards
+
+
+class ENetSharedFrontier(object):
+    """Class providing with a frontier (and set of requests seen) shared by the
+    processes of a sharded crawl.
+
+        >>> frontier = ENetSharedFrontier(filename, shard, nshards)
+        >>> new = frontier.route(requests, spider)
+        >>> requests = frontier.claim(spider)
+
+    Arguments
+    ---------
+    filename : str
+        file of the (SQLite) frontier.
+    shard, nshards : int
+        shard of the process, and number of shards.
+    """
+
+    def __init__(self, filename, shard, nshards):
+        if filename in (None,''):
+            raise ENetError("File of the shared frontier is missing")
+        self.filename, self.shard, self.nshards = filename, shard, nshards
+        # autocommit: the transactions are explicit (see _transaction)
+        self.__db = sqlite3.connect(filename, timeout=TIMEOUT, isolation_level=None)
+        self.__db.execute('PRAGMA journal_mode=WAL')
+        self.__db.execute('PRAGMA synchronous=NORMAL')
+        self.__db.execute('CREATE TABLE IF NOT EXISTS requests (key BLOB PRIMARY KEY, shard INTEGER, '
+                          'state INTEGER, priority INTEGER, request BLOB)')
+        self.__db.execute('CREATE INDEX IF NOT EXISTS queued ON requests (shard, state, priority)')
+        self.__db.execute('CREATE TABLE IF NOT EXISTS shards (shard INTEGER PRIMARY KEY, idle INTEGER)')
+        self.__db.execute('INSERT OR IGNORE INTO shards (shard, idle) VALUES (?, 0)', (shard,))
+
+    @classmethod
+    def create(cls, filename, nshards):
+        """Create an empty frontier for :literal:`nshards` shards: the crawl is
+        not over until all of them went idle.
+
+            >>> ENetSharedFrontier.create(filename, nshards)
+        """
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(filename + suffix):
+                os.remove(filename + suffix)
+        frontier = cls(filename, 0, nshards)
+        frontier.__db.executemany('INSERT OR IGNORE INTO shards (shard, idle) VALUES (?, 0)',
+                                  [(i,) for i in range(nshards)])
+        frontier.close()
+
+    def _transaction(self, sql, *args):
+        # run a callable in a transaction taking the write lock at once
+        self.__db.execute('BEGIN IMMEDIATE')
+        try:
+            result = sql(self.__db, *args)
+        except BaseException:
+            self.__db.execute('ROLLBACK')
+            raise
+        self.__db.execute('COMMIT')
+        return result
+
+    def route(self, requests, spider, claim=True):
+        """Record requests: the requests of the other shards are queued for
+        them.
+
+            >>> new = frontier.route(requests, spider, claim=True)
+
+        Arguments
+        ---------
+        requests : list
+            :class:`scrapy.Request` to record.
+        claim : bool
+            whether the new requests of the shard are claimed (_i.e._, crawled
+            by the caller); default: `True`.
+
+        Returns
+        -------
+        new : list
+            requests of the shard not seen before (by any shard).
+        """
+        rows = []
+        for request in requests:
+            key = request_key(request)
+            shard = int.from_bytes(key[:8], 'big') % self.nshards
+            state = CLAIMED if shard == self.shard and claim else QUEUED
+            blob = None if state == CLAIMED else pickle.dumps(request.to_dict(spider=spider), protocol=4)
+            rows.append((request, (key, shard, state, request.priority, blob)))
+        def insert(db):
+            new = []
+            for (request, row) in rows:
+                cursor = db.execute('INSERT OR IGNORE INTO requests (key, shard, state, priority, request) '
+                                    'VALUES (?, ?, ?, ?, ?)', row)
+                if cursor.rowcount > 0 and row[1] == self.shard:
+                    new.append(request)
+            return new
+        return self._transaction(insert) if rows else []
+
+    def claim(self, spider, size=CLAIM_SIZE):
+        """Claim the requests queued for the shard by the other ones.
+
+            >>> requests = frontier.claim(spider, size=CLAIM_SIZE)
+        """
+        from scrapy.utils.request import request_from_dict
+        def claim(db):
+            rows = db.execute('SELECT key, request FROM requests WHERE shard = ? AND state = ? '
+                              'ORDER BY priority DESC LIMIT ?', (self.shard, QUEUED, size)).fetchall()
+            if rows:
+                db.executemany('UPDATE requests SET state = ?, request = NULL WHERE key = ?',
+                               [(CLAIMED, key) for (key, _) in rows])
+                db.execute('UPDATE shards SET idle = 0 WHERE shard = ?', (self.shard,))
+            return [blob for (_, blob) in rows]
+        return [request_from_dict(pickle.loads(blob), spider=spider) for blob in self._transaction(claim)]
+
+    def idle(self):
+        """Flag the shard as idle, and tell whether the crawl is over.
+
+            >>> over = frontier.idle()
+
+        Returns
+        -------
+        over : bool
+            `True` when all the shards are idle and no request is queued: as a
+            shard only queues requests when busy, and stops being idle only by
+            claiming queued requests, the crawl cannot resume.
+        """
+        def idle(db):
+            db.execute('UPDATE shards SET idle = 1 WHERE shard = ?', (self.shard,))
+            busy = db.execute('SELECT COUNT(*) FROM shards WHERE idle = 0').fetchone()[0]
+            queued = db.execute('SELECT COUNT(*) FROM requests WHERE state = ?', (QUEUED,)).fetchone()[0]
+            return busy == 0 and queued == 0
+        return self._transaction(idle)
+
+    def __len__(self):
+        return self.__db.execute('SELECT COUNT(*) FROM requests').fetchone()[0]
+
+    def queued(self, shard=None):
+        """Number of requests queued (for a shard, or for all).
+        """
+        if shard is None:
+            return self.__db.execute('SELECT COUNT(*) FROM requests WHERE state = ?', (QUEUED,)).fetchone()[0]
+        return self.__db.execute('SELECT COUNT(*) FROM requests WHERE shard = ? AND state = ?',
+                                 (shard, QUEUED)).fetchone()[0]
+
+    def close(self):
+        self.__db.close()
+
+
+def output_file(output, shard):
+    """Output of the items of a shard, _e.g._ :literal:`items.jl.0`.
+    """
+    return '%s.%d' % (output, shard)
+
+
+def merge(output, nshards, remove=True):
+    """Merge the outputs (JSON lines) of the shards.
+
+        >>> n = merge(output, nshards, remove=True)
+
+    Returns
+    -------
+    n : int
+        number of items merged.
+    """
+    n = 0
+    with open(output, 'wb') as out:
+        for shard in range(nshards):
+            filename = output_file(output, shard)
+            if not os.path.exists(filename):
+                continue
+            with open(filename, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        out.write(line if line.endswith(b'\n') else line + b'\n')
+                        n += 1
+            if remove:
+                os.remove(filename)
+    return n
+
+
+def _spider(name):
+    from .spiders.sxnet import PageCrawler
+    spiders = {'pages': PageCrawler}
+    if name not in spiders:
+        raise ENetError("Spider %s cannot be sharded (only: %s)" % (name, list(spiders)))
+    return spiders[name]
+
+
+def _settings(shard, nshards, frontier, output, settings=None):
+    # settings of the project, overridden by the settings given and those of
+    # the shard
+    from scrapy.utils.project import get_project_settings
+    os.environ.setdefault('SCRAPY_SETTINGS_MODULE', '%s.settings' % __package__)
+    crawler_settings = get_project_settings()
+    overrides = dict(settings or {})
+    middlewares = crawler_settings.getdict('SPIDER_MIDDLEWARES')
+    middlewares.update(overrides.pop('SPIDER_MIDDLEWARES', {}))
+    middlewares.setdefault('estatnet.middlewares.ENetShardMiddleware', 50)
+    overrides.update({SHARD_SETTING: '%d/%d' % (shard, nshards), FRONTIER_SETTING: frontier,
+                      'SPIDER_MIDDLEWARES': middlewares,
+                      'FEEDS': {output_file(output, shard): {'format': 'jsonlines', 'overwrite': True}}})
+    crawler_settings.setdict(overrides, priority='cmdline')
+    return crawler_settings
+
+def crawl(shard, nshards, frontier, output, spider='pages', settings=None, **kwargs):
+    """Run the crawl of a shard (in the current process).
+
+        >>> crawl(shard, nshards, frontier, output, spider='pages', settings=None, **kwargs)
+
+    Arguments
+    ---------
+    shard, nshards : int
+        shard of the process, and number of shards.
+    frontier : str
+        file of the shared frontier (see :meth:`ENetSharedFrontier.create`).
+    output : str
+        output of the items of all the shards (see :meth:`output_file`).
+    spider : str
+        spider crawled; default: :literal:`'pages'` (:class:`estatnet.spiders.sxnet.PageCrawler`).
+    settings : dict
+        further |Scrapy| settings, overriding the settings of the project (those
+        of the module :literal:`SCRAPY_SETTINGS_MODULE`, by default
+        :mod:`estatnet.settings`).
+    kwargs :
+        keyword arguments passed to the spider.
+    """
+    from scrapy.crawler import CrawlerProcess
+    process = CrawlerProcess(_settings(shard, nshards, frontier, output, settings))
+    process.crawl(_spider(spider), **kwargs)
+    process.start()
+
+
+def launch(nshards, output, frontier=None, spider='pages', settings=None, timeout=None, **kwargs):
+    """Launch a crawl sharded over several processes, and merge their outputs.
+
+        >>> n = launch(nshards, output, frontier=None, spider='pages', settings=None,
+                       timeout=None, **kwargs)
+
+    Arguments
+    ---------
+    nshards : int
+        number of processes.
+    output : str
+        output (JSON lines) of the merged items.
+    frontier : str
+        file of the shared frontier (created anew); default: :literal:`<output>.frontier`.
+    spider, settings, kwargs :
+        see :meth:`crawl`; the settings and the keyword arguments must be JSON
+        serialisable.
+    timeout : float
+        maximum time (in seconds) of the crawl; default: `None`.
+
+    Returns
+    -------
+    n : int
+        number of items merged.
+    """
+    if nshards < 1:
+        raise ENetError("Wrong number of shards: %s" % nshards)
+    _spider(spider)
+    frontier = frontier or '%s.frontier' % output
+    ENetSharedFrontier.create(frontier, nshards)
+    config = json.dumps({'nshards': nshards, 'frontier': frontier, 'output': output, 'spider': spider,
+                         'settings': settings or {}, 'kwargs': kwargs})
+    processes = [subprocess.Popen([sys.executable, '-m', 'estatnet.shard', '--worker', str(shard), config])
+                 for shard in range(nshards)]
+    start = time.time()
+    try:
+        for process in processes:
+            remaining = None if timeout is None else max(timeout - (time.time() - start), 0.)
+            if process.wait(timeout=remaining) != 0:
+                raise ENetError("Shard crawl failed with code %s" % process.returncode)
+    finally:
+        [process.kill() for process in processes if process.poll() is None]
+    return merge(output, nshards)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m estatnet.shard',
+                                     description='Crawl Statistics Explained with several processes.')
+    parser.add_argument('-n', '--nshards', type=int, default=os.cpu_count() or 1, help='number of processes')
+    parser.add_argument('-o', '--output', default='items.jl', help='output (JSON lines) of the items')
+    parser.add_argument('--frontier', help='file of the shared frontier')
+    parser.add_argument('--pages', nargs='+', help='types of pages crawled (see PageCrawler)')
+    parser.add_argument('-s', '--set', action='append', default=[], metavar='NAME=VALUE',
+                        help='Scrapy setting (JSON values are decoded)')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('config', nargs='?', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.worker is not None:
+        config = json.loads(args.config)
+        crawl(args.worker, config['nshards'], config['frontier'], config['output'], config['spider'],
+              config['settings'], **config['kwargs'])
+        return 0
+    settings = {}
+    for setting in args.set:
+        name, _, value = setting.partition('=')
+        try:
+            settings[name] = json.loads(value)
+        except ValueError:
+            settings[name] = value
+    kwargs = {'pages': args.pages} if args.pages else {}
+    n = launch(args.nshards, args.output, frontier=args.frontier, settings=settings, **kwargs)
+    print('%d items written in %s' % (n, args.output))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
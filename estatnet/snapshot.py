@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__snapshot
+
+.. Links
+
+.. _Scrapy: https://scrapy.org
+.. |Scrapy| replace:: `Scrapy <Scrapy_>`_
+
+Generated snapshot of the xpath tables.
+
+**Description**
+
+Building the tables of :mod:`estatnet.paths` runs hundreds of calls to
+:meth:`estatnet.ENetXpath.create`, a cost paid by every |Scrapy| process that
+imports the package. The tables are computed once and written into a snapshot
+file of plain literals (:data:`SNAPSHOT_FILE`), stamped with a digest of the
+sources they are built from: the snapshot is rebuilt only when the digest does
+not match, _i.e._ when the definitions changed. The snapshot is read with
+:meth:`ast.literal_eval`: no code is run from it, whatever its location.
+
+The snapshot is written in the cache directory of the user, not in the package
+(which may be installed read-only); the environment variable
+:data:`SNAPSHOT_ENV` sets another location:
+
+    export ESTATNET_SNAPSHOT_FILE=/path/to/_paths_snapshot.txt
+
+**Dependencies**
+
+*require*:      :mod:`os`, :mod:`ast`, :mod:`hashlib`, :mod:`importlib`, :mod:`pprint`, :mod:`collections`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Mon Dec 18 17:28:29 2017
+
+#%%
+import os, sys
+import ast
+import hashlib
+import importlib
+from pprint import pformat
+from collections.abc import Mapping
+
+from warnings import warn
+
+from . import ENetWarning, ENetXpath#analysis:ignore
+from . import settings#analysis:ignore
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+PATHS_TABLES        = ['ARTICLE_PATHS', 'GLOSSARY_PATHS', 'CATEGORY_PATHS',
+                       'THEME_PATHS', 'CONCEPT_PATHS', 'WHATLINKS_PATHS',
+                       'CATEGORIES_PAGE_PATHS', 'THEMES_PAGE_PATHS', 'ARTICLES_PAGE_PATHS',
+                       'GLOSSARIES_PAGE_PATHS', 'CONCEPTS_PAGE_PATHS']
+"""Tables of :mod:`estatnet.paths` stored in the snapshot.
+"""
+
+SX_TABLES           = {'SX_PAGES_PATHS':
+                           {settings.GLOSSARY_KEY:  'GLOSSARY_PATHS',
+                            settings.CATEGORY_KEY:  'CATEGORY_PATHS',
+                            settings.ARTICLE_KEY:   'ARTICLE_PATHS',
+                            settings.THEME_KEY:     'THEME_PATHS',
+                            settings.CONCEPT_KEY:   'CONCEPT_PATHS'},
+                       'SX_START_PAGES_PATHS':
+                           {settings.GLOSSARY_KEY:  'GLOSSARIES_PAGE_PATHS',
+                            settings.CATEGORY_KEY:  'CATEGORIES_PAGE_PATHS',
+                            settings.ARTICLE_KEY:   'ARTICLES_PAGE_PATHS',
+                            settings.THEME_KEY:     'THEMES_PAGE_PATHS',
+                            settings.CONCEPT_KEY:   'CONCEPTS_PAGE_PATHS'}}
+"""Tables indexing the tables above by page type, rebuilt from the snapshot.
+"""
+
+SNAPSHOT_SOURCES    = ['paths.py', 'items.py', 'settings.py', '__init__.py']
+"""Source files (in the package directory) the tables are built from: the
+snapshot digest is computed over their contents.
+"""
+
+SNAPSHOT_ENV        = 'ESTATNET_SNAPSHOT_FILE'
+"""Name of the environment variable giving the location of the snapshot file.
+"""
+
+SNAPSHOT_FILE       = os.environ.get(SNAPSHOT_ENV) or                                       \
+                        os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                                     'estatnet', '_paths_snapshot.txt')
+"""Default location of the generated snapshot file: the variable :data:`SNAPSHOT_ENV`
+when set, the user cache directory otherwise.
+"""
+
+_TABLES             = {}
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+def digest():
+    """Compute the digest of the sources of the tables.
+
+        >>> key = digest()
+    """
+    sha = hashlib.sha1()
+    base = os.path.dirname(os.path.abspath(__file__))
+    for source in SNAPSHOT_SOURCES:
+        with open(os.path.join(base, source), 'rb') as f:
+            sha.update(f.read())
+    # the optimizing mode changes the expressions generated by ENetXpath.create
+    sha.update(b'OPTIMIZE=%r' % ENetXpath.OPTIMIZE)
+    return sha.hexdigest()
+
+def build():
+    """Build the tables by running the definitions of :mod:`estatnet.paths`.
+
+        >>> tables = build()
+
+    Returns
+    -------
+    tables : dict
+        tables of :data:`PATHS_TABLES`, indexed by name.
+    """
+    name = '%s.paths' % __package__
+    # the definitions module keeps the tables already defined (see the idiom
+    # 'try: assert X...'), even when reloaded: run it in a new module instead
+    sys.modules.pop(name, None)
+    paths = importlib.import_module(name)
+    return {name: getattr(paths, name) for name in PATHS_TABLES}
+
+def write(tables, key, filename=None):
+    """Write the tables into a snapshot file.
+
+        >>> write(tables, key, filename=None)
+
+    Arguments
+    ---------
+    tables : dict
+        tables to store, indexed by name.
+    key : str
+        digest of the sources of the tables (see :meth:`digest`).
+    filename : str
+        path of the snapshot file; default: :data:`SNAPSHOT_FILE`.
+    """
+    filename = filename or SNAPSHOT_FILE
+    # a single dictionary literal, read back with ast.literal_eval
+    snap = dict([(name, tables[name]) for name in PATHS_TABLES], DIGEST=key)
+    lines = ['# generated by estatnet.snapshot: do not edit',
+             pformat(snap, width=120),
+             '']
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+    tmp = '%s.%d.tmp' % (filename, os.getpid())
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+    os.replace(tmp, filename) # atomic: concurrent workers may rebuild at once
+
+def read(filename=None):
+    """Read the tables from a snapshot file.
+
+        >>> key, tables = read(filename=None)
+
+    Returns
+    -------
+    key, tables : str, dict
+        digest and tables of the snapshot; :literal:`(None, None)` when the
+        snapshot does not exist or cannot be read (a warning is issued then).
+
+    Note
+    ----
+    The snapshot is parsed as a literal (see :meth:`ast.literal_eval`), not
+    imported: a snapshot altered into code is rejected, not run.
+    """
+    filename = filename or SNAPSHOT_FILE
+    if not os.path.exists(filename):
+        return None, None
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            snap = ast.literal_eval(f.read())
+        return snap['DIGEST'], {name: snap[name] for name in PATHS_TABLES}
+    except (OSError, ValueError, SyntaxError, TypeError, KeyError, MemoryError, RecursionError) as e:
+        warn(ENetWarning("Snapshot of the xpath tables %s not read: %r" % (filename, e)))
+        return None, None
+
+def load(rebuild=False, filename=None):
+    """Load the tables, from the snapshot when it is up to date.
+
+        >>> tables = load(rebuild=False, filename=None)
+
+    Arguments
+    ---------
+    rebuild : bool
+        when True, the tables are built again (and the snapshot is rewritten)
+        whatever the state of the snapshot; default: False.
+    filename : str
+        path of the snapshot file; default: :data:`SNAPSHOT_FILE`.
+
+    Returns
+    -------
+    tables : dict
+        tables of :data:`PATHS_TABLES` and :data:`SX_TABLES`, indexed by name.
+        The tables are loaded once: further calls return the same tables.
+    """
+    if _TABLES and not rebuild and filename is None:
+        return _TABLES
+    key = digest()
+    snapkey, tables = (None, None) if rebuild else read(filename)
+    if tables is None or snapkey != key:
+        tables = build()
+        try:
+            write(tables, key, filename)
+        except OSError as e:
+            warn(ENetWarning("Snapshot of the xpath tables not written: %s" % e))
+    for (name, table) in SX_TABLES.items():
+        tables[name] = {page: tables[t] for (page, t) in table.items()}
+    if filename is None:
+        _TABLES.clear()
+        _TABLES.update(tables)
+    # compile all paths once and for all (see estatnet.xpaths)
+    from .xpaths import XPATHS
+    XPATHS.register([tables[name] for name in PATHS_TABLES])
+    return tables
+
+
+class ENetLazyTable(Mapping):
+    """Class providing with a read-only table loaded on first access.
+
+        >>> table = ENetLazyTable(loader)
+
+    Arguments
+    ---------
+    loader : callable
+        function with no argument returning the table.
+    """
+
+    def __init__(self, loader):
+        self.__loader, self.__table = loader, None
+
+    def __load(self):
+        if self.__table is None:
+            self.__table = self.__loader()
+        return self.__table
+
+    def __getitem__(self, key):
+        return self.__load()[key]
+
+    def __iter__(self):
+        return iter(self.__load())
+
+    def __len__(self):
+        return len(self.__load())
+
+    def __repr__(self):
+        return repr(self.__load())
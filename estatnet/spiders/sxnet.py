@@ -10,81 +10,71 @@ Basic definitions for Eurobase scraping/indexing spider.
 # *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_ 
 # *since*:        Sun Jan 14 17:31:51 2018
 
+import re
+import inspect
+import itertools
+from urllib.parse import urlencode, quote
+
 import scrapy
 
+from scrapy import signals
 from scrapy.spiders import Spider, CrawlSpider, Rule
 from scrapy.linkextractors import LinkExtractor
-from scrapy.loader.processors import TakeFirst
 
-from collections import Mapping
+from collections.abc import Mapping
 
 from .. import ENetError, ENetWarning#analysis:ignore 
-from ..settings import DEF_LANG, SX_MAINURL, SX_KEYS, SX_KEYDOMAINS, \
+from ..settings import DEF_LANG, LANGS, EC_URL, SX_MAINURL, SX_KEYS, SX_KEYDOMAINS, SX_VERSIONS, \
     ARTICLE_KEY, GLOSSARY_KEY, CATEGORY_KEY, THEME_KEY, CONCEPT_KEY,                \
     ARTICLE_DOMAIN, GLOSSARY_DOMAIN, CATEGORY_DOMAIN, THEME_DOMAIN, CONCEPT_DOMAIN, \
-    SE_START_PAGES,                                                                 \
-    WHATLINKSHERE_URL, WHATLINKSHERE_LIMIT                                          \
+    SX_START_URLS, SX_RELURL, SX_APIURL, API_BATCH_SIZE, API_LIMIT,                 \
+    WHATLINKSHERE_URL, WHATLINKSHERE_LIMIT                                          
     
-import items
-from ..items import GLOSSARY_PATHS, SX_PAGES_PATHS, SX_START_PAGES_PATHS, WHATLINKS
+from .. import items
+from ..items import GLOSSARY_PATHS, SX_PAGES_PATHS, SX_START_PAGES_PATHS, WHATLINKS_PATHS
+from ..xpaths import XPATHS
+from ..sections import detect_version
+from ..pages import ENetPageClassifier, PAGE_CHECK, page_title, canonical_title, split_lang, lang_title
+from ..frontier import ENetBFSFrontier
+from ..priority import TYPE_META
+from ..extract import ENetExtractor
 
 #%%
 #==============================================================================
 # GLOBAL VARIABLES
 #==============================================================================
 
-try:
-    assert PAGE_CHECK
-    assert not (PAGE_CHECK in (None,{}) or all([v in ([],'',None) for v in PAGE_CHECK.values()]))
-except (NameError,AssertionError):
-    PAGE_CHECK = {}
-    PAGE_CHECK[ARTICLE_KEY] =                                   \
-        '//h2[span[contains(normalize-space(text()), "Further Eurostat information")]] \
-            | //h2[span[contains(normalize-space(text()), "See also")]] \
-            | //h3[span[contains(normalize-space(text()), "Dedicated section")]]'
-    PAGE_CHECK[GLOSSARY_KEY] =                                  \
-        '//h1[@id="firstHeading"][starts-with(normalize-space(text()), "Glossary")]   \
-            | //h2[span[contains(normalize-space(text()), "Related concepts")]] \
-            | //h2[span[contains(normalize-space(text()), "Statistical data")]]'
-    PAGE_CHECK[CATEGORY_KEY] =                                  \
-        '//h1[@id="firstHeading"][starts-with(normalize-space(text()), "Category")]   \
-            | //h2[starts-with(normalize-space(text()), "Pages in category")]'
-    PAGE_CHECK[THEME_KEY] =                                     \
-        '//h2[span[@id="Statistical_articles"]]//text()'
-    PAGE_CHECK[CONCEPT_KEY] =                                   \
-        PAGE_CHECK[GLOSSARY_KEY]
+PAGES_CLASSIFIER    = ENetPageClassifier(SX_KEYDOMAINS, PAGE_CHECK)
+"""Classifier identifying the type of the responses (see :mod:`estatnet.pages`).
+"""
 
 #%%
 #==============================================================================
 # COMMON METHODS
 #==============================================================================
 
-def __check_page(response, page):
-    if not page in SX_KEYDOMAINS:
-        raise ENetError("Page type %s not recognised as any from Eurostat website" % page)
-    else:
-        domain = SX_KEYDOMAINS[page]
-    if domain not in (None,'',[]):
-        return response.url.startswith(domain)
-    else:
-        return TakeFirst()(response.xpath(PAGE_CHECK[page])) is not None
+def _check_page(response, page):
+    return PAGES_CLASSIFIER.check(response, page)
         
+def _identify_page(response):        
+    # dispatch on the prefix of the page title, with a DOM probe only for the
+    # titles that do not tell the type (articles and themes)
+    return PAGES_CLASSIFIER.identify(response)
+
+def _chain(output, requests):
+    # OUTPUT is an asynchronous generator when the items are extracted in a
+    # pool of processes (see estatnet.extract)
+    if not inspect.isasyncgen(output):
+        return itertools.chain(output, requests)
+    async def chain():
+        async for r in output:
+            yield r
+        for r in requests:
+            yield r
+    return chain()
         
-def __identify_page(response):        
-    res = False
-    for (page,domain) in SX_KEYDOMAINS.items():
-        if domain not in (None,'',[]):
-            res = response.url.startswith(domain)
-        else:
-            res = TakeFirst()(response.xpath(PAGE_CHECK[page]))
-        if res is True:
-            return page
-    if res is False: # actually if we are still here...
-        #warn(SXcrapWarning("Page %s not recognised as a standard type" % response.url))
-        return None
-        
-def __remove_link(path):
-    return path.replace('/a/@href','') # we should use a regex here...    
+def _remove_link(path):
+    return re.sub(r'/*(a/)?@href$', '', path)
     
 #%%
 #==============================================================================
@@ -93,68 +83,200 @@ def __remove_link(path):
     
 class WhatLinksSpider(Spider):
     name = "WhatLinksHere"
-    allowed_domains = [SX_MAINURL] 
+    allowed_domains = [EC_URL] # domains only, not URLs (see OffsiteMiddleware)
+    # the backlinks are either scraped from the "What links here" HTML pages 
+    # (mode 'html': one page per title), or queried through the MediaWiki API
+    # (mode 'api': titles batched in requests, with continuation)
+    allowed_modes = ['html', 'api']
+    
+    @staticmethod
+    def url_whatlinkshere(page, limit=WHATLINKSHERE_LIMIT):
+        # the title is passed in the query: '&', '?' and '#' are escaped
+        return '%s/%s&limit=%s' % (WHATLINKSHERE_URL, quote(page.replace(' ', '_'), safe=";:@$!*(),/~"), limit)
+    
+    @staticmethod
+    def url_backlinks(titles, **continuation):
+        params = [('action', 'query'), ('format', 'json'), ('formatversion', '2'),
+                  ('prop', 'linkshere'), ('titles', '|'.join(titles)), 
+                  ('lhprop', 'title'), ('lhlimit', API_LIMIT)]
+        params.extend(sorted(continuation.items()))
+        return '%s?%s' % (SX_APIURL, urlencode(params))
     
     @staticmethod
-    def url_whatlinkshere(page):
-        return '%s/%s&limit=%s' % (WHATLINKSHERE_URL, page, WHATLINKSHERE_LIMIT)
+    def url_page(title):
+        # link to a page as in the "What links here" pages
+        return '/%s/%s' % (SX_RELURL, quote(title.replace(' ', '_'), safe=";:@$!*(),/~"))
     
     def __init__(self, page, *args, **kwargs):
-        self.npages, self.nlinks = kwargs.pop('npages', -1), kwargs.pop('nlinks', -1)
+        # NPAGES: maximum number of pages explored, NLINKS: maximum number of 
+        # backlinks followed per page, DEPTH: maximum level explored from the
+        # start pages (negative: no limit)
+        self.npages, self.nlinks = int(kwargs.pop('npages', -1)), int(kwargs.pop('nlinks', -1))
+        self.maxdepth = int(kwargs.pop('depth', -1))
+        self.lang, self.mode = kwargs.pop('lang', DEF_LANG), kwargs.pop('mode', 'html')
+        self.batch = int(kwargs.pop('batch', API_BATCH_SIZE))
         if page is None:
            raise ENetError("Name of destination page is missing")
         elif not isinstance(page, (list, tuple)):
-            page = page[0]
-        if self.start_urls is None:
-            self.start_urls = []
+            page = [page]
+        if self.mode not in self.allowed_modes:
+            raise ENetError("Mode %s not supported" % self.mode)
+        elif self.batch < 1:
+            raise ENetError("Wrong batch size: %s" % self.batch)
+        self.pages = [p.replace(' ', '_') for p in page]
+        self.frontier = ENetBFSFrontier(npages=self.npages, nlinks=self.nlinks, depth=self.maxdepth)
+        self.start_urls = []
         [self.start_urls.append(self.url_whatlinkshere(p)) for p in page]
         super(WhatLinksSpider, self).__init__(*args, **kwargs)
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super(WhatLinksSpider, cls).from_crawler(crawler, *args, **kwargs)
+        crawler.signals.connect(spider._dropped, signal=signals.request_dropped)
+        return spider
+
+    @property
+    def stats(self):
+        crawler = getattr(self, 'crawler', None)
+        return getattr(crawler, 'stats', None)
     
     def start_requests(self):
         #for page in self.page:
         #    yield scrapy.Request(url=self.url_whatlinkshere(self.page), callback=self.parse)  
-        for url in getattr(self, 'start_urls', []):
-            yield scrapy.Request(url=url, callback=self.parse_whatlinkshere)
+        # the pages are explored breadth-first: the pages of a level are only
+        # requested once all pages of the previous level are done (see _complete)
+        yield from self._requests(self.frontier.seed(self.pages), 0)
+
+    def _requests(self, titles, level):
+        if not titles:
+            return
+        dont_filter = level == 0 # like the start URLs of Scrapy spiders
+        self.logger.info('Exploring %s pages at level %s...', len(titles), level)
+        if self.stats is not None:
+            self.stats.set_value('estatnet/frontier/level_%d' % level, len(titles))
+            self.stats.max_value('estatnet/frontier/max_level', level)
+        if self.mode == 'api':
+            for i in range(0, len(titles), self.batch):
+                batch = titles[i:i+self.batch]
+                yield scrapy.Request(self.url_backlinks(batch), callback=self.parse_backlinks,
+                                     errback=self._failed, dont_filter=dont_filter,
+                                     meta={'titles': batch, 'level': level, 'backlinks': {}})
+        else:
+            limit = self.nlinks if 0 <= self.nlinks < WHATLINKSHERE_LIMIT else WHATLINKSHERE_LIMIT
+            for title in titles:
+                yield scrapy.Request(self.url_whatlinkshere(title, limit), callback=self.parse_whatlinkshere,
+                                     errback=self._failed, dont_filter=dont_filter,
+                                     meta={'titles': [title], 'level': level})
+
+    def _complete(self, request, links):
+        # admit the backlinks at the next level, and request the next level 
+        # when the current one is complete
+        level = request.meta['level']
+        self.frontier.admit(links, level + 1)
+        yield from self._requests(self.frontier.complete(level, len(request.meta['titles'])), level + 1)
+
+    def _dropped(self, request, spider):
+        # requests filtered by the scheduler (e.g., seen in a previous run, see 
+        # estatnet.dupefilter) complete their pages with no backlinks
+        if spider is not self or 'level' not in request.meta:
+            return
+        [self.crawler.engine.crawl(r) for r in self._complete(request, [])]
+
+    def _failed(self, failure):
+        self.logger.error('Exploration of %s failed: %s', failure.request.url, failure.value)
+        yield from self._complete(failure.request, [])
+
+    def closed(self, reason):
+        if self.stats is None:
+            return
+        self.stats.set_value('estatnet/frontier/visited', len(self.frontier.visited))
+        [self.stats.set_value('estatnet/frontier/dropped/%s' % key, n)
+            for (key, n) in self.frontier.ndropped.items()]
             
     def parse_whatlinkshere(self, response):
         self.logger.info('Exploring what links to %s...', response.url)
         # if response.status :
-        next_pages = response.xpath(WHATLINKS['Links']).extract()
-        whatlink = items.WhatLinksItem(response=response)
-        [whatlink.add_xpath(key, whatlink.paths[key]) for key in whatlink.fields]
-        yield whatlink
-        for next_page in next_pages:
-            next_page = response.urljoin(next_page)
-            yield scrapy.Request(self.url_whatlinkshere(next_page), callback=self.parse_whatlinkshere)
+        links = self.frontier.links(XPATHS.xpath(response.selector, WHATLINKS_PATHS['link']).extract())
+        l = items.WhatLinksItemLoader(response=response)
+        l.add_value('link', links)
+        l.add_xpath('language', WHATLINKS_PATHS['language'])
+        l.add_value('page_id', canonical_title(response.meta['titles'][0]))
+        yield l.load_item()
+        next_pages = [page_title(response.urljoin(link)) for link in links]
+        yield from self._complete(response.request, [p for p in next_pages if p is not None])
+
+    def parse_backlinks(self, response):
+        titles = response.meta['titles']
+        result = response.json()
+        if 'error' in result:
+            self.logger.error('Query of the backlinks of %s failed: %s', titles, result['error'])
+            yield from self._complete(response.request, [])
+            return
+        # the backlinks of the batch are collected over the continued queries
+        backlinks = dict(response.meta['backlinks'])
+        for page in result.get('query', {}).get('pages', []):
+            backlinks.setdefault(page['title'].replace(' ', '_'), []).extend(
+                [link['title'].replace(' ', '_') for link in page.get('linkshere', [])])
+        # continue, unless NLINKS backlinks were found for all titles already
+        if 'continue' in result                                                 \
+                and not (self.nlinks >= 0 and all([len(backlinks.get(t, [])) >= self.nlinks for t in titles])):
+            yield scrapy.Request(self.url_backlinks(titles, **result['continue']), 
+                                 callback=self.parse_backlinks, errback=self._failed,
+                                 dont_filter=response.request.dont_filter,
+                                 meta={'titles': titles, 'level': response.meta['level'],
+                                       'backlinks': backlinks})
+            return
+        next_pages = []
+        for (title, links) in backlinks.items():
+            links = self.frontier.links(links)
+            l = items.WhatLinksItemLoader()
+            l.add_value('link', [self.url_page(link) for link in links])
+            l.add_value('language', self.lang)
+            l.add_value('page_id', canonical_title(title))
+            yield l.load_item()
+            next_pages.extend(links)
+        yield from self._complete(response.request, next_pages)
             
             
 class PageCrawler(CrawlSpider):
     name = "PageExplained"
-    allowed_domains = [SX_MAINURL]  # [settings.ESTAT_URL]
+    allowed_domains = [EC_URL]  # [settings.ESTAT_URL]
     allowed_arguments = [key for key in SX_KEYS if key!=ARTICLE_KEY]
 
     # this spider has one rule per type of page scraped: extract all (unique and 
     # canonicalized) links, follow them and parse them using the dedicated parse
     # method
     rules = (
-        Rule(LinkExtractor(restrict_xpath=__remove_link(SX_PAGES_PATHS[key]['Links']), 
-                           allow=r"^" + SX_MAINURL + SX_KEYDOMAINS[key],
-                           deny=[r"^" + SX_MAINURL + SX_KEYDOMAINS[_]   \
+        Rule(LinkExtractor(restrict_xpaths=_remove_link(SX_PAGES_PATHS[key][SX_VERSIONS['current']]['link']), 
+                           allow=r"^" + SX_MAINURL + '/' + SX_KEYDOMAINS[key],
+                           deny=[r"^" + SX_MAINURL + '/' + SX_KEYDOMAINS[_]   \
                                  for _ in SX_KEYDOMAINS.keys()          \
                                  if _!=key and SX_KEYDOMAINS[_]!='']), 
              callback="_parse_%s" % key )
         for key in allowed_arguments
         )
 
+    # extraction of the items, possibly in worker processes (see from_crawler)
+    extractor = None
+
     def __init__(self, pages=None, *args, **kwargs):
         self.lang, self.maxdepth = kwargs.pop('lang', DEF_LANG), kwargs.pop('depth',0)
+        # languages of the translations fetched with every page: the structure
+        # (links, categories, datasets, ...) is shared, and only crawled and
+        # extracted in the default language
+        langs = kwargs.pop('langs', None) or []
+        if isinstance(langs, str):
+            langs = LANGS if langs == 'all' else langs.split(',')
+        if set(langs).difference(set(LANGS)) != set({}):
+            raise ENetError('wrong settings for LANGS parameter (only: %s)' % list(LANGS))
+        self.langs = [lang for lang in langs if lang != DEF_LANG]
         if pages in (None,{},[]):
-            pages = self.allowed_argments # 'main' instesad ? 
+            pages = self.allowed_arguments # 'main' instesad ? 
         if isinstance(pages,str) and pages in self.allowed_arguments:
             pages = {pages: True}
         elif isinstance(pages,(list,tuple))     \
                 and set(pages).difference(set(self.allowed_arguments)) == set({}):
-            pages = {(key,True) for key in self.allowed_arguments} # {'main': True} ? 
+            pages = {key: True for key in pages} # {'main': True} ? 
         elif not isinstance(pages,Mapping)      \
                 or set(pages.keys()).difference(set(self.allowed_arguments)) != set({}):
             raise ENetError('wrong settings for PAGES parameter')
@@ -162,59 +284,154 @@ class PageCrawler(CrawlSpider):
         #    warning.warn(SXcrapWarning('nothing to scrape!'))
         #    return
         self.start_urls = []
-        [self.start_urls.append(SE_START_PAGES[key] if val is True  
-                                else '%s/%s%S' % (SX_MAINURL, SX_KEYDOMAINS[key], val))
+        [self.start_urls.append(SX_START_URLS[key] if val is True  
+                                else '%s/%s%s' % (SX_MAINURL, SX_KEYDOMAINS[key], val))
             for (key,val) in pages.items() ] 
         super(PageCrawler, self).__init__(*args, **kwargs)
 
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super(PageCrawler, cls).from_crawler(crawler, *args, **kwargs)
+        spider.extractor = ENetExtractor.from_crawler(crawler)
+        return spider
+
     # Method which starts the requests by visiting all URLs specified in start_urls
     def start_requests(self):
         for url in self.start_urls:
-            yield scrapy.Request(url, callback=self.parse, dont_filter=True)
+            # no callback: CrawlSpider runs parse_start_url and the rules
+            yield scrapy.Request(url, dont_filter=True)
 
     def parse_start_url(self, response):
-        key = __identify_page(response) 
-        if response.url == SE_START_PAGES[key]:
-            links = response.xpath(SX_START_PAGES_PATHS[key]['Links'])
+        start = {url: key for (key, url) in SX_START_URLS.items()}
+        if response.url in start:
+            key = start[response.url]
+            links = XPATHS.xpath(response.selector, SX_START_PAGES_PATHS[key]['link'])
+            # the start pages list pages of their own type (see estatnet.priority)
+            meta, output = {TYPE_META: key}, ()
         else:
-            links = response.xpath(SX_PAGES_PATHS[key]['Links'])
-        for link in links:
-            yield scrapy.Request(link, callback=self.parse) # ???? 
+            key = _identify_page(response) 
+            if key is None:
+                return ()
+            # the page is parsed here: its URL may not be requested again by
+            # the rules (see the dupefilter)
+            output = getattr(self, '_parse_%s' % key)(response)
+            links = XPATHS.xpath(response.selector, SX_PAGES_PATHS[key][SX_VERSIONS['current']]['link'])
+            meta = {}
+        return _chain(output, [scrapy.Request(response.urljoin(link), meta=dict(meta)) # ???? 
+                               for link in links.extract()])
     
         
     @staticmethod
-    def _parse_loader(cls, response):
+    def _parse_loader(cls, response, stats=None, skip=()):
         l = cls(response=response)
-        [l.add_xpath(key, l.item._paths[key]) for key in l.item._allowed_keys]
+        # only the paths of the layout version used by the response are run; 
+        # when the version cannot be told, run the current version first, the
+        # last one as a fallback; section-based fields are extracted in a single
+        # pass, the other paths are evaluated through their precompiled expressions
+        version = detect_version(response.selector)
+        if version is None:
+            versions = (SX_VERSIONS['current'], SX_VERSIONS['last'])
+        else:
+            versions = (version,)
+        for v in versions:
+            sections = l.item.sections[v]
+            l.add_sections(sections, fallback=True, skip=skip)
+            [l.add_fallback_xpath(key, XPATHS[path])                            \
+                 for (key, path) in sections.paths.items() if key not in skip]
+        l.add_value('version', version)
+        if stats is not None:
+            stats.inc_value('estatnet/version/%s' % ('unknown' if version is None else version))
         return l.load_item()
 
+    @property
+    def stats(self):
+        crawler = getattr(self, 'crawler', None)
+        return getattr(crawler, 'stats', None)
+
     def parse_item(self, response):
         self.logger.info('%s', response.url)
         title = response.url.split('/')[-1]
         if title.startswith(GLOSSARY_DOMAIN):
-            yield self._parse_loader(items.GlossaryItemLoader, response)
+            yield self._parse_loader(items.GlossaryItemLoader, response, self.stats)
         elif title.startswith(CATEGORY_DOMAIN):
-            yield self._parse_loader(items.CategoryItemLoader, response)
+            yield self._parse_loader(items.CategoryItemLoader, response, self.stats)
         elif title.startswith(ARTICLE_DOMAIN):
-            yield self._parse_loader(items.ArticleItemLoader, response)
+            yield self._parse_loader(items.ArticleItemLoader, response, self.stats)
         
+    def _extract(self, key, response, skip=()):
+        if self.extractor is None:
+            return self._parse_loader(items.SX_ITEMLOADERS[key], response, self.stats, skip=skip)
+        return self.extractor.inline(key, response, skip=skip)
+
+    async def _parse_pooled(self, output, key, response, skip=()):
+        # the item is extracted in a worker process, the reactor is free
+        # meanwhile (see estatnet.extract)
+        item = await self.extractor.extract(key, response, skip=skip)
+        for r in output(key, response, item):
+            yield r
+
+    def _parse_page(self, key, response):
+        if self.extractor is not None and self.extractor.pooled:
+            return self._parse_pooled(self._page_output, key, response)
+        return self._page_output(key, response, self._extract(key, response))
+
+    def _page_output(self, key, response, item):
+        if not self.langs:
+            yield item
+            return
+        # one item per language, all linked to the same page
+        title = split_lang(page_title(response.url))[0]
+        if title in (None,''):
+            # no title in the URL (e.g., '?curid=' or redirects): the URLs of
+            # the translations are unknown
+            yield item
+            return
+        item['page_id'] = canonical_title(title)
+        yield item
+        for lang in self.langs:
+            yield scrapy.Request('%s/%s' % (SX_MAINURL, quote(lang_title(title, lang), safe=':/')),
+                                 callback=self._parse_translation,
+                                 meta={TYPE_META: key, 'estatnet_page': item['page_id'], 'estatnet_lang': lang})
+
+    def _parse_translation(self, response):
+        # the fields shared with the page in the default language are not
+        # extracted again, nor are the links followed
+        key = response.meta[TYPE_META]
+        if self.extractor is not None and self.extractor.pooled:
+            return self._parse_pooled(self._translation_output, key, response, skip=items.SHARED_FIELDS)
+        return self._translation_output(key, response, self._extract(key, response, skip=items.SHARED_FIELDS))
+
+    def _translation_output(self, key, response, item):
+        item['page_id'] = response.meta['estatnet_page']
+        if not item.get('language'):
+            item['language'] = response.meta['estatnet_lang']
+        if self.stats is not None:
+            self.stats.inc_value('estatnet/lang/%s' % response.meta['estatnet_lang'])
+        yield item
+
     def _parse_category(self, response):
         #l = CategoryItemLoader(response=response)
         #[l.add_xpath(key, CATEGORY_PATHS[key]) for key in CATEGORY_PATHS.keys()]
         #yield l.load_item()
-        yield self._parse_loader(items.CategoryItemLoader, response)
+        return self._parse_page(CATEGORY_KEY, response)
 
     def _parse_glossary(self, response):
         #l = GlossaryItemLoader(response=response)
         #[l.add_xpath(key, GLOSSARY_PATHS[key]) for key in GLOSSARY_PATHS.keys()]
         #yield l.load_item()
-        yield self._parse_loader(items.GlossaryItemLoader, response)
+        return self._parse_page(GLOSSARY_KEY, response)
 
     def _parse_article(self, response):
         #l = ArticleItemLoader(response=response)
         #[l.add_xpath(key, ARTICLE_PATHS[key]) for key in ARTICLE_PATHS.keys()]
         #yield l.load_item()
-        yield self._parse_loader(items.ArticleItemLoader, response)
+        return self._parse_page(ARTICLE_KEY, response)
+
+    def _parse_theme(self, response):
+        return self._parse_page(THEME_KEY, response)
+
+    def _parse_concept(self, response):
+        return self._parse_page(CONCEPT_KEY, response)
 
 
     #def start_requests(self):
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__state
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+.. _Scrapy: https://scrapy.org
+.. |Scrapy| replace:: `Scrapy <Scrapy_>`_
+
+Persistent state of the crawled |StatX| pages, for incremental recrawls.
+
+**Description**
+
+The class :class:`ENetPageStore` records, for every page crawled (keyed by its
+canonical URL):
+
+* the :literal:`ETag` and :literal:`Last-Modified` headers of the response,
+* the :literal:`last_modified` value parsed from the page,
+* a digest of the content of the page,
+* the requests followed from the page.
+
+The store is used by the middlewares :class:`estatnet.middlewares.ENetConditionalMiddleware`
+(conditional requests) and :class:`estatnet.middlewares.ENetIncrementalMiddleware`
+(no extraction, nor pipeline work, for unchanged pages) enabled through the
+setting :literal:`ESTATNET_STATE_FILE`:
+
+    ESTATNET_STATE_FILE = 'estatnet.state'
+    DOWNLOADER_MIDDLEWARES = {'estatnet.middlewares.ENetConditionalMiddleware': 580}
+    SPIDER_MIDDLEWARES = {'estatnet.middlewares.ENetIncrementalMiddleware': 990}
+
+**Dependencies**
+
+*require*:      :mod:`sqlite3`, :mod:`hashlib`, :mod:`json`, :mod:`time`, :mod:`w3lib`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Sun Jan 14 17:31:51 2018
+
+#%%
+import time
+import json
+import hashlib
+import sqlite3
+
+from w3lib.url import canonicalize_url
+
+from . import ENetError, ENetShared#analysis:ignore
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+STATE_SETTING       = 'ESTATNET_STATE_FILE'
+"""Name of the |Scrapy| setting giving the file of the page-state store.
+"""
+
+STATE_FIELDS        = ['etag', 'http_modified', 'page_modified', 'digest', 'links', 'crawled']
+"""Fields recorded for every page: :literal:`ETag` and :literal:`Last-Modified`
+headers, parsed :literal:`last_modified` value, digest of the content, requests
+followed from the page (see :meth:`ENetPageStore.put`) and time of the crawl.
+"""
+
+COMMIT_SIZE         = 1000
+"""Number of updates after which the store is committed to disk.
+"""
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+def digest(body):
+    """Compute the digest of the content of a page.
+
+        >>> key = digest(body)
+    """
+    return hashlib.sha1(body).hexdigest()
+
+
+class ENetPageStore(ENetShared):
+    """Class providing with a persistent store of the state of the crawled pages.
+
+        >>> store = ENetPageStore(filename)
+        >>> store.put(url, etag=etag, digest=digest(body))
+        >>> record = store.get(url)
+
+    Arguments
+    ---------
+    filename : str
+        file of the (SQLite) store; :literal:`':memory:'` for a transient store.
+    """
+
+    def __init__(self, filename):
+        if filename in (None,''):
+            raise ENetError("File of the page-state store is missing")
+        self.filename = filename
+        self.__db = sqlite3.connect(filename)
+        self.__db.execute('CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, %s)'
+                          % ', '.join(STATE_FIELDS))
+        self.__pending = 0
+
+    @classmethod
+    def open(cls, filename):
+        """Open the store of a file, shared within the process (see
+        :class:`estatnet.ENetShared`).
+
+            >>> store = ENetPageStore.open(filename)
+        """
+        return cls._open_shared(filename, lambda: cls(filename))
+
+    @staticmethod
+    def key(url):
+        """Canonical URL of a page used as key in the store.
+
+            >>> key = ENetPageStore.key(url)
+        """
+        return canonicalize_url(url)
+
+    def get(self, url, links=True):
+        """Retrieve the record of a page.
+
+            >>> record = store.get(url, links=True)
+
+        Arguments
+        ---------
+        url : str
+            URL of the page.
+        links : bool
+            when `False`, the requests followed from the page are not decoded:
+            the record holds their number (:literal:`'nlinks'`, counted by
+            SQLite) instead of :literal:`'links'`; default: `True`.
+
+        Returns
+        -------
+        record : dict
+            fields of :data:`STATE_FIELDS`, or `None` when the page is not stored.
+        """
+        fields = STATE_FIELDS if links else                                                 \
+            [f if f != 'links' else 'COALESCE(json_array_length(links), 0)' for f in STATE_FIELDS]
+        row = self.__db.execute('SELECT %s FROM pages WHERE url = ?' % ', '.join(fields),
+                                (self.key(url),)).fetchone()
+        if row is None:
+            return None
+        record = dict(zip(STATE_FIELDS, row))
+        if links:
+            record['links'] = json.loads(record['links']) if record['links'] else []
+        else:
+            record['nlinks'] = record.pop('links')
+        return record
+
+    def put(self, url, **fields):
+        """Create or update the record of a page.
+
+            >>> store.put(url, **fields)
+
+        Arguments
+        ---------
+        url : str
+            URL of the page.
+        fields :
+            fields of :data:`STATE_FIELDS` updated; :literal:`links` is a list of
+            JSON-serialisable descriptions of the followed requests. The time of
+            the crawl is set unless given.
+        """
+        if set(fields).difference(STATE_FIELDS):
+            raise ENetError("Fields %s not supported" % list(set(fields).difference(STATE_FIELDS)))
+        fields.setdefault('crawled', time.time())
+        if 'links' in fields:
+            fields['links'] = json.dumps(fields['links'])
+        names = list(fields.keys())
+        self.__db.execute('INSERT INTO pages (url, %s) VALUES (?%s) ON CONFLICT(url) DO UPDATE SET %s'
+                          % (', '.join(names), ', ?' * len(names),
+                             ', '.join(['%s = excluded.%s' % (n, n) for n in names])),
+                          [self.key(url)] + [fields[n] for n in names])
+        self.__pending += 1
+        if self.__pending >= COMMIT_SIZE:
+            self.commit()
+
+    def __contains__(self, url):
+        return self.__db.execute('SELECT 1 FROM pages WHERE url = ?', (self.key(url),)).fetchone() is not None
+
+    def __len__(self):
+        return self.__db.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+
+    def commit(self):
+        self.__db.commit()
+        self.__pending = 0
+
+    def close(self):
+        """Commit and close the store; a store shared through :meth:`open` is
+        closed by its last user.
+
+            >>> store.close()
+        """
+        self.commit()
+        if self._release_shared(self.filename):
+            self.__db.close()
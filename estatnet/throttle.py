@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__throttle
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+.. _Scrapy: https://scrapy.org
+.. |Scrapy| replace:: `Scrapy <Scrapy_>`_
+
+Adaptive throttling of the |StatX| crawls.
+
+**Description**
+
+The class :class:`ENetThrottle` adapts the concurrency and the delay of the
+requests sent to a website from the feedback of its responses:
+
+* overload (responses :literal:`429` or :literal:`503`, network errors, or
+  latencies far beyond the target) halves the concurrency, then, once at its
+  minimum, doubles the delay: consecutive overloads back off exponentially; the
+  requests are further paused as long as required by :literal:`Retry-After`,
+* latencies (95th percentile over a window of responses) above the target
+  decrease the concurrency by one,
+* latencies within the target first bring the delay back to its minimum, then
+  increase the concurrency by one.
+
+The downloader middleware :class:`estatnet.middlewares.ENetThrottleMiddleware`
+applies the decisions to the |Scrapy| download slots, and reports the current
+state (:literal:`estatnet/throttle/concurrency`, :literal:`delay`,
+:literal:`latency_p50`, :literal:`latency_p95`) and the decisions taken
+(:literal:`estatnet/throttle/backoff`, :literal:`decrease`, :literal:`increase`,
+:literal:`recover`) in the crawl stats:
+
+    ESTATNET_THROTTLE_ENABLED = True
+    DOWNLOADER_MIDDLEWARES = {'estatnet.middlewares.ENetThrottleMiddleware': 600}
+
+**Dependencies**
+
+*require*:      :mod:`collections`, :mod:`email.utils`, :mod:`time`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Sun Jan 14 17:31:51 2018
+
+#%%
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+from . import ENetError#analysis:ignore
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+THROTTLE_SETTING    = 'ESTATNET_THROTTLE_ENABLED'
+"""Name of the |Scrapy| setting enabling the adaptive throttling.
+"""
+
+TARGET_LATENCY      = 1.
+"""Default target of the 95th percentile of the latencies, in seconds (setting
+:literal:`ESTATNET_THROTTLE_TARGET_LATENCY`).
+"""
+
+START_CONCURRENCY   = 4
+"""Default initial concurrency (setting :literal:`ESTATNET_THROTTLE_START_CONCURRENCY`).
+"""
+
+MAX_DELAY           = 60.
+"""Default maximum delay between requests, in seconds (setting
+:literal:`ESTATNET_THROTTLE_MAX_DELAY`).
+"""
+
+BACKOFF_DELAY       = 0.25
+"""Delay set on the first overload when no delay is used.
+"""
+
+OVERLOAD_STATUS     = (429, 503)
+"""Status codes of the responses of an overloaded website.
+"""
+
+OVERLOAD_FACTOR     = 3.
+"""Latencies beyond this factor of the target are considered as an overload.
+"""
+
+WINDOW              = 50
+"""Number of (last) latencies over which the percentiles are computed.
+"""
+
+ADJUST_INTERVAL     = 10
+"""Minimum number of responses between two adjustments when no delay is used.
+"""
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+def retry_after(value, now=None):
+    """Parse a :literal:`Retry-After` header.
+
+        >>> seconds = retry_after(value, now=None)
+
+    Returns
+    -------
+    seconds : float
+        delay (in seconds) given either as a number of seconds or as a date, or
+        `None` when the header is missing or cannot be parsed.
+    """
+    if isinstance(value, bytes):
+        value = value.decode('latin-1')
+    if value in (None,''):
+        return None
+    try:
+        return max(float(value), 0.)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - (time.time() if now is None else now), 0.)
+    except (TypeError, ValueError):
+        return None
+
+
+class ENetThrottle(object):
+    """Class providing with the adaptive throttling of the requests sent to a
+    website.
+
+        >>> throttle = ENetThrottle(concurrency=START_CONCURRENCY, max_concurrency=16)
+        >>> decision = throttle.observe(latency=0.2, status=200)
+        >>> throttle.concurrency, throttle.delay
+
+    Arguments
+    ---------
+    concurrency : int
+        initial concurrency; default: :data:`START_CONCURRENCY`.
+    delay : float
+        initial (and minimum) delay between requests, in seconds; default: 0.
+    min_concurrency, max_concurrency : int
+        bounds of the concurrency; default: 1 and 16.
+    max_delay : float
+        maximum delay between requests; default: :data:`MAX_DELAY`.
+    target : float
+        target of the 95th percentile of the latencies; default: :data:`TARGET_LATENCY`.
+    window : int
+        number of latencies kept; default: :data:`WINDOW`.
+
+    Attributes
+    ----------
+    level : int
+        number of consecutive backoffs.
+    pause : float
+        time to wait before sending further requests, as required by the website
+        (see :meth:`observe`), or `None`.
+    decisions : dict
+        number of decisions taken, by type: :literal:`'backoff'`, :literal:`'decrease'`,
+        :literal:`'increase'`, :literal:`'recover'`.
+    """
+
+    def __init__(self, concurrency=START_CONCURRENCY, delay=0., min_concurrency=1, max_concurrency=16,
+                 max_delay=MAX_DELAY, target=TARGET_LATENCY, window=WINDOW):
+        if not 1 <= min_concurrency <= max_concurrency or delay < 0 or max_delay < delay or target <= 0:
+            raise ENetError("Wrong throttling parameters")
+        self.min_concurrency, self.max_concurrency = min_concurrency, max_concurrency
+        self.concurrency = min(max(int(concurrency), min_concurrency), max_concurrency)
+        self.min_delay, self.max_delay, self.delay = delay, max_delay, delay
+        self.target = target
+        self.latencies = deque(maxlen=window)
+        self.level = 0
+        self.decisions = {'backoff': 0, 'decrease': 0, 'increase': 0, 'recover': 0}
+        self.pause = None
+        self.__count = 0 # responses since the last adjustment
+        self.__inflight = 0 # requests in flight at the last backoff
+
+    def percentile(self, q):
+        """Percentile of the latencies of the window (`None` when empty).
+
+            >>> p95 = throttle.percentile(0.95)
+        """
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)]
+
+    def _decide(self, decision):
+        self.decisions[decision] += 1
+        self.__count = 0
+        return decision
+
+    def backoff(self):
+        """Back off: halve the concurrency or, at the minimum concurrency,
+        double the delay (at least :data:`BACKOFF_DELAY`).
+
+            >>> throttle.backoff()
+        """
+        self.level += 1
+        self.__inflight = self.concurrency
+        if self.concurrency > self.min_concurrency:
+            self.concurrency = max(self.min_concurrency, self.concurrency // 2)
+        else:
+            self.delay = min(self.max_delay, max(2 * self.delay, BACKOFF_DELAY))
+        self.latencies.clear() # the latencies measured before are outdated
+        return self._decide('backoff')
+
+    def observe(self, latency=None, status=200, wait=None):
+        """Observe a response (or an error) and adjust the concurrency and the
+        delay.
+
+            >>> decision = throttle.observe(latency=None, status=200, wait=None)
+
+        Arguments
+        ---------
+        latency : float
+            latency of the response, in seconds.
+        status : int
+            status of the response; `None` for a network error.
+        wait : float
+            time required by the website before sending further requests (see
+            :meth:`retry_after`): it is kept in :attr:`pause` (bounded by the
+            maximum delay) until consumed by the caller.
+
+        Returns
+        -------
+        decision : str
+            decision taken (see :attr:`decisions`), or `None`.
+        """
+        self.__count += 1
+        if wait is not None:
+            self.pause = max(self.pause or 0., min(wait, self.max_delay))
+        if status is None or status in OVERLOAD_STATUS:
+            # the responses to the requests in flight when backing off answer
+            # the same overload: back off once for all of them
+            if self.level > 0 and self.__count <= self.__inflight:
+                return None
+            return self.backoff()
+        if latency is not None:
+            self.latencies.append(latency)
+        # with a delay, responses are spaced out: adjust after every round of
+        # concurrent requests, not to recover too slowly
+        interval = self.concurrency if self.delay > 0 else max(ADJUST_INTERVAL, self.concurrency)
+        if self.__count < interval or not self.latencies:
+            return None
+        p95 = self.percentile(0.95)
+        if p95 > OVERLOAD_FACTOR * self.target:
+            return self.backoff()
+        self.level = 0
+        if p95 > self.target:
+            if self.concurrency <= self.min_concurrency:
+                return None
+            self.concurrency -= 1
+            return self._decide('decrease')
+        elif self.delay > self.min_delay:
+            self.delay = self.delay / 2 if self.delay / 2 >= BACKOFF_DELAY / 4 else self.min_delay
+            self.delay = max(self.delay, self.min_delay)
+            return self._decide('recover')
+        elif self.concurrency < self.max_concurrency:
+            self.concurrency += 1
+            return self._decide('increase')
+        self.__count = 0
+        return None
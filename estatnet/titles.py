@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__titles
+
+.. Links
+
+.. _StatX: https://ec.europa.eu/eurostat/statistics-explained/index.php/Main_Page
+.. |StatX| replace:: `Statistics Explained <StatX_>`_
+.. _Scrapy: https://scrapy.org
+.. |Scrapy| replace:: `Scrapy <Scrapy_>`_
+
+Interning of the titles of the |StatX| pages to integer identifiers.
+
+**Description**
+
+The link fields of the items (:literal:`category`, :literal:`see_also`,
+:literal:`page`, :literal:`concept`, :literal:`link`, ...) hold the raw links
+of the pages, repeated over thousands of items. The class :class:`ENetTitleTable`
+maps the canonical title of the page targeted by each link (see
+:meth:`estatnet.pages.link_title`) to an integer identifier:
+
+* identifiers are consecutive, and never reassigned: a title keeps the same
+  identifier as long as the table lives,
+* a table stored in a file (SQLite) keeps them across crawls, so that the
+  pages of different crawls are joined on their identifiers.
+
+The item pipeline :class:`estatnet.pipelines.ENetTitlePipeline` sets the
+identifiers of the page of the items (:literal:`node_id`) and of the pages
+they link to (:literal:`link_ids`, by field). The graph of the pages (see
+:mod:`estatnet.graph`) built in the same process uses the same table, so that
+its nodes are the identifiers of the titles:
+
+    ESTATNET_TITLES_FILE = 'estatnet.titles'
+    ITEM_PIPELINES = {'estatnet.pipelines.ENetTitlePipeline': 700}
+
+**Dependencies**
+
+*require*:      :mod:`sqlite3`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Sun Jan 14 17:31:51 2018
+
+#%%
+import sqlite3
+
+from . import ENetError, ENetShared#analysis:ignore
+from .pages import link_title
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+TITLES_SETTING      = 'ESTATNET_TITLES_FILE'
+"""Name of the |Scrapy| setting giving the file of the table of titles.
+"""
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+class ENetTitleTable(ENetShared):
+    """Class providing with the interning of the canonical titles of pages to
+    stable integer identifiers.
+
+        >>> table = ENetTitleTable(filename=None)
+        >>> n = table.id(title)
+        >>> ids = table.ids(links)
+        >>> title = table.title(n)
+
+    Arguments
+    ---------
+    filename : str
+        file of the (SQLite) table, loaded when it exists; default: `None` for
+        a transient table.
+
+    Attributes
+    ----------
+    titles : list
+        titles, indexed by identifier.
+    """
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.titles, self.__ids = [], {}
+        self.__db, self.__saved = None, 0
+        if filename in (None,''):
+            return
+        self.__db = sqlite3.connect(filename)
+        self.__db.execute('CREATE TABLE IF NOT EXISTS titles (id INTEGER PRIMARY KEY, title TEXT UNIQUE NOT NULL)')
+        for (n, title) in self.__db.execute('SELECT id, title FROM titles ORDER BY id'):
+            if n != len(self.titles):
+                raise ENetError("Table of titles %s corrupted" % filename)
+            self.__ids[title] = n
+            self.titles.append(title)
+        self.__saved = len(self.titles)
+
+    @classmethod
+    def open(cls, filename):
+        """Open the table of a file, shared by the pipelines of the process
+        (see :class:`estatnet.ENetShared`).
+
+            >>> table = ENetTitleTable.open(filename)
+        """
+        return cls._open_shared(filename, lambda: cls(filename))
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __contains__(self, title):
+        return title in self.__ids
+
+    def id(self, title, create=True):
+        """Identifier of a canonical title.
+
+            >>> n = table.id(title, create=True)
+
+        Returns
+        -------
+        n : int
+            identifier of the title; `None` when the title is not in the table,
+            unless it is added (:literal:`create=True`).
+        """
+        n = self.__ids.get(title)
+        if n is None and create:
+            n = self.__ids[title] = len(self.titles)
+            self.titles.append(title)
+        return n
+
+    def title(self, n):
+        return self.titles[n]
+
+    def ids(self, links, create=True):
+        """Identifiers of the (distinct) pages targeted by links.
+
+            >>> ids = table.ids(links, create=True)
+
+        Arguments
+        ---------
+        links : list
+            absolute or relative URLs; those not targeting a page of the website
+            are ignored.
+
+        Returns
+        -------
+        ids : list
+            identifiers, in the order of the links.
+        """
+        ids, seen = [], set()
+        for title in map(link_title, links):
+            n = self.id(title, create=create) if title not in (None,'') else None
+            if n is not None and n not in seen:
+                seen.add(n)
+                ids.append(n)
+        return ids
+
+    def commit(self):
+        """Save the titles added in the file of the table (if any).
+
+            >>> table.commit()
+        """
+        if self.__db is None or self.__saved == len(self.titles):
+            return
+        with self.__db:
+            self.__db.executemany('INSERT INTO titles (id, title) VALUES (?, ?)',
+                                  [(n, self.titles[n]) for n in range(self.__saved, len(self.titles))])
+        self.__saved = len(self.titles)
+
+    def close(self):
+        """Commit and close the table; a table shared through :meth:`open` is
+        closed by its last user.
+
+            >>> table.close()
+        """
+        if self.filename in (None,''):
+            return
+        self.commit()
+        if self._release_shared(self.filename):
+            self.__db.close()
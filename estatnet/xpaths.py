@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.. _estatnet__xpaths
+
+.. Links
+
+.. _lxml: http://lxml.de
+.. |lxml| replace:: `lxml <lxml_>`_
+
+Registry of precompiled xpath expressions.
+
+**Description**
+
+The path tables of :mod:`estatnet.items` are defined as plain strings (see
+:meth:`estatnet.ENetXpath.create`). Evaluated through :meth:`Selector.xpath`,
+such strings are parsed again by |lxml| every time they are run, _i.e._ once
+per field and per response. The registry below compiles every expression once
+(at load time) into a reusable :class:`lxml.etree.XPath` object and evaluates
+the compiled object directly on the document tree.
+
+**Dependencies**
+
+*require*:      :mod:`lxml`
+
+**Contents**
+"""
+
+# *credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+# *since*:        Mon Dec 18 17:28:29 2017
+
+#%%
+from collections.abc import Mapping
+
+from lxml import etree
+
+from . import ENetError, ENetXpath#analysis:ignore
+
+#%%
+#==============================================================================
+# GLOBAL VARIABLES
+#==============================================================================
+
+XPATH_NAMESPACES    = {'re':    'http://exslt.org/regular-expressions',
+                       'set':   'http://exslt.org/sets'}
+"""Namespaces available to the compiled expressions: these are the EXSLT
+namespaces also registered by default on :class:`parsel.Selector`.
+"""
+
+#%%
+#==============================================================================
+# GLOBAL CLASSES/METHODS
+#==============================================================================
+
+class ENetXpathRegistry(object):
+    """Class providing with a registry of precompiled xpath expressions.
+
+        >>> registry = ENetXpathRegistry(*tables)
+
+    Arguments
+    ---------
+    tables : dict
+        (possibly nested) dictionaries of xpath expressions, _e.g._ the path tables
+        defined in :mod:`estatnet.items`; all string values found in the tables
+        are compiled.
+    """
+
+    def __init__(self, *tables):
+        self.__compiled = {}
+        [self.register(table) for table in tables]
+
+    def __contains__(self, path):
+        return path in self.__compiled
+
+    def __len__(self):
+        return len(self.__compiled)
+
+    def __iter__(self):
+        return iter(self.__compiled)
+
+    def __getitem__(self, path):
+        if isinstance(path, etree.XPath):
+            return path
+        try:
+            return self.__compiled[path]
+        except KeyError:
+            return self.compile(path)
+
+    def compile(self, path):
+        """Compile an xpath expression (once) and store it in the registry.
+
+            >>> xpath = registry.compile(path)
+
+        Arguments
+        ---------
+        path : str
+            `xpath` formatted path.
+
+        Returns
+        -------
+        xpath : lxml.etree.XPath
+            compiled expression.
+        """
+        if path in (None,''):
+            raise ENetError("Empty path cannot be compiled")
+        elif path not in self.__compiled:
+            try:
+                self.__compiled[path] = etree.XPath(path,
+                                                    namespaces=XPATH_NAMESPACES,
+                                                    smart_strings=False)
+            except etree.XPathSyntaxError as e:
+                raise ENetError("Wrong xpath %s: %s" % (path, e))
+        return self.__compiled[path]
+
+    def register(self, paths):
+        """Compile all expressions of a (possibly nested) table of paths.
+
+            >>> registry.register(paths)
+
+        Empty paths (*e.g.* fields not available for a given layout version) are
+        ignored.
+        """
+        if isinstance(paths, Mapping):
+            [self.register(path) for path in paths.values()]
+        elif isinstance(paths, (list, tuple)):
+            [self.register(path) for path in paths]
+        elif isinstance(paths, str) and paths != '':
+            self.compile(paths)
+        return self
+
+    def xpath(self, selector, path, **kwargs):
+        """Evaluate an expression over a selector using its compiled version.
+
+            >>> sel = registry.xpath(selector, path, **kwargs)
+
+        Arguments
+        ---------
+        selector : scrapy.Selector
+            selector to evaluate the expression on.
+        path : str,lxml.etree.XPath
+            `xpath` formatted path or compiled expression; paths that were not
+            registered yet are compiled on the fly.
+        kwargs :
+            variables passed to the expression.
+
+        Returns
+        -------
+        sel : scrapy.SelectorList
+            list of selectors, as :meth:`selector.xpath(path)` would return.
+        """
+        xpath = self[path]
+        try:
+            result = xpath(selector.root, **kwargs)
+        except etree.XPathError as e:
+            raise ENetError("Failed to evaluate xpath %s: %s" % (xpath.path, e))
+        if not isinstance(result, list):
+            result = [result]
+        return selector.selectorlist_cls([selector.__class__(root=x, _expr=xpath.path,
+                                                             namespaces=selector.namespaces,
+                                                             type=selector.type)
+                                          for x in result])
+
+def _document_root(document):
+    if isinstance(document, (str, bytes)):
+        return etree.fromstring(document, parser=etree.HTMLParser())
+    elif hasattr(document, 'selector'):     # scrapy.http.Response
+        return document.selector.root
+    else:                                   # scrapy.Selector or lxml element
+        return getattr(document, 'root', document)
+
+def check_equivalence(paths, documents, rewrite=None):
+    """Check that the rewritten forms of xpath expressions select the same
+    contents as the original expressions over a set of documents.
+
+        >>> mismatches = check_equivalence(paths, documents, rewrite=None)
+
+    Arguments
+    ---------
+    paths : str,dict
+        `xpath` formatted path, or (possibly nested) table of paths.
+    documents : list
+        documents to run the expressions on: :class:`scrapy.http.Response`,
+        :class:`scrapy.Selector`, :class:`lxml.etree._Element` or HTML text.
+    rewrite : callable
+        function rewriting a path; default: None, _i.e._ :meth:`ENetXpath.optimize`
+        is used.
+
+    Returns
+    -------
+    mismatches : list
+        list of tuples :literal:`(path, rewritten, index, values, rewritten_values)`
+        for all documents (of index :literal:`index`) where the outputs differ;
+        the list is empty when both forms are equivalent over :data:`documents`.
+    """
+    if rewrite is None:
+        rewrite = ENetXpath.optimize
+    registry = ENetXpathRegistry(paths)
+    roots = [_document_root(document) for document in documents]
+    mismatches = []
+    for path in sorted(registry):
+        rewritten = rewrite(path)
+        if rewritten == path:
+            continue
+        xpath, xrewritten = registry[path], registry.compile(rewritten)
+        for (i, root) in enumerate(roots):
+            values, rvalues = xpath(root), xrewritten(root)
+            if values != rvalues:
+                mismatches.append((path, rewritten, i, values, rvalues))
+    return mismatches
+
+XPATHS              = ENetXpathRegistry()
+"""Default registry where the path tables of :mod:`estatnet.items` are compiled.
+"""
@@ -19,9 +19,9 @@ Testing units.
 # PROGRAM METADATA
 #==============================================================================
 
-from esscrape.metadata import metadata
+from estatnet import METADATA
 
-metadata = metadata.copy()
+metadata = METADATA.copy()
 metadata.update({ 
                 'date': 'Sat Jan 27 20:00:50 2018',
                 'credits':  ['grazzja']
@@ -32,4 +32,4 @@ metadata.update({
 # CORE
 #==============================================================================
  
-__all__ = ['items']#analysis:ignore
+__all__ = ['items', 'crawl']#analysis:ignore
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _crawl.py
+
+End-to-end crawls of the tests, run against the stand-in server in a new
+process: the reactor cannot be restarted.
+
+    >>> first, second = run_crawl((PageCrawler, settings, kwargs), (PageCrawler, settings, kwargs),
+    ...                           server=True, collect=None, between=None)
+
+Every run returns the dictionary of the crawl with the keys:
+
+* :literal:`'stats'`: the statistics of the crawler,
+* :literal:`'items'`: the items scraped (as dictionaries), and :literal:`'types'`
+  the names of their classes,
+* :literal:`'collected'`: the values output by the function :literal:`collect`,
+* :literal:`'nrequests'`: the number of requests received by the server.
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+import os, sys
+import json
+import subprocess
+
+ROOTDIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#%%
+#/************************************************************************/
+def _path(obj):
+    # the objects are loaded again by the new process
+    return obj if obj is None or isinstance(obj, str) else '%s.%s' % (obj.__module__, obj.__qualname__)
+
+def _command(*runs, server=True, collect=None, between=None):
+    spec = {'runs': [(_path(spider), settings or {}, kwargs or {}) for (spider, settings, kwargs) in runs],
+            'server': server, 'collect': _path(collect), 'between': _path(between)}
+    return [sys.executable, '-W', 'ignore', '-m', 'tests.crawl', json.dumps(spec)]
+
+#/************************************************************************/
+def run_crawl(*runs, timeout=300, **kwargs):
+    """Run the crawls in a new process, and return their results.
+
+        >>> results = run_crawl(*runs, timeout=300, server=True, collect=None, between=None)
+
+    Arguments
+    ---------
+    runs :
+        tuples :literal:`(spider, settings, kwargs)` of the crawls, run one after
+        the other.
+    server : bool,dict
+        keyword arguments of the stand-in server targeted by the crawls; when
+        :literal:`False`, no server is started and the settings are used as is.
+    collect : callable,str
+        function :literal:`collect(crawler, output)` connecting further receivers
+        to the signals of the crawler, that append to :literal:`output`.
+    between : callable,str
+        function :literal:`between(server, crawler)` called after each run.
+    """
+    output = subprocess.check_output(_command(*runs, **kwargs), cwd=ROOTDIR, timeout=timeout)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+def start_crawl(*runs, **kwargs):
+    """Start the crawls in a new process, whose output is discarded.
+
+        >>> process = start_crawl(*runs, server=True, collect=None, between=None)
+    """
+    return subprocess.Popen(_command(*runs, **kwargs), cwd=ROOTDIR, stdout=subprocess.DEVNULL)
+
+#/************************************************************************/
+def main(spec):
+    from estatnet.server import ENetStandinServer
+    from scrapy import signals
+    from scrapy.crawler import Crawler, CrawlerRunner
+    from scrapy.utils.misc import load_object
+    from twisted.internet import reactor, defer
+    server = spec['server']
+    if server is not False:
+        server = ENetStandinServer(**(server if isinstance(server, dict) else {})).start()
+    collect, between = [load_object(p) if p else None for p in (spec['collect'], spec['between'])]
+    results, errors = [], []
+    @defer.inlineCallbacks
+    def crawl():
+        try:
+            for (spider, settings, kwargs) in spec['runs']:
+                result = {'items': [], 'types': [], 'collected': []}
+                settings.setdefault('LOG_LEVEL', 'ERROR')
+                crawler = Crawler(load_object(spider), server.settings(**settings) if server else settings)
+                def scraped(item, response, spider, result=result):
+                    result['items'].append(dict(item))
+                    result['types'].append(type(item).__name__)
+                crawler.signals.connect(scraped, signal=signals.item_scraped, weak=False)
+                if collect is not None:
+                    collect(crawler, result['collected'])
+                nrequests = server.nrequests if server else 0
+                yield CrawlerRunner().crawl(crawler, **kwargs)
+                result.update(stats=crawler.stats.get_stats(),
+                              nrequests=(server.nrequests if server else 0) - nrequests)
+                results.append(result)
+                if between is not None:
+                    between(server, crawler)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            reactor.stop()
+    reactor.callWhenRunning(crawl)
+    reactor.run()
+    if errors:
+        raise errors[0]
+    print(json.dumps(results, default=str))
+
+if __name__ == '__main__':
+    main(json.loads(sys.argv[1]))
@@ -16,11 +16,11 @@ import scrapy
 from scrapy import http
 from scrapy.loader.processors import TakeFirst
 
-from esscrape import items
+from estatnet import items
 
 _xp = lambda sel, path: sel.xpath(path).extract()
 try:
-    from esscrape.items import xpath
+    from estatnet import ENetXpath as xpath
 except ImportError:
     _xpcreate = lambda **kwargs: None
 else:
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_analytics.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import ENetError
+from estatnet import analytics
+from estatnet.graph import ENetGraph
+
+import os
+import json
+import tempfile
+import time
+import unittest
+import importlib.util
+
+HAS_SCIPY = all([importlib.util.find_spec(m) is not None for m in ('numpy', 'scipy')])
+HAS_NETWORKX = importlib.util.find_spec('networkx') is not None
+
+#%%
+#/************************************************************************/
+def dense_pagerank(graph, damping=0.85, weights=None, niter=200):
+    # reference: power iterations over the dense adjacency
+    n, weights = graph.nnodes, weights or {}
+    A = [[0.] * n for _ in range(n)]
+    for (s, d, t) in graph.edges():
+        A[s][d] += weights.get(t, 1.)
+    x = [1. / n] * n
+    for _ in range(niter):
+        out = [sum(row) for row in A]
+        dangling = sum([x[s] for s in range(n) if out[s] == 0])
+        x = [(1. - damping) / n + damping * dangling / n
+             + damping * sum([x[s] * A[s][d] / out[s] for s in range(n) if out[s] > 0])
+             for d in range(n)]
+    return x
+
+#%%
+#/************************************************************************/
+class analyticsTestCase(unittest.TestCase):
+    """Class providing the tests of the ranking of the pages.
+    """
+
+    def setUp(self):
+        self.graph = ENetGraph()
+        self.graph.add_edges('A', ['B', 'C'], 'link')
+        self.graph.add_edges('B', ['C'], 'link')
+        self.graph.add_edges('C', ['A'], 'see_also')
+        self.graph.add_edges('D', ['C'], 'category')
+        self.graph.add_edges('D', ['C'], 'link')
+        self.graph.add_edges('C', ['E'], 'category') # E is dangling
+        self.graph.finalize()
+
+    def assertClose(self, x, y, places=5):
+        self.assertEqual(len(x), len(y))
+        [self.assertAlmostEqual(a, b, places=places) for (a, b) in zip(x, y)]
+
+    def test01_degrees(self):
+        indegree, outdegree = analytics.degrees(self.graph, backend='python')
+        self.assertEqual(list(indegree), [1, 1, 4, 0, 1])
+        self.assertEqual(list(outdegree), [2, 1, 2, 2, 0])
+        indegree, outdegree = analytics.degrees(self.graph, weights={'category': 0, 'see_also': 2})
+        self.assertEqual(list(indegree), [2, 1, 3, 0, 0])
+        self.assertEqual(list(outdegree), [2, 1, 2, 1, 0])
+        self.assertRaises(ENetError, analytics.degrees, self.graph, weights={'unknown': 1})
+        self.assertRaises(ENetError, analytics.degrees, self.graph, backend='unknown')
+        self.graph.thaw()
+        self.assertRaises(ENetError, analytics.degrees, self.graph)
+
+    def test02_pagerank(self):
+        for weights in (None, {'see_also': 3, 'category': 0.5}, {'category': 0}):
+            scores = analytics.pagerank(self.graph, weights=weights, tol=1e-10, backend='python')
+            self.assertAlmostEqual(sum(scores), 1.)
+            self.assertClose(scores, dense_pagerank(self.graph, weights=weights))
+        self.assertClose(analytics.pagerank(self.graph, damping=0), [0.2] * 5)
+        self.assertRaises(ENetError, analytics.pagerank, self.graph, damping=2)
+        self.assertRaises(ENetError, analytics.pagerank, self.graph, max_iter=1)
+        self.assertEqual(analytics.top(self.graph, analytics.pagerank(self.graph), n=2)[0][0], 'C')
+        self.assertEqual([t for (t, _) in analytics.top(self.graph, [5, 4, 3, 2, 1], prefix='D')], ['D'])
+        # a cycle ranks all the pages the same
+        graph = ENetGraph()
+        [graph.add_edges(s, [d], 'link') for (s, d) in ('AB', 'BC', 'CA')]
+        graph.finalize()
+        self.assertClose(analytics.pagerank(graph), [1. / 3] * 3)
+
+    def test03_hits(self):
+        # A and D point to B and C: A, D are the hubs, B, C the authorities
+        graph = ENetGraph()
+        [graph.add_edges(s, ['B', 'C'], 'link') for s in ('A', 'D')]
+        graph.finalize()
+        hubs, authorities = analytics.hits(graph, backend='python')
+        self.assertClose(hubs, [0.5, 0, 0, 0.5])
+        self.assertClose(authorities, [0, 0.5, 0.5, 0])
+        hubs, authorities = analytics.hits(self.graph, weights={'see_also': 0})
+        self.assertAlmostEqual(sum(hubs), 1.)
+        self.assertEqual(max(range(5), key=lambda n: authorities[n]), self.graph.node('C'))
+        self.assertAlmostEqual(hubs[self.graph.node('C')], 0) # C only points to E, no authority
+
+    def random_scores(self, weights):
+        # the baseline scores over a random graph
+        graph = analytics.random_graph(200, 1000, seed=1)
+        scores = analytics.pagerank(graph, weights=weights, tol=1e-10, backend='python')
+        hubs, authorities = analytics.hits(graph, weights=weights, tol=1e-10, max_iter=1000, backend='python')
+        return graph, scores, authorities
+
+    @unittest.skipIf(HAS_SCIPY, 'scipy installed')
+    def test04_noscipy(self):
+        self.assertRaises(ENetError, analytics.pagerank, self.graph, backend='scipy')
+
+    @unittest.skipUnless(HAS_SCIPY, 'scipy not installed')
+    def test05_scipy(self):
+        # the vectorized backend and the baseline give the same scores
+        weights = {'link': 2, 'category': 0}
+        graph, scores, authorities = self.random_scores(weights)
+        indices = list(graph.indices)
+        self.assertClose(analytics.pagerank(graph, weights=weights, tol=1e-10, backend='scipy'), scores)
+        self.assertClose(analytics.hits(graph, weights=weights, tol=1e-10, max_iter=1000,
+                                        backend='scipy')[1], authorities)
+        self.assertClose(analytics.degrees(graph, weights=weights, backend='scipy')[0],
+                         analytics.degrees(graph, weights=weights, backend='python')[0])
+        # the graph is left untouched
+        self.assertEqual(list(graph.indices), indices)
+
+    @unittest.skipUnless(HAS_NETWORKX, 'networkx not installed')
+    def test06_networkx(self):
+        import networkx as nx
+        weights = {'link': 2, 'category': 0}
+        graph, scores, _ = self.random_scores(weights)
+        expected = nx.pagerank(analytics._networkx(graph, weights), tol=1e-10, weight='weight')
+        self.assertClose(scores, [expected[n] for n in range(graph.nnodes)])
+
+    def test07_benchmark(self):
+        results = analytics.benchmark(analytics.random_graph(100, 500), repeat=2)
+        self.assertEqual((results['nodes'], results['edges'] <= 500), (100, True))
+        self.assertEqual(set(results['times']['python']), {'degrees', 'pagerank', 'hits'})
+        with tempfile.TemporaryDirectory() as directory:
+            self.graph.save(os.path.join(directory, 'graph'))
+            output = os.path.join(directory, 'results.json')
+            self.assertEqual(analytics.main([os.path.join(directory, 'graph'), '-n', '3',
+                                             '-w', '{"category": 0}', '-o', output]), 0)
+            with open(output) as f:
+                results = json.load(f)
+        self.assertEqual(len(results['pagerank']), 3)
+        self.assertEqual(results['authorities'][0][0], 'C')
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module analytics.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
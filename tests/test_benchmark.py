@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_benchmark.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_ 
+
+*version*:      0.1
+--
+*since*:        Mon Dec 18 17:28:29 2017
+
+**Contents**
+"""
+
+from estatnet import ENetError
+from estatnet import settings
+from estatnet import benchmark
+
+import os
+import copy
+import tempfile
+import time
+import unittest
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+#%%
+#/************************************************************************/
+class benchmarkTestCase(unittest.TestCase):
+    """Class providing the tests of the extraction benchmark.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.results = benchmark.run(CORPUS, repeat=2)
+
+    def test01_corpus(self):
+        corpus = benchmark.load_corpus(CORPUS)
+        self.assertEqual(set(corpus.keys()), set(benchmark.BENCHMARK_KEYS))
+        self.assertTrue(corpus[settings.GLOSSARY_KEY][0].url.endswith('/Glossary:At-risk-of-poverty_rate'))
+        self.assertRaises(ENetError, benchmark.load_corpus, os.path.join(CORPUS, 'none'))
+    def test02_run(self):
+        results = self.results
+        self.assertEqual(results['metadata']['npages'], 5)
+        self.assertEqual(results['loaders'][settings.ARTICLE_KEY]['items'], 4)
+        self.assertEqual(results['total']['items'], 10)
+        self.assertTrue(results['total']['peak_memory'] > 0)
+        fields = results['fields'][settings.ARTICLE_KEY]
+        # fields evaluated by xpath, and single-pass extraction of the sections
+        # (the section-based fields are not timed apart: the loaders do not
+        # evaluate their xpath)
+        self.assertTrue(all([key in fields for key in ('title', 'category', benchmark.SECTIONS_FIELD)]))
+        self.assertFalse(set(fields).intersection(['see_also', 'legislation', 'table']))
+        self.assertEqual(fields['title']['calls'], 4)
+        self.assertEqual(fields[benchmark.SECTIONS_FIELD]['calls'], 4)
+        self.assertEqual(set(results['snapshot'].keys()), {'build', 'read', 'import_snapshot', 'import_build'})
+    def test03_write_read(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'results.json')
+            benchmark.write(self.results, filename)
+            self.assertEqual(benchmark.read(filename), self.results)
+    def test04_compare(self):
+        self.assertEqual(benchmark.compare(self.results, self.results), [])
+        slower = copy.deepcopy(self.results)
+        slower['loaders'][settings.THEME_KEY]['time_per_item'] *= 2
+        slower['fields'][settings.THEME_KEY]['title']['time_per_call'] *= 2
+        slower['total']['items_per_second'] /= 2
+        metrics = [metric for (metric, _, _) in benchmark.compare(slower, self.results)]
+        self.assertEqual(sorted(metrics), ['fields/theme/title/time_per_call',
+                                           'loaders/theme/time_per_item',
+                                           'total/items_per_second'])
+        self.assertEqual(benchmark.compare(slower, self.results, tolerance=1.5), [])
+    def test05_main(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'results.json')
+            self.assertEqual(benchmark.main([CORPUS, '-o', filename]), 0)
+            self.assertTrue(os.path.exists(filename))
+            self.assertEqual(benchmark.main([CORPUS, '-b', filename, '-t', '1000']), 0)
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module benchmark.py' % cls.__name__)
+        time.sleep(0.5) 
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
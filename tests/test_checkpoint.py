@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_checkpoint.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import ENetError, ENetWarning, settings
+from estatnet.checkpoint import ENetCheckpoint, CHECKPOINT_SETTING, JOURNAL_FILE, PENDING, DONE
+from estatnet.middlewares import ENetCheckpointMiddleware, ENetCheckpointFailureMiddleware
+from estatnet.server import ENetStandinServer
+from estatnet.spiders.sxnet import PageCrawler
+
+import os
+import json
+import shutil
+import signal
+import tempfile
+import time
+import unittest
+
+import scrapy
+from scrapy.utils.test import get_crawler
+from twisted.python.failure import Failure
+
+from tests.crawl import run_crawl, start_crawl
+
+URL = '%s/%%s' % settings.SX_MAINURL
+
+#%%
+#/************************************************************************/
+class checkpointTestCase(unittest.TestCase):
+    """Class providing the tests of the checkpoints of the crawls.
+    """
+
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test01_checkpoint(self):
+        spider = scrapy.Spider('test')
+        checkpoint = ENetCheckpoint(self.dirname)
+        self.assertEqual(checkpoint.resumed, {'pages': 0, 'items': 0, 'pending': 0})
+        requests = [scrapy.Request(URL % ('Page_%d' % i), callback=spider.parse) for i in range(4)]
+        self.assertEqual([checkpoint.schedule(r, spider) for r in requests + [scrapy.Request(URL % 'Page 0')]],
+                         [True] * 4 + [False])
+        checkpoint.complete(requests[0], [{'title': 'Page 0'}])
+        checkpoint.save()
+        # not checkpointed: lost on interruption
+        checkpoint.complete(requests[1], [{'title': 'Page 1'}])
+        checkpoint.schedule(scrapy.Request(URL % 'Page_4'), spider)
+        checkpoint.close()
+        checkpoint = ENetCheckpoint(self.dirname)
+        self.assertEqual(checkpoint.resumed, {'pages': 1, 'items': 1, 'pending': 3})
+        self.assertEqual(sorted([r.url for r in checkpoint.pending(spider)]), [r.url for r in requests[1:]])
+        self.assertEqual(checkpoint.pending(spider)[0].callback, spider.parse)
+        self.assertIn(scrapy.Request(URL % 'Page_0'), checkpoint)
+        self.assertNotIn(scrapy.Request(URL % 'Page_4'), checkpoint)
+        with open(os.path.join(self.dirname, JOURNAL_FILE)) as f:
+            self.assertEqual([json.loads(l) for l in f], [{'title': 'Page 0'}])
+        checkpoint.close()
+        self.assertRaises(ENetError, ENetCheckpoint, None)
+
+    def test02_redirect(self):
+        # a redirected request is done under its original key
+        spider = scrapy.Spider('test')
+        checkpoint = ENetCheckpoint(self.dirname)
+        request = scrapy.Request(URL % 'Page')
+        checkpoint.schedule(request, spider)
+        checkpoint.complete(request.replace(url=URL % 'Other_page'))
+        checkpoint.save()
+        self.assertEqual((checkpoint.count(PENDING), checkpoint.count(DONE)), (0, 1))
+        checkpoint.close()
+
+    def test03_failures(self):
+        # the requests failed, dropped, or output by the errbacks (which bypass
+        # the spider middlewares) are recorded as well
+        spider = scrapy.Spider('test')
+        with self.assertWarns(ENetWarning):
+            ENetCheckpointMiddleware.from_crawler(get_crawler(settings_dict={CHECKPOINT_SETTING: self.dirname}))
+        crawler = get_crawler(settings_dict={CHECKPOINT_SETTING: self.dirname, 'DOWNLOADER_MIDDLEWARES':
+                                             {'estatnet.middlewares.ENetCheckpointFailureMiddleware': 40}})
+        middleware = ENetCheckpointMiddleware.from_crawler(crawler)
+        downloader = ENetCheckpointFailureMiddleware.from_crawler(crawler)
+        self.assertIs(middleware.checkpoint, downloader.checkpoint)
+        failed, dropped = scrapy.Request(URL % 'Failed'), scrapy.Request(URL % 'Dropped')
+        list(middleware.process_start_requests([failed, dropped], spider))
+        self.assertIsNone(downloader.process_exception(failed, IOError(), spider))
+        middleware.request_dropped(dropped, spider)
+        errback = scrapy.Request(URL % 'Errback')
+        middleware.request_scheduled(errback, spider)
+        failure = Failure(IOError())
+        failure.request = failed
+        middleware.item_scraped({'title': 'Failed'}, failure, spider)
+        middleware.item_scraped({'title': 'Other'}, None, spider)
+        middleware._save()
+        self.assertEqual((middleware.checkpoint.count(PENDING), middleware.checkpoint.count(DONE)), (1, 2))
+        self.assertEqual([r.url for r in middleware.checkpoint.pending(spider)], [errback.url])
+        middleware.spider_closed(spider); downloader.spider_closed(spider)
+        with open(os.path.join(self.dirname, JOURNAL_FILE)) as f:
+            self.assertEqual([json.loads(l) for l in f], [{'title': 'Failed'}])
+
+    def test04_resume(self):
+        # a crawl killed then resumed emits every item once, and does not fetch
+        # again the pages done
+        server = ENetStandinServer(latency=0.01).start()
+        # the server is that of the test, which counts the requests of both runs
+        run = (PageCrawler, server.settings(**{CHECKPOINT_SETTING: self.dirname, 'ESTATNET_CHECKPOINT_INTERVAL': 0.2,
+            'DOWNLOADER_MIDDLEWARES': {'estatnet.middlewares.ENetCheckpointFailureMiddleware': 40},
+            'SPIDER_MIDDLEWARES': {'estatnet.middlewares.ENetCheckpointMiddleware': 40}, 'CONCURRENT_REQUESTS': 4}), {})
+        try:
+            process = start_crawl(run, server=False)
+            journal, start = os.path.join(self.dirname, JOURNAL_FILE), time.time()
+            while time.time() - start < 120:
+                time.sleep(0.2)
+                if os.path.exists(journal) and os.path.getsize(journal) > 200000:
+                    break
+            process.send_signal(signal.SIGKILL)
+            process.wait()
+            killed = server.nrequests
+            stats = dict([(k.split('/')[-1], v) for (k, v) in run_crawl(run, server=False)[0]['stats'].items()
+                          if k.startswith('estatnet/checkpoint/')])
+            resumed = server.nrequests - killed
+        finally:
+            server.stop()
+        with open(journal) as f:
+            titles = [json.loads(l)['title'] for l in f]
+        self.assertEqual(len(titles), len(set(titles)))
+        self.assertEqual(len(titles), 776) # all items of the crawl of the stand-in
+        self.assertGreater(stats['resumed_pages'], 0)
+        self.assertGreater(stats['resumed_items'], 0)
+        self.assertEqual(stats['items'], 776)
+        # only the pages pending at the last checkpoint are fetched again
+        self.assertLessEqual(killed + resumed - 780, stats['restored'])
+        self.assertLess(resumed, 780 - stats['resumed_pages'] + stats['restored'])
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module checkpoint.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_diff.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import ENetError
+from estatnet import diff
+from estatnet.diff import ENetGraphDiff
+from estatnet.graph import ENetGraph
+from estatnet.titles import ENetTitleTable
+
+import os
+import csv
+import json
+import random
+import tempfile
+import time
+import unittest
+
+from array import array
+
+#%%
+#/************************************************************************/
+class diffTestCase(unittest.TestCase):
+    """Class providing the tests of the differences between crawl graphs.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @staticmethod
+    def graph(edges, table=None, scraped=()):
+        graph = ENetGraph(table=table)
+        for (s, d, t) in edges:
+            graph.add_edges(s, [d], t)
+        [graph.node(title, create=True) for title in scraped]
+        graph._grow()
+        for title in scraped:
+            graph.scraped[graph.node(title)] = 1
+        graph.finalize()
+        return graph
+
+    def test01_difference(self):
+        rng = random.Random(0)
+        a, b = sorted(rng.sample(range(1000), 300)), sorted(rng.sample(range(1000), 300))
+        self.assertEqual(list(diff._difference(array('q', a), array('q', b))), sorted(set(a) - set(b)))
+        self.assertEqual(list(diff._difference(array('q', a), array('q'))), a)
+        self.assertEqual(list(diff._difference(array('q'), array('q', b))), [])
+
+    def test02_diff(self):
+        # the titles are not in the same order in both graphs
+        old = self.graph([('A', 'B', 'link'), ('A', 'Category:X', 'category'),
+                          ('Glossary:G', 'A', 'link'), ('C', 'B', 'see_also')], scraped=['Z'])
+        new = self.graph([('Glossary:G', 'A', 'link'), ('A', 'B', 'link'), ('A', 'Category:Y', 'category'),
+                          ('C', 'B', 'link'), ('D', 'Glossary:G', 'glossary')])
+        delta = ENetGraphDiff(old, new)
+        self.assertEqual(sorted(delta.edges()),
+                         [('added', 'A', 'Category:Y', 'category'), ('added', 'C', 'B', 'link'),
+                          ('added', 'D', 'Glossary:G', 'glossary'),
+                          ('removed', 'A', 'Category:X', 'category'), ('removed', 'C', 'B', 'see_also')])
+        self.assertEqual(sorted(delta.nodes()),
+                         [('added', 'Category:Y', 'category'), ('added', 'D', 'article'),
+                          ('removed', 'Category:X', 'category'), ('removed', 'Z', 'article')])
+        self.assertEqual(list(delta.added), sorted(delta.added))
+        stats = delta.summary()
+        self.assertEqual(stats['edges'], {'old': 4, 'new': 5, 'added': 3, 'removed': 2})
+        self.assertEqual(stats['nodes'], {'old': 6, 'new': 6, 'added': 2, 'removed': 2})
+        self.assertEqual(stats['edge_types']['category'], {'added': 1, 'removed': 1})
+        self.assertEqual(stats['page_types']['category'],
+                         {'nodes_added': 1, 'nodes_removed': 1, 'edges_added': 0, 'edges_removed': 0})
+        self.assertEqual(stats['page_types']['article']['edges_added'], 3)
+        # no change from a graph to itself
+        same = ENetGraphDiff(new, new)
+        self.assertEqual((len(same.added), len(same.removed), same.nodes_added), (0, 0, []))
+        new.thaw()
+        self.assertRaises(ENetError, ENetGraphDiff, old, new)
+
+    def test03_shared(self):
+        # crawls sharing the table of titles: the nodes keep their identifiers
+        table = ENetTitleTable()
+        old = self.graph([('A', 'B', 'link'), ('B', 'C', 'link')], table=table)
+        old.save(os.path.join(self.directory.name, 'old'))
+        new = self.graph([('A', 'B', 'link'), ('E', 'A', 'link')], table=table)
+        new.save(os.path.join(self.directory.name, 'new'))
+        delta = ENetGraphDiff(ENetGraph.load(os.path.join(self.directory.name, 'old'), table=table), new)
+        self.assertEqual(delta.titles, ['A', 'B', 'C', 'E'])
+        self.assertEqual(list(delta.edges()), [('added', 'E', 'A', 'link'), ('removed', 'B', 'C', 'link')])
+        self.assertEqual(list(delta.nodes()), [('added', 'E', 'article'), ('removed', 'C', 'article')])
+        self.assertEqual(diff.main([os.path.join(self.directory.name, 'old'), os.path.join(self.directory.name, 'new'),
+                                    '-o', os.path.join(self.directory.name, 'delta')]), 0)
+        with open(os.path.join(self.directory.name, 'delta', 'edges.csv')) as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows, [['change', 'source', 'target', 'type'], ['added', 'E', 'A', 'link'],
+                                ['removed', 'B', 'C', 'link']])
+        with open(os.path.join(self.directory.name, 'delta', 'summary.json')) as f:
+            self.assertEqual(json.load(f), delta.summary())
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module diff.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_dupefilter.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import ENetError
+from estatnet import settings
+from estatnet.pages import canonical_title
+from estatnet.dupefilter import ENetBloomFilter, ENetFingerprintStore, ENetDupeFilter, \
+    DUPEFILTER_SETTING, request_key
+from estatnet.spiders.sxnet import WhatLinksSpider
+
+import os
+import hashlib
+import tempfile
+import time
+import unittest
+
+import scrapy
+from scrapy.utils.test import get_crawler
+
+from tests.crawl import run_crawl
+
+#%%
+#/************************************************************************/
+class dupefilterTestCase(unittest.TestCase):
+    """Class providing the tests of the persistent filter of duplicate requests.
+    """
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.dir.name, 'seen.sqlite')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test01_keys(self):
+        self.assertEqual(canonical_title(' glossary:at-risk  of_poverty rate '), 'Glossary:At-risk_of_poverty_rate')
+        self.assertEqual(canonical_title('income__distribution'), 'Income_distribution')
+        self.assertEqual(canonical_title('Euro:area'), 'Euro:area')
+        key = lambda url, **kw: request_key(scrapy.Request(url, **kw))
+        self.assertEqual(key('%s/Glossary:Euro' % settings.SX_MAINURL),
+                         key('%s?title=glossary:Euro' % settings.SX_MAINURL))
+        self.assertEqual(key('%s/Income%%20distribution' % settings.SX_MAINURL),
+                         key('%s/Income_distribution' % settings.SX_MAINURL))
+        self.assertNotEqual(key('%s?title=Euro&oldid=1' % settings.SX_MAINURL),
+                            key('%s?title=Euro' % settings.SX_MAINURL))
+        self.assertNotEqual(key('%s/Euro' % settings.SX_MAINURL),
+                            key('%s/Euro' % settings.SX_MAINURL, method='POST'))
+        self.assertNotEqual(key('%s?action=query&titles=A' % settings.SX_APIURL),
+                            key('%s?action=query&titles=B' % settings.SX_APIURL))
+
+    def test02_bloom(self):
+        self.assertRaises(ENetError, ENetBloomFilter, 0)
+        bloom = ENetBloomFilter(capacity=1000, error_rate=0.01)
+        keys = [hashlib.sha1(str(i).encode()).digest() for i in range(2000)]
+        self.assertFalse(any([bloom.add(k) for k in keys[:1000]]))
+        self.assertTrue(all([k in bloom for k in keys[:1000]]))
+        self.assertLess(sum([k in bloom for k in keys[1000:]]), 50)
+        # the size depends on the capacity only
+        nbytes = bloom.nbytes
+        [bloom.add(k) for k in keys[1000:]]
+        self.assertEqual(bloom.nbytes, nbytes)
+        self.assertRaises(TypeError, len, bloom)
+
+    def test03_store(self):
+        keys = [hashlib.sha1(str(i).encode()).digest() for i in range(100)]
+        store = ENetFingerprintStore(self.filename, capacity=10)
+        self.assertTrue(all([store.add(k) for k in keys]))
+        self.assertFalse(any([store.add(k) for k in keys]))
+        self.assertEqual(store.nlookups - store.nfalse, 100) # over capacity: lookups, no error
+        store.close()
+        store = ENetFingerprintStore(self.filename)
+        self.assertEqual(len(store), 100)
+        self.assertTrue(keys[0] in store)
+        self.assertFalse(store.add(keys[0]))
+        self.assertEqual(store.nfalse, 0)
+        store.close()
+
+    def test04_dupefilter(self):
+        crawler = get_crawler(scrapy.Spider, {DUPEFILTER_SETTING: self.filename})
+        url = '%s/Glossary:Euro' % settings.SX_MAINURL
+        dupefilter = ENetDupeFilter.from_crawler(crawler)
+        self.assertFalse(dupefilter.request_seen(scrapy.Request(url)))
+        self.assertTrue(dupefilter.request_seen(scrapy.Request(url.replace('Euro', 'euro'))))
+        dupefilter.close('finished')
+        self.assertEqual(crawler.stats.get_value('estatnet/dupefilter/stored'), 1)
+        # resume: seen in the previous run
+        dupefilter = ENetDupeFilter.from_crawler(crawler)
+        self.assertTrue(dupefilter.request_seen(scrapy.Request(url)))
+        dupefilter.close('finished')
+        # no file: a temporary store
+        dupefilter = ENetDupeFilter.from_crawler(get_crawler(scrapy.Spider))
+        filename = dupefilter.store.filename
+        self.assertTrue(os.path.exists(filename))
+        dupefilter.close('finished')
+        self.assertFalse(os.path.exists(filename))
+
+    def test05_resume(self):
+        # a second run only requests the start page: the backlinks were explored
+        # already (in a new process: the reactor cannot be restarted)
+        crawler_settings = {'DUPEFILTER_CLASS': 'estatnet.dupefilter.ENetDupeFilter', DUPEFILTER_SETTING: self.filename}
+        results = run_crawl(*[(WhatLinksSpider, crawler_settings, {'page': 'Main_Page', 'npages': 30})] * 2,
+                            server={'sizes': {'whatlinks': {'nlinks': 10}}})
+        first, second = [(r['stats']['response_received_count'], r['stats'].get('dupefilter/filtered', 0))
+                         for r in results]
+        self.assertEqual(first[0], 30)
+        self.assertEqual(second[0], 1)
+        self.assertGreater(second[1], 0)
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module dupefilter.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
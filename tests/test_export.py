@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_export.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import ENetError, settings
+from estatnet import items
+from estatnet.export import ENetNeo4jExporter, NODE_HEADER, RELATIONSHIP_HEADER
+from estatnet.export import ENetColumnarItemExporter, ENetParquetItemExporter, feeds, row_groups
+from estatnet.generator import ENetPageGenerator
+from estatnet.pages import link_title
+from estatnet.spiders.sxnet import PageCrawler
+
+import os
+import io
+import csv
+import json
+import tempfile
+import time
+import unittest
+import importlib.util
+
+from tests.crawl import run_crawl
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+#%%
+#/************************************************************************/
+class exportTestCase(unittest.TestCase):
+    """Class providing the tests of the export of the crawled items.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _read(self, exporter, name, header=False):
+        with open(exporter.filename(name, header=header), newline='', encoding='utf-8') as f:
+            return list(csv.reader(f))
+
+    def test01_neo4j(self):
+        self.assertRaises(ENetError, ENetNeo4jExporter, '')
+        self.assertRaises(ENetError, ENetNeo4jExporter, self.directory.name, chunk_size=0)
+        exporter = ENetNeo4jExporter(self.directory.name, chunk_size=5)
+        for key in settings.SX_KEYS:
+            self.assertEqual(self._read(exporter, key, header=True), [NODE_HEADER])
+        self.assertEqual(self._read(exporter, 'relationships', header=True), [RELATIONSHIP_HEADER])
+        generator = ENetPageGenerator(seed=0)
+        article = PageCrawler._parse_loader(items.ArticleItemLoader, generator.response(settings.ARTICLE_KEY))
+        glossary = PageCrawler._parse_loader(items.GlossaryItemLoader, generator.response(settings.GLOSSARY_KEY))
+        self.assertTrue(exporter.add_item(article))
+        self.assertTrue(exporter.add_item(glossary))
+        self.assertFalse(exporter.add_item(items.ArticleItem()))
+        # the rows are written by chunks
+        self.assertEqual(len(self._read(exporter, 'relationships')) % 5, 0)
+        exporter.add_item(items.WhatLinksItem(link=['/eurostat/statistics-explained/index.php/A_b'],
+                                              page_id='Health_statistics_1'))
+        # translations share the node of the page
+        exporter.add_item(items.ArticleItem(title='Gesundheit', language='de', page_id='Health_statistics_1'))
+        exporter.close()
+        self.assertEqual(self._read(exporter, settings.ARTICLE_KEY),
+                         [['Health_statistics_1', 'Health statistics 1',
+                           'This page was last modified on 3 March 2018, at 10:20.', 'en', '0']])
+        self.assertEqual(exporter.nnodes[settings.GLOSSARY_KEY], 1)
+        relationships = self._read(exporter, 'relationships')
+        self.assertEqual(len(relationships), exporter.nrelationships)
+        self.assertIn(['A_b', 'Health_statistics_1', 'BACKLINK'], relationships)
+        self.assertEqual(sorted([end for (start, end, t) in relationships if t == 'CATEGORY'
+                                 and start == 'Health_statistics_1']),
+                         sorted(set([link_title(l) for l in article['category']])))
+        # no relationship is left without nodes
+        stubs = set([row[0] for row in self._read(exporter, 'page')])
+        self.assertTrue(set([r[1] for r in relationships]).issubset(stubs))
+        self.assertIn('A_b', stubs)
+        command = exporter.command(database='statx')
+        self.assertEqual(command[:4], ['neo4j-admin', 'database', 'import', 'full'])
+        self.assertEqual(command[-1], 'statx')
+        self.assertIn('--nodes=Page:Article=%s,%s' % (exporter.filename('article', header=True),
+                                                      exporter.filename('article')), command)
+        self.assertLess(command.index([c for c in command if c.startswith('--nodes=Page:Concept=')][0]),
+                        command.index([c for c in command if c.startswith('--nodes=Page=')][0]))
+
+    def test02_crawl(self):
+        result = run_crawl((PageCrawler, {'ESTATNET_NEO4J_DIR': self.directory.name,
+                                          'ITEM_PIPELINES': {'estatnet.pipelines.ENetNeo4jPipeline': 810}},
+                            {'pages': ['category']}))[0]
+        nitems, nnodes = len(result['items']), result['stats']['estatnet/neo4j/nodes']
+        self.assertGreater(nitems, 10)
+        self.assertEqual(nnodes, nitems)
+        rows = 0
+        for key in settings.SX_KEYS:
+            with open(os.path.join(self.directory.name, '%s.csv' % key), newline='') as f:
+                rows += len([row for row in csv.reader(f) if len(row) == len(NODE_HEADER)])
+        self.assertEqual(rows, nitems)
+
+    def test03_columnar(self):
+        generator = ENetPageGenerator(seed=0)
+        articles = [PageCrawler._parse_loader(items.ArticleItemLoader, generator.response(settings.ARTICLE_KEY))
+                    for _ in range(5)]
+        self.assertRaises(ENetError, ENetColumnarItemExporter, io.BytesIO(), row_group_size=0)
+        f = io.BytesIO()
+        exporter = ENetColumnarItemExporter(f, row_group_size=2)
+        exporter.start_exporting()
+        [exporter.export_item(item) for item in articles]
+        # the row groups are written as soon as they are full
+        self.assertEqual(len(f.getvalue().splitlines()), 2)
+        exporter.finish_exporting()
+        lines = f.getvalue().splitlines()
+        self.assertEqual([json.loads(l)['rows'] for l in lines], [2, 2, 1])
+        # the links are dictionary-encoded
+        group = json.loads(lines[0])
+        self.assertEqual(len(group['dictionary']), len(set(group['dictionary'])))
+        self.assertIn('see_also', group['lists'])
+        self.assertTrue(all([isinstance(i, int) for row in group['columns']['see_also'] for i in row]))
+        groups = list(row_groups(io.BytesIO(f.getvalue())))
+        self.assertEqual(set(groups[0].keys()), set(items.ArticleItem.fields.keys()))
+        rows = [dict([(k, v[i]) for (k, v) in g.items()]) for g in groups for i in range(len(g['title']))]
+        for (row, item) in zip(rows, articles):
+            self.assertEqual(row['title'], item['title'])
+            self.assertEqual(row['language'], item['language'][0])
+            self.assertEqual(row['version'], item['version'])
+            self.assertEqual(row['see_also'], item['see_also'])
+            self.assertEqual(row['legislation'], [])
+            self.assertIsNone(row['node_id'])
+        self.assertRaises(ENetError, feeds, 'out', format='xml')
+        self.assertEqual(feeds('out/', format='columnar')['out/whatlinks.jl'],
+                         {'format': 'columnar', 'overwrite': True, 'item_classes': ['estatnet.items.WhatLinksItem']})
+        if not HAS_PYARROW:
+            self.assertRaises(ENetError, ENetParquetItemExporter, io.BytesIO())
+            self.assertEqual(feeds('out')['out/article.jl']['format'], 'columnar')
+
+    @unittest.skipUnless(HAS_PYARROW, 'pyarrow not installed')
+    def test04_parquet(self):
+        import pyarrow.parquet as pq
+        generator = ENetPageGenerator(seed=0)
+        articles = [PageCrawler._parse_loader(items.ArticleItemLoader, generator.response(settings.ARTICLE_KEY))
+                    for _ in range(5)]
+        f = io.BytesIO()
+        exporter = ENetParquetItemExporter(f, row_group_size=2)
+        exporter.start_exporting()
+        [exporter.export_item(item) for item in articles]
+        exporter.finish_exporting()
+        parquet = pq.ParquetFile(io.BytesIO(f.getvalue()))
+        self.assertEqual(parquet.metadata.num_row_groups, 3)
+        table = parquet.read()
+        self.assertEqual(table.column('title').to_pylist(), [item['title'] for item in articles])
+        self.assertEqual(table.column('see_also').to_pylist(), [item['see_also'] for item in articles])
+
+    def test05_feeds(self):
+        # one dataset per item type (in a new process: the reactor cannot be
+        # restarted)
+        types = run_crawl((PageCrawler, {'FEEDS': feeds(self.directory.name, format='columnar'),
+                                         'FEED_EXPORTERS': {'columnar': 'estatnet.export.ENetColumnarItemExporter'}},
+                           {'pages': ['category', 'glossary']}))[0]['types']
+        counts = [types.count(name) for name in ('ArticleItem', 'GlossaryItem', 'CategoryItem')]
+        self.assertGreater(min(counts), 0)
+        for (key, count) in zip((settings.ARTICLE_KEY, settings.GLOSSARY_KEY, settings.CATEGORY_KEY), counts):
+            with open(os.path.join(self.directory.name, '%s.jl' % key), 'rb') as f:
+                titles = [t for g in row_groups(f) for t in g['title']]
+            self.assertEqual(len(titles), count)
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module export.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
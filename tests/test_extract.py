@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_extract.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import ENetError, settings
+from estatnet import items
+from estatnet.extract import ENetExtractor, extract
+from estatnet.generator import ENetPageGenerator
+from estatnet.spiders.sxnet import PageCrawler
+
+import json
+import time
+import unittest
+
+from scrapy.statscollectors import MemoryStatsCollector
+from scrapy.utils.test import get_crawler
+
+from tests.crawl import run_crawl
+
+#%%
+#/************************************************************************/
+class extractTestCase(unittest.TestCase):
+    """Class providing the tests of the extraction of the items in worker
+    processes.
+    """
+
+    def test01_extract(self):
+        # the workers run the same extraction as the spider
+        generator = ENetPageGenerator(seed=0)
+        for key in (settings.ARTICLE_KEY, settings.GLOSSARY_KEY, settings.CATEGORY_KEY):
+            response = generator.response(key)
+            values, seconds = extract(key, response.url, response.body, response.encoding)
+            self.assertEqual(values, dict(PageCrawler._parse_loader(items.SX_ITEMLOADERS[key], response)))
+            self.assertGreater(seconds, 0)
+        values, _ = extract(settings.ARTICLE_KEY, response.url, response.body, response.encoding,
+                            skip=items.SHARED_FIELDS)
+        self.assertFalse(set(values).intersection(items.SHARED_FIELDS))
+
+    def test02_inline(self):
+        self.assertRaises(ENetError, ENetExtractor, workers=-1)
+        self.assertRaises(ENetError, ENetExtractor, max_inflight=0)
+        self.assertEqual(ENetExtractor(workers=3).max_inflight, 6)
+        self.assertRaises(ENetError, ENetExtractor().extract, settings.ARTICLE_KEY, None)
+        stats = MemoryStatsCollector(get_crawler())
+        extractor = ENetExtractor(stats=stats)
+        self.assertFalse(extractor.pooled)
+        item = extractor.inline(settings.ARTICLE_KEY, ENetPageGenerator(seed=0).response(settings.ARTICLE_KEY))
+        self.assertIsInstance(item, items.ArticleItem)
+        self.assertEqual(extractor.npages, 1)
+        extractor.report()
+        self.assertEqual(stats.get_value('estatnet/extract/pages'), 1)
+        # the stats collector of the crawler is looked up once set
+        crawler = get_crawler()
+        crawler.stats = None
+        extractor = ENetExtractor.from_crawler(crawler)
+        self.assertIsNone(extractor.stats)
+        crawler.stats = stats
+        self.assertIs(extractor.stats, stats)
+
+    def test03_crawl(self):
+        # the items extracted in the pool are those extracted in the reactor
+        # thread (in a new process: the reactor cannot be restarted)
+        results = run_crawl(*[(PageCrawler, {'ESTATNET_EXTRACT_WORKERS': workers}, {'pages': ['category'], 'langs': 'de'})
+                              for workers in (0, 2)])
+        (inline, inline_stats), (pooled, pooled_stats) = [
+            (r['items'], dict([(k.split('/')[-1], v) for (k, v) in r['stats'].items() if k.startswith('estatnet/')]))
+            for r in results]
+        self.assertGreater(len(inline), 10)
+        # the items may list their unique values in any order
+        normalise = lambda items: sorted([json.dumps({k: sorted(v) if isinstance(v, list) else v
+                                                      for (k, v) in i.items()}, sort_keys=True)
+                                          for i in items])
+        self.assertEqual(normalise(pooled), normalise(inline))
+        self.assertEqual(pooled_stats['pages'], len(pooled))
+        self.assertTrue(1 <= pooled_stats['inflight_max'] <= 4)
+        for stats in (inline_stats, pooled_stats):
+            self.assertIn('reactor_lag_max', stats)
+            self.assertGreater(stats['throughput'], 0)
+        self.assertEqual(pooled_stats['de'], inline_stats['de'])
+        self.assertEqual(pooled_stats['0'] + pooled_stats.get('1', 0), inline_stats['0'] + inline_stats.get('1', 0))
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module extract.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_frontier.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import ENetError
+from estatnet.frontier import ENetBFSFrontier
+from estatnet.spiders.sxnet import WhatLinksSpider
+
+import time
+import unittest
+
+from tests.crawl import run_crawl
+
+#%%
+#/************************************************************************/
+class frontierTestCase(unittest.TestCase):
+    """Class providing the tests of the breadth-first frontier.
+    """
+
+    def test01_admit(self):
+        frontier = ENetBFSFrontier()
+        self.assertEqual(frontier.seed(['A', 'B', 'A']), ['A', 'B'])
+        self.assertRaises(ENetError, frontier.seed, ['C'])
+        self.assertEqual(frontier.admit(['C', 'A', 'D', 'C'], 1), 2)
+        self.assertEqual(frontier.ndropped['visited'], 3)
+        self.assertTrue('D' in frontier and 'E' not in frontier)
+        self.assertEqual(len(frontier), 2) # admitted, not issued yet
+
+    def test02_levels(self):
+        frontier = ENetBFSFrontier()
+        frontier.seed(['A', 'B'])
+        frontier.admit(['C', 'D'], 1)
+        # the next level is only issued once the current one is complete
+        self.assertEqual(frontier.complete(0), [])
+        frontier.admit(['E'], 1)
+        self.assertEqual(frontier.complete(0), ['C', 'D', 'E'])
+        self.assertEqual(frontier.level, 1)
+        self.assertRaises(ENetError, frontier.complete, 1, 4)
+        self.assertEqual(frontier.complete(1, 3), [])
+        self.assertEqual(list(frontier.sizes.items()), [(0, 2), (1, 3)])
+
+    def test03_bounds(self):
+        frontier = ENetBFSFrontier(npages=4, nlinks=2, depth=1)
+        self.assertEqual(frontier.links(['C', 'D', 'E']), ['C', 'D'])
+        frontier.seed(['A', 'B'])
+        self.assertEqual(frontier.admit(['C', 'D', 'E'], 1), 2)
+        self.assertTrue(frontier.exhausted)
+        self.assertEqual(frontier.ndropped['budget'], 1)
+        frontier = ENetBFSFrontier(depth=1)
+        frontier.seed(['A'])
+        frontier.admit(['B'], 1)
+        self.assertEqual(frontier.complete(0), ['B'])
+        self.assertEqual(frontier.admit(['C'], 2), 0)
+        self.assertEqual(frontier.ndropped['depth'], 1)
+        self.assertEqual(frontier.complete(1), [])
+
+    def test04_crawl(self):
+        # a bounded exploration against the stand-in server (in a new process:
+        # the reactor cannot be restarted)
+        modes = ('html', 'api')
+        runs = run_crawl(*[(WhatLinksSpider, {}, {'page': 'Main_Page', 'mode': mode, 'npages': 50, 'nlinks': 5,
+                                                  'depth': 2}) for mode in modes],
+                         server={'sizes': {'whatlinks': {'nlinks': 20}}})
+        results = dict([(mode, dict([(k.split('/', 2)[-1], v) for (k, v) in r['stats'].items()
+                                     if k.startswith('estatnet/frontier/')])) for (mode, r) in zip(modes, runs)])
+        for stats in results.values():
+            self.assertEqual(stats['level_0'], 1)
+            self.assertLessEqual(stats['level_1'], 5)
+            self.assertEqual(stats['max_level'], 2)
+            self.assertLessEqual(stats['visited'], 50)
+            self.assertEqual(stats['visited'], sum([stats.get('level_%d' % l, 0) for l in range(3)]))
+        self.assertEqual(results['api'], results['html'])
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module frontier.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
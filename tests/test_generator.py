@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_generator.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Mon Dec 18 17:28:29 2017
+
+**Contents**
+"""
+
+from estatnet import ENetError
+from estatnet import settings
+from estatnet import items
+from estatnet import benchmark
+from estatnet.generator import ENetPageGenerator
+from estatnet.pages import ENetPageClassifier
+from estatnet.sections import detect_version
+from estatnet.spiders.sxnet import PageCrawler
+from estatnet.xpaths import XPATHS
+
+import tempfile
+import time
+import unittest
+
+#%%
+#/************************************************************************/
+class generatorTestCase(unittest.TestCase):
+    """Class providing the tests of the generator of synthetic pages.
+    """
+
+    def setUp(self):
+        self.generator = ENetPageGenerator(seed=0)
+
+    def test01_seed(self):
+        self.assertEqual(ENetPageGenerator(seed=1).article(), ENetPageGenerator(seed=1).article())
+        self.assertNotEqual(ENetPageGenerator(seed=1).article(), ENetPageGenerator(seed=2).article())
+        self.assertRaises(ENetError, self.generator.article, version=2)
+        self.assertRaises(ENetError, self.generator.response, 'unknown')
+    def test02_article(self):
+        for version in (settings.SX_VERSIONS[0], settings.SX_VERSIONS[1]):
+            response = self.generator.response(settings.ARTICLE_KEY, version=version,
+                                               nsections=50, nlinks=4, ncategories=2000)
+            self.assertEqual(detect_version(response.selector), version)
+            item = PageCrawler._parse_loader(items.ArticleItemLoader, response)
+            self.assertEqual(item['version'], version)
+            self.assertEqual(len(item['category']), 2000)
+            self.assertEqual(len(item['category_hidden']), 1)
+            self.assertEqual(len(item['publication']), 4)
+            self.assertEqual(len(item['database']), 4)
+            self.assertEqual(len(item['product']), 17) # one figure every 3 sections
+            self.assertTrue(item['last_modified'].strip().startswith('This page was last modified'))
+            self.assertEqual(response.url, '%s/%s' % (settings.SX_MAINURL, item['title'].replace(' ', '_')))
+    def test03_pages(self):
+        response = self.generator.response(settings.CATEGORY_KEY, npages=2000)
+        item = PageCrawler._parse_loader(items.CategoryItemLoader, response)
+        self.assertEqual(len(item['page']), 2000)
+        self.assertTrue(item['title'].startswith(settings.CATEGORY_DOMAIN))
+        response = self.generator.response(settings.GLOSSARY_KEY, nlinks=5)
+        item = PageCrawler._parse_loader(items.GlossaryItemLoader, response)
+        self.assertEqual(len(item['concept']), 5)
+        response = self.generator.response(settings.THEME_KEY, nlinks=5)
+        item = PageCrawler._parse_loader(items.ThemeItemLoader, response)
+        self.assertEqual(len(item['glossary']), 5)
+        response = self.generator.response(settings.WHATLINKS_KEY, nlinks=1000)
+        self.assertEqual(len(XPATHS.xpath(response.selector, items.WHATLINKS_PATHS['link'])), 1000)
+    def test04_classify(self):
+        classifier = ENetPageClassifier()
+        corpus = self.generator.corpus(npages=2)
+        for (key, responses) in corpus.items():
+            for response in responses:
+                self.assertEqual(classifier.identify(response), key)
+        # articles of both layout versions
+        self.assertEqual(set([detect_version(r.selector) for r in corpus[settings.ARTICLE_KEY]]),
+                         set(settings.SX_VERSIONS.values()))
+        # namespace of the URL in any case
+        response = self.generator.response(settings.CATEGORY_KEY)
+        response = response.replace(url=response.url.replace('/Category:', '/category:'))
+        self.assertEqual(ENetPageClassifier().identify(response), settings.CATEGORY_KEY)
+    def test05_benchmark(self):
+        corpus = self.generator.corpus(npages=2, nsections=10)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.generator.write(tmpdir, corpus)
+            loaded = benchmark.load_corpus(tmpdir)
+            self.assertEqual({k: sorted([r.url for r in v]) for (k, v) in loaded.items()},
+                             {k: sorted([r.url for r in v]) for (k, v) in corpus.items()})
+            results = benchmark.run(tmpdir)
+        self.assertEqual(results['total']['items'], 8)
+        self.assertEqual(set(results['loaders'].keys()), set(benchmark.BENCHMARK_KEYS))
+    def test06_scaling(self):
+        # extraction time grows (about) linearly with the size of the pages
+        elapsed = []
+        for nsections in (10, 100):
+            response = self.generator.response(settings.ARTICLE_KEY, nsections=nsections)
+            PageCrawler._parse_loader(items.ArticleItemLoader, response)
+            times = []
+            for _ in range(5):
+                start = time.perf_counter()
+                PageCrawler._parse_loader(items.ArticleItemLoader, response)
+                times.append(time.perf_counter() - start)
+            elapsed.append(min(times))
+        # 10 times larger pages: far below the 100 times of a quadratic cost
+        self.assertLess(elapsed[1], 50 * elapsed[0])
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module generator.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
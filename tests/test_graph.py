@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_graph.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import ENetError, settings
+from estatnet import items
+from estatnet.generator import ENetPageGenerator
+from estatnet.graph import ENetGraph, EDGE_TYPES
+from estatnet.pages import link_title
+from estatnet.spiders.sxnet import PageCrawler, WhatLinksSpider
+
+import os
+import tempfile
+import time
+import unittest
+
+from tests.crawl import run_crawl
+
+#%%
+#/************************************************************************/
+class graphTestCase(unittest.TestCase):
+    """Class providing the tests of the graph of the pages.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'estatnet.graph')
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test01_item(self):
+        self.assertEqual(link_title('/eurostat/statistics-explained/index.php/Category:energy_statistics'),
+                         'Category:Energy_statistics')
+        self.assertIsNone(link_title('http://ec.europa.eu/eurostat/web/energy_statistics'))
+        self.assertIsNone(link_title('http://ec.europa.eu/eurostat/product?code=ilc_03&mode=view'))
+        response = ENetPageGenerator(seed=0).response(settings.ARTICLE_KEY)
+        item = PageCrawler._parse_loader(items.ArticleItemLoader, response)
+        graph = ENetGraph()
+        self.assertTrue(graph.add_item(item))
+        self.assertFalse(graph.add_item(items.ArticleItem()))
+        graph.finalize()
+        source = graph.node('Health_statistics_1')
+        self.assertEqual(source, 0)
+        self.assertEqual(graph.scraped[source], 1)
+        self.assertEqual(sorted([graph.title(n) for n in graph.successors(source, 'category')]),
+                         sorted([link_title(l) for l in item['category']]))
+        self.assertEqual(len(graph.successors(source, 'see_also')), len(set(item['see_also'])))
+        # no edges to external websites, nor from the linked pages
+        self.assertEqual(graph.successors(source, 'publication'), [])
+        self.assertEqual(graph.nedges, len(graph.successors(source)))
+        self.assertEqual(sum(graph.scraped), 1)
+        self.assertEqual(set([t for (s, d, t) in graph.edges()]),
+                         {'link', 'see_also', 'category', 'category_hidden'})
+        self.assertRaises(ENetError, graph.add_item, item)
+
+    def test02_edges(self):
+        graph = ENetGraph()
+        self.assertRaises(ENetError, graph.successors, 0)
+        self.assertRaises(ENetError, graph.add_edges, 'A', ['B'], 'unknown')
+        graph.add_edges('A', ['B', 'C', 'B'], 'link')
+        graph.add_edges('A', ['B'], 'see_also')
+        graph.add_edges('C', ['A'], 'link')
+        item = items.WhatLinksItem(link=['/eurostat/statistics-explained/index.php/D'], page_id='A')
+        graph.add_item(item)
+        self.assertEqual(graph.nedges, 6)
+        graph.finalize()
+        # duplicated edges are dropped, the backlinks are reversed
+        self.assertEqual(list(graph.edges()), [(0, 1, 'link'), (0, 1, 'see_also'), (0, 2, 'link'),
+                                               (2, 0, 'link'), (3, 0, 'backlink')])
+        self.assertEqual(list(graph.indptr), [0, 3, 3, 4, 5])
+        self.assertEqual(graph.scraped, bytearray(4))
+        self.assertEqual(graph.nbytes, 5 * 8 + 5 * 4 + 5 + 4)
+        graph.thaw()
+        graph.add_edges('B', ['D'], 'concept')
+        graph.finalize()
+        self.assertEqual(graph.successors(1), [3])
+        self.assertEqual(graph.nedges, 6)
+
+    def test03_save(self):
+        graph = ENetGraph.open(self.filename)
+        self.assertIs(ENetGraph.open(self.filename), graph)
+        graph.add_edges('A', ['B'], 'link')
+        graph.close()
+        self.assertFalse(os.path.exists(self.filename))
+        graph.close()
+        # the graph saved is extended by the next users of the file
+        graph = ENetGraph.open(self.filename)
+        self.assertFalse(graph.finalized)
+        graph.add_edges('B', ['C'], 'category')
+        graph.close()
+        graph = ENetGraph.load(self.filename)
+        self.assertEqual(graph.titles, ['A', 'B', 'C'])
+        self.assertEqual(list(graph.edges()), [(0, 1, 'link'), (1, 2, 'category')])
+        self.assertEqual(graph.node('C'), 2)
+
+    def test04_crawl(self):
+        # the items of successive crawls are streamed into the same graph (in a
+        # new process: the reactor cannot be restarted)
+        crawler_settings = {'ESTATNET_GRAPH_FILE': self.filename,
+                            'ITEM_PIPELINES': {'estatnet.pipelines.ENetGraphPipeline': 800}}
+        spiders = ((PageCrawler, {'pages': ['category']}), (WhatLinksSpider, {'page': 'Main_Page'}))
+        results = run_crawl(*[(spider, crawler_settings, kwargs) for (spider, kwargs) in spiders],
+                            server={'sizes': {'whatlinks': {'nlinks': 5}}})
+        titles = [item['title'] for r in results for item in r['items'] if item.get('title')]
+        stats = dict([(spider.name, dict([(k.split('/')[-1], v) for (k, v) in r['stats'].items()
+                                          if k.startswith('estatnet/graph/')]))
+                      for ((spider, _), r) in zip(spiders, results)])
+        graph = ENetGraph.load(self.filename)
+        self.assertGreater(len(titles), 10)
+        self.assertEqual(sum(graph.scraped), len(titles))
+        for title in titles:
+            self.assertEqual(graph.scraped[graph.node(title.replace(' ', '_'))], 1)
+        self.assertEqual(stats['WhatLinksHere']['nodes'], graph.nnodes)
+        self.assertEqual(stats['WhatLinksHere']['edges'], graph.nedges)
+        self.assertGreater(stats['WhatLinksHere']['nodes'], stats['PageExplained']['nodes'])
+        types = set([EDGE_TYPES[t] for t in graph.types])
+        self.assertTrue({'link', 'category', 'page', 'backlink'}.issubset(types))
+        self.assertIn(graph.node('Main_Page'), [d for (s, d, t) in graph.edges() if t == 'backlink'])
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module graph.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
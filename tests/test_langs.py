@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_langs.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import ENetError, settings
+from estatnet import items
+from estatnet.server import ENetStandinServer
+from estatnet.spiders.sxnet import PageCrawler
+
+import time
+import unittest
+from collections import defaultdict
+
+from scrapy import Request
+from scrapy.http import HtmlResponse
+
+from tests.crawl import run_crawl
+
+#%%
+#/************************************************************************/
+class langsTestCase(unittest.TestCase):
+    """Class providing the tests of the multi-language crawls.
+    """
+
+    def test01_spider(self):
+        self.assertEqual(PageCrawler(langs='all').langs, [l for l in settings.LANGS if l != settings.DEF_LANG])
+        self.assertEqual(PageCrawler(langs='fr,en').langs, ['fr'])
+        self.assertEqual(PageCrawler().langs, [])
+        self.assertRaises(ENetError, PageCrawler, langs=['de', 'xx'])
+
+    def test02_translation(self):
+        # a translation shares the links of the original page: only the
+        # language dependent fields are extracted
+        server = ENetStandinServer()
+        spider = PageCrawler(langs='de')
+        response = lambda title, meta=None: HtmlResponse(url='%s/%s' % (settings.SX_MAINURL, title),
+                                                         body=server.page('/%s/%s' % (settings.SX_RELURL, title)),
+                                                         request=Request('%s/%s' % (settings.SX_MAINURL, title), meta=meta),
+                                                         encoding='utf-8')
+        original, request = list(spider._parse_glossary(response('Glossary:Euro')))
+        self.assertEqual((original['language'], original['page_id']), ('en', 'Glossary:Euro'))
+        self.assertEqual(request.url, '%s/Glossary:Euro/de' % settings.SX_MAINURL)
+        translation = next(spider._parse_translation(response('Glossary:Euro/de', request.meta)))
+        self.assertEqual((translation['language'], translation['page_id']), ('de', 'Glossary:Euro'))
+        self.assertEqual(translation['title'], 'Glossary:Euro/de')
+        self.assertNotIn('link', translation)
+        self.assertEqual(spider._parse_loader(items.GlossaryItemLoader, response('Glossary:Euro/de'))['link'],
+                         original['link'])
+        # no title in the URL: no translation requested
+        untitled = HtmlResponse(url='%s?curid=42' % settings.SX_MAINURL,
+                                body=server.page('/%s/Glossary:Euro' % settings.SX_RELURL), encoding='utf-8')
+        self.assertEqual([type(r) for r in spider._parse_glossary(untitled)], [items.GlossaryItem])
+        server.stop()
+
+    def test03_crawl(self):
+        # every page is fetched in all languages, its links followed once (in
+        # a new process: the reactor cannot be restarted)
+        single, multi = run_crawl(*[(PageCrawler, {'CONCURRENT_REQUESTS': 16}, {'pages': ['category'], 'langs': langs})
+                                    for langs in ('', 'all')])
+        (nrequests, single), (nrequests_all, multi) = [(r['nrequests'], r['items']) for r in (single, multi)]
+        nlangs = len(settings.LANGS)
+        self.assertGreater(len(single), 10)
+        self.assertEqual(len(multi), nlangs * len(single))
+        # only the translations are fetched in addition
+        self.assertEqual(nrequests_all, nrequests + (nlangs - 1) * len(single))
+        pages = defaultdict(dict)
+        for item in multi:
+            language = item['language'][0] if isinstance(item['language'], list) else item['language']
+            pages[item['page_id']][language] = item
+        self.assertEqual(len(pages), len(single))
+        for page in pages.values():
+            self.assertEqual(set(page), set(settings.LANGS))
+            for (lang, item) in page.items():
+                if lang != settings.DEF_LANG:
+                    self.assertFalse(set(item).intersection(items.SHARED_FIELDS))
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing the multi-language crawls' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_pages.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_ 
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from scrapy import http
+
+from estatnet import ENetError
+from estatnet import settings
+from estatnet.pages import ENetPageClassifier, ENetPrefixTrie, page_title, split_lang, lang_title
+from estatnet.spiders import sxnet
+
+import time
+import unittest
+
+_response = lambda url, body='': http.HtmlResponse(url=url, encoding='utf-8',
+                                                   body=('<html><body>%s</body></html>' % body).encode())
+
+#%%
+#/************************************************************************/
+class pagesTestCase(unittest.TestCase):
+    """Class providing the tests of the identification of the type of pages.
+    """
+    article = '<h2><span class="mw-headline" id="See_also">See also</span></h2>'
+    theme = '<h2><span class="mw-headline" id="Statistical_articles">Statistical articles</span></h2>'
+
+    def test01_page_title(self):
+        self.assertEqual(page_title('%s/Glossary:Euro' % settings.SX_MAINURL), 'Glossary:Euro')
+        self.assertEqual(page_title('%s?title=Category:Living_conditions&oldid=1' % settings.SX_MAINURL),
+                         'Category:Living_conditions')
+        self.assertEqual(page_title('%s/Income%%20distribution%%20statistics' % settings.SX_MAINURL),
+                         'Income_distribution_statistics')
+        self.assertEqual(page_title('http://ec.europa.eu/eurostat/web/main'), None)
+    def test02_trie(self):
+        trie = ENetPrefixTrie({'Glossary:': 'glossary', 'Gloss': 'other', 'Category:': 'category'})
+        trie.insert('Glossary:', 'concept') # first value kept
+        self.assertEqual(trie.match('Glossary:Euro'), 'glossary')
+        self.assertEqual(trie.match('Glossy'), 'other')
+        self.assertEqual(trie.match('Income'), None)
+        self.assertEqual(trie.match(None), None)
+        self.assertRaises(ENetError, trie.insert, '', 'article')
+    def test03_identify(self):
+        classifier = ENetPageClassifier()
+        self.assertEqual(classifier.identify(_response('%s/Glossary:Euro' % settings.SX_MAINURL)),
+                         settings.GLOSSARY_KEY)
+        self.assertEqual(classifier.identify(_response('%s?title=Category:Living_conditions' % settings.SX_MAINURL)),
+                         settings.CATEGORY_KEY)
+        self.assertEqual(classifier.nprobes, 0)
+        self.assertEqual(classifier.identify(_response('%s/Income' % settings.SX_MAINURL, self.article)),
+                         settings.ARTICLE_KEY)
+        self.assertEqual(classifier.identify(_response('%s/Population' % settings.SX_MAINURL, self.theme)),
+                         settings.THEME_KEY)
+        # articles are tested first
+        self.assertEqual(classifier.identify(_response('%s/Both' % settings.SX_MAINURL, self.article + self.theme)),
+                         settings.ARTICLE_KEY)
+        self.assertEqual(classifier.identify(_response('%s/Unknown' % settings.SX_MAINURL)), None)
+        self.assertEqual(classifier.nprobes, 4)
+        # memoized per title
+        self.assertEqual(classifier.identify(_response('%s?title=Income' % settings.SX_MAINURL)),
+                         settings.ARTICLE_KEY)
+        self.assertEqual(classifier.nprobes, 4)
+    def test04_memo(self):
+        classifier = ENetPageClassifier(memo=2)
+        [classifier.identify(_response('%s/%s' % (settings.SX_MAINURL, title), self.article))
+            for title in ('A', 'B', 'C', 'A')]
+        self.assertEqual(classifier.nprobes, 4)
+        # pages not recognised (e.g., error pages) are not memoized
+        self.assertIsNone(classifier.identify(_response('%s/D' % settings.SX_MAINURL)))
+        self.assertEqual(classifier.identify(_response('%s/D' % settings.SX_MAINURL, self.article)),
+                         settings.ARTICLE_KEY)
+        self.assertEqual(classifier.nprobes, 6)
+    def test05_check(self):
+        classifier = ENetPageClassifier()
+        self.assertTrue(classifier.check(_response('%s/Glossary:Euro' % settings.SX_MAINURL), settings.GLOSSARY_KEY))
+        self.assertFalse(classifier.check(_response('%s/Glossary:Euro' % settings.SX_MAINURL), settings.CATEGORY_KEY))
+        self.assertTrue(classifier.check(_response('%s/Population' % settings.SX_MAINURL, self.theme), settings.THEME_KEY))
+        self.assertFalse(classifier.check(_response('%s/Population' % settings.SX_MAINURL, self.theme), settings.ARTICLE_KEY))
+        self.assertRaises(ENetError, classifier.check, _response(settings.SX_MAINURL), 'unknown')
+    def test06_spider(self):
+        self.assertEqual(sxnet._identify_page(_response('%s/Category:Living_conditions' % settings.SX_MAINURL)),
+                         settings.CATEGORY_KEY)
+        self.assertTrue(sxnet._check_page(_response('%s/Income' % settings.SX_MAINURL, self.article),
+                                          settings.ARTICLE_KEY))
+
+    def test07_lang(self):
+        self.assertEqual(split_lang('Glossary:Euro/de'), ('Glossary:Euro', 'de'))
+        self.assertEqual(split_lang('Glossary:Euro'), ('Glossary:Euro', settings.DEF_LANG))
+        self.assertEqual(split_lang('Input/output_tables'), ('Input/output_tables', settings.DEF_LANG))
+        self.assertEqual(split_lang('/fr'), ('/fr', settings.DEF_LANG))
+        self.assertEqual(lang_title('Euro/de', 'fr'), 'Euro/fr')
+        self.assertEqual(lang_title('Euro/de', settings.DEF_LANG), 'Euro')
+        self.assertRaises(ENetError, lang_title, 'Euro', 'xx')
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module pages.py' % cls.__name__)
+        time.sleep(0.5) 
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_priority.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import settings
+from estatnet.state import ENetPageStore
+from estatnet.priority import ENetPriority, PRIORITY_TYPES, TYPE_META, modified_time
+from estatnet.middlewares import ENetPriorityMiddleware
+from estatnet.spiders.sxnet import PageCrawler
+
+import time
+import unittest
+
+import scrapy
+from scrapy import signals
+from scrapy.utils.test import get_crawler
+
+from tests.crawl import run_crawl
+
+URL = '%s/%%s' % settings.SX_MAINURL
+
+def _received(crawler, output):
+    # the types of the pages, in the order of their responses
+    receive = lambda response, request, spider: output.append(ENetPriority().page_type(request, spider))
+    crawler.signals.connect(receive, signal=signals.response_received, weak=False)
+
+#%%
+#/************************************************************************/
+class priorityTestCase(unittest.TestCase):
+    """Class providing the tests of the priorities of the requests.
+    """
+
+    def test01_modified(self):
+        self.assertEqual(modified_time('This page was last modified on 3 March 2018, at 10:20.'),
+                         1520072400.)
+        self.assertEqual(modified_time('3 march 2018'), 1520035200.)
+        self.assertIsNone(modified_time('last modified on 3 Mars 2018'))
+        self.assertIsNone(modified_time(None))
+
+    def test02_type(self):
+        scorer = ENetPriority()
+        self.assertEqual(scorer.page_type(scrapy.Request(URL % 'Glossary:Euro')), settings.GLOSSARY_KEY)
+        self.assertEqual(scorer.page_type(scrapy.Request(URL % 'Category:Euro')), settings.CATEGORY_KEY)
+        self.assertEqual(scorer.page_type(scrapy.Request(URL % 'Euro')), settings.ARTICLE_KEY)
+        self.assertEqual(scorer.page_type(scrapy.Request(URL % 'Euro', meta={TYPE_META: settings.THEME_KEY})),
+                         settings.THEME_KEY)
+        self.assertEqual(scorer.page_type(scrapy.Request(settings.SX_START_URLS[settings.THEME_KEY])),
+                         settings.THEME_KEY)
+        self.assertIsNone(scorer.page_type(scrapy.Request('%s/Euro' % settings.WHATLINKSHERE_URL)))
+
+    def test03_score(self):
+        now = time.time()
+        day = 86400.
+        self.assertEqual(ENetPriority.staleness(None), 1.)
+        # a page modified just before its last crawl is more likely changed
+        changed = {'crawled': now - 10 * day, 'page_modified': time.strftime('%d %B %Y', time.gmtime(now - 12 * day))}
+        unchanged = {'crawled': now - 10 * day, 'page_modified': '3 March 2015'}
+        self.assertGreater(ENetPriority.staleness(changed, now), ENetPriority.staleness(unchanged, now))
+        store = ENetPageStore(':memory:')
+        store.put(URL % 'Changed', crawled=changed['crawled'], page_modified=changed['page_modified'])
+        store.put(URL % 'Unchanged', crawled=unchanged['crawled'], page_modified=unchanged['page_modified'])
+        store.put(URL % 'Linked', crawled=unchanged['crawled'], page_modified=unchanged['page_modified'],
+                  links=[{'url': URL % i} for i in range(20)])
+        self.assertEqual(store.get(URL % 'Linked', links=False)['nlinks'], 20)
+        self.assertEqual(store.get(URL % 'Changed', links=False)['nlinks'], 0)
+        self.assertEqual(ENetPriority.degree(store.get(URL % 'Linked')), 20)
+        scorer = ENetPriority(store)
+        score = lambda title: scorer.score(scrapy.Request(URL % title), now=now)
+        self.assertGreater(score('New'), score('Changed'))
+        self.assertGreater(score('Changed'), score('Unchanged'))
+        self.assertGreater(score('Linked'), score('Unchanged'))
+        self.assertGreater(score('Category:Euro'), score('Glossary:Euro'))
+        self.assertGreater(score('Glossary:Euro'), score('New'))
+        self.assertEqual(ENetPriority(types={settings.ARTICLE_KEY: 0}).types[settings.CATEGORY_KEY],
+                         PRIORITY_TYPES[settings.CATEGORY_KEY])
+        store.close()
+
+    def test04_middleware(self):
+        crawler = get_crawler(scrapy.Spider, {'ESTATNET_PRIORITY_TYPES': {settings.GLOSSARY_KEY: 1000}})
+        middleware = ENetPriorityMiddleware.from_crawler(crawler)
+        requests = [scrapy.Request(URL % 'Euro', priority=1), scrapy.Request(URL % 'Glossary:Euro'), {}]
+        output = list(middleware.process_spider_output(None, requests, None))
+        self.assertEqual(output[2], {})
+        self.assertEqual(output[0].priority, 1 + PRIORITY_TYPES[settings.ARTICLE_KEY] + 50)
+        self.assertEqual(output[1].priority, 1000 + 50)
+
+    def test05_crawl(self):
+        # with a limited budget, the pages that fan out are fetched first (in a
+        # new process: the reactor cannot be restarted)
+        received = run_crawl((PageCrawler, {'CONCURRENT_REQUESTS': 4, 'CLOSESPIDER_PAGECOUNT': 60,
+                                            'SPIDER_MIDDLEWARES': {'estatnet.middlewares.ENetPriorityMiddleware': 980}},
+                              {}), collect=_received)[0]['collected']
+        self.assertGreaterEqual(len(received), 60)
+        # past the start pages and the requests in flight
+        self.assertEqual(set(received[10:]), {settings.CATEGORY_KEY, settings.THEME_KEY})
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module priority.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_sections.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_ 
+
+*version*:      0.1
+--
+*since*:        Mon Dec 18 17:28:29 2017
+
+**Contents**
+"""
+
+import scrapy
+from scrapy import http
+from scrapy.utils.test import get_crawler
+
+from estatnet import items
+from estatnet.sections import ENetSections, parse_section, detect_version, HEADING_SECTION, DAT_SECTION
+from estatnet.spiders.sxnet import PageCrawler
+
+import random
+import time
+import unittest
+
+_xp = lambda sel, path: sel.xpath(path).extract()
+
+#%%
+#/************************************************************************/
+class sectionsTestCase(unittest.TestCase):
+    """Class providing the tests of the single-pass extraction of sections: the
+    outputs shall be identical to those of the xpath expressions.
+    """
+    # layout version 0, e.g.:
+    # http://ec.europa.eu/eurostat/statistics-explained/index.php/Income_distribution_statistics
+    response0 = http.HtmlResponse(url="", encoding='utf-8', body=b"""
+            <html lang="en">
+            <body>
+            <h1 id="firstHeading" class="firstHeading">Income distribution statistics</h1>
+            <div id="mw-content-text">
+            <h2><span class="mw-headline" id="See_also">See also</span><span class="mw-editsection"><a href="/edit&amp;section=1">edit</a></span></h2>
+            <ul>
+                <li><a href="/eurostat/statistics-explained/index.php/Housing_conditions">Housing conditions</a></li>
+                <li><a href="/eurostat/statistics-explained/index.php/Housing_statistics">Housing statistics</a></li>
+            </ul>
+            <h2><span class="mw-headline" id="Further_Eurostat_information">Further Eurostat information</span><span class="mw-editsection"><a href="/edit&amp;section=2">edit</a></span></h2>
+            <h3><span class="mw-headline" id="Publications">Publications</span></h3>
+            <p><b>Statistical books</b></p>
+            <ul>
+                <li><a class="external text" href="http://ec.europa.eu/eurostat/product?code=KS-DZ-14-001&amp;language=en">Living conditions in Europe</a></li>
+            </ul>
+            <h3><span class="mw-headline" id="Main_tables">Main tables</span></h3>
+            <ul>
+                <li><a class="external text" href="http://ec.europa.eu/eurostat/web/income-and-living-conditions/data/main-tables">Income and living conditions (t_ilc)</a></li>
+            </ul>
+            <h3><span class="mw-headline" id="Database">Database</span></h3>
+            <dl><dd><a class="external text" href="http://ec.europa.eu/eurostat/web/income-and-living-conditions/data/database">Income and living conditions (ilc)</a></dd></dl>
+            <h3><span class="mw-headline" id="Dedicated_section">Dedicated section</span></h3>
+            <ul>
+                <li><a class="external text" href="http://ec.europa.eu/eurostat/web/income-and-living-conditions/overview">Income and living conditions</a></li>
+            </ul>
+            <h2><span class="mw-headline" id="External_links">External links</span></h2>
+            <ul>
+                <li><a class="external text" href="http://www.oecd.org/statistics/better-life-initiative.htm">OECD</a></li>
+            </ul>
+            </div>
+            </body>
+            </html>
+            """)
+    # layout version 1, e.g.:
+    # https://ec.europa.eu/eurostat/statistics-explained/index.php?title=People_at_risk_of_poverty_or_social_exclusion
+    response1 = http.HtmlResponse(url="", encoding='utf-8', body=b"""
+            <html lang="en">
+            <body>
+            <h1 id="firstHeading" class="firstHeading">People at risk of poverty or social exclusion</h1>
+            <div class="dat-section" id="seealso">
+                <h2>See also</h2>
+                <ul>
+                    <li><a href="/eurostat/statistics-explained/index.php?title=Employment_statistics">Employment statistics</a></li>
+                    <li><a href="/eurostat/statistics-explained/index.php?title=Housing_statistics">Housing statistics</a></li>
+                </ul>
+            </div>
+            <div class="dat-section" id="maintables">
+                <ul><li><a href="https://ec.europa.eu/eurostat/web/income-and-living-conditions/data/main-tables">Main tables</a></li></ul>
+            </div>
+            <div class="dat-section" id="legal">
+                <ul><li><a href="http://eur-lex.europa.eu/LexUriServ/LexUriServ.do?uri=CELEX:32003R1177:EN:NOT">Regulation</a></li></ul>
+                <div id="inner"><ul><li><a href="http://eur-lex.europa.eu/nested">Nested</a></li></ul></div>
+            </div>
+            </body>
+            </html>
+            """)
+
+    def test01_parse_section(self):
+        section = parse_section(items.ARTICLE_PATHS[0]['publication'])
+        self.assertEqual(section.kind, HEADING_SECTION)
+        self.assertEqual((section.first, section.id, section.tag), ('h3', 'Publications', 'li/a/@href'))
+        section = parse_section(items.ARTICLE_PATHS[1]['see_also'])
+        self.assertEqual(section.kind, DAT_SECTION)
+        self.assertEqual((section.id, section.tag), ('seealso', 'a/@href'))
+        self.assertEqual(parse_section(items.ARTICLE_PATHS[0]['title']), None)
+        self.assertEqual(parse_section(''), None)
+    def test02_fields(self):
+        sections = ENetSections(items.ARTICLE_PATHS[0])
+        self.assertEqual(set(sections.fields.keys()),
+                         set(['see_also', 'link', 'publication', 'table', 'database',
+                              'section', 'metadata', 'information', 'link_external']))
+        self.assertTrue('title' in sections.paths and not 'legislation' in sections.paths)
+        sections = ENetSections(items.ARTICLE_PATHS[1])
+        self.assertTrue(all([key in sections.fields for key in
+                             ['see_also', 'publication', 'table', 'database', 'section',
+                              'link_external', 'legislation', 'methodology']]))
+    def test03_version0(self):
+        for version in items.ARTICLE_PATHS.keys():
+            sections = ENetSections(items.ARTICLE_PATHS[version])
+            values = sections.extract(self.response0.selector)
+            for key in sections.fields:
+                self.assertEqual(values[key], _xp(self.response0, items.ARTICLE_PATHS[version][key]))
+        self.assertEqual(ENetSections(items.ARTICLE_PATHS[0]).extract(self.response0.selector)['table'],
+                         ['http://ec.europa.eu/eurostat/web/income-and-living-conditions/data/main-tables'])
+    def test04_version1(self):
+        for version in items.ARTICLE_PATHS.keys():
+            sections = ENetSections(items.ARTICLE_PATHS[version])
+            values = sections.extract(self.response1.selector)
+            for key in sections.fields:
+                self.assertEqual(values[key], _xp(self.response1, items.ARTICLE_PATHS[version][key]))
+        self.assertEqual(ENetSections(items.ARTICLE_PATHS[1]).extract(self.response1.selector)['legislation'],
+                         ['http://eur-lex.europa.eu/LexUriServ/LexUriServ.do?uri=CELEX:32003R1177:EN:NOT'])
+    def test05_random(self):
+        ids = ['See_also', 'Publications', 'Main_tables', 'Other_information', 'Statistical_articles',
+               'seealso', 'maintables', 'legal', '']
+        def page(rand, depth=0):
+            html = []
+            for _ in range(rand.randint(0, 6)):
+                c = rand.random()
+                if c < 0.25:
+                    tag = rand.choice(['h2', 'h3', 'h4', 'hr'])
+                    html.append('<%s><span id="%s">x</span><span><a href="/e%d">e</a></span></%s>'
+                                % (tag, rand.choice(ids), rand.randint(0, 99), tag))
+                elif c < 0.45:
+                    html.append('<ul>%s</ul>' % ''.join(['<li><a href="/l%d">l</a></li>' % rand.randint(0, 999)
+                                                         for _ in range(rand.randint(0, 3))]))
+                elif c < 0.55:
+                    html.append('<a href="/a%d">a</a>' % rand.randint(0, 999))
+                elif c < 0.8 and depth < 4:
+                    html.append('<div class="%s" id="%s">%s</div>' % (rand.choice(['dat-section', 'x']),
+                                                                      rand.choice(ids), page(rand, depth+1)))
+                elif depth < 4:
+                    html.append('<dl><dd>%s</dd></dl>' % page(rand, depth+1))
+            return ''.join(html)
+        for seed in range(200):
+            sel = scrapy.Selector(text='<html><body>%s</body></html>' % page(random.Random(seed)))
+            for paths in (items.ARTICLE_PATHS, items.THEME_PATHS):
+                for version in paths.keys():
+                    sections = ENetSections(paths[version])
+                    values = sections.extract(sel)
+                    [self.assertEqual(values[key], _xp(sel, paths[version][key])) for key in sections.fields]
+    def test06_loader(self):
+        item = PageCrawler._parse_loader(items.ArticleItemLoader, self.response0)
+        self.assertEqual(item['title'], 'Income distribution statistics')
+        self.assertEqual(item['see_also'], _xp(self.response0, items.ARTICLE_PATHS[0]['see_also']))
+        self.assertEqual(item['link_external'], ['http://www.oecd.org/statistics/better-life-initiative.htm'])
+        item = PageCrawler._parse_loader(items.ArticleItemLoader, self.response1)
+        self.assertEqual(item['legislation'], _xp(self.response1, items.ARTICLE_PATHS[1]['legislation']))
+    def test07_detect_version(self):
+        self.assertEqual(detect_version(self.response0.selector), 0)
+        self.assertEqual(detect_version(self.response1.selector), 1)
+        self.assertEqual(detect_version(scrapy.Selector(text='<html><body><p>x</p></body></html>')), None)
+    def test08_loader_version(self):
+        stats = get_crawler().stats
+        item = PageCrawler._parse_loader(items.ArticleItemLoader, self.response0, stats)
+        self.assertEqual(item['version'], 0)
+        # the paths of the other version are not evaluated: the dat-section
+        # fields of version 1 are left empty
+        self.assertTrue('legislation' not in item)
+        item = PageCrawler._parse_loader(items.ArticleItemLoader, self.response1, stats)
+        self.assertEqual(item['version'], 1)
+        response = http.HtmlResponse(url="", encoding='utf-8', body=b'<html><body><h1 id="firstHeading">X</h1></body></html>')
+        item = PageCrawler._parse_loader(items.ArticleItemLoader, response, stats)
+        self.assertTrue('version' not in item)
+        self.assertEqual(item['title'], 'X')
+        self.assertEqual((stats.get_value('estatnet/version/0'), stats.get_value('estatnet/version/1'),
+                          stats.get_value('estatnet/version/unknown')), (1, 1, 1))
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing class ENetSections of sections.py' % cls.__name__)
+        time.sleep(0.5) 
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
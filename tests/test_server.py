@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_server.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import ENetError
+from estatnet import settings
+from estatnet import items
+from estatnet.server import ENetStandinServer
+from estatnet.middlewares import ENetStandinMiddleware
+from estatnet.xpaths import XPATHS
+
+import os, sys
+import json
+import subprocess
+import time
+import unittest
+from urllib.request import urlopen
+from urllib.error import HTTPError
+
+import scrapy
+from scrapy.exceptions import NotConfigured
+from scrapy.http import HtmlResponse
+from scrapy.utils.test import get_crawler
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+#%%
+#/************************************************************************/
+class serverTestCase(unittest.TestCase):
+    """Class providing the tests of the stand-in server.
+    """
+
+    def setUp(self):
+        self.server = ENetStandinServer(corpus=CORPUS)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _response(self, path):
+        return HtmlResponse(url=settings.SX_MAINURL, body=self.server.page(path), encoding='utf-8')
+
+    def test01_routes(self):
+        path = '/%s' % settings.SX_RELURL
+        self.assertEqual(self.server.page('%s/Some_article' % path), self.server.page('%s?title=Some_article' % path))
+        response = self._response('%s?title=%s/Some_article&limit=7' % (path, settings.WHATLINKSHERE_PAGE))
+        self.assertEqual(len(XPATHS.xpath(response.selector, items.WHATLINKS_PATHS['link'])), 7)
+        response = self._response('%s?title=%s' % (path, settings.CATEGORIES_PAGE.replace('limit=1000', 'limit=12')))
+        self.assertEqual(len(XPATHS.xpath(response.selector, items.CATEGORIES_PAGE_PATHS['link'])), 12)
+        response = self._response('%s/%sSome_glossary' % (path, settings.GLOSSARY_DOMAIN))
+        self.assertEqual(XPATHS.xpath(response.selector, items.GLOSSARY_PATHS[0]['title']).extract_first(),
+                         'Glossary:Some glossary')
+        self.assertIsNone(self.server.page('/robots.txt'))
+        with open(os.path.join(CORPUS, 'glossary', 'At-risk-of-poverty_rate.html'), 'rb') as f:
+            self.assertEqual(self.server.page('%s/Glossary:At-risk-of-poverty_rate' % path), f.read())
+        self.assertRaises(ENetError, ENetStandinServer, error_rate=2)
+    def test02_http(self):
+        self.server.start()
+        url = '%s/%s/Some_article' % (self.server.url, settings.SX_RELURL)
+        with urlopen(url) as response:
+            self.assertEqual(response.status, 200)
+            self.assertEqual(response.read(), self.server.page('/%s/Some_article' % settings.SX_RELURL))
+        self.assertRaises(HTTPError, urlopen, '%s/robots.txt' % self.server.url)
+        self.assertEqual((self.server.nrequests, self.server.nerrors), (2, 1))
+    def test03_degraded(self):
+        server = ENetStandinServer(error_rate=1.).start()
+        try:
+            with self.assertRaises(HTTPError) as context:
+                urlopen('%s/%s/Some_article' % (server.url, settings.SX_RELURL))
+            self.assertEqual(context.exception.code, 503)
+        finally:
+            server.stop()
+        server = ENetStandinServer(latency=0.2, bandwidth=50000,
+                                   sizes={settings.ARTICLE_KEY: {'nsections': 50}}).start()
+        try:
+            start = time.perf_counter()
+            with urlopen('%s/%s/Some_article' % (server.url, settings.SX_RELURL)) as response:
+                size = len(response.read())
+            self.assertGreater(time.perf_counter() - start, 0.2 + size / 50000. * 0.9)
+        finally:
+            server.stop()
+    def test04_middleware(self):
+        self.assertRaises(NotConfigured, ENetStandinMiddleware.from_crawler, get_crawler())
+        crawler = get_crawler(settings_dict=self.server.settings())
+        middleware = ENetStandinMiddleware.from_crawler(crawler)
+        url = '%s/Some_article' % settings.SX_MAINURL
+        request = scrapy.Request(url)
+        self.assertIsNone(middleware.process_request(request, None))
+        self.assertEqual(request.url, '%s/%s/Some_article' % (self.server.url, settings.SX_RELURL))
+        self.assertEqual(request.meta[ENetStandinMiddleware.META_KEY], url)
+        self.assertIsNone(middleware.process_request(request, None)) # e.g., retried
+        self.assertEqual(request.url, '%s/%s/Some_article' % (self.server.url, settings.SX_RELURL))
+        self.assertIsNone(middleware.process_request(scrapy.Request('http://example.com/'), None))
+        response = HtmlResponse(url=request.url, body=b'<html></html>', request=request)
+        self.assertEqual(middleware.process_response(request, response, None).url, url)
+        self.assertEqual(request.url, url)
+        request = scrapy.Request(url)
+        middleware.process_request(request, None)
+        self.assertIsNone(middleware.process_exception(request, IOError(), None))
+        self.assertEqual(request.url, url)
+    def test05_crawl(self):
+        # end-to-end crawls (in a new process: the reactor cannot be restarted)
+        code = 'import json; '                                                          \
+            'from estatnet.server import throughput; '                                  \
+            'from estatnet.spiders.sxnet import WhatLinksSpider; '                      \
+            'print(json.dumps([r["responses"] for r in throughput(WhatLinksSpider, (2, 8), 30, page="Main_Page")]))'
+        output = subprocess.check_output([sys.executable, '-W', 'ignore', '-c', code],
+                                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                         timeout=300)
+        responses = json.loads(output.decode().strip().splitlines()[-1])
+        self.assertEqual(len(responses), 2)
+        self.assertTrue(all([n >= 30 for n in responses]))
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module server.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
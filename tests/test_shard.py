@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_shard.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import ENetError, settings
+from estatnet.shard import ENetSharedFrontier, shard_of, parse_shard, merge, output_file, launch
+from estatnet.server import ENetStandinServer
+
+import os
+import json
+import shutil
+import tempfile
+import time
+import unittest
+
+import scrapy
+
+URL = '%s/%%s' % settings.SX_MAINURL
+
+#%%
+#/************************************************************************/
+class shardTestCase(unittest.TestCase):
+    """Class providing the tests of the sharded crawls.
+    """
+
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test01_shard(self):
+        self.assertEqual(parse_shard('1/4'), (1, 4))
+        self.assertRaises(ENetError, parse_shard, '4/4')
+        self.assertRaises(ENetError, parse_shard, 'all')
+        # the same page, whatever its URL, goes to the same shard
+        self.assertEqual(shard_of(scrapy.Request(URL % 'Euro_area'), 7),
+                         shard_of(scrapy.Request(URL % 'euro area'), 7))
+        shards = [shard_of(scrapy.Request(URL % ('Page_%d' % i)), 4) for i in range(200)]
+        self.assertEqual(set(shards), {0, 1, 2, 3})
+        self.assertTrue(all(30 <= shards.count(s) <= 70 for s in range(4)))
+
+    def test02_route(self):
+        filename = os.path.join(self.dirname, 'frontier.sqlite')
+        ENetSharedFrontier.create(filename, 2)
+        shards = [ENetSharedFrontier(filename, s, 2) for s in range(2)]
+        spider = scrapy.Spider('test')
+        requests = [scrapy.Request(URL % ('Page_%d' % i), priority=i) for i in range(20)]
+        mine = [r for r in requests if shard_of(r, 2) == 0]
+        new = shards[0].route(requests + requests[:5], spider)
+        self.assertEqual([r.url for r in new], [r.url for r in mine])
+        self.assertEqual(len(shards[1]), 20)
+        self.assertEqual(shards[1].queued(1), 20 - len(mine))
+        # seen by one shard, seen by all
+        self.assertEqual(shards[1].route(requests, spider), [])
+        claimed = shards[1].claim(spider, size=3)
+        self.assertEqual([r.priority for r in claimed],
+                         sorted([r.priority for r in requests if shard_of(r, 2) == 1], reverse=True)[:3])
+        self.assertEqual(claimed[0].url, max([r for r in requests if shard_of(r, 2) == 1],
+                                             key=lambda r: r.priority).url)
+        [s.close() for s in shards]
+
+    def test03_idle(self):
+        filename = os.path.join(self.dirname, 'frontier.sqlite')
+        ENetSharedFrontier.create(filename, 2)
+        shards = [ENetSharedFrontier(filename, s, 2) for s in range(2)]
+        spider = scrapy.Spider('test')
+        self.assertFalse(shards[0].idle()) # shard 1 still busy
+        request = [r for r in (scrapy.Request(URL % ('Page_%d' % i)) for i in range(10))
+                   if shard_of(r, 2) == 0][0]
+        shards[1].route([request], spider)
+        self.assertFalse(shards[1].idle()) # request queued for shard 0
+        self.assertEqual(len(shards[0].claim(spider)), 1)
+        self.assertFalse(shards[1].idle()) # shard 0 busy again
+        self.assertTrue(shards[0].idle())
+        [s.close() for s in shards]
+
+    def test04_merge(self):
+        output = os.path.join(self.dirname, 'items.jl')
+        for shard in (0, 2):
+            with open(output_file(output, shard), 'w') as f:
+                f.write('{"page": %d}\n{"page": %d}' % (shard, shard + 1))
+        self.assertEqual(merge(output, 3), 4)
+        with open(output) as f:
+            self.assertEqual([json.loads(l)['page'] for l in f], [0, 1, 2, 3])
+        self.assertFalse(os.path.exists(output_file(output, 0)))
+
+    def test05_settings(self):
+        # the workers run with the settings of the project, overridden
+        from estatnet import settings
+        from estatnet.shard import _settings
+        output = os.path.join(self.dirname, 'items.jl')
+        s = _settings(1, 3, 'frontier', output, {'ROBOTSTXT_OBEY': False, 'SPIDER_MIDDLEWARES': {'a.B': 10}})
+        self.assertEqual(s.get('USER_AGENT'), settings.USER_AGENT)
+        self.assertFalse(s.getbool('ROBOTSTXT_OBEY'))
+        self.assertEqual(s.getdict('SPIDER_MIDDLEWARES'),
+                         {'a.B': 10, 'estatnet.middlewares.ENetShardMiddleware': 50})
+        self.assertEqual((s.get('ESTATNET_SHARD'), list(s.getdict('FEEDS'))), ('1/3', [output_file(output, 1)]))
+
+    def test06_crawl(self):
+        # the sharded crawl fetches every page once, and collects the same items
+        # as a single process
+        server = ENetStandinServer().start()
+        results = {}
+        try:
+            for nshards in (1, 3):
+                server.nrequests = 0
+                output = os.path.join(self.dirname, 'items%d.jl' % nshards)
+                # robots.txt (project settings) would be fetched once per process
+                n = launch(nshards, output, settings=server.settings(LOG_LEVEL='ERROR', ROBOTSTXT_OBEY=False),
+                           timeout=300)
+                with open(output) as f:
+                    pages = [json.dumps(json.loads(l)['title']) for l in f]
+                self.assertEqual(n, len(pages))
+                self.assertEqual(len(set(pages)), len(pages))
+                results[nshards] = (set(pages), server.nrequests)
+        finally:
+            server.stop()
+        self.assertGreater(len(results[1][0]), 100)
+        self.assertEqual(results[3], results[1])
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module shard.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_snapshot.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Mon Dec 18 17:28:29 2017
+
+**Contents**
+"""
+
+from estatnet import ENetXpath, ENetWarning
+from estatnet import items
+from estatnet import snapshot
+
+import os, sys
+import subprocess
+import tempfile
+import time
+import unittest
+
+#%%
+#/************************************************************************/
+class snapshotTestCase(unittest.TestCase):
+    """Class providing the tests of the snapshot of the path tables.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, '_paths_snapshot.txt')
+        # the default snapshot is not written in the user cache directory
+        self.default, snapshot.SNAPSHOT_FILE = snapshot.SNAPSHOT_FILE, \
+            os.path.join(self.tmpdir.name, 'cache', '_paths_snapshot.txt')
+
+    def tearDown(self):
+        snapshot.SNAPSHOT_FILE = self.default
+        self.tmpdir.cleanup()
+
+    def test01_write_read(self):
+        tables = snapshot.build()
+        snapshot.write(tables, 'KEY', self.filename)
+        key, read = snapshot.read(self.filename)
+        self.assertEqual(key, 'KEY')
+        self.assertEqual(read, tables)
+        self.assertEqual(snapshot.read(os.path.join(self.tmpdir.name, 'none.txt')), (None, None))
+        # the snapshot is parsed, not run
+        flag = os.path.join(self.tmpdir.name, 'flag')
+        with open(self.filename, 'w') as f:
+            f.write('open(%r, "w").close()' % flag)
+        with self.assertWarns(ENetWarning):
+            self.assertEqual(snapshot.read(self.filename), (None, None))
+        self.assertFalse(os.path.exists(flag))
+    def test02_rebuild(self):
+        tables = snapshot.build()
+        tables['ARTICLE_PATHS'] = {}
+        snapshot.write(tables, 'STALE', self.filename)
+        # the digest does not match: the tables are built again
+        loaded = snapshot.load(filename=self.filename)
+        self.assertEqual(loaded['ARTICLE_PATHS'], snapshot.build()['ARTICLE_PATHS'])
+        self.assertEqual(snapshot.read(self.filename)[0], snapshot.digest())
+        self.assertIs(loaded['SX_PAGES_PATHS']['article'], loaded['ARTICLE_PATHS'])
+    def test03_items(self):
+        tables = snapshot.load()
+        for name in snapshot.PATHS_TABLES:
+            self.assertEqual(getattr(items, name), tables[name])
+        self.assertEqual(items.SX_START_PAGES_PATHS['theme'], items.THEMES_PAGE_PATHS)
+        self.assertEqual(dict(items.ArticleItem.paths), items.ARTICLE_PATHS)
+        self.assertEqual(set(items.ArticleItem.sections.keys()), set(items.ARTICLE_PATHS.keys()))
+        self.assertRaises(AttributeError, getattr, items, 'NOT_A_PATHS')
+    def test04_lazy(self):
+        snapshot.load(rebuild=True) # make sure the snapshot is up to date
+        self.assertTrue(os.path.exists(snapshot.SNAPSHOT_FILE))
+        code = 'import sys; import estatnet.items as items; '                       \
+            'print("estatnet.paths" in sys.modules); items.ARTICLE_PATHS; '         \
+            'print("estatnet.paths" in sys.modules)'
+        output = subprocess.check_output([sys.executable, '-W', 'ignore', '-c', code],
+                                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                         env=dict(os.environ, **{snapshot.SNAPSHOT_ENV: snapshot.SNAPSHOT_FILE}))
+        self.assertEqual(output.split(), [b'False', b'False'])
+    def test05_optimize(self):
+        # the tables are computed again at every build (the timings of the
+        # build and of the snapshot are reported by estatnet.benchmark)
+        snapshot.write(snapshot.build(), snapshot.digest(), self.filename)
+        self.assertEqual(snapshot.read(self.filename)[1], snapshot.build())
+        optimize = ENetXpath.OPTIMIZE
+        try:
+            tables = snapshot.build()
+            ENetXpath.OPTIMIZE = not optimize
+            optimized = snapshot.build()
+            self.assertNotEqual(optimized['ARTICLE_PATHS'], tables['ARTICLE_PATHS'])
+            self.assertNotEqual(snapshot.digest(), snapshot.read(self.filename)[0])
+        finally:
+            ENetXpath.OPTIMIZE = optimize
+        self.assertEqual(snapshot.build(), tables)
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module snapshot.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
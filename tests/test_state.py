@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_state.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import ENetError, ENetWarning
+from estatnet import settings
+from estatnet.state import ENetPageStore, STATE_SETTING, digest
+from estatnet.middlewares import ENetConditionalMiddleware, ENetIncrementalMiddleware
+from estatnet.pages import page_title
+from estatnet.spiders.sxnet import PageCrawler
+
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+import scrapy
+from scrapy.exceptions import NotConfigured
+from scrapy.http import HtmlResponse
+from scrapy.utils.test import get_crawler
+
+from tests.crawl import run_crawl
+
+URL = '%s/Some_article' % settings.SX_MAINURL
+
+def _modify(server, crawler):
+    # 5 of the pages stored are modified between the crawls
+    connection = sqlite3.connect(crawler.settings.get(STATE_SETTING))
+    server.modify(*[page_title(url) for (url,) in connection.execute('SELECT url FROM pages ORDER BY url LIMIT 5')])
+    connection.close()
+
+#%%
+#/************************************************************************/
+class stateTestCase(unittest.TestCase):
+    """Class providing the tests of the incremental recrawls.
+    """
+
+    class Spider(scrapy.Spider):
+        name = 'test'
+        def parse_page(self, response):
+            pass
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, 'estatnet.state')
+        self.spider = self.Spider()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _middlewares(self):
+        crawler = get_crawler(settings_dict={STATE_SETTING: self.filename, 'SPIDER_MIDDLEWARES':
+                                             {'estatnet.middlewares.ENetIncrementalMiddleware': 990}})
+        return (ENetConditionalMiddleware.from_crawler(crawler),
+                ENetIncrementalMiddleware.from_crawler(crawler), crawler.stats)
+
+    def _fetch(self, downloader, url, body, status=200, headers=None):
+        request = scrapy.Request(url)
+        downloader.process_request(request, self.spider)
+        response = HtmlResponse(url=url, body=body, status=status, headers=headers, request=request)
+        return request, downloader.process_response(request, response, self.spider)
+
+    def test01_store(self):
+        store = ENetPageStore(self.filename)
+        self.assertIsNone(store.get(URL))
+        store.put('%s?b=1&a=2' % URL, etag='"x"', links=[{'url': URL}])
+        self.assertIn('%s?a=2&b=1' % URL, store)
+        self.assertEqual(store.get('%s?a=2&b=1' % URL)['links'], [{'url': URL}])
+        self.assertRaises(ENetError, store.put, URL, unknown=1)
+        store.close()
+        store = ENetPageStore.open(self.filename)
+        self.assertIs(ENetPageStore.open(self.filename), store)
+        self.assertEqual((len(store), store.get('%s?a=2&b=1' % URL)['etag']), (1, '"x"'))
+        store.close(); store.close()
+        self.assertIsNot(ENetPageStore.open(self.filename), store)
+        ENetPageStore.open(self.filename).close()
+    def test02_conditional(self):
+        self.assertRaises(NotConfigured, ENetConditionalMiddleware.from_crawler, get_crawler())
+        downloader, spider, stats = self._middlewares()
+        headers = {'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Jan 2018 00:00:00 GMT'}
+        request, response = self._fetch(downloader, URL, b'<html>1</html>', headers=headers)
+        self.assertNotIn(b'If-None-Match', request.headers)
+        self.assertFalse(response.meta[ENetConditionalMiddleware.UNCHANGED_KEY])
+        list(spider.process_spider_output(response, [], self.spider))
+        # conditional request answered with 304
+        request, response = self._fetch(downloader, URL, b'', status=304)
+        self.assertEqual(request.headers[b'If-None-Match'], b'"abc"')
+        self.assertEqual(request.headers[b'If-Modified-Since'], headers['Last-Modified'].encode())
+        self.assertEqual(response.status, 200)
+        self.assertTrue(response.meta[ENetConditionalMiddleware.UNCHANGED_KEY])
+        # conditional headers ignored, same content
+        request, response = self._fetch(downloader, URL, b'<html>1</html>')
+        self.assertTrue(response.meta[ENetConditionalMiddleware.UNCHANGED_KEY])
+        request, response = self._fetch(downloader, URL, b'<html>2</html>')
+        self.assertFalse(response.meta[ENetConditionalMiddleware.UNCHANGED_KEY])
+        self.assertEqual(response.meta[ENetConditionalMiddleware.META_KEY]['digest'], digest(b'<html>2</html>'))
+        self.assertEqual((stats.get_value('estatnet/state/not_modified'), stats.get_value('estatnet/state/same_digest')),
+                         (1, 1))
+        downloader.spider_closed(self.spider); spider.spider_closed(self.spider)
+        # without the spider middleware, the 304 responses are not parsed as pages
+        with self.assertWarns(ENetWarning):
+            downloader = ENetConditionalMiddleware.from_crawler(get_crawler(settings_dict={STATE_SETTING: self.filename}))
+        request, response = self._fetch(downloader, URL, b'', status=304)
+        self.assertEqual(request.headers[b'If-None-Match'], b'"abc"')
+        self.assertEqual(response.status, 304)
+        downloader.spider_closed(self.spider)
+    def test03_incremental(self):
+        downloader, spider, stats = self._middlewares()
+        called = []
+        def callback(item):
+            called.append(True)
+            yield scrapy.Request('%s/Linked_article' % settings.SX_MAINURL, callback=self.spider.parse_page,
+                                 meta={'rule': 2, 'other': 1})
+            yield item
+        # new page: the item and the requests are passed on, the requests are recorded
+        request, response = self._fetch(downloader, URL, b'<html>1</html>')
+        output = list(spider.process_spider_output(response, callback({'last_modified': 'March'}), self.spider))
+        self.assertEqual(len(output), 2)
+        # changed page, same parsed 'last_modified': the item is dropped
+        request, response = self._fetch(downloader, URL, b'<html>2</html>')
+        output = list(spider.process_spider_output(response, callback({'last_modified': 'March'}), self.spider))
+        self.assertEqual([type(o) for o in output], [scrapy.Request])
+        # unchanged page: the callback is not run, the requests are replayed
+        called.clear()
+        request, response = self._fetch(downloader, URL, b'<html>2</html>')
+        output = list(spider.process_spider_output(response, callback({'last_modified': 'April'}), self.spider))
+        self.assertEqual(called, [])
+        self.assertEqual(len(output), 1)
+        self.assertEqual((output[0].url, output[0].callback, output[0].meta),
+                         ('%s/Linked_article' % settings.SX_MAINURL, self.spider.parse_page, {'rule': 2}))
+        self.assertEqual([stats.get_value('estatnet/state/%s' % k) for k in ('new', 'changed', 'replayed', 'same_last_modified')],
+                         [1, 1, 1, 1])
+        downloader.spider_closed(self.spider); spider.spider_closed(self.spider)
+    def test04_recrawl(self):
+        # end-to-end recrawls against the stand-in server, with 5 pages modified
+        # between the crawls (in a new process: the reactor cannot be restarted)
+        crawler_settings = {STATE_SETTING: self.filename,
+                            'DOWNLOADER_MIDDLEWARES': {'estatnet.middlewares.ENetConditionalMiddleware': 580},
+                            'SPIDER_MIDDLEWARES': {'estatnet.middlewares.ENetIncrementalMiddleware': 990}}
+        results = run_crawl(*[(PageCrawler, crawler_settings, {'pages': 'category'})] * 2, between=_modify,
+                            server={'sizes': {'start': {'nlinks': 10}, 'category': {'npages': 5}}})
+        first, second = [dict([(k.split('/')[-1], v) for (k, v) in r['stats'].items()
+                               if k.startswith('estatnet/state') or k == 'response_received_count'])
+                         for r in results]
+        self.assertEqual(first['new'], first['response_received_count'])
+        self.assertLessEqual(second.get('changed', 0), 5)
+        self.assertGreater(second['not_modified'], first['new'] - 10)
+        self.assertEqual(second['replayed'], second['not_modified'])
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module state.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_throttle.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import ENetError
+from estatnet.middlewares import ENetThrottleMiddleware
+from estatnet.throttle import ENetThrottle, retry_after, ADJUST_INTERVAL, BACKOFF_DELAY
+from estatnet.spiders.sxnet import WhatLinksSpider
+
+import time
+import unittest
+from email.utils import formatdate
+from types import SimpleNamespace
+
+from scrapy import Request, Spider
+from scrapy.http import Response
+from scrapy.utils.test import get_crawler
+
+from tests.crawl import run_crawl
+
+#%%
+#/************************************************************************/
+class throttleTestCase(unittest.TestCase):
+    """Class providing the tests of the adaptive throttling.
+    """
+
+    def test01_retry_after(self):
+        self.assertEqual(retry_after(b'5'), 5.)
+        self.assertAlmostEqual(retry_after(formatdate(1000., usegmt=True), now=990.), 10., places=0)
+        self.assertIsNone(retry_after(None))
+        self.assertIsNone(retry_after('soon'))
+
+    def test02_increase(self):
+        self.assertRaises(ENetError, ENetThrottle, min_concurrency=4, max_concurrency=2)
+        throttle = ENetThrottle(concurrency=2, max_concurrency=4, target=1.)
+        decisions = [throttle.observe(latency=0.1) for _ in range(10 * ADJUST_INTERVAL)]
+        self.assertEqual(decisions.count('increase'), 2)
+        self.assertEqual(throttle.concurrency, 4)
+        # slow responses: one less
+        [throttle.observe(latency=2.) for _ in range(ADJUST_INTERVAL)]
+        self.assertEqual(throttle.concurrency, 3)
+        self.assertEqual(throttle.decisions['decrease'], 1)
+
+    def test03_backoff(self):
+        throttle = ENetThrottle(concurrency=8, max_concurrency=8)
+        self.assertEqual(throttle.observe(status=429, wait=2.), 'backoff')
+        self.assertEqual(throttle.pause, 2.)
+        # the other requests in flight are not counted again
+        self.assertEqual([throttle.observe(status=503) for _ in range(7)], [None] * 7)
+        self.assertEqual(throttle.concurrency, 4)
+        # consecutive overloads: exponential backoff, then delays
+        def overload():
+            while throttle.observe(status=None) is None:
+                pass
+            return throttle.concurrency, throttle.delay
+        self.assertEqual(throttle.observe(status=None), None) # still one in flight
+        self.assertEqual([overload() for _ in range(4)],
+                         [(2, 0.), (1, 0.), (1, BACKOFF_DELAY), (1, 2 * BACKOFF_DELAY)])
+        self.assertEqual(throttle.level, 5)
+        # far too slow responses are an overload as well
+        throttle = ENetThrottle(concurrency=4, target=0.1)
+        [throttle.observe(latency=1.) for _ in range(ADJUST_INTERVAL)]
+        self.assertEqual(throttle.decisions['backoff'], 1)
+
+    def test04_recover(self):
+        throttle = ENetThrottle(concurrency=1, max_concurrency=2)
+        throttle.observe(status=503), throttle.observe(status=503), throttle.observe(status=503)
+        self.assertGreater(throttle.delay, BACKOFF_DELAY)
+        decisions = [throttle.observe(latency=0.1) for _ in range(100)]
+        self.assertEqual(throttle.delay, 0.)
+        self.assertEqual(throttle.level, 0)
+        self.assertEqual(throttle.concurrency, 2)
+        self.assertLess(decisions.index('increase'), 3 * ADJUST_INTERVAL) # quick recovery
+
+    def test05_pause(self):
+        # Retry-After pauses the slot through its delay only, until it elapsed
+        crawler = get_crawler(Spider, {'ESTATNET_THROTTLE_ENABLED': True, 'CONCURRENT_REQUESTS': 8})
+        slot = SimpleNamespace(concurrency=8, delay=0.)
+        crawler.engine = SimpleNamespace(downloader=SimpleNamespace(slots={'sx': slot}))
+        middleware, spider = ENetThrottleMiddleware.from_crawler(crawler), Spider('sx')
+        request = Request('http://localhost/', meta={'download_slot': 'sx', 'download_latency': 0.1})
+        middleware.request_reached_downloader(request, spider)
+        self.assertEqual((slot.concurrency, slot.delay), (ENetThrottle().concurrency, 0.))
+        middleware.process_response(request, Response(request.url, status=429, headers={'Retry-After': '0.2'}),
+                                    spider)
+        self.assertEqual(slot.delay, 0.2)
+        middleware.process_response(request, Response(request.url), spider)
+        self.assertEqual(slot.delay, 0.2)
+        time.sleep(0.25)
+        middleware.process_response(request, Response(request.url), spider)
+        self.assertEqual(slot.delay, 0.)
+        self.assertEqual(crawler.stats.get_value('estatnet/throttle/pause'), 1)
+
+    def test06_crawl(self):
+        # against a stand-in server with limited capacity: the throttled crawl
+        # gets far less errors 429 (in a new process: the reactor cannot be
+        # restarted)
+        runs = run_crawl(*[(WhatLinksSpider, {'CLOSESPIDER_PAGECOUNT': 100, 'CONCURRENT_REQUESTS': 16,
+                                              'CONCURRENT_REQUESTS_PER_DOMAIN': 16, 'ESTATNET_THROTTLE_ENABLED': throttled,
+                                              'ESTATNET_THROTTLE_TARGET_LATENCY': 0.2,
+                                              'DOWNLOADER_MIDDLEWARES': {'estatnet.middlewares.ENetThrottleMiddleware': 600}},
+                            {'page': 'Main_Page'}) for throttled in (False, True)],
+                         server={'latency': 0.02, 'capacity': 4, 'sizes': {'whatlinks': {'nlinks': 20}}})
+        results = dict([(throttled, dict([(k.split('/')[-1], v) for (k, v) in r['stats'].items()
+                                          if k.startswith('estatnet/throttle/') or 'status_count' in k]))
+                        for (throttled, r) in zip((False, True), runs)])
+        self.assertNotIn('concurrency', results[False])
+        throttled = results[True]
+        self.assertGreaterEqual(throttled['200'], 90)
+        self.assertLess(4 * throttled.get('429', 0), results[False]['429'])
+        self.assertGreaterEqual(throttled['backoff'], 1)
+        self.assertTrue(1 <= throttled['concurrency'] <= 16)
+        self.assertIn('latency_p95', throttled)
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module throttle.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_titles.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import ENetError
+from estatnet.graph import ENetGraph
+from estatnet.pages import link_title
+from estatnet.titles import ENetTitleTable
+from estatnet.spiders.sxnet import PageCrawler
+
+import os
+import tempfile
+import time
+import unittest
+
+from tests.crawl import run_crawl
+
+#%%
+#/************************************************************************/
+class titlesTestCase(unittest.TestCase):
+    """Class providing the tests of the interning of the titles of the pages.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'estatnet.titles')
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test01_links(self):
+        # all the forms of the links to a page give the same title
+        links = ['https://ec.europa.eu/eurostat/statistics-explained/index.php/Glossary:At-risk-of-poverty_rate',
+                 '/eurostat/statistics-explained/index.php/glossary:At-risk-of-poverty_rate#Definition',
+                 '/eurostat/statistics-explained/index.php?title=Glossary:At-risk-of-poverty%20rate&action=edit',
+                 '/eurostat/statistics-explained/index.php?title=glossary:+at-risk-of-poverty+rate',
+                 'http://ec.europa.eu/eurostat/statistics-explained/index.php/Glossary%3AAt-risk-of-poverty_rate']
+        self.assertEqual(set(map(link_title, links)), {'Glossary:At-risk-of-poverty_rate'})
+        self.assertEqual(link_title('/eurostat/statistics-explained/index.php/category:Living__conditions'),
+                         'Category:Living_conditions')
+        # relative forms
+        self.assertEqual(link_title('index.php/foo'), 'Foo')
+        self.assertEqual(link_title('index.php?title=Foo'), 'Foo')
+        self.assertEqual(link_title('statistics-explained/index.php?title=Glossary:foo'), 'Glossary:Foo')
+        for link in (None, '', 'http://ec.europa.eu/eurostat/web/main', '#top', 'Foo', 'images/a.png',
+                     'https://ec.europa.eu/eurostat/statistics-explained/images/a.png',
+                     # no content pages
+                     '/eurostat/statistics-explained/index.php/File:Foo.png',
+                     'index.php/image:Foo.png',
+                     'index.php/MediaWiki:Foo',
+                     '/eurostat/statistics-explained/index.php/Special:WhatLinksHere/Foo',
+                     '/eurostat/statistics-explained/index.php?title=Special:Search&search=foo',
+                     '/eurostat/statistics-explained/index.php/Talk:Foo',
+                     'index.php?title=Glossary_talk:Foo'):
+            self.assertIsNone(link_title(link))
+
+    def test02_table(self):
+        table = ENetTitleTable()
+        self.assertEqual(table.ids(['/eurostat/statistics-explained/index.php/B',
+                                    'http://ec.europa.eu/eurostat/web/main',
+                                    '/eurostat/statistics-explained/index.php?title=A',
+                                    '/eurostat/statistics-explained/index.php/b']), [0, 1])
+        self.assertEqual(table.id('A'), 1)
+        self.assertIsNone(table.id('C', create=False))
+        self.assertEqual((len(table), table.title(0)), (2, 'B'))
+        table.close() # transient
+        # the identifiers are kept across the uses of a stored table
+        table = ENetTitleTable.open(self.filename)
+        self.assertIs(ENetTitleTable.open(self.filename), table)
+        self.assertEqual([table.id(t) for t in ('A', 'B')], [0, 1])
+        table.close()
+        table.id('C')
+        table.close()
+        table = ENetTitleTable(self.filename)
+        self.assertEqual(table.titles, ['A', 'B', 'C'])
+        self.assertEqual(table.ids(['/eurostat/statistics-explained/index.php/D'], create=False), [])
+        self.assertEqual(table.id('D'), 3)
+        table.close()
+
+    def test03_graph(self):
+        # the nodes of the graph are the identifiers of the titles
+        table = ENetTitleTable(self.filename)
+        [table.id(t) for t in ('X', 'Y')]
+        graph = ENetGraph(table=table)
+        graph.add_edges('A', ['Y'], 'link')
+        graph.save(os.path.join(self.directory.name, 'graph'))
+        self.assertEqual(graph.successors(table.id('A')), [table.id('Y')])
+        self.assertEqual(len(graph.scraped), 3)
+        table.id('Z')
+        graph = ENetGraph.load(os.path.join(self.directory.name, 'graph'), table=table)
+        self.assertEqual(graph.nnodes, 4)
+        self.assertEqual(graph.successors(table.id('Z')), [])
+        other = ENetTitleTable()
+        other.id('Y')
+        self.assertRaises(ENetError, ENetGraph.load, os.path.join(self.directory.name, 'graph'), table=other)
+        self.assertEqual(ENetGraph.load(os.path.join(self.directory.name, 'graph')).titles, ['X', 'Y', 'A'])
+        table.close()
+
+    def test04_crawl(self):
+        # the identifiers of the items are those of the nodes of the graph, and
+        # are kept across crawls (in a new process: the reactor cannot be
+        # restarted)
+        crawler_settings = {'ESTATNET_TITLES_FILE': self.filename,
+                            'ESTATNET_GRAPH_FILE': os.path.join(self.directory.name, 'graph'),
+                            'ITEM_PIPELINES': {'estatnet.pipelines.ENetTitlePipeline': 700,
+                                               'estatnet.pipelines.ENetGraphPipeline': 800}}
+        first, second = [[(item.get('title'), item.get('node_id'), item.get('link_ids')) for item in r['items']]
+                         for r in run_crawl(*[(PageCrawler, crawler_settings, {'pages': pages})
+                                              for pages in (['category'], ['category', 'glossary'])])]
+        self.assertGreater(len(first), 10)
+        table = ENetTitleTable(self.filename)
+        graph = ENetGraph.load(os.path.join(self.directory.name, 'graph'), table=table)
+        self.assertEqual(graph.nnodes, len(table))
+        for (title, n, ids) in first + second:
+            self.assertEqual(table.title(n), title.replace(' ', '_'))
+            self.assertEqual(graph.scraped[n], 1)
+            for (field, targets) in ids.items():
+                self.assertEqual(set(graph.successors(n, field)), set(targets))
+        # the pages crawled again keep their identifier
+        ids = dict([(title, n) for (title, n, _) in first])
+        again = [(title, n) for (title, n, _) in second if title in ids]
+        self.assertGreater(len(again), 0)
+        self.assertEqual(again, [(title, ids[title]) for (title, _) in again])
+        table.close()
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module titles.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_whatlinks.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_
+
+*version*:      0.1
+--
+*since*:        Sun Jan 14 17:31:51 2018
+
+**Contents**
+"""
+
+from estatnet import ENetError
+from estatnet import settings
+from estatnet.server import ENetStandinServer
+from estatnet.spiders.sxnet import WhatLinksSpider
+
+import json
+import time
+import unittest
+from urllib.parse import urlsplit, parse_qs
+
+import scrapy
+from scrapy.http import TextResponse
+
+from tests.crawl import run_crawl
+
+#%%
+#/************************************************************************/
+class whatlinksTestCase(unittest.TestCase):
+    """Class providing the tests of the backlinks spider.
+    """
+
+    def setUp(self):
+        self.server = ENetStandinServer(sizes={settings.WHATLINKS_KEY: {'nlinks': 7}})
+
+    def tearDown(self):
+        self.server.server_close()
+
+    def _response(self, request):
+        # answer a request of the spider with the stand-in API
+        body = json.dumps(self.server.api(parse_qs(urlsplit(request.url).query))).encode('utf-8')
+        return TextResponse(url=request.url, body=body, encoding='utf-8', request=request)
+
+    def test01_urls(self):
+        url = WhatLinksSpider.url_backlinks(['A_b', 'C'], lhcontinue='0|5', **{'continue': '||'})
+        params = parse_qs(urlsplit(url).query)
+        self.assertTrue(url.startswith(settings.SX_APIURL))
+        self.assertEqual((params['prop'], params['titles'], params['lhcontinue']), (['linkshere'], ['A_b|C'], ['0|5']))
+        self.assertEqual(WhatLinksSpider.url_page("Living conditions's"),
+                         "/%s/Living_conditions%%27s" % settings.SX_RELURL)
+        url = WhatLinksSpider.url_whatlinkshere('R&D expenditure?', limit=10)
+        self.assertEqual(url, '%s/R%%26D_expenditure%%3F&limit=10' % settings.WHATLINKSHERE_URL)
+        self.assertEqual(parse_qs(urlsplit(url).query)['title'], ['Special:WhatLinksHere/R&D_expenditure?'])
+        self.assertRaises(ENetError, WhatLinksSpider, page='A', mode='unknown')
+        self.assertRaises(ENetError, WhatLinksSpider, page='A', mode='api', batch=0)
+    def test02_parse(self):
+        spider = WhatLinksSpider(page=['A', 'B', 'C'], mode='api', batch=2)
+        requests = list(spider.start_requests())
+        self.assertEqual([r.meta['titles'] for r in requests], [['A', 'B'], ['C']])
+        # the default limit (10) of the stand-in API splits the 14 backlinks of
+        # the first batch over 2 queries
+        output = list(spider.parse_backlinks(self._response(requests[0].replace(
+            url=requests[0].url.replace('lhlimit=max', 'lhlimit=10')))))
+        self.assertEqual(len(output), 1)
+        self.assertIn('lhcontinue', output[0].url)
+        output = list(spider.parse_backlinks(self._response(output[0])))
+        self.assertEqual(len(output), 2)
+        self.assertEqual([len(item['link']) for item in output], [7, 7])
+        self.assertEqual(output[0]['language'], [settings.DEF_LANG])
+        # the next level is explored once all pages of the level are done: the
+        # (distinct) backlinks of the 3 titles are batched by 2
+        output = list(spider.parse_backlinks(self._response(requests[1])))
+        self.assertEqual(len([o for o in output if not isinstance(o, scrapy.Request)]), 1)
+        requests = [o for o in output if isinstance(o, scrapy.Request)]
+        self.assertEqual(set([r.meta['level'] for r in requests]), {1})
+        self.assertEqual(spider.frontier.sizes[0], 3)
+        self.assertEqual(len(requests), (spider.frontier.sizes[1] + 1) // 2)
+        self.assertEqual(spider.frontier.sizes[1] + spider.frontier.ndropped['visited'], 21)
+    def test03_crawl(self):
+        # the backlinks found through the API are those of the "What links here"
+        # pages, with far fewer requests (in a new process: the reactor cannot
+        # be restarted)
+        modes = ('html', 'api')
+        runs = run_crawl(*[(WhatLinksSpider, {}, {'page': 'Main_Page', 'mode': mode}) for mode in modes],
+                         server={'sizes': {'whatlinks': {'nlinks': 20}}})
+        results = dict([(mode, (sorted([sorted(item.get('link', [])) for item in r['items']]),
+                                r['stats']['response_received_count'])) for (mode, r) in zip(modes, runs)])
+        self.assertEqual(results['api'][0], results['html'][0])
+        self.assertGreater(len(results['api'][0]), 100)
+        self.assertLess(10 * results['api'][1], results['html'][1])
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing module sxnet.py' % cls.__name__)
+        time.sleep(0.5)
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return
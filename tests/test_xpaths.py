@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.. _test_xpaths.py
+
+*credits*:      `gjacopo <jacopo.grazzini@ec.europa.eu>`_ 
+
+*version*:      0.1
+--
+*since*:        Mon Dec 18 17:28:29 2017
+
+**Contents**
+"""
+
+from scrapy import http
+
+from lxml import etree
+
+from estatnet import ENetError, ENetXpath
+from estatnet import items
+from estatnet.sections import ENetSections
+from estatnet.xpaths import ENetXpathRegistry, XPATHS, check_equivalence
+
+import random
+import time
+import unittest
+
+#%%
+#/************************************************************************/
+class xpathRegistryTestCase(unittest.TestCase):
+    """Class providing the various tests of the ENetXpathRegistry class.
+    """
+    response = http.HtmlResponse(url="", encoding='utf-8', body=b"""
+            <html lang="en">
+            <body>
+            <h1 id="firstHeading" class="firstHeading">Income distribution statistics</h1>
+            <h2><span class="mw-headline" id="See_also">See also</span></h2>
+            <ul>
+                <li><a href="/eurostat/statistics-explained/index.php/Housing_conditions">Housing conditions</a></li>
+                <li><a href="/eurostat/statistics-explained/index.php/Housing_statistics">Housing statistics</a></li>
+            </ul>
+            <h2><span class="mw-headline" id="Further_Eurostat_information">Further Eurostat information</span></h2>
+            <h3><span class="mw-headline" id="Main_tables">Main tables</span></h3>
+            <ul>
+                <li><a href="http://ec.europa.eu/eurostat/web/income-and-living-conditions/data/main-tables">Income and living conditions (t_ilc)</a></li>
+            </ul>
+            <div id="footer" role="contentinfo">
+                <ul id="f-list" class="list-inline"> 
+                    <li id="lastmod"> This page was last modified on 19 September 2017, at 10:19.</li>
+                </ul>
+            </div>
+            </body>
+            </html>
+            """)
+
+    def test01_compile(self):
+        registry = ENetXpathRegistry()
+        xpath = registry.compile('//h1/text()')
+        self.assertIsInstance(xpath, etree.XPath)
+        self.assertIs(registry.compile('//h1/text()'), xpath)
+        self.assertEqual(len(registry), 1)
+    def test02_compile_errors(self):
+        registry = ENetXpathRegistry()
+        self.assertRaises(ENetError, registry.compile, '')
+        self.assertRaises(ENetError, registry.compile, '//h1[')
+    def test03_register(self):
+        registry = ENetXpathRegistry({0: {'title': '//h1/text()', 'empty': ''},
+                                      1: {'title': '//h1/text()', 'link': '//a/@href'}})
+        self.assertEqual(len(registry), 2)
+        self.assertTrue('//a/@href' in registry)
+    def test04_tables(self):
+        for paths in (items.ARTICLE_PATHS, items.GLOSSARY_PATHS, items.CATEGORY_PATHS,
+                      items.THEME_PATHS):
+            for version in paths.keys():
+                [self.assertTrue(path in XPATHS) for path in paths[version].values()
+                    if path not in (None,'')]
+        [self.assertTrue(path in XPATHS) for path in items.WHATLINKS_PATHS.values()]
+    def test05_xpath(self):
+        for version in items.ARTICLE_PATHS.keys():
+            for (key, path) in items.ARTICLE_PATHS[version].items():
+                if path in (None,''):
+                    continue
+                self.assertEqual(XPATHS.xpath(self.response.selector, path).extract(),
+                                 self.response.xpath(path).extract())
+    def test06_loader(self):
+        l = items.ArticleItemLoader(response=self.response)
+        [l.add_xpath(key, XPATHS[path]) for (key, path) in items.ARTICLE_PATHS[0].items()
+            if path not in (None,'')]
+        item = l.load_item()
+        self.assertEqual(item['title'], 'Income distribution statistics')
+        self.assertEqual(item['see_also'],
+                         ['/eurostat/statistics-explained/index.php/Housing_conditions',
+                          '/eurostat/statistics-explained/index.php/Housing_statistics'])
+        self.assertEqual(item['table'],
+                         ['http://ec.europa.eu/eurostat/web/income-and-living-conditions/data/main-tables'])
+
+    #%%
+    # optimizing rewrite of ENetXpath.create
+    @staticmethod
+    def pages(nseeds):
+        # random MediaWiki-like pages, with unique headline identifiers
+        ids = ['See_also', 'Publications', 'Main_tables', 'Database', 'Other_information',
+               'External_links', 'Dedicated_section', 'Statistical_articles', 'Methodology_.2F_Metadata']
+        def page(rand, used, level=0):
+            html = []
+            for _ in range(rand.randint(0, 8)):
+                c = rand.random()
+                if c < 0.3:
+                    tag, sid = rand.choice(['h2', 'h3', 'h4']), rand.choice(ids)
+                    sid = sid if sid not in used else 'x%d' % rand.randint(0, 999)
+                    used.add(sid)
+                    html.append('<%s><span id="%s">x</span><span><a href="/e%d">e</a></span></%s>'
+                                % (tag, sid, rand.randint(0, 99), tag))
+                elif c < 0.55:
+                    html.append('<ul>%s</ul>' % ''.join(['<li><a href="/l%d">l</a></li>' % rand.randint(0, 999)
+                                                         for _ in range(rand.randint(0, 3))]))
+                elif c < 0.7:
+                    html.append('<p><a href="/a%d">a</a></p>' % rand.randint(0, 999))
+                elif level < 3:
+                    html.append('<div>%s</div>' % page(rand, used, level+1))
+            return ''.join(html)
+        return ['<html><body>%s</body></html>' % page(random.Random(seed), set())
+                for seed in range(nseeds)]
+
+    def test07_optimize(self):
+        path = items.ARTICLE_PATHS[0]['table']
+        optimized = ENetXpath.optimize(path)
+        self.assertNotEqual(optimized, path)
+        self.assertTrue(optimized.startswith('(set:leading(//h3[span[@id="Main_tables"]]/following-sibling::*, '))
+        self.assertTrue(optimized.endswith(')//li/a/@href'))
+        # paths that are not quadratic sibling sections are left unchanged
+        [self.assertEqual(ENetXpath.optimize(items.ARTICLE_PATHS[version][key]), items.ARTICLE_PATHS[version][key])
+            for (version, key) in ((0, 'title'), (1, 'see_also'), (1, 'table'))]
+        self.assertEqual(XPATHS.xpath(self.response.selector, optimized).extract(),
+                         self.response.xpath(path).extract())
+    def test08_create(self):
+        kwargs = dict(node='h3[span[@id="Main_tables"]]', first='h3[span[@id="Main_tables"]]',
+                      following=True, last='*[starts-with(name(),"h")]', tag='li/a/@href')
+        path = ENetXpath.create(**kwargs)
+        self.assertEqual(ENetXpath.create(optimize=True, **kwargs), ENetXpath.optimize(path))
+        self.assertEqual(ENetXpath.create(optimize=False, **kwargs), path)
+        try:
+            ENetXpath.OPTIMIZE = True
+            self.assertEqual(ENetXpath.create(**kwargs), ENetXpath.optimize(path))
+            self.assertEqual(ENetXpath.create(optimize=False, **kwargs), path)
+        finally:
+            ENetXpath.OPTIMIZE = False
+    def test09_equivalence(self):
+        from tests.items import ArticleItemTestCase
+        from tests.test_sections import sectionsTestCase
+        documents = [self.response, ArticleItemTestCase.response,
+                     sectionsTestCase.response0, sectionsTestCase.response1]
+        documents.extend(self.pages(300))
+        for paths in (items.ARTICLE_PATHS, items.THEME_PATHS, items.GLOSSARY_PATHS):
+            self.assertEqual(check_equivalence(paths, documents), [])
+        # a wrong rewrite is reported
+        mismatches = check_equivalence(items.ARTICLE_PATHS[0]['table'], [self.response],
+                                       rewrite=lambda path: '//a/@href')
+        self.assertEqual(len(mismatches), 1)
+    def test10_sections(self):
+        # the optimized paths are still extracted in a single pass
+        paths = {key: ENetXpath.optimize(path) for (key, path) in items.ARTICLE_PATHS[0].items()}
+        self.assertEqual(set(ENetSections(paths).fields.keys()),
+                         set(ENetSections(items.ARTICLE_PATHS[0]).fields.keys()))
+    def test11_long(self):
+        # long section: the original expression is quadratic in its size, the
+        # rewritten one no longer rescans the preceding siblings
+        n, path = 300, items.ARTICLE_PATHS[0]['information']
+        body = '<h2><span id="See_also">a</span></h2>%s'                                \
+            '<h3><span id="Other_information">o</span></h3>%s'                          \
+            '<h2><span id="External_links">b</span></h2>%s'                             \
+            % (''.join(['<p><a href="/p%d">x</a></p>' % i for i in range(n)]),
+               ''.join(['<ul><li><a href="/l%d">x</a></li></ul>' % i for i in range(n)]),
+               ''.join(['<p>%d</p>' % i for i in range(n)]))
+        root = http.HtmlResponse(url="", encoding='utf-8',
+                                 body=('<html><body>%s</body></html>' % body).encode()).selector.root
+        optimized = ENetXpath.optimize(path)
+        self.assertIn('preceding-sibling::', path)
+        self.assertNotIn('preceding-sibling::', optimized)
+        self.assertEqual(optimized.count('set:leading('), 1)
+        registry = ENetXpathRegistry()
+        values = registry.compile(path)(root)
+        self.assertEqual(registry.compile(optimized)(root), values)
+        self.assertEqual(values, ['/l%d' % i for i in range(n)])
+
+    @classmethod
+    def runtest(cls, **kwargs):
+        print('\n{}: Class test %s for testing class ENetXpathRegistry of xpaths.py' % cls.__name__)
+        time.sleep(0.5) 
+        suite = unittest.TestLoader().loadTestsFromTestCase(cls)
+        unittest.TextTestRunner(verbosity=kwargs.pop('verbosity',2)).run(suite)
+        return